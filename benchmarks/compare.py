@@ -0,0 +1,119 @@
+"""Compare two HTTP benchmark result files and flag regressions.
+
+A scenario regresses when its throughput drops, or its p99 latency grows,
+by more than ``--threshold`` percent against the baseline. The exit status
+is 1 when any scenario regressed, so the script can gate CI jobs.
+
+Usage::
+
+    python benchmarks/compare.py BASELINE.json CURRENT.json
+    python benchmarks/compare.py BASELINE.json CURRENT.json --threshold 5
+    python benchmarks/compare.py BASELINE.json CURRENT.json --metric rps
+
+Both files are the JSON written by ``benchmarks/http_benchmarks.py``
+(``BENCH_SAVE_RESULTS=1`` or ``--output``).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+# metric -> True when a higher value is better.
+METRICS: dict[str, bool] = {
+    "rps": True,
+    "p50_ms": False,
+    "p99_ms": False,
+}
+DEFAULT_METRICS: tuple[str, ...] = ("rps", "p99_ms")
+
+
+def load_summary(path: Path) -> dict[str, dict[str, Any]]:
+    payload = json.loads(path.read_text())
+    return payload.get("summary", payload)
+
+
+def change_percent(baseline: float, current: float) -> float:
+    if not baseline:
+        return 0.0
+    return (current - baseline) / baseline * 100.0
+
+
+def compare(
+    baseline: dict[str, dict[str, Any]],
+    current: dict[str, dict[str, Any]],
+    metrics: tuple[str, ...] = DEFAULT_METRICS,
+    threshold: float = 10.0,
+) -> list[dict[str, Any]]:
+    """One row per (scenario, metric) present in both summaries."""
+    rows = []
+    for scenario in baseline:
+        if scenario not in current:
+            continue
+        for metric in metrics:
+            old = baseline[scenario].get(metric)
+            new = current[scenario].get(metric)
+            if old is None or new is None:
+                continue
+            delta = change_percent(old, new)
+            worse = -delta if METRICS[metric] else delta
+            rows.append({
+                "scenario": scenario,
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "change_percent": round(delta, 1),
+                "regression": worse > threshold,
+            })
+    return rows
+
+
+def _print_rows(rows: list[dict[str, Any]], threshold: float) -> None:
+    print("")
+    print("=" * 78)
+    print(f"HTTP benchmark comparison (regression threshold {threshold:.1f}%)")
+    print("=" * 78)
+    print(
+        f"{'Scenario':<20}{'Metric':<10}{'Baseline':>12}{'Current':>12}"
+        f"{'Change':>10}{'Verdict':>14}"
+    )
+    print("-" * 78)
+    for row in rows:
+        verdict = "REGRESSION" if row["regression"] else "ok"
+        print(
+            f"{row['scenario']:<20}{row['metric']:<10}{row['baseline']:>12.3f}"
+            f"{row['current']:>12.3f}{row['change_percent']:>9.1f}%{verdict:>14}"
+        )
+    print("=" * 78)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("-t", "--threshold", type=float, default=10.0,
+                        help="allowed change in percent (default: 10)")
+    parser.add_argument("-m", "--metric", action="append", choices=sorted(METRICS),
+                        help="metric to compare (repeatable; default: rps, p99_ms)")
+    args = parser.parse_args(argv)
+
+    metrics = tuple(args.metric) if args.metric else DEFAULT_METRICS
+    baseline = load_summary(args.baseline)
+    current = load_summary(args.current)
+    rows = compare(baseline, current, metrics, args.threshold)
+    _print_rows(rows, args.threshold)
+
+    missing = sorted(set(baseline) - set(current))
+    if missing:
+        print(f"Missing from current run: {', '.join(missing)}")
+    regressions = [r for r in rows if r["regression"]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.1f}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
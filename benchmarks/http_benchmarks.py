@@ -0,0 +1,468 @@
+"""End-to-end HTTP benchmarks.
+
+Boots an in-process :class:`navigator.Application` on a loopback socket,
+backed by a throw-away SQLite database (no Postgres needed), and drives it
+with the async load generator in :mod:`benchmarks.loadgen`.
+
+Scenarios:
+
+* ``plain`` / ``json``: function routes returning text and JSON.
+* ``error``: a handler raising, answered through ``error_middleware``.
+* ``validate`` / ``validate_payload``: ``Application.validate`` and
+  :func:`navigator.decorators.validate_payload` on a POSTed body.
+* ``model_get`` / ``model_list`` / ``model_post``: a :class:`ModelView`
+  over the SQLite ``airports`` table.
+* ``sse_broadcast``: one ``SSEManager`` progress broadcast, timed until
+  every subscriber has received it.
+* ``ws_fanout``: one ``WebSocketChannelManager`` channel broadcast, timed
+  until every client has received it.
+
+Each scenario reports rps and p50/p99 latency.
+
+Usage::
+
+    python benchmarks/http_benchmarks.py                       # all scenarios
+    python benchmarks/http_benchmarks.py --duration 2 -c 64    # shorter, wider
+    python benchmarks/http_benchmarks.py --only plain,model_get
+
+    # Persist the results and compare against a previous run:
+    BENCH_SAVE_RESULTS=1 python benchmarks/http_benchmarks.py
+    python benchmarks/compare.py baseline.json \\
+        benchmarks/results/http_benchmarks.json
+"""
+# No ``from __future__ import annotations`` here: datamodel and asyncdb read
+# the field annotations of the models below as types.
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import os
+import random
+import socket
+import sqlite3
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Optional
+
+# Make the worktree importable when the script is launched directly.
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+import aiohttp  # noqa: E402  (sys.path must be patched first)
+from aiohttp import web  # noqa: E402
+from asyncdb.models import Column, Model  # noqa: E402
+from datamodel import BaseModel, Field  # noqa: E402
+
+from benchmarks.loadgen import (  # noqa: E402
+    FanoutProbe,
+    LoadFailed,
+    LoadResult,
+    http_operation,
+    run_load,
+)
+from navigator import Application  # noqa: E402
+from navigator.decorators import validate_payload  # noqa: E402
+from navigator.handlers.types import AppHandler  # noqa: E402
+from navigator.services.sse import SSEManager  # noqa: E402
+from navigator.services.ws import WebSocketChannelManager  # noqa: E402
+from navigator.views import ModelView  # noqa: E402
+
+SCENARIOS: tuple[str, ...] = (
+    "plain",
+    "json",
+    "error",
+    "validate",
+    "validate_payload",
+    "model_get",
+    "model_list",
+    "model_post",
+    "sse_broadcast",
+    "ws_fanout",
+)
+
+
+class Airport(Model):
+    iata: str = Column(primary_key=True, required=True)
+    airport: str = Column(required=True)
+    city: str
+    country: str
+
+    class Meta:
+        name: str = "airports"
+        # SQLite's default schema, so "main.airports" is valid SQL.
+        schema: str = "main"
+        strict = True
+
+
+class AirportPayload(BaseModel):
+    iata: str = Field(required=True)
+    airport: str = Field(required=True)
+    city: str
+    country: str
+
+
+class AirportHandler(ModelView):
+    model: Model = Airport
+    pk: str = "iata"
+    driver: str = "sqlite"
+
+
+class BenchHandler(AppHandler):
+    enable_error_middleware: bool = True
+
+
+def _seed_database(path: Path, rows: int) -> list[str]:
+    """Create the ``airports`` table with *rows* entries; returns the keys."""
+    keys = [f"A{n:05d}" for n in range(rows)]
+    with contextlib.closing(sqlite3.connect(path)) as conn:
+        conn.execute(
+            "CREATE TABLE airports ("
+            "iata TEXT PRIMARY KEY, airport TEXT NOT NULL, city TEXT, country TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO airports VALUES (?, ?, ?, ?)",
+            [(k, f"Airport {k}", "City", "Country") for k in keys],
+        )
+        conn.commit()
+    return keys
+
+
+def _payload_factory(prefix: str) -> Callable[[], dict[str, Any]]:
+    counter = itertools.count()
+
+    def _payload() -> dict[str, Any]:
+        iata = f"{prefix}{next(counter):07d}"
+        return {
+            "iata": iata,
+            "airport": f"Airport {iata}",
+            "city": "City",
+            "country": "Country",
+        }
+
+    return _payload
+
+
+def build_app(db_path: Path) -> Application:
+    app = Application(
+        handler=BenchHandler,
+        enable_metrics=False,
+        enable_profiler=False,
+        enable_loop_monitor=False,
+        enable_admission_control=False,
+        enable_compression=False,
+        enable_queue_logging=False,
+        enable_tracing=False,
+    )
+    webapp = app.get_app()
+
+    async def plain(request: web.Request) -> web.Response:
+        return web.Response(text="Hello World")
+
+    async def as_json(request: web.Request) -> web.Response:
+        return web.json_response({"message": "Hello World", "items": list(range(20))})
+
+    async def error(request: web.Request) -> web.Response:
+        raise ValueError("Benchmark failure")
+
+    @app.validate(AirportPayload)
+    async def validate(airport: AirportPayload, errors: Optional[dict] = None):
+        return web.json_response({"iata": airport.iata})
+
+    @validate_payload(AirportPayload)
+    async def payload(request: web.Request, airportpayload=None, errors=None):
+        return web.json_response({"iata": airportpayload.iata})
+
+    webapp.router.add_get("/plain", plain)
+    webapp.router.add_get("/json", as_json)
+    webapp.router.add_get("/error", error)
+    webapp.router.add_post("/validate", validate)
+    webapp.router.add_post("/validate/payload", payload)
+    AirportHandler.configure(
+        webapp, "/api/v1/airports", credentials={"database": str(db_path)}
+    )
+
+    # SSE: the manager's own subscribe loop, without the cleanup task.
+    sse = SSEManager()
+    webapp["sse_manager"] = sse
+
+    async def events(request: web.Request) -> web.StreamResponse:
+        return await sse.subscribe_to_task(request, request.match_info["task_id"])
+
+    async def stop_sse(_app: web.Application) -> None:
+        await sse.stop()
+
+    webapp.router.add_get("/events/{task_id}", events)
+    webapp.on_cleanup.append(stop_sse)
+    webapp["ws_manager"] = WebSocketChannelManager(webapp, route_prefix="/ws")
+    return app
+
+
+async def _sse_scenario(
+    session: aiohttp.ClientSession,
+    base_url: str,
+    webapp: web.Application,
+    args: argparse.Namespace,
+) -> LoadResult:
+    sse: SSEManager = webapp["sse_manager"]
+    task_id = await sse.create_task_notification("benchmark")
+    connected = FanoutProbe(args.subscribers)
+    received = FanoutProbe(args.subscribers)
+    ready = connected.arm()
+
+    async def subscriber():
+        async with session.get(f"{base_url}/events/{task_id}") as response:
+            async for line in response.content:
+                if not line.startswith(b"data:"):
+                    continue
+                if b"progress" in line:
+                    received.hit()
+                elif b"connected" in line:
+                    connected.hit()
+
+    readers = [asyncio.create_task(subscriber()) for _ in range(args.subscribers)]
+    try:
+        await asyncio.wait_for(ready, timeout=10)
+        counter = itertools.count()
+
+        async def broadcast():
+            done = received.arm()
+            await sse.broadcast_task_progress(task_id, {"progress": next(counter)})
+            await asyncio.wait_for(done, timeout=5)
+
+        return await run_load(
+            "sse_broadcast", broadcast, concurrency=1, duration=args.duration
+        )
+    finally:
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+
+async def _ws_scenario(
+    session: aiohttp.ClientSession,
+    base_url: str,
+    webapp: web.Application,
+    args: argparse.Namespace,
+) -> LoadResult:
+    manager: WebSocketChannelManager = webapp["ws_manager"]
+    connected = FanoutProbe(args.subscribers)
+    received = FanoutProbe(args.subscribers)
+    ready = connected.arm()
+
+    async def on_connect(ws, channel, client_info):  # pylint: disable=W0613
+        connected.hit()
+
+    manager.add_connect_callback("bench", on_connect)
+
+    async def client():
+        async with session.ws_connect(f"{base_url}/ws/bench") as ws:
+            async for msg in ws:
+                if msg.type == aiohttp.WSMsgType.TEXT and '"tick"' in msg.data:
+                    received.hit()
+
+    readers = [asyncio.create_task(client()) for _ in range(args.subscribers)]
+    try:
+        await asyncio.wait_for(ready, timeout=10)
+        counter = itertools.count()
+
+        async def broadcast():
+            done = received.arm()
+            await manager.broadcast_to_channel(
+                "bench", {"type": "tick", "n": next(counter)}
+            )
+            await asyncio.wait_for(done, timeout=5)
+
+        return await run_load(
+            "ws_fanout", broadcast, concurrency=1, duration=args.duration
+        )
+    finally:
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+
+async def run_benchmarks(args: argparse.Namespace) -> tuple[dict[str, Any], list[str]]:
+    """Run the selected scenarios: ``(results, failed scenarios)``."""
+    selected = [s for s in SCENARIOS if s in args.only] if args.only else SCENARIOS
+    with tempfile.TemporaryDirectory(prefix="nav-bench-") as tmp:
+        db_path = Path(tmp) / "bench.db"
+        keys = _seed_database(db_path, args.rows)
+        app = build_app(db_path)
+        webapp = app.setup_app()
+        runner = web.AppRunner(webapp, access_log=None)
+        await runner.setup()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        site = web.SockSite(runner, sock)
+        await site.start()
+        base_url = "http://127.0.0.1:{}".format(sock.getsockname()[1])
+        connector = aiohttp.TCPConnector(limit=max(args.concurrency, args.subscribers) * 2)
+        rng = random.Random(args.seed)
+        operations = {
+            "plain": ("GET", "/plain", (200,), None),
+            "json": ("GET", "/json", (200,), None),
+            "error": ("GET", "/error", (500,), None),
+            "validate": ("POST", "/validate", (200,), _payload_factory("V")),
+            "validate_payload": (
+                "POST", "/validate/payload", (200,), _payload_factory("P")
+            ),
+            "model_list": ("GET", "/api/v1/airports", (200,), None),
+            "model_post": (
+                "POST", "/api/v1/airports", (200, 201), _payload_factory("N")
+            ),
+        }
+        results: dict[str, Any] = {}
+        failed: list[str] = []
+        try:
+            async with aiohttp.ClientSession(connector=connector) as session:
+                for name in selected:
+                    try:
+                        result = await _run_scenario(
+                            name, session, base_url, webapp, operations, keys, rng, args
+                        )
+                    except LoadFailed as exc:
+                        failed.append(name)
+                        print(f"{name:<20}FAILED: {exc}")
+                        continue
+                    results[name] = result.as_dict()
+                    _print_row(name, results[name])
+        finally:
+            await runner.cleanup()
+    return results, failed
+
+
+async def _run_scenario(
+    name: str,
+    session: aiohttp.ClientSession,
+    base_url: str,
+    webapp: web.Application,
+    operations: dict[str, tuple],
+    keys: list[str],
+    rng: random.Random,
+    args: argparse.Namespace,
+) -> LoadResult:
+    if name == "sse_broadcast":
+        return await _sse_scenario(session, base_url, webapp, args)
+    if name == "ws_fanout":
+        return await _ws_scenario(session, base_url, webapp, args)
+    if name == "model_get":
+
+        async def model_get():
+            url = f"{base_url}/api/v1/airports/{rng.choice(keys)}"
+            async with session.get(url) as response:
+                await response.read()
+                if response.status != 200:
+                    raise RuntimeError(f"GET {url}: HTTP {response.status}")
+
+        return await run_load(
+            name,
+            model_get,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            warmup=args.warmup,
+        )
+    method, route, expect, factory = operations[name]
+    operation = http_operation(
+        session, method, base_url + route, expect=expect, json=factory
+    )
+    return await run_load(
+        name,
+        operation,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        warmup=args.warmup,
+    )
+
+
+def _print_header() -> None:
+    print("")
+    print("=" * 78)
+    print("Navigator end-to-end HTTP benchmarks")
+    print("=" * 78)
+    print(
+        f"{'Scenario':<20}{'Requests':>10}{'Errors':>8}{'rps':>12}"
+        f"{'p50 (ms)':>12}{'p99 (ms)':>12}"
+    )
+    print("-" * 78)
+
+
+def _print_row(name: str, entry: dict[str, Any]) -> None:
+    print(
+        f"{name:<20}{entry['requests']:>10}{entry['errors']:>8}{entry['rps']:>12.1f}"
+        f"{entry['p50_ms']:>12.3f}{entry['p99_ms']:>12.3f}"
+    )
+
+
+def _save_results(
+    summary: dict[str, Any], config: dict[str, Any], output_path: Path
+) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python_version": sys.version,
+        "config": config,
+        "summary": summary,
+    }
+    output_path.write_text(json.dumps(payload, indent=2))
+    print(f"Saved results to {output_path}")
+
+
+def _parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-d", "--duration", type=float, default=5.0,
+                        help="seconds per scenario (default: 5)")
+    parser.add_argument("-c", "--concurrency", type=int, default=32,
+                        help="concurrent clients for request scenarios")
+    parser.add_argument("-s", "--subscribers", type=int, default=100,
+                        help="SSE subscribers / WebSocket clients for fan-out")
+    parser.add_argument("--rows", type=int, default=1000,
+                        help="rows seeded into the SQLite table")
+    parser.add_argument("--warmup", type=int, default=50,
+                        help="unmeasured requests before each scenario")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", type=lambda v: [s.strip() for s in v.split(",")],
+                        default=None, help=f"comma-separated subset of {SCENARIOS}")
+    parser.add_argument("-o", "--output", type=Path, default=None,
+                        help="write the results as JSON to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _parse_args(argv)
+    # Silence navconfig's startup banner and per-request logging.
+    logging.getLogger().setLevel(logging.ERROR)
+    unknown = set(args.only or ()) - set(SCENARIOS)
+    if unknown:
+        print(f"Unknown scenarios: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    _print_header()
+    summary, failed = asyncio.run(run_benchmarks(args))
+    print("=" * 78)
+    if failed:
+        # never save (and later compare against) a partial run.
+        print(f"Failed scenarios: {', '.join(failed)}", file=sys.stderr)
+        return 1
+
+    output = args.output
+    if output is None and os.environ.get("BENCH_SAVE_RESULTS"):
+        output = _REPO_ROOT / "benchmarks" / "results" / "http_benchmarks.json"
+    if output is not None:
+        config = {
+            "duration_s": args.duration,
+            "concurrency": args.concurrency,
+            "subscribers": args.subscribers,
+            "rows": args.rows,
+        }
+        _save_results(summary, config, output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
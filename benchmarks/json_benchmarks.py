@@ -0,0 +1,137 @@
+"""JSON response encoding micro-benchmarks.
+
+Compares the ``str`` path (``json_encoder`` -> ``text=`` -> aiohttp
+re-encodes to UTF-8) with the bytes fast path used by
+:func:`navigator.responses.JSONResponse` (one orjson call, ``body=``),
+for the encoding alone and for building the whole ``web.Response``.
+
+Usage::
+
+    python benchmarks/json_benchmarks.py
+    python benchmarks/json_benchmarks.py --rows 1000 --number 2000
+
+    # Also persist the summary:
+    BENCH_SAVE_RESULTS=1 python benchmarks/json_benchmarks.py
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+# Make the worktree importable when the script is launched directly.
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from aiohttp import web  # noqa: E402  (sys.path must be patched first)
+
+from navigator.libs.json import json_encoder, json_encoder_bytes  # noqa: E402
+from navigator.responses import JSONResponse  # noqa: E402
+
+
+def make_payload(rows: int) -> list[dict[str, Any]]:
+    now = datetime(2024, 1, 1, 12, 30)
+    return [
+        {
+            "id": n,
+            "name": f"Record número {n}",
+            "score": n * 1.5,
+            "active": n % 2 == 0,
+            "created_at": now,
+            "tags": ["alpha", "beta", "gamma"],
+        }
+        for n in range(rows)
+    ]
+
+
+def _str_response(payload: Any) -> web.Response:
+    # what BaseHandler.response / web.json_response used to do.
+    return web.Response(text=json_encoder(payload), content_type="application/json")
+
+
+def _bench(fn, number: int, repeat: int) -> float:
+    """Best time per call, in seconds."""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def run(rows: int, number: int, repeat: int) -> dict[str, Any]:
+    payload = make_payload(rows)
+    cases = {
+        "encode": (
+            lambda: json_encoder(payload).encode("utf-8"),
+            lambda: json_encoder_bytes(payload),
+        ),
+        "response": (
+            lambda: _str_response(payload),
+            lambda: JSONResponse(payload),
+        ),
+    }
+    summary: dict[str, Any] = {}
+    for name, (str_path, bytes_path) in cases.items():
+        str_s = _bench(str_path, number, repeat)
+        bytes_s = _bench(bytes_path, number, repeat)
+        summary[name] = {
+            "rows": rows,
+            "str_mean_s": str_s,
+            "bytes_mean_s": bytes_s,
+            "speedup_percent": round((str_s - bytes_s) / str_s * 100.0, 1),
+        }
+    return summary
+
+
+def _print_summary(summary: dict[str, Any]) -> None:
+    print("")
+    print("=" * 66)
+    print("JSON responses: str path vs bytes fast path")
+    print("=" * 66)
+    print(f"{'Case':<14}{'Rows':>8}{'str (µs)':>14}{'bytes (µs)':>14}{'Speedup':>14}")
+    print("-" * 66)
+    for name, entry in summary.items():
+        print(
+            f"{name:<14}{entry['rows']:>8}{entry['str_mean_s'] * 1e6:>14.2f}"
+            f"{entry['bytes_mean_s'] * 1e6:>14.2f}{entry['speedup_percent']:>13.1f}%"
+        )
+    print("=" * 66)
+
+
+def _save_summary(summary: dict[str, Any], output_path: Path) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python_version": sys.version,
+        "summary": summary,
+    }
+    output_path.write_text(json.dumps(payload, indent=2))
+    print(f"Saved summary to {output_path}")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200,
+                        help="records in the encoded payload (default: 200)")
+    parser.add_argument("--number", type=int, default=500,
+                        help="calls per timing (default: 500)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--summary-output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    summary = run(args.rows, args.number, args.repeat)
+    _print_summary(summary)
+
+    output = args.summary_output
+    if output is None and os.environ.get("BENCH_SAVE_RESULTS"):
+        output = _REPO_ROOT / "benchmarks" / "results" / "json_benchmarks.json"
+    if output is not None:
+        _save_summary(summary, output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,166 @@
+"""Minimal async load generator used by the HTTP benchmarks.
+
+Runs an *operation* (any ``async`` callable: an HTTP request, a broadcast
+followed by the wait for every subscriber, ...) from ``concurrency``
+workers, for a fixed duration or a fixed number of operations, and reports
+throughput and latency percentiles.
+
+Usage::
+
+    from benchmarks.loadgen import run_load, http_operation
+
+    async with aiohttp.ClientSession() as session:
+        op = http_operation(session, "GET", "http://127.0.0.1:8080/hello")
+        result = await run_load("hello", op, concurrency=32, duration=5)
+        print(result.as_dict())
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import aiohttp
+
+Operation = Callable[[], Awaitable[Any]]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of *values* (0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class LoadFailed(RuntimeError):
+    """No operation of a load run succeeded (its numbers mean nothing)."""
+
+
+@dataclass
+class LoadResult:
+    """Outcome of one load run (latencies in seconds)."""
+    name: str
+    concurrency: int
+    duration: float = 0.0
+    errors: int = 0
+    latencies: list[float] = field(default_factory=list, repr=False)
+    first_error: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.duration if self.duration else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "concurrency": self.concurrency,
+            "duration_s": round(self.duration, 3),
+            "rps": round(self.rps, 1),
+            "p50_ms": round(percentile(self.latencies, 50) * 1000, 3),
+            "p99_ms": round(percentile(self.latencies, 99) * 1000, 3),
+            "max_ms": round(max(self.latencies, default=0.0) * 1000, 3),
+        }
+
+
+async def run_load(
+    name: str,
+    operation: Operation,
+    concurrency: int = 16,
+    duration: Optional[float] = 5.0,
+    requests: Optional[int] = None,
+    warmup: int = 0,
+) -> LoadResult:
+    """Drive *operation* until *duration* elapses or *requests* are done.
+
+    Failed operations (any exception) are counted as errors and excluded
+    from the latency distribution. *warmup* operations run first and are
+    not measured. Raises :class:`LoadFailed` when no operation succeeded.
+    """
+    if duration is None and requests is None:
+        raise ValueError("run_load needs a duration or a number of requests")
+    for _ in range(warmup):
+        try:
+            await operation()
+        except Exception:  # pylint: disable=W0703
+            pass
+    result = LoadResult(name=name, concurrency=concurrency)
+    counter = itertools.count()
+    clock = time.perf_counter
+    started = clock()
+    deadline = started + duration if duration is not None else None
+
+    async def worker():
+        while True:
+            if deadline is not None and clock() >= deadline:
+                return
+            if requests is not None and next(counter) >= requests:
+                return
+            t0 = clock()
+            try:
+                await operation()
+            except Exception as exc:  # pylint: disable=W0703
+                result.errors += 1
+                if result.first_error is None:
+                    result.first_error = f"{type(exc).__name__}: {exc}"
+                continue
+            result.latencies.append(clock() - t0)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.duration = clock() - started
+    if not result.latencies:
+        raise LoadFailed(
+            f"{name}: no successful operation out of {result.errors} "
+            f"(first error: {result.first_error})"
+        )
+    return result
+
+
+def http_operation(
+    session: aiohttp.ClientSession,
+    method: str,
+    url: str,
+    expect: tuple[int, ...] = (200,),
+    json: Optional[Callable[[], Any]] = None,
+) -> Operation:
+    """Build an operation issuing one HTTP request and reading the body.
+
+    *json* is a factory called per request (so payloads can carry unique
+    keys); a status outside *expect* raises and is counted as an error.
+    """
+    async def _operation():
+        kwargs = {"json": json()} if json is not None else {}
+        async with session.request(method, url, **kwargs) as response:
+            await response.read()
+            if response.status not in expect:
+                raise RuntimeError(f"{method} {url}: HTTP {response.status}")
+
+    return _operation
+
+
+class FanoutProbe:
+    """Completes when *expected* subscribers have seen the current message."""
+
+    def __init__(self, expected: int) -> None:
+        self.expected = expected
+        self._seen = 0
+        self._done: Optional[asyncio.Future] = None
+
+    def arm(self) -> asyncio.Future:
+        self._seen = 0
+        self._done = asyncio.get_running_loop().create_future()
+        return self._done
+
+    def hit(self) -> None:
+        self._seen += 1
+        if self._seen >= self.expected and self._done and not self._done.done():
+            self._done.set_result(None)
@@ -0,0 +1,127 @@
+"""Background queue enqueue throughput benchmarks.
+
+Measures how many tasks per second a producer can hand to a
+:class:`navigator.background.BackgroundQueue`:
+
+* ``legacy``: ``put()`` followed by the fixed ``asyncio.sleep(0.1)`` it
+  used to pay on every call (measured on a small sample, it is ~10/s).
+* ``put``: one ``put()`` per task.
+* ``put_yield``: ``put()`` with ``yield_on_put`` (one loop turn per task).
+* ``put_many``: a single batched ``put_many()``.
+
+Consumers are not started, so only the enqueue path is measured.
+
+Usage::
+
+    python benchmarks/queue_benchmarks.py
+    BENCH_SAVE_RESULTS=1 python benchmarks/queue_benchmarks.py --tasks 50000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+# Make the worktree importable when the script is launched directly.
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from aiohttp import web  # noqa: E402  (sys.path must be patched first)
+
+from navigator.background import BackgroundQueue  # noqa: E402
+
+
+async def job(value: int) -> int:  # pragma: no cover
+    return value
+
+
+def _queue(size: int, **kwargs) -> BackgroundQueue:
+    return BackgroundQueue(web.Application(), queue_size=size, **kwargs)
+
+
+async def _legacy(queue: BackgroundQueue, count: int) -> None:
+    for i in range(count):
+        await queue.put(job, i)
+        await asyncio.sleep(.1)
+
+
+async def _put(queue: BackgroundQueue, count: int) -> None:
+    for i in range(count):
+        await queue.put(job, i)
+
+
+async def _put_many(queue: BackgroundQueue, count: int) -> None:
+    await queue.put_many([(job, (i,), {}) for i in range(count)])
+
+
+async def _measure(fn, count: int, repeat: int, **kwargs) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        queue = _queue(count, **kwargs)
+        start = time.perf_counter()
+        await fn(queue, count)
+        best = min(best, time.perf_counter() - start)
+        queue.shutdown_executor()
+    return count / best
+
+
+async def run(tasks: int, legacy_tasks: int, repeat: int) -> dict[str, Any]:
+    return {
+        "legacy": await _measure(_legacy, legacy_tasks, 1),
+        "put": await _measure(_put, tasks, repeat),
+        "put_yield": await _measure(_put, tasks, repeat, yield_on_put=True),
+        "put_many": await _measure(_put_many, tasks, repeat),
+    }
+
+
+def _print_summary(summary: dict[str, Any]) -> None:
+    print("")
+    print("=" * 44)
+    print("BackgroundQueue enqueue throughput")
+    print("=" * 44)
+    print(f"{'Mode':<16}{'tasks/sec':>16}{'vs legacy':>12}")
+    print("-" * 44)
+    legacy = summary["legacy"]
+    for name, rate in summary.items():
+        print(f"{name:<16}{rate:>16,.0f}{rate / legacy:>11,.0f}x")
+    print("=" * 44)
+
+
+def _save_summary(summary: dict[str, Any], output_path: Path) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python_version": sys.version,
+        "summary": summary,
+    }
+    output_path.write_text(json.dumps(payload, indent=2))
+    print(f"Saved summary to {output_path}")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--legacy-tasks", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--summary-output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(run(args.tasks, args.legacy_tasks, args.repeat))
+    _print_summary(summary)
+
+    output = args.summary_output
+    if output is None and os.environ.get("BENCH_SAVE_RESULTS"):
+        output = _REPO_ROOT / "benchmarks" / "results" / "queue_benchmarks.json"
+    if output is not None:
+        _save_summary(summary, output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
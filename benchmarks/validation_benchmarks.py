@@ -0,0 +1,147 @@
+"""Payload validation micro-benchmarks.
+
+Compares the per-request work of the ``validate``/``validate_payload``
+decorators before and after validators were compiled at decoration time:
+
+* ``legacy``: signature inspection, model-kind checks and model build on
+  every call (what the decorators used to do per request).
+* ``compiled``: a cached :class:`navigator.utils.validation.ModelValidator`
+  (required-field check, converters, model build).
+
+Both a plain dataclass and a datamodel ``BaseModel`` are measured.
+
+Usage::
+
+    python benchmarks/validation_benchmarks.py
+    BENCH_SAVE_RESULTS=1 python benchmarks/validation_benchmarks.py
+"""
+# No ``from __future__ import annotations`` here: datamodel reads the field
+# annotations of the models below as types.
+import argparse
+import inspect
+import json
+import os
+import sys
+import time
+import timeit
+from dataclasses import dataclass, is_dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+# Make the worktree importable when the script is launched directly.
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from datamodel import BaseModel, Field  # noqa: E402  (sys.path must be patched first)
+
+from navigator.utils.validation import get_validator  # noqa: E402
+
+
+@dataclass
+class AirportDC:
+    iata: str
+    airport: str
+    city: str = None
+    country: str = None
+
+
+class AirportModel(BaseModel):
+    iata: str = Field(required=True)
+    airport: str = Field(required=True)
+    city: str
+    country: str
+
+
+PAYLOAD: dict[str, Any] = {
+    "iata": "AEP",
+    "airport": "Aeroparque",
+    "city": "Buenos Aires",
+    "country": "AR",
+}
+
+
+async def handler(request, airport=None, errors=None):  # pragma: no cover
+    return airport
+
+
+def _legacy(model):
+    def _call():
+        sig = inspect.signature(handler)
+        sig.bind_partial(None)
+        if issubclass(model, BaseModel) or is_dataclass(model):
+            model(**PAYLOAD)
+        for name in sig.parameters:
+            name.lower()
+    return _call
+
+
+def _compiled(model):
+    validator = get_validator(model)
+    sig = inspect.signature(handler)
+
+    def _call():
+        sig.bind_partial(None)
+        validator(PAYLOAD)
+    return _call
+
+
+def run(number: int, repeat: int) -> dict[str, Any]:
+    summary: dict[str, Any] = {}
+    for name, model in (("dataclass", AirportDC), ("datamodel", AirportModel)):
+        legacy = min(timeit.repeat(_legacy(model), number=number, repeat=repeat)) / number
+        compiled = min(timeit.repeat(_compiled(model), number=number, repeat=repeat)) / number
+        summary[name] = {
+            "legacy_mean_s": legacy,
+            "compiled_mean_s": compiled,
+            "speedup_percent": round((legacy - compiled) / legacy * 100.0, 1),
+        }
+    return summary
+
+
+def _print_summary(summary: dict[str, Any]) -> None:
+    print("")
+    print("=" * 62)
+    print("Payload validation: per-call inspection vs compiled validator")
+    print("=" * 62)
+    print(f"{'Model':<14}{'legacy (µs)':>16}{'compiled (µs)':>16}{'Speedup':>14}")
+    print("-" * 62)
+    for name, entry in summary.items():
+        print(
+            f"{name:<14}{entry['legacy_mean_s'] * 1e6:>16.2f}"
+            f"{entry['compiled_mean_s'] * 1e6:>16.2f}{entry['speedup_percent']:>13.1f}%"
+        )
+    print("=" * 62)
+
+
+def _save_summary(summary: dict[str, Any], output_path: Path) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python_version": sys.version,
+        "summary": summary,
+    }
+    output_path.write_text(json.dumps(payload, indent=2))
+    print(f"Saved summary to {output_path}")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--summary-output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    summary = run(args.number, args.repeat)
+    _print_summary(summary)
+
+    output = args.summary_output
+    if output is None and os.environ.get("BENCH_SAVE_RESULTS"):
+        output = _REPO_ROOT / "benchmarks" / "results" / "validation_benchmarks.json"
+    if output is not None:
+        _save_summary(summary, output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -20,6 +20,8 @@ TODO:
 https://github.com/phenobarbital/navigator
 
 """
+import importlib
+import sys
 from .version import (
     __title__,
     __description__,
@@ -29,20 +31,16 @@ from .version import (
     __copyright__,
     __license__
 )
-try:
-    from .navigator import Application
-    from .responses import Response
-except Exception as _imp_err:  # pragma: no cover
-    # ImportError: optional extras not installed.
-    # OSError/FileExistsError: navconfig env directory missing.
-    # ProjectDetectionError: navconfig can't find project root.
-    # Any navconfig init failure in CI/build environments.
-    import logging as _logging
-    _logging.getLogger(__name__).warning(
-        "navigator.Application unavailable: %s", _imp_err
-    )
-    Application = None
-    Response = None
+# ── Lazy-load mapping: name → (relative module, attribute name) ────────────
+# ``Application`` pulls in aiohttp, navconfig, the template system, the
+# WebSocket handler and (optionally) navigator_auth / sockjs; CLI commands
+# and background-only workers never need them. Resolved on first access
+# via PEP 562 ``__getattr__``.
+_LAZY: dict[str, tuple[str, str]] = {
+    "Application": (".navigator", "Application"),
+    "Response": (".responses", "Response"),
+}
+
 try:
     from .utils.uv import install_uvloop
     install_uvloop()
@@ -66,3 +64,37 @@ __all__ = (
     "__version__",
     "__author__",
 )
+
+
+def __getattr__(name: str):
+    """Lazy-load the heavy top-level exports on first access.
+
+    Args:
+        name: Attribute name being accessed.
+
+    Returns:
+        The requested object, or ``None`` when its optional dependencies
+        are not available (same behavior as the former eager import).
+
+    Raises:
+        AttributeError: If the name is not a recognised lazy export.
+    """
+    if name in _LAZY:
+        module_rel, attr = _LAZY[name]
+        try:
+            module = importlib.import_module(module_rel, package=__name__)
+            obj = getattr(module, attr)
+        except Exception as _imp_err:  # pragma: no cover
+            # ImportError: optional extras not installed.
+            # OSError/FileExistsError: navconfig env directory missing.
+            # ProjectDetectionError: navconfig can't find project root.
+            # Any navconfig init failure in CI/build environments.
+            import logging as _logging
+            _logging.getLogger(__name__).warning(
+                "navigator.%s unavailable: %s", name, _imp_err
+            )
+            obj = None
+        # Cache in this module so subsequent access is instant
+        setattr(sys.modules[__name__], name, obj)
+        return obj
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,53 @@
+"""
+navigator.actions — pluggable Actions (REST integrations, ticketing, etc).
+
+Public API:
+    AbstractAction, AbstractTicket, RESTAction, Avochato, Odoo,
+    OdooHelpdesk, Zammad, Hubspot, ActionExecutor.
+
+Lazy loading:
+    Integrations depend on heavy SDKs (``hubspot``, ``httpx``, ``lxml``...),
+    so every name is resolved on first access (via __getattr__) and only
+    the module that defines it is imported.
+"""
+from __future__ import annotations
+
+import importlib
+import sys
+
+# ── Lazy-load mapping: name → (relative module, attribute name) ────────────
+_LAZY: dict[str, tuple[str, str]] = {
+    "AbstractAction": (".abstract", "AbstractAction"),
+    "AbstractTicket": (".ticket", "AbstractTicket"),
+    "RESTAction": (".rest", "RESTAction"),
+    "Avochato": (".avochato", "Avochato"),
+    "Odoo": (".odoo", "Odoo"),
+    "OdooHelpdesk": (".odoo_helpdesk", "OdooHelpdesk"),
+    "Zammad": (".zammad", "Zammad"),
+    "Hubspot": (".hubspot", "Hubspot"),
+    "ActionExecutor": (".executor", "ActionExecutor"),
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    """Lazy-load actions on first access.
+
+    Args:
+        name: Attribute name being accessed.
+
+    Returns:
+        The requested class.
+
+    Raises:
+        AttributeError: If the name is not a recognised lazy export.
+    """
+    if name in _LAZY:
+        module_rel, attr = _LAZY[name]
+        module = importlib.import_module(module_rel, package=__name__)
+        obj = getattr(module, attr)
+        # Cache in this module so subsequent access is instant
+        setattr(sys.modules[__name__], name, obj)
+        return obj
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,6 +6,9 @@ class AbstractAction(ABC):
 
     an Action is a pluggable component that can be used to perform operations.
     """
+    # remote service the action talks to (rate limits are per provider).
+    provider: str = None
+
     def __init__(self, *args, **kwargs):
         self._name_ = self.__class__.__name__
         # log
@@ -43,6 +46,8 @@ class AbstractAction(ABC):
         # storing parameters that control the behavior of the action.
         self._args = args
         self._kwargs = kwargs
+        if not self.provider:
+            self.provider = self._name_.lower()
 
     def __repr__(self):
         return f'<Action.{self._name_}>'
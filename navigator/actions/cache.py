@@ -0,0 +1,685 @@
+"""Response cache for outbound action calls.
+
+A private HTTP cache under :class:`RESTAction`: ``GET`` responses are kept
+per HTTP caching semantics (``Cache-Control``/``Expires`` freshness, ``Vary``
+and ``ETag``/``Last-Modified`` revalidation) in an in-process LRU bounded by
+entries and bytes, optionally backed by a shared Redis tier. Actions may
+override the freshness with an explicit TTL (``cache_ttl``), and concurrent
+misses of the same resource are collapsed into a single upstream request.
+
+Usage::
+
+    from navigator.actions.cache import get_response_cache
+
+    cache = get_response_cache()
+    async with cache.fetch(pool, "GET", url, ttl=300) as resp:
+        data = await resp.json()
+"""
+from typing import Any, Optional
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from email.utils import formatdate, parsedate_to_datetime
+import asyncio
+import base64
+import hashlib
+import threading
+import time
+import weakref
+import orjson
+from aiohttp import web
+from multidict import CIMultiDict, CIMultiDictProxy
+from navconfig.logging import logging
+
+
+HTTP_CACHE_KEY = web.AppKey("http_response_cache")
+
+CACHEABLE_METHODS: frozenset = frozenset({"GET", "HEAD"})
+# statuses cacheable by default (RFC 9110, section 15.1).
+CACHEABLE_STATUSES: frozenset = frozenset({200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501})
+
+# response headers worth keeping with a cached body.
+_STORED_HEADERS: tuple = (
+    # bodies are stored decoded: no Content-Encoding.
+    "Content-Type", "Content-Disposition", "Content-Language",
+    "Cache-Control", "Expires", "Date", "ETag", "Last-Modified", "Vary", "X-Error",
+)
+
+# request headers that never select a different response (transport,
+# tracing, caching directives): every other header is part of the cache
+# key, so credentials in any header (API keys, on-behalf-of...) keep
+# responses apart.
+_UNKEYED_HEADERS: frozenset = frozenset({
+    "accept-encoding", "cache-control", "connection", "content-length",
+    "dnt", "host", "if-modified-since", "if-none-match", "keep-alive",
+    "pragma", "te", "traceparent", "tracestate", "transfer-encoding",
+    "upgrade-insecure-requests", "user-agent",
+})
+
+
+def keyed_headers(headers: Optional[Mapping]) -> list:
+    """The request headers a cache key covers, as sorted ``(name, value)``."""
+    if not headers:
+        return []
+    return sorted(
+        (str(name).lower(), str(value)) for name, value in headers.items()
+        if str(name).lower() not in _UNKEYED_HEADERS
+    )
+
+
+def parse_cache_control(value: Optional[str]) -> dict:
+    """``Cache-Control`` directives as ``{name: value or True}``."""
+    directives: dict = {}
+    if not value:
+        return directives
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else True
+    return directives
+
+
+def _seconds(value: Any) -> Optional[int]:
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: Mapping, ttl: Optional[int] = None) -> Optional[int]:
+    """Seconds a response stays fresh; ``None`` when it must not be stored.
+
+    An explicit *ttl* overrides the response headers except ``no-store``.
+    """
+    cc = parse_cache_control(headers.get("Cache-Control"))
+    if "no-store" in cc:
+        return None
+    if ttl is not None:
+        return max(0, ttl)
+    if "no-cache" in cc:
+        return 0
+    lifetime = _seconds(cc.get("s-maxage")) if "s-maxage" in cc else None
+    if lifetime is None and "max-age" in cc:
+        lifetime = _seconds(cc["max-age"])
+    if lifetime is None and "Expires" in headers:
+        try:
+            expires = parsedate_to_datetime(headers["Expires"]).timestamp()
+            date = parsedate_to_datetime(headers["Date"]).timestamp() if "Date" in headers else time.time()
+            lifetime = max(0, int(expires - date))
+        except (TypeError, ValueError, IndexError):
+            lifetime = 0
+    if lifetime is None:
+        # no heuristic freshness: only kept for revalidation.
+        return 0
+    return max(0, lifetime - (_seconds(headers.get("Age")) or 0))
+
+
+class CacheEntry:
+    """A stored response (status, the relevant headers and the body)."""
+    __slots__ = ("status", "reason", "headers", "body", "expires", "vary", "url")
+
+    def __init__(
+        self,
+        status: int,
+        headers: Mapping,
+        body: bytes,
+        expires: float,
+        vary: Optional[dict] = None,
+        reason: str = "",
+        url: str = ""
+    ) -> None:
+        self.status = status
+        self.reason = reason
+        self.headers = {k: headers[k] for k in _STORED_HEADERS if k in headers}
+        self.body = body
+        self.expires = expires
+        self.vary = vary or {}
+        self.url = url
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("ETag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("Last-Modified")
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    def fresh(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) < self.expires
+
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def matches(self, headers: Mapping) -> bool:
+        """Whether the (lower-cased) request *headers* select this entry (``Vary``)."""
+        return all(headers.get(name) == value for name, value in self.vary.items())
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def refresh(self, headers: Mapping, lifetime: int) -> None:
+        """Apply a ``304 Not Modified`` (its headers replace the stored ones)."""
+        for name in _STORED_HEADERS:
+            if name in headers:
+                self.headers[name] = headers[name]
+        self.expires = time.time() + lifetime
+
+    def dumps(self) -> bytes:
+        return orjson.dumps({
+            "status": self.status,
+            "reason": self.reason,
+            "headers": self.headers,
+            "body": base64.b64encode(self.body).decode(),
+            "expires": self.expires,
+            "vary": self.vary,
+            "url": self.url,
+        })
+
+    @classmethod
+    def loads(cls, data: bytes) -> "CacheEntry":
+        obj = orjson.loads(data)
+        return cls(
+            status=obj["status"],
+            headers=obj["headers"],
+            body=base64.b64decode(obj["body"]),
+            expires=obj["expires"],
+            vary=obj.get("vary"),
+            reason=obj.get("reason", ""),
+            url=obj.get("url", ""),
+        )
+
+
+class _CachedContent:
+    """Minimal ``StreamReader`` over a cached body."""
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def read(self, n: int = -1) -> bytes:
+        return self._body
+
+    async def iter_chunked(self, n: int) -> AsyncIterator[bytes]:
+        for i in range(0, len(self._body), max(1, n)):
+            yield self._body[i:i + n]
+
+
+class CachedResponse:
+    """Read-only stand-in for ``aiohttp.ClientResponse`` built from a cache entry."""
+    from_cache: bool = True
+
+    def __init__(self, entry: CacheEntry, method: str = "GET") -> None:
+        self.method = method
+        self.status = entry.status
+        self.reason = entry.reason
+        self.url = entry.url
+        self.headers = CIMultiDictProxy(CIMultiDict(entry.headers))
+        self.content = _CachedContent(entry.body)
+        self._body = entry.body
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get("Content-Type", "application/octet-stream").split(";")[0].strip()
+
+    @property
+    def charset(self) -> Optional[str]:
+        _, _, params = self.headers.get("Content-Type", "").partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "charset":
+                return value.strip('"')
+        return None
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: Optional[str] = None, errors: str = "strict") -> str:
+        return self._body.decode(encoding or self.charset or "utf-8", errors)
+
+    async def json(self, *, encoding: Optional[str] = None, loads: Any = None, content_type: Any = None) -> Any:
+        if not self._body.strip():
+            return None
+        if loads is None:
+            return orjson.loads(self._body)
+        return loads(await self.text(encoding))
+
+    def release(self) -> None:
+        pass
+
+    def __repr__(self) -> str:
+        return f"<CachedResponse({self.url}) [{self.status} {self.reason}]>"
+
+
+class LRUCache:
+    """In-process LRU bounded by number of entries and total body bytes."""
+    def __init__(self, maxsize: int = 1024, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._data: OrderedDict = OrderedDict()
+        # actions may run in worker-thread loops.
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.size
+            self._data[key] = entry
+            self.nbytes += entry.size
+            while self._data and (len(self._data) > self.maxsize or self.nbytes > self.max_bytes):
+                _, evicted = self._data.popitem(last=False)
+                self.nbytes -= evicted.size
+
+    def items(self) -> list:
+        with self._lock:
+            return list(self._data.items())
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                self.nbytes -= entry.size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+
+class RedisTier:
+    """Shared second tier (``redis.asyncio``) of raw values, one client per event loop."""
+    def __init__(self, url: str, prefix: str = "http_cache") -> None:
+        self.url = url
+        self.prefix = prefix if prefix.endswith(":") else f"{prefix}:"
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.logger = logging.getLogger("navigator.http_cache")
+
+    def _client(self) -> Any:
+        import redis.asyncio as redis  # pylint: disable=C0415
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = redis.from_url(self.url)
+        return client
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self._client().get(f"{self.prefix}{key}")
+        except Exception as exc:  # pylint: disable=W0703
+            # the shared tier is an optimisation: never fail a request on it.
+            self.logger.warning(f"HTTP cache: Redis get failed: {exc!r}")
+            return None
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: int,
+        index: Optional[str] = None
+    ) -> None:
+        """Store *value*, also listed in the *index* set (see :meth:`invalidate`)."""
+        ttl = max(1, ttl)
+        try:
+            client = self._client()
+            if index is None:
+                await client.set(f"{self.prefix}{key}", value, ex=ttl)
+                return
+            name = f"{self.prefix}index:{index}"
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.set(f"{self.prefix}{key}", value, ex=ttl)
+                pipe.sadd(name, key)
+                pipe.ttl(name)
+                *_, remaining = await pipe.execute()
+            # the index outlives every value it lists.
+            if remaining < ttl:
+                await client.expire(name, ttl)
+        except Exception as exc:  # pylint: disable=W0703
+            self.logger.warning(f"HTTP cache: Redis set failed: {exc!r}")
+
+    async def invalidate(self, index: str) -> None:
+        """Delete every value listed in the *index* set, and the set."""
+        name = f"{self.prefix}index:{index}"
+        try:
+            client = self._client()
+            keys = await client.smembers(name)
+            await client.delete(
+                name,
+                *(
+                    f"{self.prefix}{k.decode() if isinstance(k, bytes) else k}"
+                    for k in keys
+                )
+            )
+        except Exception as exc:  # pylint: disable=W0703
+            self.logger.warning(f"HTTP cache: Redis invalidate failed: {exc!r}")
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self._client().delete(f"{self.prefix}{key}")
+        except Exception as exc:  # pylint: disable=W0703
+            self.logger.warning(f"HTTP cache: Redis delete failed: {exc!r}")
+
+    async def close(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.close()
+
+
+class ResponseCache:
+    """ResponseCache.
+
+    Args:
+        maxsize: maximum entries of the in-process tier.
+        max_bytes: maximum total body bytes of the in-process tier.
+        max_entry: bodies larger than this are never stored.
+        stale_ttl: seconds a stale entry with validators is kept for
+            ``ETag``/``Last-Modified`` revalidation.
+        redis_url: optional shared second tier.
+        prefix: key prefix of the shared tier.
+    """
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entry: int = 1024 * 1024,
+        stale_ttl: int = 3600,
+        redis_url: Optional[str] = None,
+        prefix: str = "http_cache"
+    ) -> None:
+        self.memory = LRUCache(maxsize=maxsize, max_bytes=max_bytes)
+        self.remote: Optional[RedisTier] = RedisTier(redis_url, prefix) if redis_url else None
+        self.max_entry = max_entry
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.logger = logging.getLogger("navigator.http_cache")
+
+    @staticmethod
+    def key(
+        method: str,
+        url: str,
+        params: Any = None,
+        credentials: Any = None,
+        body: Any = None,
+        headers: Optional[Mapping] = None
+    ) -> str:
+        """Cache key of a request; *credentials* (basic auth, cookies) and
+        the request *headers* (see :func:`keyed_headers`) keep private
+        responses apart."""
+        if isinstance(params, Mapping):
+            params = sorted((str(k), str(v)) for k, v in params.items())
+        raw = (
+            f"{method.upper()} {url} {params!r} {body!r} {credentials!r} "
+            f"{keyed_headers(headers)!r}"
+        )
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def url_key(url: str) -> str:
+        """Key of every cached variant of *url* (any query string)."""
+        base = url.split("?", 1)[0]
+        return hashlib.blake2b(base.encode(), digest_size=16).hexdigest()
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self.memory.get(key)
+        if entry is None and self.remote is not None:
+            data = await self.remote.get(key)
+            if data:
+                entry = CacheEntry.loads(data)
+                self.memory.set(key, entry)
+        if entry is not None and not entry.fresh() and not entry.revalidatable():
+            self.memory.delete(key)
+            return None
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        if entry.size > self.max_entry:
+            return
+        self.memory.set(key, entry)
+        if self.remote is not None:
+            ttl = int(entry.expires - time.time())
+            if entry.revalidatable():
+                ttl += self.stale_ttl
+            if ttl > 0:
+                await self.remote.set(
+                    key, entry.dumps(), ttl, index=self.url_key(entry.url)
+                )
+
+    async def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.remote is not None:
+            await self.remote.delete(key)
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        """Single flight: one request per key and loop refreshes an entry."""
+        loop = asyncio.get_running_loop()
+        locks = self._locks.get(loop)
+        if locks is None:
+            locks = self._locks[loop] = {}
+        slot = locks.get(key)
+        if slot is None:
+            slot = locks[key] = [asyncio.Lock(), 0]
+        slot[1] += 1
+        try:
+            async with slot[0]:
+                yield
+        finally:
+            slot[1] -= 1
+            if slot[1] == 0:
+                locks.pop(key, None)
+
+    @asynccontextmanager
+    async def fetch(
+        self,
+        pool: Any,
+        method: str,
+        url: str,
+        ttl: Optional[int] = None,
+        credentials: Any = None,
+        **kwargs
+    ) -> AsyncIterator[Any]:
+        """Send a request through *pool* (an ``HTTPClientPool``), cached.
+
+        Yields a :class:`CachedResponse` on a hit or a revalidated entry,
+        otherwise the live response (its body already read).
+        """
+        method = method.upper()
+        headers = kwargs.get("headers") or {}
+        selecting = {k.lower(): v for k, v in headers.items()}
+        request_cc = parse_cache_control(selecting.get("cache-control"))
+        if method not in CACHEABLE_METHODS or "no-store" in request_cc:
+            async with pool.request(method, url, **kwargs) as response:
+                if method not in CACHEABLE_METHODS and response.status < 400:
+                    # a successful unsafe request invalidates the resource.
+                    await self.invalidate(url)
+                yield response
+            return
+        key = self.key(
+            method,
+            url,
+            kwargs.get("params"),
+            credentials,
+            body=kwargs.get("json", kwargs.get("data")),
+            headers=headers,
+        )
+        entry = await self.get(key)
+        if entry is not None and entry.fresh() and entry.matches(selecting) and "no-cache" not in request_cc:
+            self.hits += 1
+            yield CachedResponse(entry, method)
+            return
+        async with self.lock(key):
+            # a concurrent miss may have refreshed it meanwhile.
+            entry = await self.get(key)
+            if entry is not None and not entry.matches(selecting):
+                entry = None
+            if entry is not None and entry.fresh() and "no-cache" not in request_cc:
+                self.hits += 1
+                cached = CachedResponse(entry, method)
+            else:
+                cached = None
+                if entry is not None and entry.revalidatable():
+                    kwargs["headers"] = {**headers, **entry.conditional_headers()}
+            if cached is None:
+                async with pool.request(method, url, **kwargs) as response:
+                    if response.status == 304 and entry is not None:
+                        lifetime = freshness_lifetime(response.headers, ttl)
+                        if lifetime is None:
+                            await self.delete(key)
+                        else:
+                            entry.refresh(response.headers, lifetime)
+                            await self.set(key, entry)
+                        self.revalidated += 1
+                        cached = CachedResponse(entry, method)
+                    else:
+                        self.misses += 1
+                        await self._store(key, url, response, selecting, ttl)
+                        yield response
+                        return
+        yield cached
+
+    async def _store(
+        self,
+        key: str,
+        url: str,
+        response: Any,
+        headers: Mapping,
+        ttl: Optional[int]
+    ) -> None:
+        if response.status not in CACHEABLE_STATUSES:
+            return
+        vary = response.headers.get("Vary", "")
+        if vary.strip() == "*":
+            return
+        lifetime = freshness_lifetime(response.headers, ttl)
+        if lifetime is None:
+            return
+        body = await response.read()
+        entry = CacheEntry(
+            status=response.status,
+            headers=response.headers,
+            body=body,
+            expires=time.time() + lifetime,
+            vary={
+                name.strip().lower(): headers.get(name.strip().lower())
+                for name in vary.split(",") if name.strip()
+            },
+            reason=response.reason or "",
+            url=url,
+        )
+        if lifetime > 0 or entry.revalidatable():
+            if "Date" not in entry.headers:
+                entry.headers["Date"] = formatdate(usegmt=True)
+            await self.set(key, entry)
+
+    async def invalidate(self, url: str) -> None:
+        """Drop every cached variant of *url* (any query string), in both
+        tiers (the in-process tier of other workers keeps its copies until
+        they expire)."""
+        base = url.split("?", 1)[0]
+        keys = [
+            key for key, entry in self.memory.items()
+            if entry.url.split("?", 1)[0] == base
+        ]
+        for key in keys:
+            self.memory.delete(key)
+        if self.remote is not None:
+            await self.remote.invalidate(self.url_key(url))
+
+    def clear(self) -> None:
+        self.memory.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.memory),
+            "bytes": self.memory.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+        }
+
+    async def close(self) -> None:
+        if self.remote is not None:
+            await self.remote.close()
+
+
+_cache: Optional[ResponseCache] = None
+_configured: bool = False
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """The process-wide cache (``None`` when ``ENABLE_HTTP_CACHE`` is off)."""
+    global _cache, _configured  # pylint: disable=W0603
+    if not _configured:
+        from ..conf import (  # pylint: disable=C0415
+            ENABLE_HTTP_CACHE,
+            HTTP_CACHE_SIZE,
+            HTTP_CACHE_MAX_BYTES,
+            HTTP_CACHE_MAX_ENTRY,
+            HTTP_CACHE_STALE_TTL,
+            HTTP_CACHE_REDIS_URL,
+            HTTP_CACHE_PREFIX,
+        )
+        if ENABLE_HTTP_CACHE:
+            _cache = ResponseCache(
+                maxsize=HTTP_CACHE_SIZE,
+                max_bytes=HTTP_CACHE_MAX_BYTES,
+                max_entry=HTTP_CACHE_MAX_ENTRY,
+                stale_ttl=HTTP_CACHE_STALE_TTL,
+                redis_url=HTTP_CACHE_REDIS_URL,
+                prefix=HTTP_CACHE_PREFIX,
+            )
+        _configured = True
+    return _cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]) -> Optional[ResponseCache]:
+    global _cache, _configured  # pylint: disable=W0603
+    _cache = cache
+    _configured = True
+    return cache
+
+
+def setup_response_cache(
+    app: web.Application,
+    cache: Optional[ResponseCache] = None
+) -> Optional[ResponseCache]:
+    """Make *cache* (default: the process-wide one) app-scoped.
+
+    Stored in ``app[HTTP_CACHE_KEY]``; its shared tier is closed on cleanup.
+    """
+    if HTTP_CACHE_KEY in app:
+        return app[HTTP_CACHE_KEY]
+    cache = set_response_cache(cache) if cache is not None else get_response_cache()
+    if cache is None:
+        return None
+    app[HTTP_CACHE_KEY] = cache
+
+    async def _close_cache(app: web.Application):  # pylint: disable=W0613
+        await cache.close()
+
+    app.on_cleanup.append(_close_cache)
+    return cache
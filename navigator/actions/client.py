@@ -0,0 +1,318 @@
+"""Shared outbound HTTP client.
+
+One connection pool for every :class:`RESTAction` (and any other outbound
+caller): keep-alive connections with global and per-host limits, a DNS
+cache, bounded retries with jittered exponential backoff (honouring
+``Retry-After``) and, optionally, an HTTP/2 ``httpx`` client.
+
+Sessions are created lazily, one per event loop, so actions that run in
+worker-thread loops get their own pool instead of a foreign-loop session.
+
+Usage::
+
+    from navigator.actions.client import get_client_pool
+
+    async with get_client_pool().request("GET", url, timeout=timeout) as resp:
+        data = await resp.json()
+"""
+from typing import Any, Optional
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from importlib.util import find_spec
+from urllib.parse import urlsplit
+import asyncio
+import random
+import time
+import weakref
+import aiohttp
+from aiohttp import web
+from navconfig.logging import logging
+
+
+HTTP_CLIENT_KEY = web.AppKey("http_client_pool")
+
+IDEMPOTENT_METHODS: frozenset = frozenset(
+    {"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"}
+)
+RETRY_STATUSES: frozenset = frozenset({429, 502, 503, 504})
+
+# errors worth another attempt (the request may not have reached the server).
+_RETRY_ERRORS: tuple = (
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+    asyncio.TimeoutError,
+)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class RetryPolicy:
+    """Bounded retries with "full jitter" exponential backoff.
+
+    Args:
+        attempts: total tries, including the first one.
+        backoff: base delay; retry *n* sleeps ``uniform(0, backoff * 2**n)``.
+        max_backoff: upper bound of any delay (``Retry-After`` included).
+        statuses: response statuses that are retried.
+        methods: methods retried after a connection error or a 5xx;
+            ``429`` is retried for every method (it was not processed).
+    """
+    def __init__(
+        self,
+        attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        statuses: frozenset = RETRY_STATUSES,
+        methods: frozenset = IDEMPOTENT_METHODS
+    ) -> None:
+        self.attempts = max(1, attempts)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(m.upper() for m in methods)
+
+    def retry_status(self, method: str, status: int, attempt: int) -> bool:
+        if attempt + 1 >= self.attempts or status not in self.statuses:
+            return False
+        return status == 429 or method in self.methods
+
+    def retry_error(self, method: str, attempt: int) -> bool:
+        return attempt + 1 < self.attempts and method in self.methods
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        wait = parse_retry_after(retry_after)
+        if wait is None:
+            wait = random.uniform(0, self.backoff * (2 ** attempt))
+        return min(wait, self.max_backoff)
+
+
+NO_RETRY = RetryPolicy(attempts=1)
+
+
+class HTTPClientPool:
+    """HTTPClientPool.
+
+    Args:
+        limit: maximum open connections.
+        limit_per_host: maximum connections (and in-flight requests) per host.
+        dns_ttl: seconds a DNS resolution is cached.
+        keepalive: seconds an idle connection is kept open.
+        retry: default :class:`RetryPolicy` of :meth:`request`.
+        http2: let :meth:`httpx_client` negotiate HTTP/2 (needs ``h2``).
+    """
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        dns_ttl: int = 300,
+        keepalive: float = 30.0,
+        retry: Optional[RetryPolicy] = None,
+        http2: bool = False
+    ) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive = keepalive
+        self.retry = retry or RetryPolicy()
+        self.http2 = http2 and find_spec("h2") is not None
+        self._sessions: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._httpx: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._hosts: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.logger = logging.getLogger("navigator.http_client")
+
+    def session(self) -> aiohttp.ClientSession:
+        """The pooled ``aiohttp`` session of the running loop."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                # shared by every action: never carry cookies between them.
+                cookie_jar=aiohttp.DummyCookieJar(),
+                auto_decompress=True,
+            )
+            self._sessions[loop] = session
+        return session
+
+    def httpx_client(self) -> Any:
+        """The pooled ``httpx.AsyncClient`` of the running loop."""
+        import httpx  # pylint: disable=C0415
+        loop = asyncio.get_running_loop()
+        client = self._httpx.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.limit,
+                    max_keepalive_connections=self.limit_per_host,
+                    keepalive_expiry=self.keepalive,
+                ),
+            )
+            self._httpx[loop] = client
+        return client
+
+    def host_limit(self, url: str) -> asyncio.Semaphore:
+        """Semaphore bounding the in-flight requests to the host of *url*."""
+        loop = asyncio.get_running_loop()
+        hosts = self._hosts.get(loop)
+        if hosts is None:
+            hosts = self._hosts[loop] = {}
+        host = urlsplit(url).netloc
+        try:
+            return hosts[host]
+        except KeyError:
+            sem = hosts[host] = asyncio.Semaphore(self.limit_per_host)
+            return sem
+
+    @asynccontextmanager
+    async def request(
+        self,
+        method: str,
+        url: str,
+        retry: Optional[RetryPolicy] = None,
+        limiter: Optional[Any] = None,
+        **kwargs
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send a request through the pool, retrying per *retry*.
+
+        Yields the final response (which may still be an error status once
+        the retries are exhausted); *kwargs* go to
+        ``aiohttp.ClientSession.request``. Every attempt waits for a token
+        of *limiter* (a provider ``TokenBucket``), which is told about
+        ``429`` answers so it slows down.
+        """
+        method = method.upper()
+        policy = retry or self.retry
+        session = self.session()
+        limit = self.host_limit(url)
+        attempt = 0
+        while True:
+            if limiter is not None:
+                await limiter.acquire()
+            await limit.acquire()
+            try:
+                response = await session.request(method, url, **kwargs)
+            except _RETRY_ERRORS as exc:
+                limit.release()
+                if not policy.retry_error(method, attempt):
+                    raise
+                delay = policy.delay(attempt)
+                self.logger.warning(
+                    f"{method} {url} failed ({exc!r}), retrying in {delay:.2f}s"
+                )
+            except BaseException:
+                limit.release()
+                raise
+            else:
+                if limiter is not None:
+                    if response.status == 429:
+                        limiter.throttle(
+                            parse_retry_after(response.headers.get("Retry-After"))
+                        )
+                    else:
+                        limiter.success()
+                if not policy.retry_status(method, response.status, attempt):
+                    try:
+                        yield response
+                    finally:
+                        response.release()
+                        limit.release()
+                    return
+                delay = policy.delay(attempt, response.headers.get("Retry-After"))
+                response.release()
+                limit.release()
+                self.logger.warning(
+                    f"{method} {url} returned {response.status}, "
+                    f"retrying in {delay:.2f}s"
+                )
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def close(self) -> None:
+        """Close every session and client of the pool."""
+        sessions = list(self._sessions.values())
+        clients = list(self._httpx.values())
+        self._sessions.clear()
+        self._httpx.clear()
+        self._hosts.clear()
+        for session in sessions:
+            if not session.closed:
+                await session.close()
+        for client in clients:
+            await client.aclose()
+
+
+_pool: Optional[HTTPClientPool] = None
+
+
+def get_client_pool() -> HTTPClientPool:
+    """The process-wide pool (created from the settings on first use)."""
+    global _pool  # pylint: disable=W0603
+    if _pool is None:
+        from ..conf import (  # pylint: disable=C0415
+            HTTP_CLIENT_LIMIT,
+            HTTP_CLIENT_LIMIT_PER_HOST,
+            HTTP_CLIENT_DNS_TTL,
+            HTTP_CLIENT_KEEPALIVE,
+            HTTP_CLIENT_RETRIES,
+            HTTP_CLIENT_BACKOFF,
+            HTTP_CLIENT_HTTP2,
+        )
+        _pool = HTTPClientPool(
+            limit=HTTP_CLIENT_LIMIT,
+            limit_per_host=HTTP_CLIENT_LIMIT_PER_HOST,
+            dns_ttl=HTTP_CLIENT_DNS_TTL,
+            keepalive=HTTP_CLIENT_KEEPALIVE,
+            retry=RetryPolicy(
+                attempts=HTTP_CLIENT_RETRIES, backoff=HTTP_CLIENT_BACKOFF
+            ),
+            http2=HTTP_CLIENT_HTTP2,
+        )
+    return _pool
+
+
+def set_client_pool(pool: Optional[HTTPClientPool]) -> Optional[HTTPClientPool]:
+    global _pool  # pylint: disable=W0603
+    _pool = pool
+    return pool
+
+
+def setup_http_client(
+    app: web.Application,
+    pool: Optional[HTTPClientPool] = None
+) -> HTTPClientPool:
+    """Make *pool* (default: the process-wide one) app-scoped.
+
+    Stored in ``app[HTTP_CLIENT_KEY]`` and closed on cleanup.
+    """
+    if HTTP_CLIENT_KEY in app:
+        return app[HTTP_CLIENT_KEY]
+    pool = set_client_pool(pool) if pool is not None else get_client_pool()
+    app[HTTP_CLIENT_KEY] = pool
+
+    async def _close_pool(app: web.Application):  # pylint: disable=W0613
+        await pool.close()
+
+    app.on_cleanup.append(_close_pool)
+    return pool
@@ -0,0 +1,130 @@
+"""Concurrent execution of independent actions.
+
+A workflow that fires several actions (a Zammad ticket, a HubSpot update,
+an Avochato SMS...) can hand them to an :class:`ActionExecutor` instead of
+awaiting them one by one: they run concurrently, bounded overall and per
+provider, and every provider call is spaced by its token bucket
+(:mod:`navigator.actions.ratelimit`). Calls over the limit are queued,
+never rejected.
+
+Usage::
+
+    from navigator.actions.executor import ActionExecutor
+
+    executor = ActionExecutor()
+    ticket, sms = await executor.gather(zammad, avochato)
+    contact = await executor.execute(hubspot, "create_contact", data)
+"""
+from typing import Any, Optional
+import asyncio
+import time
+from navconfig.logging import logging
+from ..metrics.registry import MetricsRegistry, DEFAULT_BUCKETS
+from .abstract import AbstractAction
+from .ratelimit import RateLimits, get_rate_limits
+
+
+class ActionExecutor:
+    """ActionExecutor.
+
+    Args:
+        concurrency: actions in flight at once.
+        per_provider: actions in flight at once against a single provider.
+        limits: provider token buckets (default: the process-wide ones).
+        registry: publish queue time and outcomes to this registry.
+    """
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        per_provider: Optional[int] = None,
+        limits: Optional[RateLimits] = None,
+        registry: Optional[MetricsRegistry] = None
+    ) -> None:
+        if concurrency is None or per_provider is None:
+            from ..conf import (  # pylint: disable=C0415
+                ACTION_CONCURRENCY,
+                ACTION_PROVIDER_CONCURRENCY,
+            )
+            concurrency = concurrency or ACTION_CONCURRENCY
+            per_provider = per_provider or ACTION_PROVIDER_CONCURRENCY
+        self.concurrency = concurrency
+        self.per_provider = per_provider
+        self.limits = limits or get_rate_limits()
+        self._slots = asyncio.Semaphore(concurrency)
+        self._providers: dict = {}
+        self._queued = self._executed = None
+        self.logger = logging.getLogger("navigator.actions.executor")
+        if registry is not None:
+            self.register(registry)
+
+    def register(self, registry: MetricsRegistry) -> None:
+        self._queued = registry.histogram(
+            "action_executor_queue_seconds",
+            "Time actions waited for an executor slot.",
+            ("provider",),
+            buckets=(0.0,) + DEFAULT_BUCKETS,
+        )
+        self._executed = registry.counter(
+            "action_executor_total", "Executed actions.", ("provider", "status")
+        )
+        self.limits.register(registry)
+
+    @staticmethod
+    def provider_of(action: AbstractAction) -> str:
+        return getattr(action, "provider", None) or type(action).__name__.lower()
+
+    def _provider_slots(self, provider: str) -> asyncio.Semaphore:
+        try:
+            return self._providers[provider]
+        except KeyError:
+            slots = self._providers[provider] = asyncio.Semaphore(self.per_provider)
+            return slots
+
+    async def execute(
+        self,
+        action: AbstractAction,
+        method: str = "run",
+        *args,
+        **kwargs
+    ) -> Any:
+        """Await ``action.<method>(*args, **kwargs)`` within the limits.
+
+        Actions with their own transport limiter (``RESTAction``) pay a
+        token per HTTP request; any other action pays one per call here.
+        """
+        provider = self.provider_of(action)
+        started = time.monotonic()
+        # the provider slot first: calls waiting for a busy provider do not
+        # hold a global slot.
+        async with self._provider_slots(provider), self._slots:
+            if getattr(action, "_limiter", None) is None:
+                await self.limits.get(provider).acquire()
+            if self._queued is not None:
+                self._queued.observe(time.monotonic() - started, (provider,))
+            status = "error"
+            try:
+                result = await getattr(action, method)(*args, **kwargs)
+                status = "ok"
+                return result
+            finally:
+                if self._executed is not None:
+                    self._executed.inc((provider, status))
+
+    async def _run(self, action: AbstractAction) -> Any:
+        async with action:
+            return await self.execute(action, "run")
+
+    async def gather(
+        self,
+        *actions: AbstractAction,
+        return_exceptions: bool = True
+    ) -> list:
+        """Open, run and close each action concurrently; results in order.
+
+        With *return_exceptions* a failing action yields its exception in
+        place of its result instead of cancelling the others.
+        """
+        return await asyncio.gather(
+            *(self._run(action) for action in actions),
+            return_exceptions=return_exceptions
+        )
@@ -0,0 +1,201 @@
+"""Geocode and route cache of the Google Maps actions.
+
+Results are kept in three tiers: a bounded in-process dict, a persistent
+SQLite file (survives restarts, so daily batches geocode each address
+once) and an optional shared Redis tier. Geocodes are keyed by the
+normalized address; routes by a digest of their request (origin,
+destination, ordered waypoints, mode and options), never by the API key.
+"""
+from typing import Any, Optional, Union
+from collections import OrderedDict
+from pathlib import Path
+import asyncio
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import orjson
+from navconfig.logging import logging
+from ..cache import RedisTier
+from ..ratelimit import TokenBucket, get_limiter
+from .conf import (
+    GOOGLE_MAPS_CACHE,
+    GOOGLE_MAPS_CACHE_PATH,
+    GOOGLE_MAPS_CACHE_REDIS_URL,
+    GOOGLE_MAPS_QPS,
+)
+
+
+_SPACES = re.compile(r"\s+")
+_SEPARATORS = re.compile(r"\s*([,;#])\s*")
+
+
+def normalize_address(address: str) -> str:
+    """Case, spacing and punctuation-insensitive form of *address*."""
+    address = _SPACES.sub(" ", str(address).casefold()).strip(" ,;.")
+    return _SEPARATORS.sub(r"\1 ", address).replace(".", "").strip()
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            k: normalize_address(v) if k == "address" else _normalize(v)
+            for k, v in value.items()
+            if k != "key"
+        }
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def route_key(request: dict) -> str:
+    """Digest of a route request (addresses normalized, waypoint order kept)."""
+    data = orjson.dumps(_normalize(request), option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class GeoCache:
+    """GeoCache.
+
+    Args:
+        path: SQLite file of the persistent tier (``None``: memory only).
+        redis_url: optional shared tier.
+        maxsize: entries kept in memory.
+    """
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        redis_url: Optional[str] = None,
+        maxsize: int = 4096
+    ) -> None:
+        self.path = Path(path) if path else None
+        self.maxsize = maxsize
+        self.remote: Optional[RedisTier] = (
+            RedisTier(redis_url, prefix="google_maps") if redis_url else None
+        )
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger("navigator.google.cache")
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS geocache ("
+                "kind TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+                "expires REAL NOT NULL, PRIMARY KEY (kind, key))"
+            )
+            db.commit()
+            self._db = db
+        return self._db
+
+    def _db_get(self, kind: str, key: str) -> Optional[tuple]:
+        with self._lock:
+            return self._connection().execute(
+                "SELECT value, expires FROM geocache WHERE kind = ? AND key = ?",
+                (kind, key)
+            ).fetchone()
+
+    def _db_set(self, kind: str, key: str, value: bytes, expires: float) -> None:
+        with self._lock:
+            db = self._connection()
+            db.execute(
+                "INSERT OR REPLACE INTO geocache (kind, key, value, expires) "
+                "VALUES (?, ?, ?, ?)",
+                (kind, key, value, expires)
+            )
+            db.commit()
+
+    def _remember(self, slot: tuple, value: Any, expires: float) -> None:
+        with self._lock:
+            self._memory[slot] = (value, expires)
+            self._memory.move_to_end(slot)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+
+    async def get(self, kind: str, key: str) -> Optional[Any]:
+        slot = (kind, key)
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(slot)
+        if cached is not None and cached[1] > now:
+            self.hits += 1
+            return cached[0]
+        row = None
+        if self.path is not None:
+            try:
+                row = await asyncio.to_thread(self._db_get, kind, key)
+            except sqlite3.Error as exc:
+                self.logger.warning(f"Google Maps cache: SQLite read failed: {exc}")
+        if row is None and self.remote is not None:
+            data = await self.remote.get(f"{kind}:{key}")
+            if data:
+                row = orjson.loads(data)
+        if row is None or row[1] <= now:
+            self.misses += 1
+            return None
+        value = orjson.loads(row[0])
+        self._remember(slot, value, row[1])
+        self.hits += 1
+        return value
+
+    async def set(self, kind: str, key: str, value: Any, ttl: int) -> None:
+        expires = time.time() + ttl
+        self._remember((kind, key), value, expires)
+        data = orjson.dumps(value)
+        if self.path is not None:
+            try:
+                await asyncio.to_thread(self._db_set, kind, key, data, expires)
+            except sqlite3.Error as exc:
+                self.logger.warning(f"Google Maps cache: SQLite write failed: {exc}")
+        if self.remote is not None:
+            await self.remote.set(
+                f"{kind}:{key}", orjson.dumps([data.decode(), expires]), ttl
+            )
+
+    def stats(self) -> dict:
+        return {"memory": len(self._memory), "hits": self.hits, "misses": self.misses}
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+        if self.remote is not None:
+            await self.remote.close()
+
+
+_cache: Optional[GeoCache] = None
+_configured: bool = False
+
+
+def get_geo_cache() -> Optional[GeoCache]:
+    """The process-wide cache (``None`` when ``GOOGLE_MAPS_CACHE`` is off)."""
+    global _cache, _configured  # pylint: disable=W0603
+    if not _configured:
+        if GOOGLE_MAPS_CACHE:
+            path = GOOGLE_MAPS_CACHE_PATH
+            if path is None:
+                from ...conf import files_path  # pylint: disable=C0415
+                path = files_path.joinpath("google_maps.sqlite")
+            _cache = GeoCache(path=path, redis_url=GOOGLE_MAPS_CACHE_REDIS_URL)
+        _configured = True
+    return _cache
+
+
+def set_geo_cache(cache: Optional[GeoCache]) -> Optional[GeoCache]:
+    global _cache, _configured  # pylint: disable=W0603
+    _cache = cache
+    _configured = True
+    return cache
+
+
+def get_maps_limiter() -> TokenBucket:
+    """Token bucket shared by every Google Maps call of the process."""
+    return get_limiter("google_maps", rate=GOOGLE_MAPS_QPS)
@@ -7,3 +7,14 @@ GA_SERVICE_PATH = config.get('GA_SERVICE_PATH', fallback="google/")
 
 ## Google API:
 GOOGLE_PLACES_API_KEY = config.get('GOOGLE_PLACES_API_KEY')
+
+## Geocode / route cache and quota:
+GOOGLE_MAPS_CACHE = config.getboolean('GOOGLE_MAPS_CACHE', fallback=True)
+# SQLite file of the persistent cache (default: <BASE_DIR>/temp/google_maps.sqlite).
+GOOGLE_MAPS_CACHE_PATH = config.get('GOOGLE_MAPS_CACHE_PATH', fallback=None)
+GOOGLE_MAPS_CACHE_REDIS_URL = config.get('GOOGLE_MAPS_CACHE_REDIS_URL', fallback=None)
+GOOGLE_GEOCODE_CACHE_TTL = config.getint('GOOGLE_GEOCODE_CACHE_TTL', fallback=30 * 86400)
+GOOGLE_ROUTE_CACHE_TTL = config.getint('GOOGLE_ROUTE_CACHE_TTL', fallback=3600)
+# requests per second allowed to the Maps APIs and in-flight calls of a batch.
+GOOGLE_MAPS_QPS = float(config.get('GOOGLE_MAPS_QPS', fallback=40))
+GOOGLE_MAPS_CONCURRENCY = config.getint('GOOGLE_MAPS_CONCURRENCY', fallback=10)
@@ -1,6 +1,8 @@
 from abc import ABC
 from navconfig.logging import logging
-from ..conf import GOOGLE_PLACES_API_KEY
+from ..conf import GOOGLE_PLACES_API_KEY, GOOGLE_MAPS_CONCURRENCY
+from ..cache import get_geo_cache, get_maps_limiter
+from ...client import get_client_pool
 
 class GoogleService(ABC):
     def __init__(self, *args, **kwargs):
@@ -10,6 +12,11 @@ class GoogleService(ABC):
             raise ValueError(
                 "Google API Key is not present."
             )
+        # pooled session, result cache and quota shared by every service.
+        self._client = get_client_pool()
+        self._cache = kwargs.get('cache', get_geo_cache())
+        self._limiter = kwargs.get('rate_limiter', get_maps_limiter())
+        self.concurrency: int = kwargs.get('concurrency', GOOGLE_MAPS_CONCURRENCY)
 
     async def __aenter__(self):
         self._logger.debug(f"Initializing {self.__class__.__name__} with API Key.")
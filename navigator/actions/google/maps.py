@@ -13,12 +13,14 @@ moved to the ``navigator-api[google]`` extra:
   helpers below, which raise a clear, actionable :class:`ImportError` when
   the extra is not installed.
 """
+from typing import Optional
+from collections.abc import Awaitable, Callable, Hashable
+import asyncio
 import logging
 import string
 import datetime
 from datetime import timezone
 import urllib.parse
-import requests
 import pytz
 import aiohttp
 from ...conf import BASE_DIR, TIMEZONE
@@ -26,6 +28,8 @@ from .models import (
     TravelerSearch
 )
 from .libs import GoogleService
+from .cache import normalize_address, route_key
+from .conf import GOOGLE_GEOCODE_CACHE_TTL, GOOGLE_ROUTE_CACHE_TTL
 
 
 _EXTRA_HINT = (
@@ -72,9 +76,40 @@ class LocationError(Exception):
     pass
 
 
+async def _run_batch(
+    items: list,
+    key: Callable[[object], Hashable],
+    call: Callable[[object], Awaitable],
+    concurrency: int,
+    return_exceptions: bool = True
+) -> list:
+    """Run *call* once per distinct key of *items*, at most *concurrency*
+    at a time; results (or exceptions) come back in input order.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    keys = [key(item) for item in items]
+    unique: dict = {}
+    for k, item in zip(keys, items):
+        unique.setdefault(k, item)
+
+    async def _one(item):
+        async with semaphore:
+            return await call(item)
+
+    results = await asyncio.gather(
+        *(_one(item) for item in unique.values()),
+        return_exceptions=return_exceptions
+    )
+    by_key = dict(zip(unique, results))
+    return [by_key[k] for k in keys]
+
+
 class LocationFinder(GoogleService):
     """ LocationFinder class for finding locations."""
     base_url = "https://maps.googleapis.com/maps/api/geocode/json"
+    # retries of a geocode answered with OVER_QUERY_LIMIT.
+    quota_retries: int = 3
+    timeout: int = 60
 
     def extract_location(self, data):
         city = state = state_code = zipcode = None
@@ -91,52 +126,93 @@ class LocationFinder(GoogleService):
             pass
         return city, state, state_code, zipcode
 
-    async def find_location(self, address: str, complete: bool = False) -> dict:
+    async def _geocode(self, address: str) -> Optional[dict]:
+        """First geocoding result of *address* (cached by normalized address)."""
+        key = normalize_address(address)
+        if self._cache is not None:
+            location = await self._cache.get('geocode', key)
+            if location is not None:
+                return location
         params = {
             "address": address,
             "key": self._key_
         }
-        response = requests.get(
-            self.base_url,
-            params=params
-        )
-        if response.status_code == 200:
-            result = response.json()
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        for attempt in range(self.quota_retries + 1):
+            async with self._client.request(
+                'GET',
+                self.base_url,
+                params=params,
+                timeout=timeout,
+                limiter=self._limiter
+            ) as response:
+                if response.status != 200:
+                    return None
+                result = await response.json()
             if result['status'] == 'OK':
                 location = result['results'][0]
-                city, state, state_code, zipcode = self.extract_location(
-                    location
-                )
-                if complete is False:
-                    location_info = {
-                        "latitude": location['geometry']['location']['lat'],
-                        "longitude": location['geometry']['location']['lng'],
-                        "address": location['formatted_address'],
-                        "place_id": location['place_id'],
-                        "zipcode": zipcode,
-                        "city": city,
-                        "state": state,
-                        "state_code": state_code
-                    }
-                else:
-                    location_info = {
-                        "latitude": location['geometry']['location']['lat'],
-                        "longitude": location['geometry']['location']['lng'],
-                        "address": location['formatted_address'],
-                        "place_id": location['place_id'],
-                        "zipcode": zipcode,
-                        "city": city,
-                        "state": state,
-                        "state_code": state_code,
-                        **location
-                    }
-                return location_info
-            else:
-                raise LocationError(
-                    f"Error: {result['status']}: {result!s}"
+                if self._cache is not None:
+                    await self._cache.set(
+                        'geocode', key, location, GOOGLE_GEOCODE_CACHE_TTL
+                    )
+                return location
+            if result['status'] == 'OVER_QUERY_LIMIT' and attempt < self.quota_retries:
+                # quota exhausted: slow the shared bucket down, then retry.
+                delay = 2 ** attempt
+                self._logger.warning(
+                    f"Geocoding over query limit, retrying in {delay}s"
                 )
-        else:
-            result = {}
+                self._limiter.throttle(delay)
+                continue
+            raise LocationError(
+                f"Error: {result['status']}: {result!s}"
+            )
+
+    def _location_info(self, location: dict, complete: bool = False) -> dict:
+        city, state, state_code, zipcode = self.extract_location(
+            location
+        )
+        location_info = {
+            "latitude": location['geometry']['location']['lat'],
+            "longitude": location['geometry']['location']['lng'],
+            "address": location['formatted_address'],
+            "place_id": location['place_id'],
+            "zipcode": zipcode,
+            "city": city,
+            "state": state,
+            "state_code": state_code
+        }
+        if complete is True:
+            location_info.update(location)
+        return location_info
+
+    async def find_location(self, address: str, complete: bool = False) -> dict:
+        location = await self._geocode(address)
+        if location is None:
+            return None
+        return self._location_info(location, complete)
+
+    async def geocode_many(
+        self,
+        addresses: list,
+        complete: bool = False,
+        concurrency: int = None,
+        return_exceptions: bool = True
+    ) -> list:
+        """Geocode a batch of addresses.
+
+        Duplicates (after normalization) are geocoded once, cached ones are
+        not requested at all, and at most *concurrency* requests run at a
+        time under the shared rate limit. Results follow the input order;
+        failed lookups hold their exception when *return_exceptions* is set.
+        """
+        return await _run_batch(
+            addresses,
+            normalize_address,
+            lambda address: self.find_location(address, complete=complete),
+            concurrency or self.concurrency,
+            return_exceptions=return_exceptions
+        )
 
 
 class Route(GoogleService):
@@ -144,6 +220,54 @@ class Route(GoogleService):
 
     Offers methods for plotting routes and generating static maps.
     """
+    directions_url = 'https://maps.googleapis.com/maps/api/directions/json'
+    routes_url = "https://routes.googleapis.com/directions/v2:computeRoutes"
+    timeout: int = 60
+
+    async def _directions(self, params: dict) -> Optional[dict]:
+        """Directions API result (cached when ``OK``), ``None`` on HTTP errors."""
+        key = route_key({"api": "directions", **params})
+        if self._cache is not None:
+            result = await self._cache.get('route', key)
+            if result is not None:
+                return result
+        async with self._client.request(
+            'GET',
+            self.directions_url,
+            params=params,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            limiter=self._limiter
+        ) as response:
+            if response.status != 200:
+                return None
+            result = await response.json()
+        if self._cache is not None and result.get('status') == 'OK':
+            await self._cache.set('route', key, result, GOOGLE_ROUTE_CACHE_TTL)
+        return result
+
+    async def _compute_routes(self, data: dict, headers: dict) -> tuple:
+        """``(status, result)`` of the Routes API (successful routes are cached)."""
+        key = route_key(
+            {"api": "routes", "fields": headers.get("X-Goog-FieldMask"), **data}
+        )
+        if self._cache is not None:
+            result = await self._cache.get('route', key)
+            if result is not None:
+                return 200, result
+        async with self._client.request(
+            'POST',
+            self.routes_url,
+            json=data,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            limiter=self._limiter
+        ) as response:
+            status = response.status
+            result = await response.json()
+        if self._cache is not None and status == 200 and result and result.get('routes'):
+            await self._cache.set('route', key, result, GOOGLE_ROUTE_CACHE_TTL)
+        return status, result
+
     def plot_route(self, decoded_polyline):
         plt, _mcolors = _import_matplotlib()
         ccrs, cimgt = _import_cartopy()
@@ -292,7 +416,6 @@ class Route(GoogleService):
         complete: bool = True,
         add_overview: bool = True
     ):
-        base_url = 'https://maps.googleapis.com/maps/api/directions/json'
         if payload.departure_time != 'now':
             # we need to convert the departure time to a timestamp
             # in seconds since the epoch
@@ -334,9 +457,8 @@ class Route(GoogleService):
             'departure_time': departure_time,
             'units': payload.units
         }
-        response = requests.get(base_url, params=params)
-        if response.status_code == 200:
-            result = response.json()
+        result = await self._directions(params)
+        if result is not None:
             if result['status'] == 'OK':
                 # Extracting route, duration, and distance information
                 route = result['routes'][0]
@@ -407,7 +529,6 @@ class Route(GoogleService):
         complete: bool = True,
         add_overview: bool = True
     ):
-        base_url = "https://routes.googleapis.com/directions/v2:computeRoutes"
         departure_time = None
         if payload.departure_time is not None:
             # Google Maps API requires departure_time to be in seconds since the epoch
@@ -461,129 +582,148 @@ class Route(GoogleService):
         self._logger.notice(
             f"Google Directions API params: {data}"
         )
-        timeout = aiohttp.ClientTimeout(total=60)
-        result = {}
         headers = {
             "Content-Type": "application/json",
             "X-Goog-Api-Key": self._key_,
             "X-Goog-FieldMask": "routes.legs,routes.duration,routes.staticDuration,routes.distanceMeters,routes.polyline,routes.optimizedIntermediateWaypointIndex,routes.description,routes.warnings,routes.viewport,routes.travelAdvisory,routes.localizedValues"  # noqa: E501
         }
-        async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-            async with session.request('POST', base_url, json=data) as response:
-                # check for errors:
-                if response.status != 200:
-                    error = await response.json()
-                    msg = error.get('error', {}).get('message', 'Unknown error')
-                    self._logger.error(
-                        f"Google Directions API request failed with status: {response.status}"
-                    )
-                    return {
-                        "error": f"Google Directions API request failed with status: {response.status}",
-                        "message": msg
-                    }
-                result = await response.json()
-            # The Routes API returns an empty JSON object {} for some error cases (e.g. UNKNOWN_ERROR)
-            # even with HTTP 200, so check for presence of 'routes'.
-            if not result or 'routes' not in result or not result['routes']:
-                self._logger.error(
-                    f"Google Routes API returned a 200 OK but no routes found or empty response: {result!r}"
-                )
-                return {
-                    "error": "No routes found in API response or empty response.",
-                    "message": "The API returned a successful status but no route data."
-                }
-            if result.get('routes'):
-                # Extracting route, duration, and distance information
-                route = result['routes'][0]
-                # Get the encoded polyline from the new format
-                encoded_polyline = ""
-                decoded_polyline = None
-                if route.get('polyline') and route['polyline'].get('encodedPolyline'):
-                    encoded_polyline = route['polyline']['encodedPolyline']
-                    decoded_polyline = polyline.decode(encoded_polyline)
-                map_url = self.get_google_map(
-                    payload.origin.get_coordinates(),
-                    payload.destination.get_coordinates(),
-                    result,
-                    payload,
-                    encoded_polyline
-                )
-                total_duration = 0
-                static_duration = 0
-                total_duration_min = 0
-                static_duration_min = 0
-                total_distance = 0
-                total_distance_miles = 0
-                # Duration in seconds
-                # Distance in meters and extract route instructions:
-                bestroute = []
-                for i, leg in enumerate(route['legs']):
-                    duration_str = leg.get('duration', '0s')
-                    total_duration_seconds = int(duration_str.rstrip('s')) if duration_str else 0
-                    total_duration += total_duration_seconds
-                    # Static Duration (without traffic) for reference
-                    static_duration_str = leg.get('staticDuration', '0s')
-                    static_duration += int(static_duration_str.rstrip('s'))
-                    # Distance:
-                    distance_meters = leg.get('distanceMeters', 0)
-                    distance_miles = distance_meters / 1609.34 if distance_meters else 0
-                    total_distance += distance_meters
-                    if leg.get('steps') and len(leg['steps']) > 0:
-                        # Get the first step's navigation instruction
-                        first_step = leg['steps'][0]
-                        if 'navigationInstruction' in first_step:
-                            instruction = first_step['navigationInstruction'].get('instructions', '')
-                            # Get localized distance for this leg
-                            leg_distance = leg.get(
-                                'localizedValues', {}
-                            ).get('distance', {}).get('text', f"{distance_miles:.1f} mi")  # noqa: E501
-                            bestroute.append(f"Leg {i+1}: {instruction} for {leg_distance}")
-                        else:
-                            # Fallback if no navigation instruction
-                            leg_distance = leg.get(
-                                'localizedValues', {}
-                            ).get('distance', {}).get('text', f"{distance_miles:.1f} mi")  # noqa: E501
-                            bestroute.append(f"Leg {i+1}: Continue for {leg_distance}")
-                # Convert duration to minutes
-                total_duration_min = total_duration / 60 if total_duration > 0 else 0
-                static_duration_min = static_duration / 60 if static_duration > 0 else 0
-                # Convert distance to miles
-                total_distance_miles = total_distance / 1609.34 if total_distance > 0 else 0
-                # Generate Route Map if requested:
-                url_map = None
-                if decoded_polyline and payload.open_map is True:
-                    url_map = self.plot_route(decoded_polyline)
-                # Extract the optimal order of waypoints if available
-                waypoint_order = route.get('optimizedIntermediateWaypointIndex', [])
-                # Create the route list based on waypoint order
-                locations = payload.locations or []
+        status, result = await self._compute_routes(data, headers)
+        # check for errors:
+        if status != 200:
+            msg = result.get('error', {}).get('message', 'Unknown error')
+            self._logger.error(
+                f"Google Directions API request failed with status: {status}"
+            )
+            return {
+                "error": f"Google Directions API request failed with status: {status}",
+                "message": msg
+            }
+        # The Routes API returns an empty JSON object {} for some error cases (e.g. UNKNOWN_ERROR)
+        # even with HTTP 200, so check for presence of 'routes'.
+        if not result or 'routes' not in result or not result['routes']:
+            self._logger.error(
+                f"Google Routes API returned a 200 OK but no routes found or empty response: {result!r}"
+            )
+            return {
+                "error": "No routes found in API response or empty response.",
+                "message": "The API returned a successful status but no route data."
+            }
+        if result.get('routes'):
+            # Extracting route, duration, and distance information
+            route = result['routes'][0]
+            # Get the encoded polyline from the new format
+            encoded_polyline = ""
+            decoded_polyline = None
+            if route.get('polyline') and route['polyline'].get('encodedPolyline'):
+                encoded_polyline = route['polyline']['encodedPolyline']
+                decoded_polyline = polyline.decode(encoded_polyline)
+            map_url = self.get_google_map(
+                payload.origin.get_coordinates(),
+                payload.destination.get_coordinates(),
+                result,
+                payload,
+                encoded_polyline
+            )
+            total_duration = 0
+            static_duration = 0
+            total_duration_min = 0
+            static_duration_min = 0
+            total_distance = 0
+            total_distance_miles = 0
+            # Duration in seconds
+            # Distance in meters and extract route instructions:
+            bestroute = []
+            for i, leg in enumerate(route['legs']):
+                duration_str = leg.get('duration', '0s')
+                total_duration_seconds = int(duration_str.rstrip('s')) if duration_str else 0
+                total_duration += total_duration_seconds
+                # Static Duration (without traffic) for reference
+                static_duration_str = leg.get('staticDuration', '0s')
+                static_duration += int(static_duration_str.rstrip('s'))
+                # Distance:
+                distance_meters = leg.get('distanceMeters', 0)
+                distance_miles = distance_meters / 1609.34 if distance_meters else 0
+                total_distance += distance_meters
+                if leg.get('steps') and len(leg['steps']) > 0:
+                    # Get the first step's navigation instruction
+                    first_step = leg['steps'][0]
+                    if 'navigationInstruction' in first_step:
+                        instruction = first_step['navigationInstruction'].get('instructions', '')
+                        # Get localized distance for this leg
+                        leg_distance = leg.get(
+                            'localizedValues', {}
+                        ).get('distance', {}).get('text', f"{distance_miles:.1f} mi")  # noqa: E501
+                        bestroute.append(f"Leg {i+1}: {instruction} for {leg_distance}")
+                    else:
+                        # Fallback if no navigation instruction
+                        leg_distance = leg.get(
+                            'localizedValues', {}
+                        ).get('distance', {}).get('text', f"{distance_miles:.1f} mi")  # noqa: E501
+                        bestroute.append(f"Leg {i+1}: Continue for {leg_distance}")
+            # Convert duration to minutes
+            total_duration_min = total_duration / 60 if total_duration > 0 else 0
+            static_duration_min = static_duration / 60 if static_duration > 0 else 0
+            # Convert distance to miles
+            total_distance_miles = total_distance / 1609.34 if total_distance > 0 else 0
+            # Generate Route Map if requested:
+            url_map = None
+            if decoded_polyline and payload.open_map is True:
+                url_map = self.plot_route(decoded_polyline)
+            # Extract the optimal order of waypoints if available
+            waypoint_order = route.get('optimizedIntermediateWaypointIndex', [])
+            # Create the route list based on waypoint order
+            locations = payload.locations or []
+            try:
+                if waypoint_order:
+                    route = [locations[i]['store_id'] for i in waypoint_order]
+                else:
+                    # If no optimization was requested, maintain original order
+                    route = [loc['store_id'] for loc in locations] if locations else []
+            except (AttributeError, KeyError):
                 try:
                     if waypoint_order:
-                        route = [locations[i]['store_id'] for i in waypoint_order]
+                        route = [locations[i]['location_name'] for i in waypoint_order]
                     else:
-                        # If no optimization was requested, maintain original order
-                        route = [loc['store_id'] for loc in locations] if locations else []
+                        route = [loc['location_name'] for loc in locations] if locations else []
                 except (AttributeError, KeyError):
-                    try:
-                        if waypoint_order:
-                            route = [locations[i]['location_name'] for i in waypoint_order]
-                        else:
-                            route = [loc['location_name'] for loc in locations] if locations else []
-                    except (AttributeError, KeyError):
-                        route = []
-                response = {
-                    "route_legs": bestroute,
-                    "route": route,  # The ordered list of store IDs
-                    "duration": total_duration_min,
-                    "distance": total_distance_miles,
-                    "static_duration": static_duration_min,
-                    "total_duration": f"{total_duration_min:.2f} minutes",
-                    "total_distance": f"{total_distance_miles:.2f} miles",
-                    "map_url": map_url,
-                    "map": url_map
-                }
-                if add_overview:
-                    response['overview'] = decoded_polyline
-                if complete:
-                    response['response'] = result
-                return response
+                    route = []
+            response = {
+                "route_legs": bestroute,
+                "route": route,  # The ordered list of store IDs
+                "duration": total_duration_min,
+                "distance": total_distance_miles,
+                "static_duration": static_duration_min,
+                "total_duration": f"{total_duration_min:.2f} minutes",
+                "total_distance": f"{total_distance_miles:.2f} miles",
+                "map_url": map_url,
+                "map": url_map
+            }
+            if add_overview:
+                response['overview'] = decoded_polyline
+            if complete:
+                response['response'] = result
+            return response
+
+    async def route_many(
+        self,
+        payloads: list,
+        complete: bool = True,
+        add_overview: bool = True,
+        concurrency: int = None,
+        return_exceptions: bool = True
+    ) -> list:
+        """Compute a batch of routes (see :meth:`waypoint_route`).
+
+        Identical requests are computed once, cached routes are not
+        requested, and at most *concurrency* run at a time under the shared
+        rate limit. Results follow the input order.
+        """
+        return await _run_batch(
+            payloads,
+            lambda payload: route_key(payload.to_dict()),
+            lambda payload: self.waypoint_route(
+                payload, complete=complete, add_overview=add_overview
+            ),
+            concurrency or self.concurrency,
+            return_exceptions=return_exceptions
+        )
@@ -40,6 +40,8 @@ class OdooHelpdesk(AbstractTicket, RESTAction):
     Manage Helpdesk tickets through the Odoo webhook while presenting the same
     interface and Zammad-shaped responses as the ``Zammad`` action.
     """
+    # shares the Odoo instance (and its rate limit) with the ``Odoo`` action.
+    provider = 'odoo'
 
     #: Query params ``list_tickets`` forwards to the Helpdesk ``GET /tickets``
     #: webhook. Human-friendly values (name/email/date) rather than Odoo
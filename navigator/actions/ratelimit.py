@@ -0,0 +1,257 @@
+"""Client-side rate limiting for outbound actions.
+
+A :class:`TokenBucket` spaces calls to a provider so bursts stay under its
+quota instead of failing with "over query limit" errors; callers wait for a
+token rather than being rejected. Buckets are adaptive: a ``429`` halves
+the rate (and honours ``Retry-After``), successful calls slowly bring it
+back to the configured limit.
+
+:class:`RateLimits` keeps one bucket per provider (``ACTION_RATE_LIMITS``)
+and publishes their queue time and throttling as metrics.
+"""
+from typing import Optional
+import asyncio
+import threading
+import time
+import weakref
+from navconfig.logging import logging
+from ..metrics.registry import (
+    Counter,
+    Gauge,
+    Metric,
+    MetricsRegistry,
+    DEFAULT_BUCKETS,
+)
+
+
+class TokenBucket:
+    """TokenBucket.
+
+    Args:
+        rate: tokens added per second (sustained requests per second).
+        burst: bucket capacity (requests allowed back to back), defaults
+            to ``rate``.
+        min_rate: floor of the adaptive rate (default: a tenth of *rate*).
+        name: provider the bucket belongs to (metrics label).
+
+    Tokens are reserved under a thread lock and the wait happens outside
+    of it, so one bucket can be shared by several event loops.
+    """
+    # multiplicative decrease on throttling, additive increase on success.
+    decrease: float = 0.5
+    increase: float = 0.05
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        min_rate: Optional[float] = None,
+        name: str = ""
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("TokenBucket: rate must be positive")
+        self.name = name
+        self.max_rate = float(rate)
+        self.rate = self.max_rate
+        self.min_rate = float(min_rate or self.max_rate / 10)
+        self.burst = float(burst or max(1.0, rate))
+        self.histogram = None
+        self.acquired: int = 0
+        self.throttled: int = 0
+        self.waiting: int = 0
+        self.waited: float = 0.0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            self.acquired += 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    async def acquire(self, tokens: float = 1) -> float:
+        """Wait (queued, never rejected) for *tokens*; returns the seconds waited."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            with self._lock:
+                self.waiting += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+                    self.waited += wait
+        if self.histogram is not None:
+            self.histogram.observe(wait, (self.name,))
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for *seconds* (the provider reported its quota exhausted)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """The provider answered ``429``: slow down and pause."""
+        with self._lock:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+
+    def success(self) -> None:
+        """A call went through: recover towards the configured rate."""
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.increase)
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            elapsed = time.monotonic() - self._updated
+            return min(self.burst, self._tokens + elapsed * self.rate)
+
+
+def parse_limits(value: Optional[str]) -> dict:
+    """``"zammad:5,hubspot:10:20"`` as ``{provider: (rate, burst)}``."""
+    limits: dict = {}
+    for item in (value or "").split(","):
+        parts = [p.strip() for p in item.split(":")]
+        if len(parts) < 2 or not parts[0]:
+            continue
+        try:
+            rate = float(parts[1])
+            burst = float(parts[2]) if len(parts) > 2 and parts[2] else None
+        except ValueError:
+            logging.getLogger("navigator.ratelimit").warning(
+                f"Invalid rate limit: {item!r}"
+            )
+            continue
+        limits[parts[0].lower()] = (rate, burst)
+    return limits
+
+
+class RateLimits:
+    """RateLimits.
+
+    One adaptive :class:`TokenBucket` per provider.
+
+    Args:
+        limits: ``{provider: (rate, burst)}`` overrides.
+        default_rate: requests per second of providers without a limit.
+    """
+    def __init__(
+        self,
+        limits: Optional[dict] = None,
+        default_rate: float = 10.0
+    ) -> None:
+        self.limits: dict = {k.lower(): v for k, v in (limits or {}).items()}
+        self.default_rate = default_rate
+        self._buckets: dict = {}
+        self._histogram = None
+        self._collectors = weakref.WeakKeyDictionary()  # registry -> collector
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        provider: str,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None
+    ) -> TokenBucket:
+        """Bucket of *provider*; configured limits win over *rate*/*burst*."""
+        provider = provider.lower()
+        try:
+            return self._buckets[provider]
+        except KeyError:
+            pass
+        with self._lock:
+            bucket = self._buckets.get(provider)
+            if bucket is None:
+                rate, burst = self.limits.get(
+                    provider, (rate or self.default_rate, burst)
+                )
+                bucket = TokenBucket(rate, burst=burst, name=provider)
+                bucket.histogram = self._histogram
+                self._buckets[provider] = bucket
+            return bucket
+
+    def __iter__(self):
+        return iter(list(self._buckets.values()))
+
+    def register(self, registry: MetricsRegistry) -> None:
+        """Export the limits to *registry* (once per registry)."""
+        if registry in self._collectors:
+            return
+        self._histogram = registry.histogram(
+            "action_queue_seconds",
+            "Time outbound calls waited for a rate-limit token.",
+            ("provider",),
+            buckets=(0.0,) + DEFAULT_BUCKETS,
+        )
+        for bucket in self:
+            bucket.histogram = self._histogram
+        name = registry.metric_name
+
+        def collect() -> list[Metric]:
+            calls = Counter(
+                name("action_calls_total"), "Rate-limited outbound calls.", ("provider",)
+            )
+            throttled = Counter(
+                name("action_throttled_total"), "Calls answered with 429.", ("provider",)
+            )
+            waiting = Gauge(
+                name("action_queue_depth"), "Calls waiting for a token.", ("provider",)
+            )
+            rate = Gauge(
+                name("action_rate_limit"), "Current (adaptive) requests per second.", ("provider",)
+            )
+            for bucket in self:
+                labels = (bucket.name,)
+                calls.inc(labels, bucket.acquired)
+                throttled.inc(labels, bucket.throttled)
+                waiting.set(bucket.waiting, labels)
+                rate.set(bucket.rate, labels)
+            return [calls, throttled, waiting, rate]
+
+        self._collectors[registry] = collect
+        registry.register_collector(collect)
+
+
+_limits: Optional[RateLimits] = None
+
+
+def get_rate_limits() -> RateLimits:
+    """The process-wide provider limits (built from the settings on first use)."""
+    global _limits  # pylint: disable=W0603
+    if _limits is None:
+        from ..conf import (  # pylint: disable=C0415
+            ACTION_RATE_LIMIT,
+            ACTION_RATE_LIMITS,
+        )
+        _limits = RateLimits(
+            limits=parse_limits(ACTION_RATE_LIMITS),
+            default_rate=ACTION_RATE_LIMIT,
+        )
+    return _limits
+
+
+def set_rate_limits(limits: Optional[RateLimits]) -> Optional[RateLimits]:
+    global _limits  # pylint: disable=W0603
+    _limits = limits
+    return limits
+
+
+def get_limiter(
+    provider: str,
+    rate: Optional[float] = None,
+    burst: Optional[float] = None
+) -> TokenBucket:
+    """Shortcut for ``get_rate_limits().get(provider, rate, burst)``."""
+    return get_rate_limits().get(provider, rate=rate, burst=burst)
@@ -1,15 +1,11 @@
+from typing import Optional
 import os
 import asyncio
 from urllib.parse import urlencode
-from functools import partial
-from concurrent.futures import ThreadPoolExecutor
 import random
 from pathlib import Path
 from io import BytesIO
 import aiofiles
-import requests
-from requests.auth import HTTPBasicAuth
-from requests.exceptions import HTTPError
 import httpx
 import aiohttp
 from aiohttp import BasicAuth
@@ -17,7 +13,11 @@ from lxml import html, etree
 from datamodel.parsers.json import JSONContent
 from asyncdb.utils.functions import cPrint
 from ..exceptions import ConfigError
+from ..tracing.tracer import current_span, inject, traced
 from .abstract import AbstractAction
+from .cache import get_response_cache
+from .client import get_client_pool
+from .ratelimit import get_limiter
 
 
 # ---------------------------------------------------------------------------
@@ -76,6 +76,9 @@ class RESTAction(AbstractAction):
     auth_type: str = 'key'
     token_type: str = 'Bearer'
     data_format: str = 'raw'
+    # seconds a GET response is cached regardless of its Cache-Control
+    # (None: follow the response headers).
+    cache_ttl: Optional[int] = None
 
     def __init__(self, *args, **kwargs):
         self.timeout = int(kwargs.pop('timeout', 60))
@@ -91,6 +94,8 @@ class RESTAction(AbstractAction):
         self.use_streams: bool = kwargs.pop('use_streams', False)
         self.use_proxy: bool = kwargs.pop('use_proxy', False)
         self.file_buffer: bool = kwargs.pop('file_buffer', False)
+        self.cache_ttl = kwargs.pop('cache_ttl', self.cache_ttl)
+        self.use_cache: bool = kwargs.pop('use_cache', True)
         self._proxies: list = []
         ## Headers
         try:
@@ -119,8 +124,12 @@ class RESTAction(AbstractAction):
         self.headers["Accept-Language"] = ','.join(langs)
         super(RESTAction, self).__init__(*args, **kwargs)
         self._encoder = JSONContent()
-        self._executor = ThreadPoolExecutor(max_workers=4)
-        self._semaphore = asyncio.Semaphore(10)  # Adjust the number as neededd
+        # shared connection pool (keep-alive, per-host limits, retries).
+        self._client = get_client_pool()
+        # response cache for GET lookups (None when disabled).
+        self._cache = get_response_cache() if self.use_cache else None
+        # per-provider token bucket (adapts to 429/Retry-After).
+        self._limiter = get_limiter(self.provider)
 
     async def get_proxies(self):
         """
@@ -147,6 +156,7 @@ class RESTAction(AbstractAction):
     async def close(self):
         pass
 
+    @traced("http.client", kind="client")
     async def request(
         self,
         url,
@@ -157,19 +167,14 @@ class RESTAction(AbstractAction):
     ):
         """
         request.
-            connect to an http source unsing Requests.
+            connect to an http source using the shared client pool.
         """
         result = []
         error = {}
         auth = None
-        proxies = None
+        proxy = None
         if self._proxies:
             proxy = random.choice(self._proxies)
-            proxies = {
-                "http": proxy,
-                "https": proxy,
-                "ftp": proxy
-            }
         if headers is not None and isinstance(headers, dict):
             self.headers = {**self.headers, **headers}
         if self.auth_type == 'apikey':
@@ -186,16 +191,16 @@ class RESTAction(AbstractAction):
                     queryparams=urlencode(self.auth)
                 )
             elif self.auth_type == 'basic':
-                auth = HTTPBasicAuth(*self.auth)
+                auth = BasicAuth(*self.auth)
             else:
-                auth = HTTPBasicAuth(*self.auth)
+                auth = BasicAuth(*self.auth)
         elif self._user:
-            auth = HTTPBasicAuth(
+            auth = BasicAuth(
                 self._user,
                 self._pwd
             )
         elif self.auth_type == 'basic':
-            auth = HTTPBasicAuth(
+            auth = BasicAuth(
                 self._user,
                 self._pwd
             )
@@ -203,252 +208,140 @@ class RESTAction(AbstractAction):
         self._logger.notice(
             f'HTTP: Connecting to {url} using {method}'
         )
+        self._trace_request(method, url)
         args = {
-            "timeout": self.timeout,
-            "headers": self.headers,
+            "timeout": aiohttp.ClientTimeout(total=self.timeout),
+            "headers": inject(self.headers),
             "cookies": cookies
         }
         if auth is not None:
             args['auth'] = auth
-            args['verify'] = False
-        if self._proxies:
-            args['proxies'] = proxies
+            args['ssl'] = False
+        if proxy:
+            args['proxy'] = proxy
         if method == 'get':
-            my_request = partial(
-                requests.get,
-                params=data,
-                **args
-            )
+            args['params'] = self._query_params(data)
         elif method == 'post':
             if self.data_format == 'json':
                 data = self._encoder.dumps(data)
-                my_request = partial(
-                    requests.post,
-                    json={"query": data},
-                    **args
-                )
+                args['json'] = {"query": data}
             else:
                 data = self._encoder.dumps(data)
-                my_request = partial(
-                    requests.post,
-                    data=data,
-                    **args
-                )
-        elif method == 'put':
-            my_request = partial(
-                requests.put,
-                data=data,
-                **args
-            )
-        elif method == 'delete':
-            my_request = partial(
-                requests.delete,
-                data=data,
-                **args
-            )
-        elif method == 'patch':
-            my_request = partial(
-                requests.patch,
-                data=data,
-                **args
-            )
+                args['data'] = data
         else:
-            my_request = partial(
-                requests.post,
-                data=data,
-                **args
-            )
+            # put, delete, patch (and anything else) send the raw data.
+            args['data'] = data
         # making request
-        async with self._semaphore:
+        try:
+            async with self._send(method, url, **args) as response:
+                if response.status >= 400:
+                    if 'application/json' in response.headers.get('Content-Type', ''):
+                        rsp = await response.json(content_type=None)
+                    else:
+                        rsp = await response.text()
+                    self._logger.error(
+                        f"HTTP error: {response.status} {response.reason} with response: {rsp!s}"
+                    )
+                    raise ConfigError(
+                        f"HTTP error: {response.status} {response.reason} with response: {rsp!s}"
+                    )
+                result, error = await self.process_response(response, url)
+                if self.file_buffer is True and not error:
+                    result = (result, response)
+        except ConfigError:
+            raise
+        except asyncio.TimeoutError as err:
+            self._logger.warning(
+                f"Timeout Error: {err!r}"
+            )
+            raise ConfigError(
+                f"Timeout: {err}"
+            ) from err
+        except aiohttp.ClientProxyConnectionError as err:
+            raise ConfigError(
+                f"Proxy Connection Error: {err!r}"
+            ) from err
+        except aiohttp.ClientError as err:
+            raise ConfigError(
+                f"HTTP Connection Error: {err!r}"
+            ) from err
+        except Exception as err:
+            self._logger.exception(err)
+            raise ConfigError(
+                f"Error: {err}"
+            ) from err
+        if error:
+            if isinstance(error, BaseException):
+                raise error
+            # ``error`` may be a BeautifulSoup instance when the
+            # response was parsed as HTML. Import lazily so
+            # environments without the scraping extras still reach
+            # this branch. If the extras are missing we simply
+            # cannot have a BeautifulSoup instance here, so fall
+            # through to the generic ConfigError.
             try:
-                loop = asyncio.get_running_loop()
-                future = loop.run_in_executor(self._executor, my_request, url)
-                result, error = await self.process_request(future, url)
-                if error:
-                    if isinstance(error, BaseException):
-                        raise error
-                    # ``error`` may be a BeautifulSoup instance when the
-                    # response was parsed as HTML. Import lazily so
-                    # environments without the scraping extras still reach
-                    # this branch. If the extras are missing we simply
-                    # cannot have a BeautifulSoup instance here, so fall
-                    # through to the generic ConfigError.
-                    try:
-                        BeautifulSoup = _import_beautifulsoup()
-                    except ImportError:
-                        BeautifulSoup = None
-                    if BeautifulSoup is not None and isinstance(
-                        error, BeautifulSoup
-                    ):
-                        return (result, error)
-                    raise ConfigError(str(error))
-                ## saving last execution parameters:
-                self._last_execution = {
-                    "url": self.url,
-                    "method": method,
-                    "data": data,
-                    "auth": bool(auth),
-                    "headers": self.headers
-                }
+                BeautifulSoup = _import_beautifulsoup()
+            except ImportError:
+                BeautifulSoup = None
+            if BeautifulSoup is not None and isinstance(
+                error, BeautifulSoup
+            ):
                 return (result, error)
-            except HTTPError as err:
-                self._logger.error(
-                    f"HTTP error occurred: {err}"
-                )
-                # Log the error or perform other error handling
-                raise ConfigError(
-                    f"{err}"
-                )
-            except requests.exceptions.ReadTimeout as err:
-                self._logger.warning(
-                    f"Timeout Error: {err!r}"
-                )
-                # TODO: retrying
-                raise ConfigError(
-                    f"Timeout: {err}"
-                ) from err
-            except Exception as err:
-                self._logger.exception(err)
-                raise ConfigError(
-                    f"Error: {err}"
-                ) from err
+            raise ConfigError(str(error))
+        ## saving last execution parameters:
+        self._last_execution = {
+            "url": self.url,
+            "method": method,
+            "data": data,
+            "auth": bool(auth),
+            "headers": self.headers
+        }
+        return (result, error)
 
-    async def process_request(self, future, url: str):
-        error = None
-        result = None
-        loop = asyncio.get_running_loop()
-        asyncio.set_event_loop(loop)
-        done, _ = await asyncio.wait([future], return_when=asyncio.FIRST_COMPLETED)
-        for f in done:
-            response = f.result()
-            # Check for HTTP errors
-            try:
-                response.raise_for_status()
-            except HTTPError as http_err:
-                # Handle HTTP errors here
-                error = http_err
-                # Log the error or perform other error handling
-                if response.headers.get('content_type') == 'application/json':
-                    rsp = response.json()
-                else:
-                    rsp = response.text
-                self._logger.error(
-                    f"HTTP error: {http_err} with response: {rsp!s}"
-                )
-                # You can choose to continue, break, or return based on your logic
-                raise HTTPError(
-                    f"HTTP error: {http_err} with response: {rsp!s}"
-                )
-            try:
-                if self.download is True:
-                    # Filename:
-                    filename = os.path.basename(url)
-                    # Get the filename from the response headers, if available
-                    content_disposition = response.headers.get('content-disposition')
-                    if content_disposition:
-                        _, params = content_disposition.split(';')
-                        try:
-                            key, value = params.strip().split('=')
-                            if key == 'filename':
-                                filename = value.strip('\'"')
-                        except ValueError:
-                            pass
-                    if isinstance(filename, str):
-                        filename = Path(filename)
-                    # Saving File in Directory:
-                        total_length = response.headers.get('Content-Length')
-                        self._logger.info(
-                            f'HTTPClient: Saving File {filename}, size: {total_length}'
-                        )
-                        pathname = filename.parent.absolute()
-                        if not pathname.exists():
-                            # Create a new directory
-                            pathname.mkdir(parents=True, exist_ok=True)
-                        transfer = response.headers.get("transfer-encoding", None)
-                        if transfer is None:
-                            chunk_size = int(total_length)
-                        else:
-                            chunk_size = 8192
-                        with open(filename, 'wb') as fp:
-                            try:
-                                for chunk in response.iter_content(
-                                    chunk_size=chunk_size
-                                ):
-                                    fp.write(chunk)
-                                fp.flush()
-                            except Exception:
-                                pass
-                        self._logger.debug(
-                            f'Filename Saved Successfully: {filename}'
-                        )
-                        result = filename
-                # getting the result, based on the Accept logic
-                elif self.file_buffer is True:
-                    data = response.content
-                    buffer = BytesIO(data)
-                    buffer.seek(0)
-                    result = buffer
-                    return ((result, response), error)
-                elif self.accept in (
-                    'text/html',
-                    'application/xhtml+xml',
-                    "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8"
-                ):
-                    try:
-                        # html parser for lxml
-                        self._parser = html.fromstring(response.text)
-                        # Returning a BeautifulSoup parser
-                        self._bs = _import_beautifulsoup()(response.text, 'html.parser')
-                        result = self._bs
-                    except (AttributeError, ValueError) as e:
-                        error = e
-                elif self.accept in ('application/xhtml+xml', 'application/xml'):
-                    try:
-                        self._parser = etree.fromstring(response.text)
-                    except (AttributeError, ValueError) as e:
-                        error = e
-                elif self.accept in ('text/plain', 'text/csv'):
-                    result = response.text
-                elif self.accept == 'application/json':
-                    try:
-                        result = self._encoder.loads(response.text)
-                    except (AttributeError, ValueError) as e:
-                        self._logger.error(e)
-                        # is not an json, try first with beautiful soup:
-                        try:
-                            self._bs = _import_beautifulsoup()(response.text, 'html.parser')
-                            result = self._bs
-                        except (AttributeError, ValueError) as ex:
-                            error = ex
-                else:
-                    try:
-                        self._bs = _import_beautifulsoup()(response.text, 'html.parser')
-                    except (AttributeError, ValueError) as ex:
-                        error = ex
-                    result = response.text
-                return (result, error)
-            except (requests.exceptions.ProxyError) as err:
-                raise ConfigError(
-                    f"Proxy Connection Error: {err!r}"
-                ) from err
-            except (requests.ReadTimeout) as ex:
-                return ([], ex)
-            except requests.exceptions.Timeout as err:
-                return ([], err)
-            except requests.exceptions.HTTPError as err:
-                return ([], err)
-            except (
-                requests.exceptions.RequestException,
-            ) as e:
-                raise ConfigError(
-                    f"HTTP Connection Error: {e!r}"
-                ) from e
-            except Exception as e:
-                self.logger.exception(e)
-                raise ConfigError(
-                    f"HTTP Connection Error: {e!r}"
-                ) from e
+    @staticmethod
+    def _query_params(data):
+        """Query string parameters as aiohttp accepts them (``None`` dropped)."""
+        if not isinstance(data, dict):
+            return data
+        params = {}
+        for key, value in data.items():
+            if value is None:
+                continue
+            if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+                value = str(value)
+            params[key] = value
+        return params
 
+    def _send(self, method: str, url: str, **kwargs):
+        """Request through the shared pool, served from the response cache
+        when possible (downloads and streamed bodies always go upstream).
+        """
+        kwargs['limiter'] = self._limiter
+        if self._cache is None or self.download is True:
+            return self._client.request(method, url, **kwargs)
+        auth = kwargs.get('auth')
+        # private responses never leak between credentials (the headers,
+        # API keys included, are part of the cache key).
+        credentials = (
+            tuple(auth) if auth else None,
+            sorted((kwargs.get('cookies') or {}).items()),
+        )
+        return self._cache.fetch(
+            self._client,
+            method,
+            url,
+            ttl=self.cache_ttl,
+            credentials=credentials,
+            **kwargs
+        )
+
+    def _trace_request(self, method: str, url: str) -> None:
+        span = current_span()
+        if span is not None:
+            span.set_attribute("http.method", method.upper())
+            span.set_attribute("http.url", url.split("?")[0])
+
+    @traced("http.client", kind="client")
     async def async_request(
         self,
         url: str,
@@ -496,50 +389,32 @@ class RESTAction(AbstractAction):
         cPrint(
             f'HTTP: Connecting to {url} using {method}', level='DEBUG'
         )
-        if auth is not None:
-            args = {
-                "auth": auth
-            }
-        else:
-            args = {}
         if self.download is True:
             self.headers['Accept'] = 'application/octet-stream'
             self.headers['Content-Type'] = 'application/octet-stream'
-            if hasattr(self, 'use_streams'):
+            if self.use_streams is True:
                 self.headers['Transfer-Encoding'] = 'chunked'
-                args["stream"] = True
-        timeout = aiohttp.ClientTimeout(total=self.timeout)
         headers = self.headers
         if headers is not None and isinstance(headers, dict):
             headers = {**self.headers, **headers}
-        async with aiohttp.ClientSession(
-            headers=headers,
-            timeout=timeout,
-            auth=auth,
-            cookies=cookies
-        ) as session:
-            try:
-                if use_json is True:
-                    async with session.request(
-                        method.upper(),
-                        url,
-                        json=data,
-                        proxy=proxies,
-                        **args
-                    ) as response:
-                        result, error = await self.process_response(response, url)
-                else:
-                    async with session.request(
-                        method.upper(),
-                        url,
-                        data=data,
-                        proxy=proxies,
-                        **args
-                    ) as response:
-                        # Process the response
-                        result, error = await self.process_response(response, url)
-            except aiohttp.ClientError as e:
-                error = str(e)
+        self._trace_request(method, url)
+        args = {
+            "headers": inject(headers),
+            "timeout": aiohttp.ClientTimeout(total=self.timeout),
+            "auth": auth,
+            "cookies": cookies,
+            "proxy": proxies,
+        }
+        if use_json is True:
+            args["json"] = data
+        else:
+            args["data"] = data
+        try:
+            async with self._send(method, url, **args) as response:
+                # Process the response
+                result, error = await self.process_response(response, url)
+        except aiohttp.ClientError as e:
+            error = str(e)
         return (result, error)
 
     async def process_response(self, response, url: str) -> tuple:
@@ -654,7 +529,9 @@ class RESTAction(AbstractAction):
                     error = e
             elif self.accept == 'application/json':
                 try:
-                    result = await response.json()
+                    result = await response.json(
+                        loads=self._encoder.loads, content_type=None
+                    )
                 except Exception as e:
                     self._logger.error(
                         f"Error: {e!r}"
@@ -730,25 +607,26 @@ class RESTAction(AbstractAction):
         }
         if auth is not None:
             args['auth'] = auth
+        body = {"json": data} if use_json else {"data": data}
         if self._proxies:
-            if len(self._proxies) > 0:
-                proxy = random.choice(self._proxies)
-                args['mounts'] = {
-                    "http": httpx.HTTPTransport(proxy=proxy),
-                    "https": httpx.HTTPTransport(proxy=proxy),
-                    "ftp": httpx.HTTPTransport(proxy=proxy)
-                }
-            else:
-                args['proxy'] = self._proxies
-        async with httpx.AsyncClient(**args) as client:
-            try:
-                request_func = getattr(client, method.lower())
-                if use_json:
-                    response = await request_func(url, json=data)
-                else:
-                    response = await request_func(url, data=data)
-                # Process the response
-                result, error = await self.process_response(response, url)
-            except httpx.HTTPError as e:
-                error = str(e)
+            # proxies are per client: a one-off client for this request.
+            proxy = random.choice(self._proxies)
+            args['mounts'] = {
+                "http://": httpx.AsyncHTTPTransport(proxy=proxy),
+                "https://": httpx.AsyncHTTPTransport(proxy=proxy),
+            }
+            async with httpx.AsyncClient(**args) as client:
+                try:
+                    response = await client.request(method.upper(), url, **body)
+                    result, error = await self.process_response(response, url)
+                except httpx.HTTPError as e:
+                    error = str(e)
+            return (result, error)
+        client = self._client.httpx_client()
+        try:
+            response = await client.request(method.upper(), url, **args, **body)
+            # Process the response
+            result, error = await self.process_response(response, url)
+        except httpx.HTTPError as e:
+            error = str(e)
         return (result, error)
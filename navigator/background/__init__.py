@@ -9,6 +9,7 @@ from .service import (
     DEFAULT_SERVICE_NAME,
 )
 from .queue import BackgroundQueue, BackgroundTask, SERVICE_NAME, SERVICE_KEY
+from .queue.batch import BatchHandler, batched
 
 # Lazy re-export of QWorkerTasker. The `taskers` package is always importable
 # (qworker itself is lazy-imported inside QWorkerTasker.__init__), but we
@@ -0,0 +1,33 @@
+"""Priority levels of background tasks (lower runs first)."""
+from typing import Union
+
+
+PRIORITIES: dict = {
+    "critical": 0,
+    "high": 1,
+    "normal": 2,
+    "low": 3,
+}
+DEFAULT_PRIORITY = "normal"
+
+
+def priority_level(priority: Union[str, int, None]) -> int:
+    """Return the numeric level of *priority* (a name or an int)."""
+    if priority is None:
+        return PRIORITIES[DEFAULT_PRIORITY]
+    if isinstance(priority, str):
+        try:
+            return PRIORITIES[priority]
+        except KeyError as exc:
+            raise ValueError(
+                f"Invalid priority {priority!r}, expected one of {list(PRIORITIES)}"
+            ) from exc
+    return int(priority)
+
+
+def lane_name(level: int) -> str:
+    """Metrics label of a priority level."""
+    for name, value in PRIORITIES.items():
+        if value == level:
+            return name
+    return str(level)
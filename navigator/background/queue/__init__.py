@@ -16,8 +16,19 @@ import time
 import psutil
 from aiohttp import web
 from navconfig.logging import logging
-from ...conf import QUEUE_CALLBACK
-from ..wrappers import TaskWrapper, coroutine_in_thread
+from ...conf import (
+    QUEUE_CALLBACK,
+    BACKGROUND_TASK_TIMEOUT,
+    BACKGROUND_MIN_WORKERS,
+    BACKGROUND_SCALE_IDLE,
+)
+from ...tracing.tracer import start_span
+from ..wrappers import TaskWrapper, run_in_loop_thread
+from ..wrappers.loops import get_loop_pool
+from ..priority import priority_level
+from .fair import FairQueue
+from .batch import Batch, BatchHandler, batched, batch_handler, batch_item
+from .limits import KeyedLimiter
 
 
 if sys.version_info >= (3, 10):  # pragma: no cover
@@ -33,13 +44,51 @@ SERVICE_NAME: str = 'service_queue'
 SERVICE_KEY: web.AppKey["BackgroundQueue"] = web.AppKey(SERVICE_NAME)
 
 
+class QueuedCall(tuple):
+    """``(fn, args, kwargs)`` queue item carrying its scheduling options."""
+    priority = None
+    fair_key = None
+    dedup_key = None
+
+
 class BackgroundQueue:
     """BackgroundQueue.
 
     Asyncio Queue with for background processing.
 
+    Tasks are served by priority lane (``priority`` of the TaskWrapper or
+    ``_priority`` of :meth:`put`) and, within a lane, fairly across keys:
+    the TaskWrapper ``fair_key``, the ``_fair_key`` of :meth:`put`, or
+    the ``fair_by`` attribute/keyword argument of the task (e.g.
+    ``fair_by="tenant"``), weighted by ``weights``. See
+    :class:`~navigator.background.queue.fair.FairQueue`.
+
+    A task with a ``dedup_key`` (the TaskWrapper one or the ``_dedup_key``
+    of :meth:`put`) is dropped while another task with that key is queued
+    or running in this queue.
+
+    Tasks calling a :class:`~navigator.background.queue.batch.BatchHandler`
+    with one item are accumulated and run in batches (see
+    :mod:`navigator.background.queue.batch`).
+
+    TaskWrappers with a ``partition_key`` run one at a time and in order
+    per key, and those with a ``concurrency_key`` at most
+    ``max_concurrency`` at a time per key: a task over its limits waits
+    outside the queue, without holding a consumer (see
+    :mod:`navigator.background.queue.limits`).
+
+    ``task_timeout`` is the deadline (seconds) of the tasks without their
+    own TaskWrapper ``timeout``; :meth:`cancel` stops a pending or running
+    TaskWrapper. Either way the consumer is freed at once.
+
+    With ``min_workers`` below ``max_workers`` the consumers autoscale:
+    every ``scale_interval`` seconds consumers are added when tasks wait
+    for longer than ``scale_wait`` seconds (or outnumber the consumers),
+    and one idle consumer is retired after ``scale_idle`` seconds without
+    backlog. Otherwise ``max_workers`` consumers always run.
+
     TODO:
-    - Add Task Timeout
+    - Add Task Timeout (done)
     - Add Task Retry (done)
     - Added Wrapper Support (done)
     """
@@ -58,10 +107,41 @@ class BackgroundQueue:
         self.queue_size = kwargs.get('queue_size', 5)
         self._enable_profiling: bool = kwargs.get('enable_profiling', False)
         self.coro_in_threads: bool = coro_in_threads
-        self.queue = asyncio.Queue(
-            maxsize=self.queue_size
+        # give the loop a turn after each put (lets consumers start early).
+        self.yield_on_put: bool = kwargs.get('yield_on_put', False)
+        # fairness key looked up in the task attributes/kwargs:
+        self.fair_by: Optional[str] = kwargs.get('fair_by', None)
+        # default deadline of a task (None: no limit):
+        self.task_timeout: Optional[float] = kwargs.get(
+            'task_timeout', BACKGROUND_TASK_TIMEOUT
+        ) or None
+        # TaskWrappers pending or running, by task id (see cancel()):
+        self._tasks: dict = {}
+        # dedup key -> task queued or running:
+        self._inflight: dict = {}
+        # (batch handler, priority) -> Batch being filled:
+        self._batches: dict = {}
+        # partition and concurrency limits (tasks parked over them):
+        self.limiter = KeyedLimiter()
+        self._enqueuing: set = set()  # enqueue tasks started by callbacks
+        self.queue = FairQueue(
+            maxsize=self.queue_size,
+            key=self._fair_key,
+            weights=kwargs.get('weights', None)
         )
         self.consumers: list = []
+        # Autoscaling (min_workers == max_workers: fixed consumer pool).
+        self.min_workers: int = min(
+            kwargs.get('min_workers', BACKGROUND_MIN_WORKERS) or max_workers,
+            max_workers
+        )
+        self.scale_interval: float = kwargs.get('scale_interval', 1.0)
+        self.scale_wait: float = kwargs.get('scale_wait', 0.5)
+        self.scale_idle: float = kwargs.get('scale_idle', BACKGROUND_SCALE_IDLE)
+        self._idle: set = set()  # consumers waiting for a task
+        self._idle_since: Optional[float] = None
+        self._scaler: Optional[asyncio.Task] = None
+        self._scaling = None  # scaling decisions counter (see register)
         self.logger.notice(
             f'Started Queue Manager with size: {self.queue_size}'
         )
@@ -88,6 +168,21 @@ class BackgroundQueue:
             max_workers=self.max_workers
         )
 
+    def register(self, registry, name: Optional[str] = None) -> None:
+        """Publish the lane wait times to *registry* (lane depths are
+        scraped by the application collector)."""
+        self.queue.histogram = registry.histogram(
+            "background_queue_wait_seconds",
+            "Time tasks waited in their queue lane.",
+            ("service", "lane"),
+        )
+        self.queue.labels = (name or self.service_name,)
+        self._scaling = registry.counter(
+            "background_queue_scaling_total",
+            "Consumers added (up) and retired (down) by the autoscaler.",
+            ("service", "direction"),
+        )
+
     async def get_resource_metrics(self):
         process = psutil.Process()
         memory_info = process.memory_info()
@@ -100,12 +195,28 @@ class BackgroundQueue:
 
     async def on_cleanup(self, app: web.Application) -> None:
         """Application On cleanup."""
+        if self._scaler is not None:
+            self._scaler.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._scaler
+            self._scaler = None
+        # batches being filled and parked tasks are dropped, like the
+        # queued tasks:
+        for batch in self._batches.values():
+            batch.timer.cancel()
+            self._forget(batch)
+        self._batches.clear()
+        for task in self.limiter.clear():
+            self._forget(task)
+        for enqueue in self._enqueuing:
+            enqueue.cancel()
         # finish the threads:
         with contextlib.suppress(asyncio.TimeoutError):
             await self.queue.put(None)  # Send a termination signal to the queue
             await self.empty_queue()
-        # also, finish the executor:
+        # also, finish the executor and the event-loop threads:
         self.shutdown_executor()
+        await asyncio.to_thread(get_loop_pool().shutdown)
         self.logger.info(
             'Background Queue Processor Stopped.'
         )
@@ -115,27 +226,260 @@ class BackgroundQueue:
         await self.fire_consumers()
         self.logger.info('Background Queue Processor Started.')
 
+    def _fair_key(self, item: Any) -> Any:
+        key = getattr(item, 'fair_key', None)
+        if key is None and self.fair_by:
+            if isinstance(item, TaskWrapper):
+                key = item.job_record.attributes.get(self.fair_by)
+                if key is None:
+                    key = item.kwargs.get(self.fair_by)
+            elif isinstance(item, tuple):
+                key = item[2].get(self.fair_by)
+            elif isinstance(item, partial):
+                key = item.keywords.get(self.fair_by)
+        return key
+
+    def _queue_item(
+        self,
+        fn: Any,
+        args: tuple,
+        kwargs: dict,
+        span,
+        priority: Union[str, int, None] = None,
+        fair_key: Any = None,
+        dedup_key: Any = None
+    ) -> Any:
+        if priority is not None:
+            priority_level(priority)  # raises ValueError on unknown names
+        if isinstance(fn, TaskWrapper) and fn.trace_context is None:
+            # the consumer continues this trace.
+            fn.trace_context = span.context
+        if isinstance(fn, (TaskWrapper, partial)):
+            item = fn
+        elif callable(fn):
+            item = QueuedCall((fn, args, kwargs))
+        else:
+            raise TypeError(f"Cannot enqueue a non-callable task: {fn!r}")
+        if priority is not None:
+            item.priority = priority
+        if fair_key is not None:
+            item.fair_key = fair_key
+        if dedup_key is not None:
+            item.dedup_key = dedup_key
+        return item
+
+    def _is_duplicate(self, item: Any) -> bool:
+        key = getattr(item, 'dedup_key', None)
+        if key is None or key not in self._inflight:
+            return False
+        self.logger.debug(f"Dropped {item!r}: {key!r} is already queued")
+        return True
+
     async def put(
         self,
         fn: Union[partial, Callable[P, Awaitable], Any],
         *args: P.args,
+        _priority: Union[str, int, None] = None,
+        _fair_key: Any = None,
+        _dedup_key: Any = None,
         **kwargs: P.kwargs
-    ) -> None:
+    ) -> bool:
+        """Enqueue *fn* (called with *args*/*kwargs* by a consumer).
+
+        ``_priority``, ``_fair_key`` and ``_dedup_key`` override the lane,
+        fairness key and deduplication key of the task (underscored so they
+        never clash with *fn* arguments).
+
+        Returns False (nothing enqueued) when a task with the same
+        deduplication key is queued or running.
+        """
+        span = start_span(
+            "queue.put", kind="producer", attributes={"queue.size": self.queue.qsize()}
+        )
         try:
-            if isinstance(fn, (TaskWrapper, partial)):
-                await self.queue.put(fn)
-            elif callable(fn):
-                task = (fn, args, kwargs)
-                await self.queue.put(task)
-            else:
-                self.queue.put_nowait(task)
-            await asyncio.sleep(.1)
+            item = self._queue_item(
+                fn, args, kwargs, span, _priority, _fair_key, _dedup_key
+            )
+            if self._is_duplicate(item):
+                return False
+            batch_handler(item)  # raises TypeError on invalid batch tasks
+            # tracked before a (full queue) wait: a concurrent put of the
+            # same key is a duplicate.
+            self._track(item)
+            try:
+                if self.limiter.acquire(item):
+                    await self._enqueue(item)
+            except BaseException:
+                self._forget(item)
+                raise
+            if self.yield_on_put:
+                await asyncio.sleep(0)
             return True
         except asyncio.queues.QueueFull:
             self.logger.error(
                 f"Task Queue is Full, discarding Task {fn!r}"
             )
+            span.status = "error"
             raise
+        finally:
+            span.end()
+
+    async def put_many(self, tasks: list) -> int:
+        """Enqueue a batch of tasks atomically.
+
+        Each element is a :class:`TaskWrapper`, a ``partial``, a callable
+        or a ``(fn, args, kwargs)`` tuple. The batch waits once for room
+        in the queue and is then enqueued as a whole (the tasks of a batch
+        handler are added to its batches, tasks over their keyed limits
+        wait for them).
+        Returns the number of tasks enqueued (duplicates are dropped, see
+        :meth:`put`).
+        """
+        span = start_span(
+            "queue.put_many",
+            kind="producer",
+            attributes={"queue.size": self.queue.qsize(), "batch.size": len(tasks)}
+        )
+        try:
+            items = []
+            batched_items = []
+            parked = []
+            keys = set()
+            for task in tasks:
+                if isinstance(task, tuple):
+                    fn, args, kwargs = task
+                    item = self._queue_item(fn, args, kwargs, span)
+                else:
+                    item = self._queue_item(task, (), {}, span)
+                key = getattr(item, 'dedup_key', None)
+                if self._is_duplicate(item) or (key is not None and key in keys):
+                    continue
+                if key is not None:
+                    keys.add(key)
+                handler = batch_handler(item)
+                if not self.limiter.acquire(item):
+                    parked.append(item)
+                elif handler is not None:
+                    batched_items.append((item, handler))
+                else:
+                    items.append(item)
+            try:
+                count = await self.queue.put_many(items)
+            except BaseException:
+                for item in items + parked + [i for i, _ in batched_items]:
+                    self._forget(item)
+                raise
+            for item in items + parked:
+                self._track(item)
+            for item, handler in batched_items:
+                self._track(item)
+                await self._add_to_batch(item, handler)
+            count += len(batched_items) + len(parked)
+            if self.yield_on_put:
+                await asyncio.sleep(0)
+            return count
+        except BaseException:
+            span.status = "error"
+            raise
+        finally:
+            span.end()
+
+    def _track(self, item: Any) -> None:
+        if isinstance(item, TaskWrapper):
+            self._tasks[item.task_uuid] = item
+        key = getattr(item, 'dedup_key', None)
+        if key is not None:
+            self._inflight[key] = item
+
+    def _forget(self, item: Any) -> None:
+        if isinstance(item, Batch):
+            for task in item.tasks:
+                self._forget(task)
+            return
+        if isinstance(item, TaskWrapper):
+            self._tasks.pop(item.task_uuid, None)
+        key = getattr(item, 'dedup_key', None)
+        if key is not None and self._inflight.get(key) is item:
+            del self._inflight[key]
+        for task in self.limiter.release(item):
+            self._enqueue_soon(task)
+
+    def _untrack(self, item: Any) -> None:
+        future = getattr(item, '_future', None)
+        if isinstance(item, TaskWrapper) and future is not None and not future.done():
+            # a "thread" mode task keeps running after the consumer moved on
+            # (its future completes on an event-loop thread).
+            loop = asyncio.get_running_loop()
+
+            def forget(_) -> None:
+                with contextlib.suppress(RuntimeError):  # loop closed
+                    loop.call_soon_threadsafe(self._forget, item)
+            future.add_done_callback(forget)
+        else:
+            self._forget(item)
+
+    async def _enqueue(self, item: Any) -> None:
+        """Put an admitted task in the queue (or in its batch)."""
+        handler = batch_handler(item)
+        if handler is not None:
+            await self._add_to_batch(item, handler)
+        else:
+            await self.queue.put(item)
+
+    def _enqueue_soon(self, item: Any) -> None:
+        """:meth:`_enqueue` from a callback (it waits for room)."""
+        enqueue = asyncio.create_task(self._enqueue(item))
+        self._enqueuing.add(enqueue)
+        enqueue.add_done_callback(self._enqueuing.discard)
+
+    async def _add_to_batch(self, task: Any, handler: BatchHandler) -> None:
+        """Add *task* to the batch being filled for *handler* (and enqueue
+        the batch once full)."""
+        key = (handler, getattr(task, 'priority', None))
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = Batch(handler, priority=key[1])
+            batch.timer = asyncio.get_running_loop().call_later(
+                handler.max_wait, self._flush_batch, key
+            )
+        batch.tasks.append(task)
+        if len(batch) >= handler.max_size:
+            del self._batches[key]
+            batch.timer.cancel()
+            await self.queue.put(batch)
+
+    def _flush_batch(self, key: tuple) -> None:
+        """``max_wait`` of a batch expired: enqueue it as it is."""
+        batch = self._batches.pop(key, None)
+        if batch is not None:
+            self._enqueue_soon(batch)
+
+    async def cancel(self, task_id: str) -> bool:
+        """Cancel a pending or running TaskWrapper.
+
+        A pending task is reported ``cancelled`` to its tracker right away
+        (and skipped when dequeued); a running one is cancelled in its
+        execution mode and reports itself.
+        Returns False if no such task is pending or running.
+        """
+        task = self._tasks.get(task_id)
+        if task is None:
+            return False
+        started = task.started
+        if not task.cancel():
+            return False
+        self.logger.info(f"Cancelled {task!r} ({task_id})")
+        if not started:
+            # a new task with its dedup key is no longer a duplicate.
+            key = task.dedup_key
+            if key is not None and self._inflight.get(key) is task:
+                del self._inflight[key]
+            if task.tracker:
+                await task.tracker.set_cancelled(task.task_uuid)
+        if self.limiter.parked(task):
+            # never enqueued: its place goes to the next task.
+            self._forget(task)
+        return True
 
     async def task_callback(self, task: Any, **kwargs: P.kwargs):
         self.logger.notice(
@@ -160,7 +504,9 @@ class BackgroundQueue:
     async def empty_queue(self, timeout: float = 5.0):
         """Processing and shutting down the Queue."""
         while not self.queue.empty():
-            self.queue.get_nowait()
+            item = self.queue.get_nowait()
+            self.queue.release(item)
+            self._untrack(item)
             self.queue.task_done()
 
         try:
@@ -186,6 +532,8 @@ class BackgroundQueue:
         (completion happens asynchronously via the thread callback).
         """
         result = None
+        if task.timeout is None and self.task_timeout:
+            task.timeout = self.task_timeout
         try:
             result = await task()
         except asyncio.CancelledError:
@@ -216,22 +564,96 @@ class BackgroundQueue:
                 )
         return result
 
+    async def _execute_batch(self, batch: Batch) -> dict:
+        """Run the tasks of *batch* with a single call of its handler and
+        report every task to its tracker (one update per tracker)."""
+        tasks = [t for t in batch.tasks if not getattr(t, 'cancelled', False)]
+        if not tasks:
+            return {"status": "cancelled"}
+        starting: dict = {}
+        for task in tasks:
+            if isinstance(task, TaskWrapper):
+                task.started = True
+                if task.tracker:
+                    starting.setdefault(task.tracker, []).append(task.task_uuid)
+        for tracker, job_ids in starting.items():
+            try:
+                await tracker.start_jobs(job_ids)
+            except Exception as e:  # pylint: disable=W0703
+                self.logger.error(f"Error setting {batch!r} as running: {e}")
+        try:
+            async with asyncio.timeout(batch.handler.timeout or self.task_timeout):
+                results = await batch.handler.run([batch_item(t) for t in tasks])
+        except Exception as exc:  # pylint: disable=W0703
+            self.logger.error(f"{batch!r} failed: {exc}")
+            results = [exc] * len(tasks)
+        loop = asyncio.get_running_loop()
+        finished: dict = {}
+        retries = []
+        for task, result in zip(tasks, results):
+            failed = isinstance(result, BaseException)
+            if not isinstance(task, TaskWrapper):
+                if failed:
+                    self.logger.error(f"Task {task!r} of {batch!r} failed: {result}")
+                continue
+            if failed and task.retries_done < task.max_retries:
+                task.retries_done += 1
+                self.logger.warning(
+                    f"Retry {task.retries_done}/{task.max_retries} for {task!r} "
+                    f"after error: {result}"
+                )
+                retries.append(task)
+                continue
+            if task._user_callback:
+                await task._wrapped_callback(
+                    None if failed else result,
+                    result if failed else None,
+                    loop=loop
+                )
+            if task.tracker:
+                finished.setdefault(task.tracker, {})[task.task_uuid] = result
+        for tracker, outcomes in finished.items():
+            try:
+                await tracker.finish_jobs(outcomes)
+            except Exception as e:  # pylint: disable=W0703
+                self.logger.error(f"Error updating tracker for {batch!r}: {e}")
+        if retries:
+            # retried tasks stay tracked (process_queue forgets the others).
+            batch.tasks = [t for t in batch.tasks if t not in retries]
+            for task in retries:
+                task.started = False
+                await self._add_to_batch(task, batch.handler)
+        failures = sum(isinstance(r, BaseException) for r in results)
+        return {
+            "status": "done" if not failures else "failed",
+            "tasks": len(tasks),
+            "failed": failures,
+        }
+
     async def _execute_coroutine(self, coro: coroutine):
         """Execute a coroutine."""
         result = None
         if self.coro_in_threads is True:
-            coroutine_in_thread(coro)
+            future = await run_in_loop_thread(coro)
+            if self.task_timeout:
+                # cancelled on its event-loop thread at the deadline.
+                handle = asyncio.get_running_loop().call_later(
+                    self.task_timeout, future.cancel
+                )
+                future.add_done_callback(lambda _: handle.cancel())
             result = {
                 "status": "queued"
             }
         else:
             try:
                 loop = asyncio.get_running_loop()
-                result = await loop.run_in_executor(
-                    self.executor,
-                    asyncio.run,
-                    coro
-                )
+                # the deadline frees the consumer (not the executor thread).
+                async with asyncio.timeout(self.task_timeout):
+                    result = await loop.run_in_executor(
+                        self.executor,
+                        asyncio.run,
+                        coro
+                    )
             except Exception as e:
                 self.logger.exception(
                     f"Error executing coroutine: {e}",
@@ -244,12 +666,12 @@ class BackgroundQueue:
         result = None
         try:
             loop = asyncio.get_running_loop()
-            result = await loop.run_in_executor(
-                self.executor,
-                func,
-                *args,
-                **kwargs
-            )
+            # the deadline frees the consumer (not the executor thread).
+            async with asyncio.timeout(self.task_timeout):
+                result = await loop.run_in_executor(
+                    self.executor,
+                    partial(func, *args, **kwargs)
+                )
         except Exception as e:
             self.logger.exception(
                 f"Error executing callable: {e}",
@@ -263,13 +685,18 @@ class BackgroundQueue:
 
     async def process_queue(self):
         """Process the Queue."""
-        loop = asyncio.get_running_loop()
+        consumer = asyncio.current_task()
         while True:
-            task = await self.queue.get()
+            self._idle.add(consumer)
+            try:
+                task = await self.queue.get()
+            finally:
+                self._idle.discard(consumer)
             task_start_time = int(time.time() * 1000)
             initial_memory = 0
             peak_memory = 0
             if task is None:
+                self.queue.release(task)
                 break  # Exit signal
             try:
                 if self._enable_profiling is True:
@@ -279,13 +706,22 @@ class BackgroundQueue:
             except Exception as e:
                 self.logger.error(f"Error in Resource Tracking: {e}")
 
-            self.logger.info(
-                f":: Task started: {task!r}"
+            self.logger.debug(
+                ":: Task started: %r", task
+            )
+            span = start_span(
+                "queue.process",
+                parent=getattr(task, "trace_context", None),
+                kind="consumer",
+                attributes={"task": getattr(task, "_name", repr(task))},
             )
             result = None
+            requeued = False
             try:
                 if isinstance(task, TaskWrapper):
                     result = await self._execute_taskwrapper(task)
+                elif isinstance(task, Batch):
+                    result = await self._execute_batch(task)
                 elif isinstance(task, partial):
                     result = await self._execute_callable(task)
                 else:
@@ -306,9 +742,10 @@ class BackgroundQueue:
                         )
                         continue
             except Exception as exc:  # Catch all exceptions
-                await self._handle_failure(task, exc)
+                requeued = await self._handle_failure(task, exc)
                 continue
             finally:
+                span.end()
                 if self._enable_profiling is True:
                     # Resource Tracking Finalization
                     memory_info = psutil.Process().memory_info()
@@ -318,39 +755,121 @@ class BackgroundQueue:
                 # Resource Tracking Finalization and Logging
                 task_end_time = int(time.time() * 1000)
                 task_duration = task_end_time - task_start_time
-                try:
-                    self.logger.info(f"""
-                        Task completed: {task!r}
-                        Duration: {task_duration:.2f} seconds
-                        Initial Memory: {initial_memory / (1024 ** 2):.2f}
-                        Peak Memory Usage: {peak_memory / (1024 ** 2):.2f} MB
-                    """)
-                except Exception as e:
-                    print('TASK LOG ERROR > ', e)
+                # lazy %-formatting: nothing is rendered when DEBUG is off.
+                self.logger.debug(
+                    "Task completed: %r Duration: %d ms "
+                    "Initial Memory: %.2f MB Peak Memory Usage: %.2f MB",
+                    task,
+                    task_duration,
+                    initial_memory / (1024 ** 2),
+                    peak_memory / (1024 ** 2),
+                )
                 # Call your task completion callback (if any)
                 try:
-                    print('RESULT > ', result)
                     await self._callback(task, result=result)
                 except Exception as e:
                     self.logger.error(
                         f"Error in Task Callback {self._callback}: {e}"
                     )
                 # Signal task completion for the queue
+                self.queue.release(task)
+                if not requeued:
+                    self._untrack(task)
                 try:
                     self.queue.task_done()
-                except Exception as e:
-                    print(e)
+                except ValueError as e:
+                    self.logger.warning(f"Queue task_done error: {e}")
 
     def shutdown_executor(self):
         self.executor.shutdown(wait=True)
 
     async def fire_consumers(self):
-        """Fire up the Task consumers."""
-        for _ in range(self.max_workers - 1):
+        """Fire up the Task consumers (and the autoscaler)."""
+        self._add_consumers(self.min_workers)
+        if self.min_workers < self.max_workers and self._scaler is None:
+            self._scaler = asyncio.create_task(self._autoscale())
+
+    @property
+    def busy(self) -> int:
+        """Consumers running a task."""
+        return len(self.consumers) - len(self._idle)
+
+    def _add_consumers(self, count: int) -> None:
+        for _ in range(count):
             task = asyncio.create_task(
                 self.process_queue()
             )
             self.consumers.append(task)
+        # consumers are shared by the fairness keys:
+        self.queue.slots = len(self.consumers)
+
+    def _retire_consumer(self) -> bool:
+        """Stop one idle consumer (it is waiting, so no task is lost)."""
+        for consumer in self._idle:
+            if consumer in self.consumers:
+                break
+        else:
+            return False
+        self._idle.discard(consumer)
+        self.consumers.remove(consumer)
+        consumer.cancel()
+        self.queue.slots = len(self.consumers)
+        return True
+
+    def _record_scaling(self, direction: str, count: int) -> None:
+        self.logger.debug(
+            f"Autoscaler: {direction} {count}, "
+            f"{len(self.consumers)} consumers"
+        )
+        if self._scaling is not None:
+            self._scaling.inc((self.queue.labels[0], direction), count)
+
+    def scale(self, now: Optional[float] = None) -> int:
+        """One autoscaling decision.
+
+        Returns the change in the number of consumers.
+        """
+        now = time.monotonic() if now is None else now
+        self.consumers = [c for c in self.consumers if not c.done()]
+        current = len(self.consumers)
+        depth = self.queue.qsize()
+        idle = len(self._idle)
+        if depth > idle and (
+            depth > current or self.queue.oldest_wait() >= self.scale_wait
+        ):
+            self._idle_since = None
+            count = min(self.max_workers - current, depth - idle)
+            if count > 0:
+                self._add_consumers(count)
+                self._record_scaling("up", count)
+                return count
+        elif current < self.min_workers:
+            # a consumer ended on its own: back to the floor.
+            count = self.min_workers - current
+            self._add_consumers(count)
+            self._record_scaling("up", count)
+            return count
+        elif depth == 0 and idle:
+            if self._idle_since is None:
+                self._idle_since = now
+            elif (
+                now - self._idle_since >= self.scale_idle
+                and current > self.min_workers
+                and self._retire_consumer()
+            ):
+                self._record_scaling("down", 1)
+                return -1
+        else:
+            self._idle_since = None
+        return 0
+
+    async def _autoscale(self) -> None:
+        while True:
+            await asyncio.sleep(self.scale_interval)
+            try:
+                self.scale()
+            except Exception as e:  # pylint: disable=W0703
+                self.logger.error(f"Autoscaler error: {e}")
 
     async def _requeue(self, task: TaskWrapper, exc: Exception) -> None:
         """Internal: re-enqueues `task` after updating retry-counters."""
@@ -374,18 +893,22 @@ class BackgroundQueue:
         self,
         task: Any,
         exc: Exception
-    ) -> None:
-        """Central place that decides whether we retry or finally give up."""
+    ) -> bool:
+        """Central place that decides whether we retry or finally give up.
+
+        Returns True when the task was enqueued again.
+        """
         if (
             isinstance(task, TaskWrapper) and task.retries_done < task.max_retries
         ):
             await self._requeue(task, exc)
-        else:
-            self.logger.error(
-                f"Task {task!r} failed permanently after "
-                f"{getattr(task, 'retries_done', 0)} attempt(s)."
-            )
-            await self._callback(task, result=dict(status="failed", error=exc))
+            return True
+        self.logger.error(
+            f"Task {task!r} failed permanently after "
+            f"{getattr(task, 'retries_done', 0)} attempt(s)."
+        )
+        await self._callback(task, result=dict(status="failed", error=exc))
+        return False
 
 
 class BackgroundTask:
@@ -422,7 +945,7 @@ class BackgroundTask:
         elif asyncio.iscoroutinefunction(self.fn):
             coro = self.fn(*self.args, **self.kwargs)
             if self.in_thread is True:
-                coroutine_in_thread(coro)
+                await run_in_loop_thread(coro)
             else:
                 await coro
         elif callable(self.fn):
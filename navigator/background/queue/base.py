@@ -0,0 +1,56 @@
+"""Task queue backing :class:`BackgroundQueue`."""
+from typing import Any, Iterable
+import asyncio
+import contextlib
+
+
+class TaskQueue(asyncio.Queue):
+    """TaskQueue.
+
+    :class:`asyncio.Queue` with an all-or-nothing batch ``put_many``.
+    """
+
+    def _has_room(self, count: int) -> bool:
+        if self.maxsize <= 0:
+            return True
+        # a batch larger than the queue is accepted once the queue drained.
+        return self.qsize() + count <= self.maxsize or self.qsize() == 0
+
+    async def put_many(self, items: Iterable[Any]) -> int:
+        """Put every item in *items* with a single backpressure wait.
+
+        Either the whole batch is enqueued (no consumer sees it partially
+        applied) or, if the wait is cancelled, none of it.
+        Returns the number of items enqueued.
+        """
+        items = list(items)
+        if not items:
+            return 0
+        first = True
+        while not self._has_room(len(items)):
+            putter = self._get_loop().create_future()
+            # keep our place in line while waiting for more free slots.
+            if first:
+                self._putters.append(putter)
+                first = False
+            else:
+                self._putters.appendleft(putter)
+            try:
+                await putter
+            except:  # noqa: E722 (mirrors asyncio.Queue.put)
+                putter.cancel()
+                with contextlib.suppress(ValueError):
+                    self._putters.remove(putter)
+                if not self.full() and not putter.cancelled():
+                    self._wakeup_next(self._putters)
+                raise
+        for item in items:
+            self._put(item)
+            self._unfinished_tasks += 1
+        self._finished.clear()
+        for _ in items:
+            self._wakeup_next(self._getters)
+        # pass on a free slot we were woken for but did not use up.
+        if not self.full():
+            self._wakeup_next(self._putters)
+        return len(items)
@@ -0,0 +1,148 @@
+"""Micro-batching of small, homogeneous tasks.
+
+A batch handler (see :func:`batched`) takes a list of items and returns
+their results, in order. A task calling it with a single item
+(``service.submit(send_notification, message)``) is not run on its own:
+:class:`~navigator.background.queue.BackgroundQueue` accumulates the
+tasks of a handler up to ``max_size`` items, or for ``max_wait`` seconds
+after the first one, and one consumer calls the handler once for the
+whole batch. The job records of a batch are updated together: one
+tracker round-trip to start them and one to finish them.
+
+The handler returns one result per item; an exception instance in place
+of a result fails that item only (returning None: every item is done,
+without result). If the handler raises, every item of the batch fails.
+Failed items with retries left are batched again.
+
+Only ``same_loop`` TaskWrappers are batched; a task with another
+execution mode (or called directly) runs the handler for its own item.
+The tasks of a batch share the handler ``timeout`` (their own
+``timeout`` and ``jitter`` do not apply).
+"""
+from typing import Any, Callable, Optional, Union
+import asyncio
+import functools
+from ...conf import BACKGROUND_BATCH_SIZE, BACKGROUND_BATCH_WAIT
+from ..wrappers import TaskWrapper
+
+
+class BatchHandler:
+    """BatchHandler.
+
+    Args:
+        fn: coroutine function (or function, run in a thread) called with
+            a list of items.
+        key: name of the batches (default: the function name).
+        max_size: items per batch.
+        max_wait: seconds the first item waits for the batch to fill.
+        timeout: deadline of a batch (default: the queue ``task_timeout``).
+    """
+    def __init__(
+        self,
+        fn: Callable,
+        key: Optional[str] = None,
+        max_size: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        timeout: Optional[float] = None
+    ) -> None:
+        functools.update_wrapper(self, fn)
+        self.fn = fn
+        self.key: str = key or fn.__name__
+        self.max_size: int = max_size or BACKGROUND_BATCH_SIZE
+        self.max_wait: float = (
+            BACKGROUND_BATCH_WAIT if max_wait is None else max_wait
+        )
+        self.timeout = timeout
+
+    def __repr__(self) -> str:
+        return f"<BatchHandler {self.key}>"
+
+    async def run(self, items: list) -> list:
+        """Call the handler: one result (or exception) per item."""
+        if asyncio.iscoroutinefunction(self.fn):
+            results = await self.fn(items)
+        else:
+            results = await asyncio.to_thread(self.fn, items)
+        if results is None:
+            return [None] * len(items)
+        results = list(results)
+        if len(results) != len(items):
+            raise ValueError(
+                f"{self!r} returned {len(results)} results "
+                f"for {len(items)} items"
+            )
+        return results
+
+    async def __call__(self, item: Any) -> Any:
+        """A batch of one item."""
+        result = (await self.run([item]))[0]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+
+def batched(
+    key: Union[str, Callable, None] = None,
+    max_size: Optional[int] = None,
+    max_wait: Optional[float] = None,
+    timeout: Optional[float] = None
+) -> Any:
+    """Decorator making a function a :class:`BatchHandler`.
+
+    Usage::
+
+        @batched(max_size=500, max_wait=0.02)
+        async def send_notifications(messages: list) -> list:
+            ...
+
+        await service.submit(send_notifications, message)
+    """
+    if callable(key):  # bare @batched
+        return BatchHandler(key)
+
+    def decorator(fn: Callable) -> BatchHandler:
+        return BatchHandler(fn, key, max_size, max_wait, timeout)
+    return decorator
+
+
+class Batch:
+    """Queue item: tasks of a handler run by a single handler call."""
+    __slots__ = ("handler", "tasks", "priority", "fair_key", "timer")
+
+    def __init__(self, handler: BatchHandler, priority: Any = None) -> None:
+        self.handler = handler
+        self.tasks: list = []
+        self.priority = priority
+        self.fair_key = None
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __repr__(self) -> str:
+        return f"<Batch {self.handler.key} ({len(self.tasks)} tasks)>"
+
+
+def batch_handler(item: Any) -> Optional[BatchHandler]:
+    """The BatchHandler a queue item is batched by (None: run on its own).
+
+    Raises TypeError when the task does not call it with a single item.
+    """
+    if isinstance(item, TaskWrapper):
+        if not isinstance(item.fn, BatchHandler) or item.execution_mode != "same_loop":
+            return None
+        handler, args, kwargs = item.fn, item.args, item.kwargs
+    elif isinstance(item, tuple) and isinstance(item[0], BatchHandler):
+        handler, args, kwargs = item
+    else:
+        return None
+    if len(args) != 1 or kwargs:
+        raise TypeError(f"{handler!r} tasks take a single item argument")
+    return handler
+
+
+def batch_item(task: Any) -> Any:
+    """The item of a batched task."""
+    if isinstance(task, TaskWrapper):
+        return task.args[0]
+    return task[1][0]
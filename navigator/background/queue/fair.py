@@ -0,0 +1,194 @@
+"""Priority lanes with weighted fair queuing.
+
+Items are served lane by lane (``critical`` before ``high`` before
+``normal`` before ``low``). Within a lane every fairness key (a tenant, a
+user...) has its own FIFO flow and flows are interleaved by self-clocked
+fair queuing: an item is tagged with its flow's previous tag (or the
+lane's virtual time, whichever is later) plus ``1 / weight`` and the
+smallest tag is served first, so a key with weight 2 gets twice the turns
+of a key with weight 1 however many items each one queued.
+
+A key may also not hold more than its weighted share of the consumers
+while other keys have work waiting; when every waiting key is over its
+share the consumer takes the next item anyway (the queue never idles).
+
+With a single priority and no keys this is a plain FIFO queue.
+"""
+from typing import Any, Callable, Optional
+from collections import deque
+import bisect
+import heapq
+import itertools
+import time
+from ..priority import priority_level, lane_name
+from .base import TaskQueue
+
+
+def fair_key(item: Any) -> Any:
+    """Default fairness key: the ``fair_key`` attribute of the item."""
+    return getattr(item, "fair_key", None)
+
+
+class _Lane:
+    __slots__ = ("level", "name", "flows", "heap", "vtime", "depth")
+
+    def __init__(self, level: int) -> None:
+        self.level = level
+        self.name = lane_name(level)
+        self.flows: dict = {}  # key -> deque of (tag, enqueued at, item)
+        self.heap: list = []  # (head tag, seq, key) of every non-empty flow
+        self.vtime: float = 0.0
+        self.depth: int = 0
+
+
+class FairQueue(TaskQueue):
+    """FairQueue.
+
+    Args:
+        maxsize: items waiting across every lane (0: unbounded).
+        key: returns the fairness key of an item (default: ``fair_key``).
+        weights: ``{key: weight}``, keys not listed weigh 1.
+        slots: consumers sharing the queue (0: no consumer share limit).
+    """
+    def __init__(
+        self,
+        maxsize: int = 0,
+        key: Optional[Callable[[Any], Any]] = None,
+        weights: Optional[dict] = None,
+        slots: int = 0
+    ) -> None:
+        self.key = key or fair_key
+        self.weights: dict = dict(weights or {})
+        self.slots = slots
+        # wait-time histogram, labelled ``labels + (lane,)``.
+        self.histogram = None
+        self.labels: tuple = ()
+        super().__init__(maxsize)
+
+    def _init(self, maxsize: int) -> None:
+        self._lanes: dict = {}
+        self._levels: list = []
+        self._size = 0
+        self._seq = itertools.count()
+        self._waiting: dict = {}  # key -> queued items (every lane)
+        self._running: dict = {}  # key -> items handed to consumers
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def weight(self, key: Any) -> float:
+        return float(self.weights.get(key, 1.0))
+
+    def _put(self, item: Any) -> None:
+        level = priority_level(getattr(item, "priority", None))
+        lane = self._lanes.get(level)
+        if lane is None:
+            lane = self._lanes[level] = _Lane(level)
+            bisect.insort(self._levels, level)
+        key = self.key(item)
+        flow = lane.flows.get(key)
+        if flow is None:
+            flow = lane.flows[key] = deque()
+        start = max(lane.vtime, flow[-1][0]) if flow else lane.vtime
+        tag = start + 1.0 / self.weight(key)
+        if not flow:
+            heapq.heappush(lane.heap, (tag, next(self._seq), key))
+        flow.append((tag, time.monotonic(), item))
+        lane.depth += 1
+        self._size += 1
+        self._waiting[key] = self._waiting.get(key, 0) + 1
+
+    def _share(self, key: Any, total: float) -> float:
+        return max(1.0, self.slots * self.weight(key) / total)
+
+    def _select(self) -> tuple:
+        """Pick the lane and flow to serve next."""
+        total = None
+        fallback = None
+        for level in self._levels:
+            lane = self._lanes[level]
+            if not lane.heap:
+                continue
+            if not self.slots:
+                return lane, heapq.heappop(lane.heap)[2]
+            if total is None:
+                active = self._waiting.keys() | self._running.keys()
+                total = sum(self.weight(k) for k in active)
+            skipped = []
+            found = None
+            while lane.heap:
+                entry = heapq.heappop(lane.heap)
+                key = entry[2]
+                if self._running.get(key, 0) < self._share(key, total):
+                    found = entry
+                    break
+                skipped.append(entry)
+            for entry in skipped:
+                heapq.heappush(lane.heap, entry)
+            if found is not None:
+                return lane, found[2]
+            if fallback is None:
+                fallback = lane
+        # every waiting key is over its share: keep the consumer busy.
+        return fallback, heapq.heappop(fallback.heap)[2]
+
+    def _get(self) -> Any:
+        lane, key = self._select()
+        flow = lane.flows[key]
+        tag, enqueued, item = flow.popleft()
+        lane.vtime = max(lane.vtime, tag)
+        if flow:
+            heapq.heappush(lane.heap, (flow[0][0], next(self._seq), key))
+        else:
+            del lane.flows[key]
+        lane.depth -= 1
+        self._size -= 1
+        waiting = self._waiting[key] - 1
+        if waiting:
+            self._waiting[key] = waiting
+        else:
+            del self._waiting[key]
+        self._running[key] = self._running.get(key, 0) + 1
+        if self.histogram is not None:
+            self.histogram.observe(
+                time.monotonic() - enqueued, self.labels + (lane.name,)
+            )
+        return item
+
+    def release(self, item: Any) -> None:
+        """A consumer finished with *item* (frees its key's share)."""
+        key = self.key(item)
+        running = self._running.get(key, 0) - 1
+        if running > 0:
+            self._running[key] = running
+        else:
+            self._running.pop(key, None)
+
+    def lanes(self) -> dict:
+        """``{lane: {"depth": items waiting, "keys": flows waiting}}``."""
+        return {
+            self._lanes[level].name: {
+                "depth": self._lanes[level].depth,
+                "keys": len(self._lanes[level].flows),
+            }
+            for level in self._levels
+        }
+
+    def oldest_wait(self) -> float:
+        """Seconds the oldest waiting item has been queued (0 if empty)."""
+        oldest = min(
+            (
+                flow[0][1]
+                for lane in self._lanes.values()
+                for flow in lane.flows.values()
+            ),
+            default=None
+        )
+        return 0.0 if oldest is None else time.monotonic() - oldest
+
+    def running(self) -> dict:
+        """``{key: items being processed}``."""
+        return dict(self._running)
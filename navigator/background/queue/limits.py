@@ -0,0 +1,129 @@
+"""Keyed concurrency limits and ordered partitions.
+
+A TaskWrapper with a ``partition_key`` (one employee, one document...)
+runs after the earlier tasks of that key ended: tasks of a partition run
+one at a time, in FIFO order, while different partitions run in parallel.
+A ``concurrency_key`` caps the tasks of a group (the calls to one fragile
+service) running at once to ``max_concurrency``.
+
+A task over a limit is parked by the limiter, not by a consumer: it is
+enqueued when a slot of its keys frees, so consumers keep running the
+other tasks and no task waits on a lock. Keys are taken in order
+(partition, then group), a task parked on the group keeping its
+partition slot, so the partition order holds and no two tasks wait on
+each other.
+"""
+from typing import Any
+from collections import deque
+
+
+def task_limits(task: Any) -> list:
+    """``[(key, limit)]`` of a task, in the order they are taken."""
+    limits = []
+    partition = getattr(task, "partition_key", None)
+    if partition is not None:
+        limits.append((("partition", partition), 1))
+    group = getattr(task, "concurrency_key", None)
+    if group is not None:
+        limit = max(getattr(task, "max_concurrency", 1), 1)
+        limits.append((("group", group), limit))
+    return limits
+
+
+class KeyedLimiter:
+    """Counts the running tasks of every key and parks the tasks over
+    their limit (see the module documentation)."""
+    def __init__(self) -> None:
+        self._running: dict = {}  # key -> tasks holding a slot
+        self._waiting: dict = {}  # key -> deque of parked tasks
+        self._held: dict = {}  # task -> keys (slots) it holds
+        self._limits: dict = {}  # task -> [(key, limit)]
+
+    def __len__(self) -> int:
+        """Tasks parked."""
+        return sum(len(waiting) for waiting in self._waiting.values())
+
+    def running(self) -> dict:
+        """``{key: tasks holding a slot}``."""
+        return dict(self._running)
+
+    def acquire(self, task: Any) -> bool:
+        """Take the slots of *task*.
+
+        Returns True when the task may be enqueued now; otherwise it is
+        parked, and returned by :meth:`release` once it may.
+        """
+        limits = task_limits(task)
+        if not limits:
+            return True
+        self._limits[task] = limits
+        self._held[task] = []
+        return self._advance(task)
+
+    def _advance(self, task: Any) -> bool:
+        held = self._held[task]
+        for key, limit in self._limits[task][len(held):]:
+            # behind the tasks already waiting for that key (FIFO).
+            if self._running.get(key, 0) >= limit or self._waiting.get(key):
+                self._waiting.setdefault(key, deque()).append(task)
+                return False
+            self._running[key] = self._running.get(key, 0) + 1
+            held.append(key)
+        return True
+
+    def parked(self, task: Any) -> bool:
+        held = self._held.get(task) if task_limits(task) else None
+        return held is not None and len(held) < len(self._limits[task])
+
+    def release(self, task: Any) -> list:
+        """*task* ended (or was dropped): free its slots.
+
+        Returns the parked tasks that may be enqueued now, in order.
+        """
+        if not task_limits(task):
+            return []
+        held = self._held.pop(task, None)
+        limits = self._limits.pop(task, None)
+        if held is None:
+            return []
+        if len(held) < len(limits):
+            # parked: leave its place in line.
+            key = limits[len(held)][0]
+            waiting = self._waiting[key]
+            waiting.remove(task)
+            if not waiting:
+                del self._waiting[key]
+        ready = []
+        for key in held:
+            running = self._running[key] - 1
+            if running:
+                self._running[key] = running
+            else:
+                del self._running[key]
+            self._wake(key, ready)
+        return ready
+
+    def _wake(self, key: tuple, ready: list) -> None:
+        waiting = self._waiting.get(key)
+        limit = dict(self._limits[waiting[0]])[key] if waiting else 0
+        while waiting and self._running.get(key, 0) < limit:
+            task = waiting.popleft()
+            if not waiting:
+                del self._waiting[key]
+            # the slot of *key* goes to the head of the line.
+            self._running[key] = self._running.get(key, 0) + 1
+            self._held[task].append(key)
+            if self._advance(task):
+                ready.append(task)
+            waiting = self._waiting.get(key)
+            if waiting:
+                limit = dict(self._limits[waiting[0]])[key]
+
+    def clear(self) -> list:
+        """Forget every task (shutdown); returns the parked ones."""
+        parked = [task for waiting in self._waiting.values() for task in waiting]
+        self._running.clear()
+        self._waiting.clear()
+        self._held.clear()
+        self._limits.clear()
+        return parked
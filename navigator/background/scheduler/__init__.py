@@ -0,0 +1,350 @@
+"""Delayed and recurring background tasks.
+
+:class:`Scheduler` keeps the next run of every schedule in a heap ordered
+by fire time and a single asyncio task sleeps until the earliest one is
+due, so a pending timer costs one heap entry however many there are. Due
+runs are submitted to the :class:`BackgroundService` (job record and
+``BackgroundQueue``): nothing holds a consumer before it is due.
+
+Runs found late by more than ``misfire_grace`` seconds (a blocked loop,
+an application restart...) follow the ``misfire`` policy of their
+schedule: ``"fire_once"`` runs once for all the missed times,
+``"fire_all"`` runs once per missed time and ``"skip"`` waits for the
+next time.
+
+Schedules are saved in the job tracker. With a
+:class:`~navigator.background.tracker.RedisJobTracker` they survive a
+restart (if the task is an importable function called with
+JSON-serializable arguments), and a run is fired by a single worker among
+those sharing the Redis (give the schedules the same ``schedule_id`` on
+every worker).
+"""
+from typing import Any, Optional, Union
+from datetime import datetime
+from importlib import import_module
+import asyncio
+import contextlib
+import heapq
+import itertools
+import random
+import time
+import uuid
+from navconfig.logging import logging
+from ..wrappers import TaskWrapper
+from .cron import CronSchedule
+
+
+MISFIRE_POLICIES = ("fire_once", "fire_all", "skip")
+
+# the timer wakes up at least that often (wall clock changes).
+_MAX_SLEEP = 60.0
+# at most that many missed runs are fired with "fire_all".
+_MAX_CATCHUP = 100
+
+
+def function_path(fn: Any) -> Optional[str]:
+    """``module:qualname`` of an importable function (None otherwise)."""
+    module = getattr(fn, "__module__", None)
+    qualname = getattr(fn, "__qualname__", None)
+    if not module or not qualname or "<" in qualname or module == "__main__":
+        return None
+    return f"{module}:{qualname}"
+
+
+def resolve_function(path: str) -> Any:
+    module, _, qualname = path.partition(":")
+    obj = import_module(module)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+class Schedule:
+    """A scheduled task: a one-off run (``cron`` is None) or a recurring one."""
+    __slots__ = (
+        "schedule_id", "task", "cron", "next_run", "fire_at",
+        "misfire", "jitter", "spec", "runs", "active",
+    )
+
+    def __init__(
+        self,
+        schedule_id: str,
+        task: TaskWrapper,
+        next_run: float,
+        cron: Optional[CronSchedule] = None,
+        misfire: str = "fire_once",
+        jitter: float = 0.0,
+        spec: Optional[dict] = None
+    ) -> None:
+        self.schedule_id = schedule_id
+        self.task = task
+        self.cron = cron
+        self.next_run = next_run
+        self.fire_at = next_run
+        self.misfire = misfire
+        self.jitter = jitter
+        # how to build the task again after a restart (see Scheduler.restore).
+        self.spec = spec
+        self.runs: int = 0
+        self.active: bool = True
+
+    def __repr__(self) -> str:
+        return f"<Schedule {self.schedule_id} {self.task!r}>"
+
+    def info(self) -> dict:
+        return {
+            "schedule_id": self.schedule_id,
+            "name": self.task._name,
+            "cron": self.cron.expression if self.cron else None,
+            "next_run": datetime.fromtimestamp(self.next_run),
+            "misfire": self.misfire,
+            "runs": self.runs,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "spec": self.spec,
+            "cron": self.cron.expression if self.cron else None,
+            "next_run": self.next_run,
+            "misfire": self.misfire,
+            "jitter": self.jitter,
+        }
+
+
+class Scheduler:
+    """Scheduler.
+
+    Args:
+        service: the BackgroundService due tasks are submitted to.
+        misfire_grace: seconds a run may be late before it is "missed".
+        timezone: timezone of the cron expressions (UTC).
+    """
+    def __init__(
+        self,
+        service: Any,
+        misfire_grace: float = 60.0,
+        timezone: Optional[str] = None
+    ) -> None:
+        self.service = service
+        self.misfire_grace = misfire_grace
+        self.timezone = timezone
+        self._schedules: dict = {}
+        self._heap: list = []  # (fire at, seq, schedule)
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self.logger = logging.getLogger("NAV.Queue.Scheduler")
+
+    @property
+    def tracker(self):
+        return self.service.tracker
+
+    def __len__(self) -> int:
+        return len(self._schedules)
+
+    # -----------------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------------
+    async def start(self) -> None:
+        """Restore the saved schedules and start the timer."""
+        await self.restore()
+        if self._runner is None:
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._runner
+            self._runner = None
+
+    async def restore(self) -> int:
+        """Load the schedules saved in the tracker (by an earlier run)."""
+        restored = 0
+        for schedule_id, data in (await self.tracker.load_schedules()).items():
+            if schedule_id in self._schedules:
+                continue
+            spec = data.get("spec") or {}
+            try:
+                fn = resolve_function(spec["fn"])
+                task = self.service._wrap(
+                    fn, *spec.get("args", ()), **dict(spec.get("kwargs") or {})
+                )
+            except Exception as exc:  # pylint: disable=W0703
+                self.logger.error(
+                    f"Cannot restore schedule {schedule_id}: {exc}"
+                )
+                continue
+            task.jitter = 0.0
+            cron = data.get("cron")
+            self._push(
+                Schedule(
+                    schedule_id,
+                    task,
+                    next_run=data["next_run"],
+                    cron=CronSchedule(cron, self.timezone) if cron else None,
+                    misfire=data.get("misfire", "fire_once"),
+                    jitter=data.get("jitter", 0.0),
+                    spec=spec,
+                )
+            )
+            restored += 1
+        if restored:
+            self.logger.info(f"Restored {restored} schedule(s)")
+        return restored
+
+    # -----------------------------------------------------------
+    # Schedules
+    # -----------------------------------------------------------
+    async def add(
+        self,
+        task: TaskWrapper,
+        at: Union[datetime, float, None] = None,
+        delay: Optional[float] = None,
+        cron: Optional[str] = None,
+        schedule_id: Optional[str] = None,
+        misfire: str = "fire_once",
+        jitter: float = 0.0,
+        spec: Optional[dict] = None
+    ) -> str:
+        """Schedule *task* ``at`` a time, after ``delay`` seconds or on a
+        ``cron`` expression (exactly one of them).
+
+        Returns the schedule id (an existing schedule with that id is
+        replaced).
+        """
+        if sum(x is not None for x in (at, delay, cron)) != 1:
+            raise ValueError("Exactly one of at, delay or cron is required")
+        if misfire not in MISFIRE_POLICIES:
+            raise ValueError(
+                f"Invalid misfire policy '{misfire}'. "
+                f"Must be one of: {MISFIRE_POLICIES!r}."
+            )
+        expression = None
+        if cron is not None:
+            expression = CronSchedule(cron, self.timezone)
+            next_run = expression.next_after(time.time())
+        elif delay is not None:
+            next_run = time.time() + delay
+        elif isinstance(at, datetime):
+            next_run = at.timestamp()
+        else:
+            next_run = float(at)
+        schedule_id = schedule_id or uuid.uuid4().hex
+        self._discard(schedule_id)
+        # the timer applies the jitter: no consumer sleeps through it.
+        task.jitter = 0.0
+        schedule = Schedule(
+            schedule_id,
+            task,
+            next_run=next_run,
+            cron=expression,
+            misfire=misfire,
+            jitter=jitter,
+            spec=spec,
+        )
+        self._push(schedule)
+        await self._save(schedule)
+        return schedule_id
+
+    async def remove(self, schedule_id: str) -> bool:
+        found = self._discard(schedule_id)
+        await self.tracker.delete_schedule(schedule_id)
+        return found
+
+    def get(self, schedule_id: str) -> Optional[Schedule]:
+        return self._schedules.get(schedule_id)
+
+    def list_schedules(self) -> list:
+        return [s.info() for s in self._schedules.values()]
+
+    def _discard(self, schedule_id: str) -> bool:
+        schedule = self._schedules.pop(schedule_id, None)
+        if schedule is None:
+            return False
+        # its heap entry is dropped when it comes up.
+        schedule.active = False
+        return True
+
+    def _push(self, schedule: Schedule) -> None:
+        schedule.fire_at = schedule.next_run + (
+            random.uniform(0, schedule.jitter) if schedule.jitter > 0 else 0.0
+        )
+        self._schedules[schedule.schedule_id] = schedule
+        heapq.heappush(self._heap, (schedule.fire_at, next(self._seq), schedule))
+        if self._heap[0][2] is schedule:
+            self._wakeup.set()  # earlier than what the timer waits for
+
+    async def _save(self, schedule: Schedule) -> None:
+        if not schedule.spec or not schedule.spec.get("fn"):
+            return
+        try:
+            await self.tracker.save_schedule(
+                schedule.schedule_id, schedule.to_dict()
+            )
+        except Exception as exc:  # pylint: disable=W0703
+            self.logger.warning(
+                f"Schedule {schedule.schedule_id} is not saved: {exc}"
+            )
+
+    # -----------------------------------------------------------
+    # Timer
+    # -----------------------------------------------------------
+    async def _run(self) -> None:
+        while True:
+            now = time.time()
+            while self._heap and self._heap[0][0] <= now:
+                fire_at, _, schedule = heapq.heappop(self._heap)
+                if not schedule.active or fire_at != schedule.fire_at:
+                    continue  # removed or rescheduled
+                try:
+                    await self._fire(schedule, now)
+                except Exception as exc:  # pylint: disable=W0703
+                    self.logger.exception(
+                        f"Error firing {schedule!r}: {exc}"
+                    )
+            delay = _MAX_SLEEP
+            if self._heap:
+                delay = min(max(self._heap[0][0] - now, 0), _MAX_SLEEP)
+            self._wakeup.clear()
+            # not wait_for(): it may swallow a cancellation racing the event.
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(delay):
+                    await self._wakeup.wait()
+
+    def _due_runs(self, schedule: Schedule, now: float) -> list:
+        """Run times to fire now, following the misfire policy."""
+        runs = [schedule.next_run]
+        if schedule.cron is not None:
+            following = schedule.cron.next_after(schedule.next_run)
+            while following <= now and len(runs) < _MAX_CATCHUP:
+                runs.append(following)
+                following = schedule.cron.next_after(following)
+            if following <= now:
+                following = schedule.cron.next_after(now)
+            schedule.next_run = following
+        if now - schedule.fire_at > self.misfire_grace:
+            self.logger.warning(
+                f"{schedule!r} missed {len(runs)} run(s), "
+                f"misfire policy: {schedule.misfire}"
+            )
+            if schedule.misfire == "skip":
+                return []
+            if schedule.misfire == "fire_once":
+                return runs[-1:]
+        return runs
+
+    async def _fire(self, schedule: Schedule, now: float) -> None:
+        runs = self._due_runs(schedule, now)
+        if schedule.cron is None:
+            self._discard(schedule.schedule_id)
+            await self.tracker.delete_schedule(schedule.schedule_id)
+        for run_at in runs:
+            if not await self.tracker.claim_schedule(schedule.schedule_id, run_at):
+                continue  # fired by another worker
+            task = schedule.task if schedule.cron is None else schedule.task.clone()
+            schedule.runs += 1
+            await self.service.submit(task)
+        if schedule.cron is not None and schedule.active:
+            self._push(schedule)
+            await self._save(schedule)
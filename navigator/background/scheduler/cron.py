@@ -0,0 +1,153 @@
+"""Cron expressions.
+
+Five fields, ``minute hour day-of-month month day-of-week``, each one a
+``*``, a value, a ``a-b`` range or a comma separated list of them, with
+an optional ``/step``. Months and week days also take their English
+abbreviations (``jan``, ``mon``...), Sunday is 0 (or 7). The ``@yearly``,
+``@monthly``, ``@weekly``, ``@daily`` and ``@hourly`` shortcuts are
+accepted too.
+
+As in cron, when both the day of month and the day of week are
+restricted a day matching either one of them fires.
+"""
+from typing import Optional, Union
+from datetime import datetime, timedelta, timezone, tzinfo
+from zoneinfo import ZoneInfo
+
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+MONTHS = {
+    name: number for number, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun",
+         "jul", "aug", "sep", "oct", "nov", "dec"),
+        start=1
+    )
+}
+WEEKDAYS = {
+    name: number for number, name in enumerate(
+        ("sun", "mon", "tue", "wed", "thu", "fri", "sat")
+    )
+}
+
+# no match within that many years: the expression never fires (30 feb).
+_HORIZON = 5
+
+
+def _parse_field(
+    expression: str,
+    low: int,
+    high: int,
+    names: Optional[dict] = None
+) -> frozenset:
+    def value(text: str) -> int:
+        text = text.strip().lower()
+        if names and text in names:
+            return names[text]
+        return int(text)
+
+    values = set()
+    for part in expression.split(","):
+        step = 1
+        stepped = "/" in part
+        if stepped:
+            part, _, step = part.partition("/")
+            step = int(step)
+            if step < 1:
+                raise ValueError(f"Invalid cron step in {expression!r}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            first, _, last = part.partition("-")
+            start, end = value(first), value(last)
+        else:
+            start = value(part)
+            # "5/15": from 5 to the end of the range, every 15.
+            end = high if stepped else start
+        if not low <= start <= end <= high:
+            raise ValueError(
+                f"Cron field {expression!r} out of range {low}-{high}"
+            )
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """CronSchedule.
+
+    Args:
+        expression: the cron expression.
+        tz: timezone (name or tzinfo) the expression is read in (UTC).
+    """
+    def __init__(
+        self,
+        expression: str,
+        tz: Union[str, tzinfo, None] = None
+    ) -> None:
+        self.expression = expression
+        fields = MACROS.get(expression.strip().lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(
+                f"Invalid cron expression {expression!r}: five fields expected"
+            )
+        try:
+            self.minutes = _parse_field(fields[0], 0, 59)
+            self.hours = _parse_field(fields[1], 0, 23)
+            self.days = _parse_field(fields[2], 1, 31)
+            self.months = _parse_field(fields[3], 1, 12, MONTHS)
+            self.weekdays = frozenset(
+                day % 7 for day in _parse_field(fields[4], 0, 7, WEEKDAYS)
+            )
+        except ValueError as exc:
+            raise ValueError(
+                f"Invalid cron expression {expression!r}: {exc}"
+            ) from exc
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+        if isinstance(tz, str):
+            tz = ZoneInfo(tz)
+        self.tz: tzinfo = tz or timezone.utc
+
+    def __repr__(self) -> str:
+        return f"<CronSchedule {self.expression!r}>"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        if self._any_day or self._any_weekday:
+            return (
+                moment.day in self.days
+                and moment.isoweekday() % 7 in self.weekdays
+            )
+        return (
+            moment.day in self.days
+            or moment.isoweekday() % 7 in self.weekdays
+        )
+
+    def next_after(self, timestamp: float) -> float:
+        """First fire time (epoch seconds) strictly after *timestamp*."""
+        # walk the wall clock (naive), so DST changes do not skew it.
+        moment = datetime.fromtimestamp(timestamp, self.tz).replace(
+            tzinfo=None, second=0, microsecond=0
+        ) + timedelta(minutes=1)
+        horizon = moment.year + _HORIZON
+        while moment.year <= horizon:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1) + timedelta(days=32)).replace(
+                    day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment.replace(tzinfo=self.tz).timestamp()
+        raise ValueError(f"Cron expression {self.expression!r} never fires")
@@ -1,11 +1,21 @@
 from typing import Optional, Union, Callable
+from datetime import datetime
 import uuid
 import warnings
 from aiohttp import web
 from ..queue import BackgroundQueue
 from ..tracker import JobTracker, RedisJobTracker, JobRecord
 from ..wrappers import TaskWrapper
-from ...conf import CACHE_URL
+from ..wrappers.process import ProcessPool
+from ..scheduler import Scheduler, function_path
+from ...conf import (
+    CACHE_URL,
+    TIMEZONE,
+    BACKGROUND_PROCESS_WORKERS,
+    BACKGROUND_PROCESS_MAX_TASKS,
+    BACKGROUND_PROCESS_CONTEXT,
+    BACKGROUND_PROCESS_WARM,
+)
 
 # Registry pattern: one AppKey points to a dict[name -> BackgroundService].
 # Allows N named instances per Application without polluting app._state with
@@ -28,6 +38,15 @@ class BackgroundService:
     ``name``. Use :meth:`from_app`, :meth:`exists`, and :meth:`list_services`
     for lookups.
 
+    Each service owns the :class:`ProcessPool` of its ``"process"`` mode
+    tasks (``process_workers``, ``max_tasks_per_child``,
+    ``process_timeout``, ``process_context`` and ``process_warm``
+    keyword arguments); workers start on first use, or at application
+    startup with ``process_warm``.
+
+    Tasks can be scheduled for later or on a cron expression with
+    :meth:`schedule` (see :class:`~navigator.background.scheduler.Scheduler`).
+
     The first registered instance is also exposed under the legacy keys
     ``BACKGROUND_SERVICE_KEY`` (typed) and ``'background_service'`` (string)
     for backward compatibility with older consumers. Subsequent instances
@@ -53,6 +72,22 @@ class BackgroundService:
                 )
             else:
                 self.tracker = JobTracker()
+        self.process_pool = ProcessPool(
+            workers=kwargs.get('process_workers', BACKGROUND_PROCESS_WORKERS),
+            max_tasks_per_child=kwargs.get(
+                'max_tasks_per_child', BACKGROUND_PROCESS_MAX_TASKS
+            ),
+            timeout=kwargs.get('process_timeout', None),
+            context=kwargs.get('process_context', BACKGROUND_PROCESS_CONTEXT),
+        )
+        self._warm_processes: bool = kwargs.get(
+            'process_warm', BACKGROUND_PROCESS_WARM
+        )
+        self.scheduler = Scheduler(
+            self,
+            misfire_grace=kwargs.get('misfire_grace', 60.0),
+            timezone=kwargs.get('timezone', TIMEZONE),
+        )
 
         # Register in the per-app registry (canonical lookup path).
         registry = app.get(SERVICES_REGISTRY_KEY)
@@ -76,6 +111,7 @@ class BackgroundService:
             app._state['service_tracker'] = self.tracker
 
         app.on_startup.append(self._start_tracker)
+        app.on_startup.append(self._register_metrics)
         app.on_cleanup.append(self._stop_tracker)
 
     # -----------------------------------------------------------
@@ -120,10 +156,21 @@ class BackgroundService:
     async def _start_tracker(self, app: web.Application) -> None:
         if hasattr(self.tracker, 'start'):
             await self.tracker.start()
+        await self.scheduler.start()
+        if self._warm_processes:
+            await self.process_pool.start()
+
+    async def _register_metrics(self, app: web.Application) -> None:
+        from ...metrics import get_registry  # pylint: disable=C0415
+        registry = get_registry(app)
+        if registry is not None:
+            self.queue.register(registry, name=self.name)
 
     async def _stop_tracker(self, app: web.Application) -> None:
+        await self.scheduler.stop()
         if hasattr(self.tracker, 'stop'):
             await self.tracker.stop()
+        await self.process_pool.close()
 
     # -----------------------------------------------------------
     # API-style helpers your web-handlers can call
@@ -141,8 +188,8 @@ class BackgroundService:
             fn: A callable, coroutine function, or existing TaskWrapper.
             *args: Positional arguments forwarded to fn.
             jitter: Maximum jitter delay in seconds (default 0.0).
-            execution_mode: ``"same_loop"`` (default), ``"thread"`` or
-                ``"remote"``. Forwarded to TaskWrapper if fn is not
+            execution_mode: ``"same_loop"`` (default), ``"thread"``,
+                ``"process"`` or ``"remote"``. Forwarded to TaskWrapper if fn is not
                 already a TaskWrapper.
             remote_mode: Only used when ``execution_mode == "remote"``.
                 One of ``"run"`` (wait for result), ``"queue"``
@@ -155,11 +202,112 @@ class BackgroundService:
             remote_timeout: Only used when ``execution_mode == "remote"``.
                 TCP timeout (seconds) passed to ``QClient``. Default ``5``.
             **kwargs: Additional keyword arguments forwarded to fn (and
-                recognised TaskWrapper params such as ``name``, ``callback``).
+                recognised TaskWrapper params such as ``name``, ``callback``,
+                ``dedup_key``).
+
+        Returns:
+            The JobRecord for the submitted task. With a ``dedup_key``
+            already bound to a pending, running or recently done job (see
+            ``dedup_ttl``), the record of that job is returned instead and
+            nothing is enqueued.
+        """
+        tw = self._wrap(fn, *args, jitter=jitter, **kwargs)
+        tw.job_record = await self.tracker.create_job(
+            job=tw.job_record,
+            name=tw.fn.__name__,
+        )
+        existing = await self._deduplicate(tw)
+        if existing is not None:
+            return existing
+        # Add the TaskWrapper to the queue
+        if not await self.queue.put(tw):
+            return await self._in_flight(tw)
+        return tw.job_record
+
+    async def submit_many(
+        self,
+        tasks: list,
+        jitter: float = 0.0,
+        **kwargs
+    ) -> list:
+        """Submit a batch of tasks for background execution.
+
+        Args:
+            tasks: TaskWrappers, callables, or ``(fn, args)`` /
+                ``(fn, args, kwargs)`` tuples.
+            jitter: Maximum jitter delay in seconds (default 0.0).
+            **kwargs: Same options as :meth:`submit`, applied to every
+                task that is not already a TaskWrapper.
+
+        The job records are created in one tracker batch and the tasks are
+        enqueued atomically (see :meth:`BackgroundQueue.put_many`).
 
         Returns:
-            The JobRecord for the submitted task.
+            The JobRecords of the submitted tasks, in order (the existing
+            record for a deduplicated task, see :meth:`submit`).
+        """
+        wrappers = []
+        for task in tasks:
+            if isinstance(task, tuple):
+                fn, args, *extra = task
+                options = {**kwargs, **(extra[0] if extra else {})}
+                wrappers.append(self._wrap(fn, *args, jitter=jitter, **options))
+            else:
+                wrappers.append(self._wrap(task, jitter=jitter, **kwargs))
+        records = await self.tracker.create_jobs(
+            [tw.job_record for tw in wrappers]
+        )
+        enqueue = []
+        for index, (tw, record) in enumerate(zip(wrappers, records)):
+            tw.job_record = record
+            existing = await self._deduplicate(tw)
+            if existing is None and tw.dedup_key in self.queue._inflight:
+                # dropped by the queue (see :meth:`submit`).
+                existing = await self._in_flight(tw)
+            if existing is not None:
+                records[index] = existing
+            else:
+                enqueue.append(tw)
+        if enqueue:
+            await self.queue.put_many(enqueue)
+        return records
+
+    async def _deduplicate(self, tw: TaskWrapper) -> Optional[JobRecord]:
+        """Record of the job already bound to the ``dedup_key`` of *tw*
+        (the job record of *tw* is then dropped), or None.
         """
+        if tw.dedup_key is None:
+            return None
+        existing = await self.tracker.claim_dedup(
+            tw.dedup_key, tw.task_uuid, tw.dedup_ttl
+        )
+        if existing is None:
+            return None
+        record = await self.tracker.status(existing)
+        if record is not None:
+            await self.tracker.forget(tw.task_uuid)
+        return record
+
+    async def _in_flight(self, tw: TaskWrapper) -> JobRecord:
+        """*tw* was dropped by the queue, a task with its ``dedup_key``
+        being queued or running: the record of that task (the job record
+        of *tw* is then dropped), or the record of *tw*, cancelled.
+        """
+        task_id = getattr(self.queue._inflight.get(tw.dedup_key), 'task_uuid', None)
+        record = await self.tracker.status(task_id) if task_id else None
+        if record is not None:
+            await self.tracker.forget(tw.task_uuid)
+            return record
+        await self.tracker.set_cancelled(tw.task_uuid, "Duplicate of a queued task")
+        return await self.tracker.status(tw.task_uuid) or tw.job_record
+
+    def _wrap(
+        self,
+        fn: Union[Callable, TaskWrapper],
+        *args,
+        jitter: float = 0.0,
+        **kwargs
+    ) -> TaskWrapper:
         if not callable(fn):
             raise ValueError(
                 "fn must be a callable function or TaskWrapper instance"
@@ -192,13 +340,93 @@ class BackgroundService:
             )
         if tw.tracker is None:
             tw.tracker = self.tracker
-        tw.job_record = await self.tracker.create_job(
-            job=tw.job_record,
-            name=tw.fn.__name__,
+        if tw.execution_mode == "process" and tw.process_pool is None:
+            tw.process_pool = self.process_pool
+        return tw
+
+    async def schedule(
+        self,
+        fn: Union[Callable, TaskWrapper],
+        *args,
+        at: Union[datetime, float, None] = None,
+        delay: Optional[float] = None,
+        cron: Optional[str] = None,
+        schedule_id: Optional[str] = None,
+        misfire: str = "fire_once",
+        jitter: float = 0.0,
+        **kwargs
+    ) -> str:
+        """Run a task later, or on a schedule.
+
+        Args:
+            fn: A callable, coroutine function, or existing TaskWrapper.
+            *args: Positional arguments forwarded to fn.
+            at: When to run it (a datetime or epoch seconds).
+            delay: Run it in that many seconds.
+            cron: Run it on a cron expression (e.g. ``"*/5 * * * *"``,
+                read in the service ``timezone``).
+            schedule_id: Id of the schedule (replaces an existing one).
+            misfire: What to do with runs missed by more than the
+                ``misfire_grace`` of the service: ``"fire_once"``,
+                ``"fire_all"`` or ``"skip"``.
+            jitter: Maximum random delay in seconds added to every run
+                (the ``jitter`` of a TaskWrapper is used if given one).
+            **kwargs: Same options as :meth:`submit`.
+
+        Every run is submitted as a new job. Schedules of importable
+        functions with JSON-serializable arguments are saved in a
+        RedisJobTracker and restored on startup.
+
+        Returns:
+            The schedule id.
+        """
+        spec = None
+        if isinstance(fn, TaskWrapper):
+            jitter = jitter or fn.jitter
+        else:
+            spec = {
+                "fn": function_path(fn),
+                "args": list(args),
+                "kwargs": dict(kwargs),
+            }
+        tw = self._wrap(fn, *args, **kwargs)
+        return await self.scheduler.add(
+            tw,
+            at=at,
+            delay=delay,
+            cron=cron,
+            schedule_id=schedule_id,
+            misfire=misfire,
+            jitter=jitter,
+            spec=spec,
         )
-        # Add the TaskWrapper to the queue
-        await self.queue.put(tw)
-        return tw.job_record
+
+    async def unschedule(self, schedule_id: str) -> bool:
+        """Remove a schedule (runs already submitted are not cancelled)."""
+        return await self.scheduler.remove(schedule_id)
+
+    def schedules(self) -> list:
+        """Return the pending schedules."""
+        return self.scheduler.list_schedules()
+
+    async def cancel(self, task_id: Union[uuid.UUID, str]) -> bool:
+        """Cancel a pending or running task.
+
+        The tracker reports the task as ``cancelled`` and its consumer is
+        freed at once (a ``process`` task has its worker process killed).
+
+        Returns:
+            False if the task is not pending or running in this service.
+        """
+        if isinstance(task_id, uuid.UUID):
+            task_id = task_id.hex
+        elif isinstance(task_id, str):
+            task_id = uuid.UUID(task_id).hex
+        else:
+            raise ValueError(
+                "task_id must be a UUID or a string representation of a UUID"
+            )
+        return await self.queue.cancel(task_id)
 
     async def status(self, task_id: uuid.UUID) -> Optional[str]:
         """ Get the status of a job by its task ID.
@@ -1,9 +1,9 @@
-from typing import Dict, Any, Optional, Mapping
+from typing import Dict, Any, Optional, Mapping, List
 import asyncio
 import uuid
 from datamodel.exceptions import ValidationError
 from navconfig.logging import logging
-from .models import JobRecord, time_now
+from .models import JobRecord, time_now, is_duplicate
 
 
 DEFAULT_TTL = 24 * 3600
@@ -24,6 +24,9 @@ class JobTracker:
         self._ttl = ttl_seconds
         self._reap_interval = reap_interval
         self._reaper_task: Optional[asyncio.Task] = None
+        self._schedules: Dict[str, dict] = {}
+        self._dedup: Dict[str, str] = {}  # dedup key -> task id
+        self._dedup_keys: Dict[str, str] = {}  # task id -> dedup key
         self.logger = logging.getLogger('NAV.JobTracker')
 
     # -----------------------------------------------------------
@@ -63,8 +66,15 @@ class JobTracker:
             ]
             for jid in expired:
                 del self._jobs[jid]
+                self._unbind(jid)
             return len(expired)
 
+    def _unbind(self, job_id: str) -> None:
+        """Drop the dedup binding of a removed job."""
+        key = self._dedup_keys.pop(job_id, None)
+        if key is not None and self._dedup.get(key) == job_id:
+            del self._dedup[key]
+
     # -----------------------------------------------------------
     # Public helpers
     # -----------------------------------------------------------
@@ -80,6 +90,13 @@ class JobTracker:
             self._jobs[job.task_id] = job
         return job
 
+    async def create_jobs(self, jobs: List[JobRecord]) -> List[JobRecord]:
+        """Register several job records at once (a single lock acquisition)."""
+        async with self._lock:
+            for job in jobs:
+                self._jobs[job.task_id] = job
+        return jobs
+
     async def set_running(self, job_id: str) -> None:
         async with self._lock:
             rec = self._jobs[job_id]
@@ -100,6 +117,67 @@ class JobTracker:
             rec.finished_at = time_now()
             rec.error = f"{type(exc).__name__}: {exc}"
 
+    async def set_cancelled(self, job_id: str, reason: str = "Cancelled") -> None:
+        async with self._lock:
+            rec = self._jobs[job_id]
+            rec.status = "cancelled"
+            rec.finished_at = time_now()
+            rec.error = reason
+
+    async def start_jobs(self, job_ids: List[str]) -> None:
+        """Mark several jobs running at once (a single lock acquisition)."""
+        now = time_now()
+        async with self._lock:
+            for job_id in job_ids:
+                rec = self._jobs.get(job_id)
+                if rec is not None:
+                    rec.status = "running"
+                    rec.started_at = now
+
+    async def finish_jobs(self, outcomes: Mapping[str, Any]) -> None:
+        """Record the outcome of several jobs at once: ``{job_id: result}``,
+        an exception as result marks the job failed."""
+        now = time_now()
+        async with self._lock:
+            for job_id, outcome in outcomes.items():
+                rec = self._jobs.get(job_id)
+                if rec is None:
+                    continue
+                rec.finished_at = now
+                if isinstance(outcome, BaseException):
+                    rec.status = "failed"
+                    rec.error = f"{type(outcome).__name__}: {outcome}"
+                else:
+                    rec.status = "done"
+                    rec.result = outcome
+
+    async def forget(self, job_id: str) -> None:
+        async with self._lock:
+            self._jobs.pop(job_id, None)
+            self._unbind(job_id)
+
+    async def claim_dedup(
+        self,
+        key: str,
+        job_id: str,
+        ttl: float = 0
+    ) -> Optional[str]:
+        """Bind the deduplication *key* to *job_id*.
+
+        Returns the id of the job already bound to *key* when it is
+        pending, running, or done less than *ttl* seconds ago (None: the
+        key is now bound to *job_id*).
+        """
+        async with self._lock:
+            current = self._dedup.get(key)
+            if current is not None and current != job_id:
+                if is_duplicate(self._jobs.get(current), ttl):
+                    return current
+                self._dedup_keys.pop(current, None)
+            self._dedup[key] = job_id
+            self._dedup_keys[job_id] = key
+            return None
+
     async def status(self, job_id: str) -> Optional[JobRecord]:
         async with self._lock:
             return self._jobs.get(job_id)
@@ -112,6 +190,21 @@ class JobTracker:
         async with self._lock:
             return job_id in self._jobs
 
+    # -----------------------------------------------------------
+    # Schedules (kept for the life of the process)
+    # -----------------------------------------------------------
+    async def save_schedule(self, schedule_id: str, data: dict) -> None:
+        self._schedules[schedule_id] = data
+
+    async def delete_schedule(self, schedule_id: str) -> None:
+        self._schedules.pop(schedule_id, None)
+
+    async def load_schedules(self) -> Dict[str, dict]:
+        return dict(self._schedules)
+
+    async def claim_schedule(self, schedule_id: str, due: float) -> bool:
+        return True
+
     async def flush_jobs(self, attrs: Mapping[str, Any]) -> int:
         async with self._lock:
             if not attrs:
@@ -36,3 +36,19 @@ class JobRecord(BaseModel):
 
     def __repr__(self):
         return f"<JobRecord {self.name} ({self.task_id})>"
+
+
+def is_duplicate(record: Optional[JobRecord], ttl: float = 0) -> bool:
+    """Whether a new job with the dedup key of *record* attaches to it:
+    *record* is pending or running, or done for less than *ttl* seconds
+    (failed and cancelled jobs run again)."""
+    if record is None:
+        return False
+    if record.status in ("pending", "running"):
+        return True
+    return (
+        record.status == "done"
+        and ttl > 0
+        and record.finished_at is not None
+        and time_now() - record.finished_at <= ttl * 1000
+    )
@@ -5,7 +5,7 @@ import redis.asyncio as redis
 from datamodel.exceptions import ParserError
 from navconfig.logging import logging
 from ...libs.json import json_encoder, json_decoder  # pylint: disable=E0611 # noqa
-from .models import JobRecord, time_now
+from .models import JobRecord, time_now, is_duplicate
 from ...conf import CACHE_URL
 
 
@@ -13,6 +13,15 @@ Encoder = Callable[[Any], bytes]
 DEFAULT_TTL = 24 * 3600
 MAX_TTL = 30 * 24 * 3600
 
+# replace a stale dedup binding, unless another worker already did.
+_SWAP_DEDUP = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
 
 class RedisJobTracker:
     """
@@ -74,6 +83,20 @@ class RedisJobTracker:
                     await self._redis.sadd(self._attr_key(k, v), job.task_id)
         return job
 
+    async def create_jobs(self, jobs: List[JobRecord]) -> List[JobRecord]:
+        """Store several job records in one pipeline (a single round-trip)."""
+        if not jobs:
+            return jobs
+        async with self._lock:
+            pipe = self._redis.pipeline()
+            for job in jobs:
+                pipe.set(self._key(job.task_id), self._encoder(job), ex=self._ttl)
+                for k, v in (job.attributes or {}).items():
+                    pipe.sadd(self._attr_key(k, v), job.task_id)
+            pipe.sadd(self._set_key, *[job.task_id for job in jobs])
+            await pipe.execute()
+        return jobs
+
     async def exists(self, job_id: str) -> bool:
         return await self._redis.exists(self._key(job_id)) == 1
 
@@ -150,6 +173,103 @@ class RedisJobTracker:
             error=f"{type(exc).__name__}: {exc}",
         )
 
+    async def set_cancelled(self, job_id: str, reason: str = "Cancelled") -> None:
+        await self._update(
+            job_id,
+            reset_ttl=True,
+            status="cancelled",
+            finished_at=time_now(),
+            error=reason,
+        )
+
+    async def start_jobs(self, job_ids: List[str]) -> None:
+        """Mark several jobs running in one round-trip (MGET + pipeline)."""
+        now = time_now()
+        await self._update_many(
+            {job_id: {"status": "running", "started_at": now} for job_id in job_ids}
+        )
+
+    async def finish_jobs(self, outcomes: Mapping[str, Any]) -> None:
+        """Record the outcome of several jobs in one round-trip:
+        ``{job_id: result}``, an exception as result marks the job failed."""
+        now = time_now()
+        patches = {}
+        for job_id, outcome in outcomes.items():
+            if isinstance(outcome, BaseException):
+                patches[job_id] = {
+                    "status": "failed",
+                    "finished_at": now,
+                    "error": f"{type(outcome).__name__}: {outcome}",
+                }
+            else:
+                patches[job_id] = {
+                    "status": "done", "finished_at": now, "result": outcome
+                }
+        await self._update_many(patches, reset_ttl=True)
+
+    async def _update_many(
+        self,
+        patches: Mapping[str, dict],
+        reset_ttl: bool = False
+    ) -> None:
+        """:meth:`_update` of several jobs (missing ones are skipped)."""
+        if not patches:
+            return
+        job_ids = list(patches)
+        async with self._lock:
+            payloads = await self._redis.mget(
+                [self._key(job_id) for job_id in job_ids]
+            )
+            pipe = self._redis.pipeline()
+            for job_id, payload in zip(job_ids, payloads):
+                if payload is None:
+                    continue
+                rec: JobRecord = self._decoder(payload)
+                for k, v in patches[job_id].items():
+                    setattr(rec, k, v)
+                try:
+                    blob = self._encoder(rec)
+                except ParserError as exc:
+                    # one result we cannot encode does not lose the others.
+                    rec.status = "failed"
+                    rec.result = None
+                    rec.error = f"Invalid job record data: {exc}"
+                    blob = self._encoder(rec)
+                if reset_ttl:
+                    pipe.set(self._key(job_id), blob, ex=self._ttl)
+                else:
+                    pipe.set(self._key(job_id), blob, keepttl=True)
+            await pipe.execute()
+
+    async def claim_dedup(
+        self,
+        key: str,
+        job_id: str,
+        ttl: float = 0
+    ) -> Optional[str]:
+        """Bind the deduplication *key* to *job_id* (``SET NX``), across
+        every worker sharing this Redis.
+
+        Returns the id of the job already bound to *key* when it is
+        pending, running, or done less than *ttl* seconds ago (None: the
+        key is now bound to *job_id*).
+        """
+        dkey = f"{self.prefix}dedup:{key}"
+        for _ in range(3):
+            if await self._redis.set(dkey, job_id, nx=True, ex=self._ttl):
+                return None
+            current = await self._redis.get(dkey)
+            if current is None:
+                continue  # expired in between
+            if current == job_id:
+                return None
+            if is_duplicate(await self.status(current), ttl):
+                return current
+            if await self._redis.eval(_SWAP_DEDUP, 1, dkey, current, job_id, self._ttl):
+                return None
+        # lost every race: whoever holds the key now runs the job.
+        return await self._redis.get(dkey)
+
     # -----------------------------------------------------------------
     # query helpers ----------------------------------------------------
     # -----------------------------------------------------------------
@@ -199,6 +319,39 @@ class RedisJobTracker:
             if b is not None
         ]
 
+    # -----------------------------------------------------------------
+    # schedules (see BackgroundService.schedule) -----------------------
+    # -----------------------------------------------------------------
+    @property
+    def _schedules_key(self) -> str:
+        return f"{self.prefix}__schedules"
+
+    async def save_schedule(self, schedule_id: str, data: dict) -> None:
+        await self._redis.hset(
+            self._schedules_key, schedule_id, self._encoder(data)
+        )
+
+    async def delete_schedule(self, schedule_id: str) -> None:
+        await self._redis.hdel(self._schedules_key, schedule_id)
+
+    async def load_schedules(self) -> Dict[str, dict]:
+        blobs = await self._redis.hgetall(self._schedules_key)
+        return {
+            schedule_id: json_decoder(blob)
+            for schedule_id, blob in blobs.items()
+        }
+
+    async def claim_schedule(self, schedule_id: str, due: float) -> bool:
+        """Only one worker sharing this Redis fires a given run."""
+        return bool(
+            await self._redis.set(
+                f"{self.prefix}schedule:{schedule_id}:{int(due * 1000)}",
+                1,
+                nx=True,
+                ex=DEFAULT_TTL
+            )
+        )
+
     # -----------------------------------------------------------------
     # lifecycle --------------------------------------------------------
     # -----------------------------------------------------------------
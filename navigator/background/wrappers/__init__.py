@@ -1,17 +1,21 @@
 from typing import Callable, Coroutine, Any, Union, Optional, Awaitable
+import copy
 import uuid
 import logging
 import threading
 import random
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future
 from ..tracker import JobTracker, JobRecord
+from ..priority import priority_level
+from .loops import get_loop_pool
+from .process import ProcessPool, get_process_pool
 
 
 coroutine = Callable[[int], Coroutine[Any, Any, str]]
 OnCompleteFn = Callable[[Any, Optional[Exception]], Awaitable[None]]
 
-VALID_EXECUTION_MODES = ("same_loop", "thread", "remote")
+VALID_EXECUTION_MODES = ("same_loop", "thread", "process", "remote")
 
 
 def coroutine_in_thread(
@@ -19,36 +23,44 @@ def coroutine_in_thread(
     callback: Optional[coroutine] = None,
     on_complete: OnCompleteFn = None,
 ) -> threading.Event:
-    """Run a coroutine in a new thread with its own event loop."""
-    parent_loop = asyncio.get_running_loop()
+    """Run a coroutine on one of the shared event-loop threads.
+
+    Raises :class:`asyncio.QueueFull` when the pool is saturated
+    (see :func:`run_in_loop_thread` to wait instead).
+    """
     done_event = threading.Event()
 
-    def _runner():
-        new_loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(new_loop)
-        result, exc = None, None
+    async def _callback(result, exc, loop=None):
         try:
-            result = new_loop.run_until_complete(coro)
-        except Exception as e:         # noqa: BLE001
-            exc = e
-        finally:
             if callback:
-                new_loop.run_until_complete(
-                    callback(result, exc, loop=new_loop)
-                )
-            new_loop.close()
-            done_event.set()  # Signal that the coroutine has completed
-            if on_complete is None:
-                return
-            fut = asyncio.run_coroutine_threadsafe(
-                on_complete(result, exc), parent_loop
-            )
-            fut.result()  # Wait for the completion of the callback
+                await callback(result, exc, loop=loop)
+        finally:
+            done_event.set()  # before on_complete is scheduled
 
-    threading.Thread(target=_runner, daemon=True).start()
+    future = get_loop_pool().submit(coro, _callback, on_complete=on_complete)
+    # a cancelled coroutine never reaches the callback.
+    future.add_done_callback(lambda _: done_event.set())
     return done_event
 
 
+async def run_in_loop_thread(
+    coro: coroutine,
+    callback: Optional[coroutine] = None,
+    on_complete: OnCompleteFn = None,
+) -> Future:
+    """Run a coroutine on the shared event-loop threads, waiting for room.
+
+    Returns the :class:`concurrent.futures.Future` of the coroutine.
+    """
+    pool = get_loop_pool()
+    try:
+        await pool.acquire()
+    except BaseException:
+        coro.close()
+        raise
+    return pool.submit(coro, callback, on_complete=on_complete, reserved=True)
+
+
 class TaskWrapper:
     """TaskWrapper.
 
@@ -60,8 +72,12 @@ class TaskWrapper:
         execution_mode: How to execute the task. One of:
             - ``"same_loop"`` (default): schedule on the running event loop
               via ``asyncio.create_task()``.
-            - ``"thread"``: run in a dedicated thread with its own event loop
-              via ``coroutine_in_thread()``.
+            - ``"thread"``: run on one of the shared event-loop threads
+              via ``run_in_loop_thread()``.
+            - ``"process"``: run in a worker of a warm process pool (the
+              ``BackgroundService`` one, see :class:`ProcessPool`), for
+              CPU-bound work. fn and its arguments must be picklable
+              (with cloudpickle).
             - ``"remote"``: dispatch to a remote qworker pool via
               :class:`~navigator.background.taskers.qworker.QWorkerTasker`.
         tracker: Optional JobTracker to update status.
@@ -69,6 +85,28 @@ class TaskWrapper:
         logger: Optional logger instance.
         max_retries: Maximum number of retries on failure.
         retry_delay: Base delay between retries in seconds.
+        priority: Queue lane, ``"critical"``, ``"high"``, ``"normal"``
+            (default) or ``"low"``.
+        fair_key: Fairness key (tenant, user...) the queue shares its
+            consumers by.
+        timeout: Deadline in seconds. A ``same_loop`` task is cancelled,
+            a ``thread`` task is cancelled on its event-loop thread and the
+            worker process of a ``process`` task is killed; the task fails
+            with :class:`TimeoutError` (default: no limit, or the pool
+            timeout for ``process``).
+        dedup_key: Idempotency key. ``BackgroundService.submit`` attaches
+            a task to the pending or running job with the same key
+            instead of running it again (and ``BackgroundQueue.put``
+            drops it while the other one is queued or running).
+        dedup_ttl: Seconds a done job with the same ``dedup_key`` is
+            reused (its result is returned instead of running the task
+            again).
+        partition_key: Ordering key (an employee, a document...). Tasks
+            with the same key run one at a time, in submission order;
+            other keys run in parallel.
+        concurrency_key: Group (a fragile service...) whose tasks run at
+            most ``max_concurrency`` at a time.
+        max_concurrency: Limit of the ``concurrency_key`` group (1).
         remote_mode: Only used when ``execution_mode == "remote"``. One of
             ``"run"`` (wait for result), ``"queue"`` (fire-and-forget via
             TCP), or ``"publish"`` (fire-and-forget via Redis Streams).
@@ -88,6 +126,14 @@ class TaskWrapper:
         logger: Optional[logging.Logger] = None,
         max_retries: int = 0,
         retry_delay: float = 0.0,
+        priority: Union[str, int] = "normal",
+        fair_key: Any = None,
+        timeout: Optional[float] = None,
+        dedup_key: Optional[str] = None,
+        dedup_ttl: float = 0.0,
+        partition_key: Any = None,
+        concurrency_key: Any = None,
+        max_concurrency: int = 1,
         **kwargs
     ):
         if execution_mode not in VALID_EXECUTION_MODES:
@@ -107,6 +153,27 @@ class TaskWrapper:
                 "Must be one of: 'pending', 'running', 'done', 'failed'."
             )
         self.jitter: float = jitter
+        # Scheduling (see BackgroundQueue): lane and fairness key.
+        priority_level(priority)  # raises ValueError on unknown names
+        self.priority: Union[str, int] = priority
+        self.fair_key: Any = fair_key
+        self.timeout: Optional[float] = timeout
+        self.dedup_key: Optional[str] = dedup_key
+        self.dedup_ttl: float = dedup_ttl
+        # Keyed limits (see BackgroundQueue): FIFO partition and group cap.
+        self.partition_key: Any = partition_key
+        self.concurrency_key: Any = concurrency_key
+        self.max_concurrency: int = max_concurrency
+        # Cancellation (see cancel()): the asyncio task or the future of
+        # the event-loop thread running fn.
+        self.cancelled: bool = False
+        self.started: bool = False
+        self._task: Optional[asyncio.Task] = None
+        self._future: Optional[Future] = None
+        self._timed_out: bool = False
+        # Process pool (only used when execution_mode == "process"),
+        # set by BackgroundService; falls back to the process-wide pool.
+        self.process_pool: Optional[ProcessPool] = kwargs.pop('process_pool', None)
         # Remote execution params (only used when execution_mode == "remote").
         # Popped BEFORE building job_args so they are not leaked into the
         # JobRecord or forwarded to fn().
@@ -130,6 +197,8 @@ class TaskWrapper:
         self.logger = logger or logging.getLogger(
             'NAV.Queue.TaskWrapper'
         )
+        # SpanContext of the producer (set by BackgroundQueue.put):
+        self.trace_context = None
         # Retry information:
         self.max_retries = max_retries
         self.retries_done = 0
@@ -146,6 +215,59 @@ class TaskWrapper:
     def __repr__(self):
         return f"<TaskWrapper function={self._name} mode={self.execution_mode}>"
 
+    def cancel(self) -> bool:
+        """Cancel the task, pending or running.
+
+        A pending task is skipped when dequeued; a running one is cancelled
+        (its worker process killed in ``process`` mode) and reported as
+        ``cancelled`` to the tracker.
+        Returns False if the task was already cancelled.
+        """
+        if self.cancelled:
+            return False
+        self.cancelled = True
+        if self._task is not None:
+            self._task.cancel()
+        if self._future is not None:
+            self._future.cancel()
+        return True
+
+    def clone(self) -> "TaskWrapper":
+        """A new, pending run of the same task (with its own task id)."""
+        tw = copy.copy(self)
+        tw.job_record = JobRecord(
+            name=self._name,
+            content=self.job_record.content,
+            attributes=dict(self.job_record.attributes),
+        )
+        tw.cancelled = tw.started = tw._timed_out = False
+        tw._task = tw._future = None
+        tw.retries_done = 0
+        tw.trace_context = None
+        return tw
+
+    def _expire(self) -> None:
+        """Deadline of a ``thread`` mode task."""
+        self._timed_out = True
+        if self._future is not None:
+            self._future.cancel()
+
+    async def _await_task(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Await *coro* as a cancellable asyncio task, within *timeout*."""
+        self._task = asyncio.create_task(coro)
+        deadline = asyncio.timeout(timeout)
+        try:
+            async with deadline:
+                return await self._task
+        except TimeoutError:
+            if not deadline.expired():
+                raise
+            raise TimeoutError(
+                f"Task timed out after {timeout} seconds"
+            ) from None
+        finally:
+            self._task = None
+
     def add_callback(self, callback: Union[Callable, Awaitable]):
         """add_callback.
 
@@ -184,19 +306,30 @@ class TaskWrapper:
         If execution_mode == "same_loop": creates an asyncio.Task on the
         running loop, awaits it, and returns the result directly.
 
+        If execution_mode == "process": runs fn in a worker process of the
+        pool and returns its result like "same_loop".
+
         If execution_mode == "remote": dispatches to a remote qworker pool
         via :class:`QWorkerTasker`. For ``remote_mode="run"`` it waits for
         and returns the remote result; for ``queue`` / ``publish`` it
         returns the QClient acknowledgement immediately.
 
-        If execution_mode == "thread": delegates to coroutine_in_thread()
-        (existing fire-and-forget behavior), returns {"status": "running"}.
+        If execution_mode == "thread": delegates to run_in_loop_thread()
+        (fire-and-forget, waits only for room in the pool), returns
+        {"status": "running"}.
+
+        A task running past its ``timeout`` fails with a TimeoutError; a
+        task stopped by :meth:`cancel` ends as "cancelled".
 
         Returns:
             dict with "status" key: "done", "queued_remote", "failed",
             "cancelled", or "running".
         """
         result = None
+        self.started = True
+        if self.cancelled:
+            # cancelled while pending (the tracker already knows).
+            return {"status": "cancelled"}
         # Tell tracker we're starting
         try:
             if self.tracker:
@@ -219,13 +352,17 @@ class TaskWrapper:
                 f"executing {self._name} with Jitter: {delay} sec."
             )
             await asyncio.sleep(delay)
+            if self.cancelled:
+                if self.tracker:
+                    await self.tracker.set_cancelled(self.task_uuid)
+                return {"status": "cancelled"}
 
         if self.execution_mode == "same_loop":
             # Schedule coroutine on the running event loop so all application-
             # scoped asyncio objects (sessions, locks, pools) work correctly.
             try:
                 coro = self.fn(*self.args, **self.kwargs)
-                result_val = await asyncio.create_task(coro)
+                result_val = await self._await_task(coro, self.timeout)
                 self.logger.debug(
                     f"TaskWrapper {self._name} completed successfully."
                 )
@@ -241,7 +378,7 @@ class TaskWrapper:
                     f"TaskWrapper {self._name} was cancelled."
                 )
                 if self.tracker:
-                    await self.tracker.set_failed(self.task_uuid, "Cancelled")
+                    await self.tracker.set_cancelled(self.task_uuid)
                 return {"status": "cancelled"}
             except Exception as exc:
                 self.logger.error(
@@ -254,6 +391,43 @@ class TaskWrapper:
                 if self.tracker:
                     await self.tracker.set_failed(self.task_uuid, exc)
                 return {"status": "failed", "error": str(exc)}
+        elif self.execution_mode == "process":
+            # process mode — run in a worker process of the warm pool; the
+            # result (or the exception) comes back to this loop.
+            try:
+                pool = self.process_pool or get_process_pool()
+                # the pool enforces the deadline (it kills the worker).
+                result_val = await self._await_task(
+                    pool.run(self.fn, *self.args, timeout=self.timeout, **self.kwargs)
+                )
+                self.logger.debug(
+                    f"TaskWrapper {self._name} (process) completed successfully."
+                )
+                if self._user_callback:
+                    await self._wrapped_callback(
+                        result_val, None, loop=asyncio.get_running_loop()
+                    )
+                if self.tracker:
+                    await self.tracker.set_done(self.task_uuid, result_val)
+                return {"status": "done", "result": result_val}
+            except asyncio.CancelledError:
+                self.logger.warning(
+                    f"TaskWrapper {self._name} (process) was cancelled."
+                )
+                if self.tracker:
+                    await self.tracker.set_cancelled(self.task_uuid)
+                return {"status": "cancelled"}
+            except Exception as exc:
+                self.logger.error(
+                    f"TaskWrapper {self._name} (process) failed with exception: {exc}"
+                )
+                if self._user_callback:
+                    await self._wrapped_callback(
+                        None, exc, loop=asyncio.get_running_loop()
+                    )
+                if self.tracker:
+                    await self.tracker.set_failed(self.task_uuid, exc)
+                return {"status": "failed", "error": str(exc)}
         elif self.execution_mode == "remote":
             # remote mode — dispatch to a qworker pool via QWorkerTasker.
             # The QWorkerTasker itself handles tracker transitions for the
@@ -295,7 +469,7 @@ class TaskWrapper:
                     f"TaskWrapper {self._name} (remote) was cancelled."
                 )
                 if self.tracker:
-                    await self.tracker.set_failed(self.task_uuid, "Cancelled")
+                    await self.tracker.set_cancelled(self.task_uuid)
                 return {"status": "cancelled"}
             except Exception as exc:
                 self.logger.error(
@@ -315,11 +489,24 @@ class TaskWrapper:
                         pass
                 return {"status": "failed", "error": str(exc)}
         else:
-            # thread mode — run in a dedicated thread with its own event loop.
+            # thread mode — run on a shared event-loop thread.
             # Fire-and-forget: returns {"status": "running"} immediately.
             try:
                 async def _finish(result: Any, exc: Exception):
                     """Callback to handle the completion of the coroutine."""
+                    if deadline is not None:
+                        deadline.cancel()
+                    if isinstance(exc, asyncio.CancelledError):
+                        if not self._timed_out:
+                            self.logger.warning(
+                                f"TaskWrapper {self._name} was cancelled."
+                            )
+                            if self.tracker:
+                                await self.tracker.set_cancelled(self.task_uuid)
+                            return {"status": "cancelled"}
+                        exc = TimeoutError(
+                            f"Task timed out after {self.timeout} seconds"
+                        )
                     if exc:
                         self.logger.error(
                             f"TaskWrapper {self._name} failed with exception: {exc}"
@@ -345,7 +532,16 @@ class TaskWrapper:
                 coro = self.fn(*self.args, **self.kwargs)
                 # Use the wrapped callback instead of the user callback directly
                 callback_to_use = self._wrapped_callback if self._user_callback else None
-                coroutine_in_thread(coro, callback_to_use, on_complete=_finish)
+                deadline = None
+                self._future = await run_in_loop_thread(
+                    coro, callback_to_use, on_complete=_finish
+                )
+                if self.cancelled:
+                    self._future.cancel()
+                elif self.timeout:
+                    deadline = asyncio.get_running_loop().call_later(
+                        self.timeout, self._expire
+                    )
                 return {"status": "running"}
             except asyncio.CancelledError:
                 self.logger.warning(
@@ -355,7 +551,7 @@ class TaskWrapper:
                     "status": "cancelled"
                 }
                 if self.tracker:
-                    await self.tracker.set_failed(self.task_uuid, "Cancelled")
+                    await self.tracker.set_cancelled(self.task_uuid)
             except Exception as e:
                 self.logger.error(
                     f"Error executing TaskWrapper {self._name}: {e}"
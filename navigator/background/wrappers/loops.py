@@ -0,0 +1,292 @@
+"""Pool of long-lived event-loop threads.
+
+Every worker thread runs its own event loop forever; coroutines are
+handed to the least-loaded loop with ``run_coroutine_threadsafe`` instead
+of paying a new thread and a new loop per coroutine. The number of threads
+is fixed and the coroutines in flight are bounded (``max_pending``):
+:meth:`LoopThreadPool.submit` raises :class:`asyncio.QueueFull` when the
+pool is saturated, :meth:`LoopThreadPool.acquire` waits for room.
+"""
+from typing import Any, Awaitable, Callable, Optional
+from collections import deque
+from concurrent.futures import Future
+import asyncio
+import contextlib
+import threading
+from navconfig.logging import logging
+
+
+class LoopThread:
+    """A daemon thread running an event loop until stopped."""
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.load: int = 0
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+        self._ready.wait()
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self.loop = loop
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            with contextlib.suppress(Exception):
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    async def _cancel_tasks(self) -> None:
+        tasks = [
+            t for t in asyncio.all_tasks() if t is not asyncio.current_task()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Cancel the pending coroutines, stop the loop and join the thread."""
+        if self.loop is None or not self._thread.is_alive():
+            return
+        fut = asyncio.run_coroutine_threadsafe(self._cancel_tasks(), self.loop)
+        with contextlib.suppress(Exception):
+            fut.result(timeout)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+
+class LoopThreadPool:
+    """LoopThreadPool.
+
+    Args:
+        threads: worker threads (event loops).
+        max_pending: coroutines in flight across the pool.
+        name: thread name prefix.
+    """
+    def __init__(
+        self,
+        threads: int = 4,
+        max_pending: int = 1000,
+        name: str = "nav-loop"
+    ) -> None:
+        if threads < 1:
+            raise ValueError("LoopThreadPool: threads must be positive")
+        self.size = threads
+        self.max_pending = max_pending
+        self.name = name
+        self.pending: int = 0
+        self.completed: int = 0
+        self._workers: list = []
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger("NAV.Queue.LoopThreadPool")
+
+    # -----------------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------------
+    def start(self) -> None:
+        """Start the worker threads (done once, on first use)."""
+        with self._lock:
+            if self._workers:
+                return
+            workers = [LoopThread(f"{self.name}-{i}") for i in range(self.size)]
+            for worker in workers:
+                worker.start()
+            self._workers = workers
+        self.logger.debug(f"Started {self.size} event-loop threads")
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers)
+
+    def shutdown(self, timeout: Optional[float] = 5.0) -> None:
+        """Cancel what is still running and stop every thread.
+
+        The pool can be used again afterwards (threads are restarted).
+        """
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop(timeout)
+
+    # -----------------------------------------------------------
+    # Capacity
+    # -----------------------------------------------------------
+    def _try_reserve(self) -> bool:
+        with self._lock:
+            if self.pending < self.max_pending:
+                self.pending += 1
+                return True
+            return False
+
+    async def acquire(self) -> None:
+        """Wait until the pool can take one more coroutine (reserves it)."""
+        loop = asyncio.get_running_loop()
+        waiter = (loop, loop.create_future())
+        with self._lock:
+            if self.pending < self.max_pending and not self._waiters:
+                self.pending += 1
+                return
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                    waiting = True
+                except ValueError:
+                    waiting = False
+            if not waiting and waiter[1].done() and not waiter[1].cancelled():
+                # the slot was handed over just before the cancellation.
+                self._release()
+            raise
+
+    def _handover(self, fut: asyncio.Future) -> None:
+        if fut.cancelled():
+            self._release()
+        else:
+            fut.set_result(None)
+
+    def _release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                loop, fut = self._waiters.popleft()
+                if loop.is_closed():
+                    continue
+                # the slot goes straight to the next waiter.
+                loop.call_soon_threadsafe(self._handover, fut)
+                return
+            self.pending -= 1
+
+    # -----------------------------------------------------------
+    # Execution
+    # -----------------------------------------------------------
+    def _least_loaded(self) -> LoopThread:
+        with self._lock:
+            worker = min(self._workers, key=lambda w: w.load)
+            worker.load += 1
+            return worker
+
+    async def _run(
+        self,
+        coro: Awaitable,
+        callback: Optional[Callable]
+    ) -> tuple:
+        result, exc = None, None
+        try:
+            result = await coro
+        except Exception as e:  # noqa: BLE001
+            exc = e
+        if callback:
+            try:
+                await callback(result, exc, loop=asyncio.get_running_loop())
+            except Exception as e:  # noqa: BLE001
+                self.logger.error(f"Error in coroutine callback {callback!r}: {e}")
+        return result, exc
+
+    def submit(
+        self,
+        coro: Awaitable,
+        callback: Optional[Callable] = None,
+        on_complete: Optional[Callable[[Any, Optional[Exception]], Awaitable]] = None,
+        reserved: bool = False
+    ) -> Future:
+        """Run *coro* on a worker loop.
+
+        Args:
+            coro: the coroutine.
+            callback: ``await callback(result, exc, loop=worker_loop)`` on
+                the worker loop once *coro* finished.
+            on_complete: ``await on_complete(result, exc)`` scheduled on the
+                calling loop once *coro* finished.
+            reserved: a slot was already taken with :meth:`acquire`.
+
+        Returns:
+            A :class:`concurrent.futures.Future` of ``(result, exc)``;
+            cancelling it cancels the coroutine on its worker loop.
+
+        Raises:
+            asyncio.QueueFull: ``max_pending`` coroutines are in flight.
+        """
+        if not reserved and not self._try_reserve():
+            coro.close()
+            raise asyncio.QueueFull(
+                f"LoopThreadPool is full ({self.max_pending} coroutines pending)"
+            )
+        try:
+            parent_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            parent_loop = None
+        try:
+            self.start()
+            worker = self._least_loaded()
+        except BaseException:
+            coro.close()
+            self._release()
+            raise
+        future = asyncio.run_coroutine_threadsafe(
+            self._run(coro, callback), worker.loop
+        )
+
+        def _done(fut: Future) -> None:
+            with self._lock:
+                worker.load -= 1
+                self.completed += 1
+            self._release()
+            if on_complete is None or parent_loop is None or parent_loop.is_closed():
+                return
+            if fut.cancelled():
+                result, exc = None, asyncio.CancelledError()
+            elif fut.exception() is not None:
+                result, exc = None, fut.exception()
+            else:
+                result, exc = fut.result()
+            try:
+                asyncio.run_coroutine_threadsafe(on_complete(result, exc), parent_loop)
+            except RuntimeError:  # the calling loop is shutting down.
+                pass
+
+        future.add_done_callback(_done)
+        return future
+
+    def stats(self) -> dict:
+        return {
+            "threads": len(self._workers),
+            "pending": self.pending,
+            "waiting": len(self._waiters),
+            "completed": self.completed,
+            "load": [w.load for w in self._workers],
+        }
+
+
+_pool: Optional[LoopThreadPool] = None
+
+
+def get_loop_pool() -> LoopThreadPool:
+    """The process-wide pool (sized from the settings on first use)."""
+    global _pool  # pylint: disable=W0603
+    if _pool is None:
+        from ...conf import (  # pylint: disable=C0415
+            BACKGROUND_LOOP_THREADS,
+            BACKGROUND_LOOP_PENDING,
+        )
+        _pool = LoopThreadPool(
+            threads=BACKGROUND_LOOP_THREADS,
+            max_pending=BACKGROUND_LOOP_PENDING,
+        )
+    return _pool
+
+
+def set_loop_pool(pool: Optional[LoopThreadPool]) -> Optional[LoopThreadPool]:
+    global _pool  # pylint: disable=W0603
+    _pool = pool
+    return pool
@@ -0,0 +1,269 @@
+"""Warm process pool for CPU-bound background tasks.
+
+:class:`ProcessPool` wraps a :class:`~concurrent.futures.ProcessPoolExecutor`
+whose workers are started ahead of time and recycled after
+``max_tasks_per_child`` tasks. Tasks are serialized with ``cloudpickle``
+(closures and lambdas work), results and exceptions come back to the
+caller.
+
+A task running past its timeout has its worker killed. Killing a worker
+breaks a ``ProcessPoolExecutor``, so the pool is replaced by a fresh one
+and the tasks that were interrupted on the other workers are submitted
+again (once), only the runaway task fails.
+"""
+from typing import Any, Callable, Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import itertools
+import multiprocessing
+import os
+import pickle
+import signal
+import threading
+import cloudpickle
+from navconfig.logging import logging
+
+
+_started_queue = None
+
+
+def _init_worker(started) -> None:
+    global _started_queue  # pylint: disable=W0603
+    _started_queue = started
+    # the parent handles Ctrl-C, not every worker.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _invoke(task_id: int, payload: bytes) -> bytes:
+    """Worker side: report the pid, run the task, return the pickled result."""
+    _started_queue.put((task_id, os.getpid()))
+    fn, args, kwargs = pickle.loads(payload)
+    result = fn(*args, **kwargs)
+    if asyncio.iscoroutine(result):
+        result = asyncio.run(result)
+    return cloudpickle.dumps(result)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+_KILL = getattr(signal, "SIGKILL", signal.SIGTERM)
+
+
+class ProcessPool:
+    """ProcessPool.
+
+    Args:
+        workers: worker processes (default: the CPU count).
+        max_tasks_per_child: recycle a worker after that many tasks
+            (0: never).
+        timeout: default per-task timeout in seconds (None: no limit).
+        context: multiprocessing start method (``spawn`` is safe in a
+            threaded server, ``forkserver``/``fork`` start faster).
+    """
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_tasks_per_child: int = 0,
+        timeout: Optional[float] = None,
+        context: str = "spawn"
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 2
+        self.max_tasks_per_child = max_tasks_per_child or None
+        self.timeout = timeout
+        self._context = multiprocessing.get_context(context)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._generation: int = 0
+        self._ids = itertools.count()
+        self._pids: dict = {}  # task id -> worker pid (running tasks)
+        self._active: set = set()
+        self._lock = threading.Lock()
+        self._started = None
+        self._reader: Optional[threading.Thread] = None
+        self.completed: int = 0
+        self.killed: int = 0
+        self.restarts: int = 0
+        self.logger = logging.getLogger("NAV.Queue.ProcessPool")
+
+    # -----------------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------------
+    def _read_started(self) -> None:
+        while True:
+            item = self._started.get()
+            if item is None:
+                return
+            task_id, pid = item
+            with self._lock:
+                if task_id in self._active:
+                    self._pids[task_id] = pid
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                if self._started is None:
+                    self._started = self._context.SimpleQueue()
+                    self._reader = threading.Thread(
+                        target=self._read_started,
+                        name="nav-process-pool",
+                        daemon=True
+                    )
+                    self._reader.start()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=self._context,
+                    initializer=_init_worker,
+                    initargs=(self._started,),
+                    max_tasks_per_child=self.max_tasks_per_child,
+                )
+                self._generation += 1
+            return self._executor
+
+    async def start(self) -> None:
+        """Start (warm up) every worker process."""
+        executor = self._ensure_executor()
+        await asyncio.gather(*(
+            asyncio.wrap_future(executor.submit(_ping)) for _ in range(self.workers)
+        ))
+        self.logger.debug(f"Started {self.workers} worker processes")
+
+    def _replace(self, generation: int) -> None:
+        """Drop a broken executor (once per generation)."""
+        with self._lock:
+            if self._executor is None or self._generation != generation:
+                return
+            executor, self._executor = self._executor, None
+            self.restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def close(self) -> None:
+        """Stop the workers (waits for the running tasks)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(
+                executor.shutdown, wait=True, cancel_futures=True
+            )
+        if self._started is not None:
+            self._started.put(None)
+            self._reader.join(1)
+            self._started = self._reader = None
+
+    # -----------------------------------------------------------
+    # Execution
+    # -----------------------------------------------------------
+    async def _pid_of(self, task_id: int, wait: float = 1.0) -> Optional[int]:
+        deadline = asyncio.get_running_loop().time() + wait
+        while True:
+            pid = self._pids.get(task_id)
+            if pid is not None or asyncio.get_running_loop().time() > deadline:
+                return pid
+            await asyncio.sleep(0.01)
+
+    async def _stop_task(self, task_id: int, future, generation: int) -> None:
+        """Cancel *future*, killing its worker if it already started."""
+        if future.cancel():
+            return
+        pid = await self._pid_of(task_id)
+        if pid is None or future.done():
+            return
+        try:
+            os.kill(pid, _KILL)
+        except ProcessLookupError:
+            return
+        self.killed += 1
+        self.logger.warning(f"Killed worker process {pid} (task {task_id})")
+        self._replace(generation)
+
+    async def run(
+        self,
+        fn: Callable,
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Any:
+        """Run ``fn(*args, **kwargs)`` in a worker process.
+
+        Raises:
+            TimeoutError: the task ran past *timeout* (its worker is killed).
+            Exception: whatever *fn* raised.
+        """
+        payload = cloudpickle.dumps((fn, args, kwargs))
+        timeout = self.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        task_id = next(self._ids)
+        with self._lock:
+            self._active.add(task_id)
+        try:
+            for attempt in range(2):
+                executor = self._ensure_executor()
+                generation = self._generation
+                remaining = None if deadline is None else max(0, deadline - loop.time())
+                try:
+                    future = executor.submit(_invoke, task_id, payload)
+                    data = await asyncio.wait_for(
+                        asyncio.wrap_future(future), remaining
+                    )
+                except asyncio.TimeoutError:
+                    await self._stop_task(task_id, future, generation)
+                    raise TimeoutError(
+                        f"Task timed out after {timeout} seconds"
+                    ) from None
+                except asyncio.CancelledError:
+                    await self._stop_task(task_id, future, generation)
+                    raise
+                except BrokenProcessPool:
+                    # another task's worker was killed (or died): start over.
+                    self._replace(generation)
+                    if attempt:
+                        raise
+                    self.logger.warning(
+                        f"Worker pool restarted, resubmitting task {task_id}"
+                    )
+                    with self._lock:
+                        self._pids.pop(task_id, None)
+                    continue
+                self.completed += 1
+                return pickle.loads(data)
+        finally:
+            with self._lock:
+                self._active.discard(task_id)
+                self._pids.pop(task_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": len(self._pids),
+            "completed": self.completed,
+            "killed": self.killed,
+            "restarts": self.restarts,
+        }
+
+
+_pool: Optional[ProcessPool] = None
+
+
+def get_process_pool() -> ProcessPool:
+    """The process-wide pool of TaskWrappers not bound to a BackgroundService."""
+    global _pool  # pylint: disable=W0603
+    if _pool is None:
+        from ...conf import (  # pylint: disable=C0415
+            BACKGROUND_PROCESS_WORKERS,
+            BACKGROUND_PROCESS_MAX_TASKS,
+            BACKGROUND_PROCESS_CONTEXT,
+        )
+        _pool = ProcessPool(
+            workers=BACKGROUND_PROCESS_WORKERS,
+            max_tasks_per_child=BACKGROUND_PROCESS_MAX_TASKS,
+            context=BACKGROUND_PROCESS_CONTEXT,
+        )
+    return _pool
+
+
+def set_process_pool(pool: Optional[ProcessPool]) -> Optional[ProcessPool]:
+    global _pool  # pylint: disable=W0603
+    _pool = pool
+    return pool
@@ -10,10 +10,7 @@ from concurrent.futures import ThreadPoolExecutor
 from importlib import import_module
 import traceback
 import aiofiles
-from asyncdb import AsyncDB
 from ..applications.startup import ApplicationInstaller
-# Template Extension.
-from ..template import TemplateParser
 from ..conf import TEMPLATE_DIRECTORY
 from ..functions import cPrint
 from ..version import __version__
@@ -91,6 +88,8 @@ class BaseCommand(ABC):
         """
         Useful to pre-configure the command.
         """
+        # Template Extension.
+        from ..template import TemplateParser  # pylint: disable=C0415
         self.tplparser = TemplateParser(
             template_dir=TEMPLATE_DIRECTORY
         )
@@ -116,6 +115,7 @@ class BaseCommand(ABC):
             params: dict = None,
             **kwargs
     ):
+        from asyncdb import AsyncDB  # pylint: disable=C0415
         return AsyncDB(
             driver,
             dsn=dsn,
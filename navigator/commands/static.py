@@ -0,0 +1,30 @@
+"""
+Static Files Command.
+"""
+from pathlib import Path
+from navconfig import config
+from .abstract import BaseCommand
+
+
+class StaticCommand(BaseCommand):
+    help = "Static Files Commands for Navigator"
+
+    def configure(self):
+        self.add_argument("--path", dtype=str)
+        self.add_argument("--min_size", dtype=int, default=1024)
+
+    def precompress(self, options, *args, **kwargs):
+        """Build .br/.gz siblings of the static files (served by add_static).
+
+        example: nav static precompress --path static/
+        """
+        # pylint: disable=C0415
+        from ..utils.compression import precompress_directory
+        path = options.path or (args[0] if args else None)
+        if not path:
+            path = config.get("STATIC_DIR", fallback="static/")
+        path = Path(path).resolve()
+        if not path.is_dir():
+            return f"Static directory {path} doesn't exist."
+        written = precompress_directory(path, min_size=options.min_size)
+        return f"Precompressed {len(written)} files in {path}."
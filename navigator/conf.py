@@ -27,6 +27,82 @@ HOSTS = [e.strip() for e in list(
 DOMAIN = config.get("DOMAIN", fallback="dev.local")
 BASE_API_URL = config.get('BASE_API_URL', fallback='http://localhost:5000')
 ENABLE_ACCESS_LOG = config.getboolean("ENABLE_ACCESS_LOG", fallback=False)
+ENABLE_METRICS = config.getboolean("ENABLE_METRICS", fallback=False)
+METRICS_PATH = config.get("METRICS_PATH", fallback="/metrics")
+# On-demand sampling profiler (admin-only endpoint):
+ENABLE_PROFILER = config.getboolean("ENABLE_PROFILER", fallback=False)
+PROFILER_PATH = config.get("PROFILER_PATH", fallback="/_profiler")
+PROFILER_TOKEN = config.get("PROFILER_TOKEN", fallback=None)
+PROFILER_MAX_SECONDS = config.getint("PROFILER_MAX_SECONDS", fallback=60)
+PROFILER_COOLDOWN = config.getint("PROFILER_COOLDOWN", fallback=30)
+# Event-loop lag monitor and slow-callback detector:
+ENABLE_LOOP_MONITOR = config.getboolean("ENABLE_LOOP_MONITOR", fallback=False)
+LOOP_MONITOR_INTERVAL = float(config.get("LOOP_MONITOR_INTERVAL", fallback=0.25))
+LOOP_SLOW_CALLBACK = float(config.get("LOOP_SLOW_CALLBACK", fallback=0.1))
+LOOP_OVERLOAD_LAG = float(config.get("LOOP_OVERLOAD_LAG", fallback=0.1))
+
+ENABLE_ADMISSION_CONTROL = config.getboolean(
+    "ENABLE_ADMISSION_CONTROL", fallback=False
+)
+ADMISSION_INITIAL_LIMIT = config.getint("ADMISSION_INITIAL_LIMIT", fallback=100)
+ADMISSION_MIN_LIMIT = config.getint("ADMISSION_MIN_LIMIT", fallback=10)
+ADMISSION_MAX_LIMIT = config.getint("ADMISSION_MAX_LIMIT", fallback=1000)
+ADMISSION_TARGET_LATENCY = float(
+    config.get("ADMISSION_TARGET_LATENCY", fallback=1.0)
+)
+ADMISSION_QUEUE_SIZE = config.getint("ADMISSION_QUEUE_SIZE", fallback=100)
+ADMISSION_QUEUE_TIMEOUT = float(config.get("ADMISSION_QUEUE_TIMEOUT", fallback=1.0))
+ADMISSION_RETRY_AFTER = config.getint("ADMISSION_RETRY_AFTER", fallback=1)
+
+ENABLE_COMPRESSION = config.getboolean("ENABLE_COMPRESSION", fallback=False)
+COMPRESSION_MIN_SIZE = config.getint("COMPRESSION_MIN_SIZE", fallback=1024)
+COMPRESSION_OFFLOAD_SIZE = config.getint(
+    "COMPRESSION_OFFLOAD_SIZE", fallback=65536
+)
+PRECOMPRESS_STATIC = config.getboolean("PRECOMPRESS_STATIC", fallback=False)
+
+# Non-blocking (queue-backed) logging:
+ENABLE_QUEUE_LOGGING = config.getboolean("ENABLE_QUEUE_LOGGING", fallback=False)
+LOG_QUEUE_SIZE = config.getint("LOG_QUEUE_SIZE", fallback=10000)
+LOG_BATCH_SIZE = config.getint("LOG_BATCH_SIZE", fallback=256)
+LOG_FLUSH_INTERVAL = float(config.get("LOG_FLUSH_INTERVAL", fallback=0.5))
+LOG_SAMPLE_RATE = float(config.get("LOG_SAMPLE_RATE", fallback=1.0))
+LOG_JSON = config.getboolean("LOG_JSON", fallback=False)
+JSON_ACCESS_LOG = config.getboolean("JSON_ACCESS_LOG", fallback=False)
+
+# Tracing (spans with W3C traceparent propagation):
+ENABLE_TRACING = config.getboolean("ENABLE_TRACING", fallback=False)
+TRACING_SAMPLE_RATE = float(config.get("TRACING_SAMPLE_RATE", fallback=0.1))
+# "log", "file" or the dotted path of a SpanExporter class.
+TRACING_EXPORTER = config.get("TRACING_EXPORTER", fallback="log")
+TRACING_FILE = config.get("TRACING_FILE", fallback="spans.jsonl")
+TRACING_SERVICE_NAME = config.get("TRACING_SERVICE_NAME", fallback="navigator")
+
+# Shared outbound HTTP client (RESTAction and friends):
+ENABLE_HTTP_CLIENT_POOL = config.getboolean("ENABLE_HTTP_CLIENT_POOL", fallback=True)
+HTTP_CLIENT_LIMIT = config.getint("HTTP_CLIENT_LIMIT", fallback=100)
+HTTP_CLIENT_LIMIT_PER_HOST = config.getint("HTTP_CLIENT_LIMIT_PER_HOST", fallback=10)
+HTTP_CLIENT_DNS_TTL = config.getint("HTTP_CLIENT_DNS_TTL", fallback=300)
+HTTP_CLIENT_KEEPALIVE = float(config.get("HTTP_CLIENT_KEEPALIVE", fallback=30.0))
+# total attempts per request (1 disables retries).
+HTTP_CLIENT_RETRIES = config.getint("HTTP_CLIENT_RETRIES", fallback=3)
+HTTP_CLIENT_BACKOFF = float(config.get("HTTP_CLIENT_BACKOFF", fallback=0.5))
+HTTP_CLIENT_HTTP2 = config.getboolean("HTTP_CLIENT_HTTP2", fallback=False)
+# Response cache of outbound GET lookups (in-process LRU + optional Redis):
+ENABLE_HTTP_CACHE = config.getboolean("ENABLE_HTTP_CACHE", fallback=True)
+HTTP_CACHE_SIZE = config.getint("HTTP_CACHE_SIZE", fallback=1024)
+HTTP_CACHE_MAX_BYTES = config.getint("HTTP_CACHE_MAX_BYTES", fallback=64 * 1024 * 1024)
+HTTP_CACHE_MAX_ENTRY = config.getint("HTTP_CACHE_MAX_ENTRY", fallback=1024 * 1024)
+# seconds a stale entry is kept for ETag/Last-Modified revalidation.
+HTTP_CACHE_STALE_TTL = config.getint("HTTP_CACHE_STALE_TTL", fallback=3600)
+HTTP_CACHE_REDIS_URL = config.get("HTTP_CACHE_REDIS_URL", fallback=None)
+HTTP_CACHE_PREFIX = config.get("HTTP_CACHE_PREFIX", fallback="http_cache")
+# Per-provider rate limits of actions ("provider:rate[:burst]", comma separated):
+ACTION_RATE_LIMIT = float(config.get("ACTION_RATE_LIMIT", fallback=10.0))
+ACTION_RATE_LIMITS = config.get("ACTION_RATE_LIMITS", fallback="")
+# ActionExecutor fan-out: actions in flight, overall and per provider.
+ACTION_CONCURRENCY = config.getint("ACTION_CONCURRENCY", fallback=10)
+ACTION_PROVIDER_CONCURRENCY = config.getint("ACTION_PROVIDER_CONCURRENCY", fallback=4)
 CORS_MAX_AGE = config.getint('CORS_MAX_AGE', fallback=7200)
 
 # Temp File Path
@@ -208,6 +284,26 @@ MEMCACHE_PORT = config.get("MEMCACHE_PORT", 11211)
 Background Tasks
 """
 QUEUE_CALLBACK = config.get('QUEUE_CALLBACK', fallback=None)
+# Event-loop threads running "thread" mode tasks, and coroutines in flight:
+BACKGROUND_LOOP_THREADS = config.getint('BACKGROUND_LOOP_THREADS', fallback=4)
+BACKGROUND_LOOP_PENDING = config.getint('BACKGROUND_LOOP_PENDING', fallback=1000)
+# "process" mode tasks: worker processes (0: one per CPU), tasks before a
+# worker is recycled (0: never), start method and warm-up at startup:
+BACKGROUND_PROCESS_WORKERS = config.getint('BACKGROUND_PROCESS_WORKERS', fallback=0)
+BACKGROUND_PROCESS_MAX_TASKS = config.getint('BACKGROUND_PROCESS_MAX_TASKS', fallback=0)
+BACKGROUND_PROCESS_CONTEXT = config.get('BACKGROUND_PROCESS_CONTEXT', fallback='spawn')
+BACKGROUND_PROCESS_WARM = config.getboolean('BACKGROUND_PROCESS_WARM', fallback=False)
+# Default deadline (seconds) of a queued task without its own (0: no limit):
+BACKGROUND_TASK_TIMEOUT = config.getint('BACKGROUND_TASK_TIMEOUT', fallback=0)
+# Queue consumers autoscale between BACKGROUND_MIN_WORKERS (0: no
+# autoscaling, always max_workers) and max_workers; idle seconds before
+# a consumer is retired:
+BACKGROUND_MIN_WORKERS = config.getint('BACKGROUND_MIN_WORKERS', fallback=0)
+BACKGROUND_SCALE_IDLE = config.getint('BACKGROUND_SCALE_IDLE', fallback=30)
+# Batch handlers (see navigator.background.queue.batch): items per batch
+# and seconds the first item of a batch waits for more:
+BACKGROUND_BATCH_SIZE = config.getint('BACKGROUND_BATCH_SIZE', fallback=100)
+BACKGROUND_BATCH_WAIT = float(config.get('BACKGROUND_BATCH_WAIT', fallback=0.05))
 
 """
 Brokers:
@@ -1,15 +1,16 @@
-from typing import Union, Any
-from collections.abc import Callable
+from typing import Optional, Union, Any
+from collections.abc import Callable, Mapping
 from functools import wraps
 import asyncio
 import inspect
-from dataclasses import dataclass, is_dataclass
+from dataclasses import dataclass
 from aiohttp import web
 from aiohttp.abc import AbstractView
 from aiohttp.web_exceptions import HTTPError
 from datamodel import BaseModel
 from datamodel.exceptions import ValidationError
 from navigator_auth.conf import exclude_list
+from .utils.validation import ModelValidator, check_request, get_validator
 
 
 """
@@ -33,24 +34,9 @@ def allow_anonymous(func):
     return wrapper
 
 
-async def validate_model(request: web.Request, model: Union[dataclass, BaseModel]) -> tuple:
-    """
-    validate_model.
-
-    Description: Validate a model using a dataclass or BaseModel.
-    Args:
-        request (web.Request): aiohttp Request object.
-        model (Union[dataclass,BaseModel]): Model can be a dataclass or BaseModel.
-
-    Returns:
-        tuple: data, errors (if any)
-    """
-    errors: dict = {}
-    data = None
-    if request.method in ('OPTIONS', 'HEAD'):
-        # There is no validation for OPTIONS/HEAD methods:
-        return (True, None)
-    elif request.method in ("POST", "PUT", "PATCH"):
+async def read_payload(request: web.Request) -> Any:
+    """Data to validate: the body (POST/PUT/PATCH) or the query string (GET)."""
+    if request.method in ("POST", "PUT", "PATCH"):
         if request.content_type == "application/json":
             # getting data from POST
             data = await request.json()
@@ -68,129 +54,174 @@ async def validate_model(request: web.Request, model: Union[dataclass, BaseModel
             reason="There is no content for validation.",
             content_type="application/json",
         )
+    return data
 
-    async def validate_data(data):
-        valid = None
-        errors = {}
-        if issubclass(model, BaseModel):
-            try:
-                valid = model(**data)
-            except (TypeError, ValueError, AttributeError) as exc:
-                errors = {
-                    "error": f"Invalid Data: {exc}"
-                }
-            except ValidationError as exc:
-                errors = {
-                    "error": f"Invalid Data: {exc}",
-                    "payload": exc.payload
-                }
-        elif is_dataclass(model):
-            try:
-                valid = model(**data)
-            except Exception as err:
-                errors = {"error": f"Invalid Data: {err}"}
-        else:
-            errors = {"error": "Invalid Model Type"}
-        return valid, errors
 
+def _validate_data(validator: ModelValidator, data: Any) -> tuple:
+    valid = None
     errors = {}
-    valid = {}
+    try:
+        valid = validator(data)
+    except (TypeError, ValueError, AttributeError) as exc:
+        errors = {
+            "error": f"Invalid Data: {exc}"
+        }
+    except ValidationError as exc:
+        errors = {
+            "error": f"Invalid Data: {exc}",
+            "payload": exc.payload
+        }
+    except Exception as exc:  # pylint: disable=W0703
+        if validator.is_datamodel:
+            raise
+        errors = {"error": f"Invalid Data: {exc}"}
+    return valid, errors
+
 
+def validate_data(validator: ModelValidator, data: Any) -> tuple:
+    """Validate already decoded *data* (a dict, a dict of dicts or a list)."""
+    errors = {}
+    valid = {}
     if isinstance(data, dict):
-        if isinstance(list(data.values())[0], dict):
+        if data and isinstance(next(iter(data.values())), dict):
             for k, v in data.items():
-                item_valid, item_error = await validate_data(v)
+                item_valid, item_error = _validate_data(validator, v)
                 if item_valid:
                     valid[k] = item_valid
                 if item_error:
                     errors.update(item_error)
             if valid:
                 return valid, errors
-        valid, error = await validate_data(data)
+        valid, error = _validate_data(validator, data)
         if error:
             errors.update(error)
         return valid, errors
-
     elif isinstance(data, list):
         valid = []
         for item in data:
-            item_valid, item_error = await validate_data(item)
+            item_valid, item_error = _validate_data(validator, item)
             if item_valid:
                 valid.append(item_valid)
             if item_error:
                 errors.update(item_error)
         return valid, errors
+    elif isinstance(data, Mapping):
+        # form data (MultiDict)
+        return validate_data(validator, dict(data))
     else:
         return data, {
             "error": "Invalid type for Data Input, expecting a Dict or List."
         }
 
 
-def validate_payload(*models: Union[type[BaseModel], type[dataclass]]) -> Callable:
+async def validate_model(request: web.Request, model: Union[dataclass, BaseModel]) -> tuple:
+    """
+    validate_model.
+
+    Description: Validate a model using a dataclass or BaseModel.
+    Args:
+        request (web.Request): aiohttp Request object.
+        model (Union[dataclass,BaseModel]): Model can be a dataclass or BaseModel.
+
+    Returns:
+        tuple: data, errors (if any)
+    """
+    if request.method in ('OPTIONS', 'HEAD'):
+        # There is no validation for OPTIONS/HEAD methods:
+        return (True, None)
+    try:
+        validator = get_validator(model)
+    except TypeError:
+        return None, {"error": "Invalid Model Type"}
+    data = await read_payload(request)
+    return validate_data(validator, data)
+
+
+def _validation_error(
+    validator: ModelValidator,
+    err: Exception,
+    content_type: Optional[str]
+) -> web.Response:
+    message = f"Error during validation of model {validator.model.__name__}: {err}"
+    if content_type == "application/json":
+        return web.json_response({"error": message}, status=400)
+    raise web.HTTPBadRequest(
+        reason=message,
+        content_type="application/json"
+    )
+
+
+def validate_payload(
+    *models: Union[type[BaseModel], type[dataclass]],
+    max_size: Optional[int] = None
+) -> Callable:
     """validate_payload.
     Description: Validate Request payload using dataclasses or Datamodels.
     Args:
         models (Union[dataclass,BaseModel]): List of models can be used for validation.
-        kwargs: Any other data passed as arguments to function.
+        max_size (int): reject bodies larger than this (413) without reading them.
 
     Returns:
         Callable: Decorator function adding validated data to handler.
+
+    Validators, the handler signature and the parameter receiving each model
+    are resolved once, when the handler is decorated; the body is read once
+    per request whatever the number of models.
     """
+    validators = tuple(get_validator(model) for model in models)
+
     def _validation(func: Callable) -> Callable:
+        sig = inspect.signature(func)
+        # model name -> handler parameter receiving it.
+        targets = {
+            param_name.lower(): param_name for param_name in sig.parameters
+        }
+        is_coroutine = asyncio.iscoroutinefunction(func)
+
         @wraps(func)
         async def _wrap(*args: Any, **kwargs) -> web.StreamResponse:
             ## building arguments:
             # Supports class based views see web.View
-            if isinstance(args[0], AbstractView):
-                request = args[0].request
-            elif isinstance(args[0], web.View):
+            if isinstance(args[0], (AbstractView, web.View)):
                 request = args[0].request
             else:
                 request = args[-1]
 
             content_type = request.headers.get('Content-Type')
+            check_request(request, max_size)
 
-            sig = inspect.signature(func)
             bound_args = sig.bind_partial(*args, **kwargs)
             bound_args.apply_defaults()
 
             # Dictionary to hold validation results
-            validated_data = {}
             errors = {}
+            data = None
+            if request.method not in ('OPTIONS', 'HEAD'):
+                try:
+                    data = await read_payload(request)
+                except Exception as err:
+                    return _validation_error(validators[0], err, content_type)
 
             # Validate payload using the model
-            for model in models:
+            for validator in validators:
                 try:
-                    data, model_errors = await validate_model(
-                        request, model
-                    )
-                    model_name = model.__name__.lower()
-                    validated_data[model_name] = data
-                    if model_errors:
-                        errors[model_name] = model_errors
+                    if data is None:
+                        valid, model_errors = True, None
+                    else:
+                        valid, model_errors = validate_data(validator, data)
                 except Exception as err:
-                    if content_type == "application/json":
-                        return web.json_response(
-                            {
-                                "error": f"Error during validation of model {model.__name__}: {err}"
-                            }, status=400
-                        )
-                    raise web.HTTPBadRequest(
-                        reason=f"Error during validation of model {model.__name__}: {err}",
-                        content_type="application/json"
-                    )
-
-            # Assign validated data to respective function arguments
-            for param_name, param in sig.parameters.items():
-                model_name = param_name.lower()
-                if model_name in validated_data:
-                    bound_args.arguments[param_name] = validated_data[model_name]
+                    return _validation_error(validator, err, content_type)
+                if model_errors:
+                    errors[validator.name] = model_errors
+                # Assign validated data to respective function arguments
+                if validator.name in targets:
+                    bound_args.arguments[targets[validator.name]] = valid
 
             bound_args.arguments['errors'] = errors
 
             # Call the original function with new arguments
             try:
-                if asyncio.iscoroutinefunction(func):
+                if is_coroutine:
                     response = await func(*bound_args.args, **bound_args.kwargs)
                 else:
                     response = func(*bound_args.args, **bound_args.kwargs)
@@ -209,3 +240,4 @@ def validate_payload(*models: Union[type[BaseModel], type[dataclass]]) -> Callab
         return _wrap
 
     return _validation
+
@@ -2,7 +2,6 @@ import logging
 import asyncio
 from collections.abc import Callable
 from aiohttp import web
-from datamodel.parsers.encoders import DefaultEncoder
 from asyncdb.utils.functions import colors, cPrint
 
 try:
@@ -30,9 +29,5 @@ def json_response(
 ):
     if cls is not None:
         logging.warning("Using *cls* is deprecated an will be removed soon.")
-    fn = DefaultEncoder()
-    jsonfn = fn.dumps
-    obj = web.json_response(response, status=state, dumps=jsonfn)
-    for header, value in headers.items():
-        obj.headers[header] = value
-    return obj
+    from .responses import JSONResponse  # pylint: disable=C0415
+    return JSONResponse(response, status=state, headers=headers)
@@ -1,6 +1,26 @@
+from typing import Any
+import orjson
 from datamodel.parsers.json import (
     json_encoder,
     json_decoder,
     BaseEncoder,
     JSONContent
 )
+
+# datamodel's hook for the types orjson does not serialize natively.
+_default = getattr(JSONContent(), "default", None)
+# the options of ``json_encoder`` (UTC datetimes as ``Z``, naive ones as UTC).
+_options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC
+
+
+def json_encoder_bytes(obj: Any) -> bytes:
+    """Encode *obj* straight to UTF-8 JSON bytes.
+
+    Skips the ``bytes -> str -> bytes`` round-trip of ``json_encoder`` when
+    the result goes on the wire; falls back to it for anything orjson
+    cannot encode on its own.
+    """
+    try:
+        return orjson.dumps(obj, default=_default, option=_options)
+    except TypeError:
+        return json_encoder(obj).encode("utf-8")
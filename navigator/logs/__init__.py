@@ -0,0 +1,125 @@
+"""Navigator Logging.
+
+Opt-in, non-blocking logging pipeline: the handlers of the configured
+loggers are moved behind a bounded queue drained by a writer thread
+(batched writes), optional sampling of high-volume INFO records and a
+structured JSON access log. Log I/O never runs on the event loop.
+
+Enabled with ``ENABLE_QUEUE_LOGGING`` (see :meth:`Application.setup_logging`).
+"""
+from typing import Optional
+from collections.abc import Iterable
+import atexit
+import logging
+import queue
+from .formatters import JSONFormatter
+from .handlers import LogWriter, NonBlockingQueueHandler, SamplingFilter
+
+
+_pipeline: Optional["QueueLogging"] = None
+
+
+class QueueLogging:
+    """QueueLogging.
+
+    Every logger gets its own queue and writer thread, feeding only the
+    handlers moved from that logger: a record propagated from
+    ``navigator`` to root is written once by each, as without the queues.
+
+    Args:
+        loggers: names of the loggers to make non-blocking ("" is root).
+        queue_size: bound of each record queue (records are dropped, never
+            blocking the caller, when it is full).
+        batch_size: max records written per batch.
+        flush_interval: max seconds a record waits in the queue.
+        sample_rate: fraction of INFO-and-below records kept (1.0 = all).
+        json: use :class:`JSONFormatter` on the moved handlers.
+    """
+    def __init__(
+        self,
+        loggers: Iterable[str] = ("",),
+        queue_size: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        sample_rate: float = 1.0,
+        json: bool = False
+    ) -> None:
+        self.loggers = [logging.getLogger(name or None) for name in loggers]
+        # logger name -> queue handler, and the writer draining its queue:
+        self.handlers: dict = {}
+        self.writers: dict = {}
+        for logger in self.loggers:
+            handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+            if sample_rate < 1.0:
+                handler.addFilter(SamplingFilter(sample_rate))
+            self.handlers[logger.name] = handler
+            self.writers[logger.name] = LogWriter(
+                handler.queue,
+                [],
+                batch_size=batch_size,
+                flush_interval=flush_interval
+            )
+        self.json = json
+        self._moved: dict = {}
+        self._formatters: dict = {}  # handler -> formatter before start()
+
+    @property
+    def dropped(self) -> int:
+        return sum(handler.dropped for handler in self.handlers.values())
+
+    def start(self) -> None:
+        for logger in self.loggers:
+            handler = self.handlers[logger.name]
+            moved = [h for h in logger.handlers if h is not handler]
+            self._moved[logger] = moved
+            for target in moved:
+                logger.removeHandler(target)
+                if self.json and target not in self._formatters:
+                    self._formatters[target] = target.formatter
+                    target.setFormatter(JSONFormatter())
+            logger.addHandler(handler)
+            writer = self.writers[logger.name]
+            writer.handlers = moved
+            writer.start()
+
+    def stop(self) -> None:
+        """Flush the queues and give the handlers (and their formatters)
+        back to their loggers."""
+        for writer in self.writers.values():
+            writer.stop()
+        for logger, handlers in self._moved.items():
+            logger.removeHandler(self.handlers[logger.name])
+            for handler in handlers:
+                logger.addHandler(handler)
+        for handler, formatter in self._formatters.items():
+            handler.setFormatter(formatter)
+        self._moved.clear()
+        self._formatters.clear()
+
+
+def setup_queue_logging(**kwargs) -> QueueLogging:
+    """Install the process-wide non-blocking logging pipeline (once)."""
+    global _pipeline  # pylint: disable=W0603
+    if _pipeline is None:
+        _pipeline = QueueLogging(**kwargs)
+        _pipeline.start()
+        atexit.register(shutdown_queue_logging)
+    return _pipeline
+
+
+def shutdown_queue_logging() -> None:
+    global _pipeline  # pylint: disable=W0603
+    if _pipeline is not None:
+        _pipeline.stop()
+        _pipeline = None
+
+
+__all__ = (
+    "JSONFormatter",
+    "LogWriter",
+    "NonBlockingQueueHandler",
+    "QueueLogging",
+    "SamplingFilter",
+    "setup_queue_logging",
+    "shutdown_queue_logging",
+)
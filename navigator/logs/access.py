@@ -0,0 +1,44 @@
+"""Structured access log."""
+import logging
+from aiohttp.abc import AbstractAccessLogger
+from aiohttp import web
+from ..middlewares.metrics import route_name
+
+
+class JSONAccessLogger(AbstractAccessLogger):
+    """JSON access log: one record per request on the access logger of
+    the runner (``aiohttp.access``).
+
+    Fields: method, path, route (canonical route, low cardinality), status,
+    latency_ms, size, remote and user_agent. Error responses are logged
+    at WARNING so INFO sampling never hides them.
+
+    usage: ``web.AppRunner(app, access_log_class=JSONAccessLogger)``.
+    """
+    def log(
+        self,
+        request: web.BaseRequest,
+        response: web.StreamResponse,
+        time: float
+    ) -> None:
+        status = response.status
+        level = logging.WARNING if status >= 400 else logging.INFO
+        if not self.logger.isEnabledFor(level):
+            return
+        self.logger.log(
+            level,
+            "%s %s %s",
+            request.method,
+            request.path,
+            status,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "route": route_name(request),
+                "status": status,
+                "latency_ms": round(time * 1000, 3),
+                "size": response.body_length,
+                "remote": request.remote,
+                "user_agent": request.headers.get("User-Agent"),
+            },
+        )
@@ -0,0 +1,145 @@
+"""Non-blocking logging handlers.
+
+The event loop only puts records on a bounded in-memory queue
+(:class:`NonBlockingQueueHandler`); a :class:`LogWriter` thread drains it
+in batches and does the actual I/O on the real handlers (stream, file,
+syslog, remote...). When the queue is full, records are dropped and
+counted instead of blocking the caller.
+"""
+from typing import Optional
+import itertools
+import logging
+import queue
+import threading
+from logging.handlers import BaseRotatingHandler, QueueHandler
+
+
+class SamplingFilter(logging.Filter):
+    """Keep 1 of every ``1/rate`` records at or below *level*.
+
+    Records above *level* (warnings, errors) always pass. Deterministic
+    (a counter, not random) so it is cheap and predictable.
+    """
+    def __init__(self, rate: float = 1.0, level: int = logging.INFO) -> None:
+        super().__init__()
+        if not 0 < rate <= 1:
+            raise ValueError(f"Sampling rate must be in (0, 1], got {rate}")
+        self.rate = rate
+        self.level = level
+        self._every = max(1, round(1 / rate))
+        self._counter = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level or self._every == 1:
+            return True
+        return next(self._counter) % self._every == 0
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks: drops records when the queue is full."""
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped: int = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogWriter:
+    """Writer thread: drains the log queue and writes batches to *handlers*.
+
+    Stream/file handlers get a whole batch in a single ``write`` + ``flush``
+    instead of one flush per record; handlers exposing ``emit_batch(records)``
+    receive the batch as a list.
+    """
+    _sentinel = None
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        handlers: list,
+        batch_size: int = 256,
+        flush_interval: float = 0.5
+    ) -> None:
+        self.queue = log_queue
+        self.handlers: list = list(handlers)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="NAV-LogWriter", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Flush pending records and stop the thread."""
+        if self._thread is None:
+            return
+        self.queue.put(self._sentinel)
+        self._thread.join()
+        self._thread = None
+        for handler in self.handlers:
+            handler.flush()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            try:
+                record = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = []
+            while True:
+                if record is self._sentinel:
+                    stopping = True
+                    break
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self.write(batch)
+
+    def write(self, batch: list) -> None:
+        for handler in self.handlers:
+            try:
+                records = [
+                    r for r in batch
+                    if r.levelno >= handler.level and handler.filter(r)
+                ]
+                if not records:
+                    continue
+                if hasattr(handler, "emit_batch"):
+                    handler.emit_batch(records)
+                elif isinstance(handler, logging.StreamHandler) and not isinstance(
+                    handler, BaseRotatingHandler  # rotation checks run per record
+                ):
+                    self._write_stream(handler, records)
+                else:
+                    for record in records:
+                        handler.handle(record)
+            except Exception:  # pylint: disable=W0703
+                handler.handleError(batch[0])
+
+    @staticmethod
+    def _write_stream(handler: logging.StreamHandler, records: list) -> None:
+        text = "".join(
+            handler.format(r) + handler.terminator for r in records
+        )
+        with handler.lock:
+            stream = handler.stream
+            if stream is None and hasattr(handler, "_open"):
+                # FileHandler with delay=True
+                stream = handler.stream = handler._open()  # pylint: disable=W0212
+            stream.write(text)
+            stream.flush()
@@ -0,0 +1,108 @@
+"""
+navigator.metrics — request instrumentation and Prometheus endpoint.
+
+Usage::
+
+    app = Application(enable_metrics=True)  # or ENABLE_METRICS=true
+
+or, for a bare aiohttp application::
+
+    from navigator.metrics import setup_metrics
+    registry = setup_metrics(app, path="/metrics")
+
+Other components (event-loop monitor, admission control, background
+queues...) publish their own series through :func:`get_registry`.
+
+The admin-only sampling profiler (:mod:`navigator.metrics.profiler`) is
+registered the same way with ``enable_profiler=True``/``ENABLE_PROFILER``,
+and the event-loop lag monitor (:mod:`navigator.metrics.loop`) with
+``enable_loop_monitor=True``/``ENABLE_LOOP_MONITOR``.
+"""
+from typing import Optional
+from aiohttp import web
+from .registry import (
+    MetricsRegistry,
+    Metric,
+    Counter,
+    Gauge,
+    Histogram,
+    DEFAULT_BUCKETS,
+    SIZE_BUCKETS,
+)
+from .collectors import app_collector
+from .profiler import SamplingProfiler, PROFILER_KEY, setup_profiler
+from .loop import LoopMonitor, LOOP_MONITOR_KEY, setup_loop_monitor
+
+
+METRICS_KEY: web.AppKey[MetricsRegistry] = web.AppKey(
+    "metrics_registry", MetricsRegistry
+)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def get_registry(app: web.Application) -> Optional[MetricsRegistry]:
+    """Return the MetricsRegistry installed on *app* (or None)."""
+    return app.get(METRICS_KEY)
+
+
+async def metrics_handler(request: web.Request) -> web.Response:
+    """Expose the registry in the Prometheus text format."""
+    registry = request.app[METRICS_KEY]
+    return web.Response(
+        body=registry.render().encode("utf-8"),
+        headers={"Content-Type": CONTENT_TYPE},
+    )
+
+
+def setup_metrics(
+    app: web.Application,
+    path: str = "/metrics",
+    registry: Optional[MetricsRegistry] = None,
+    namespace: str = "navigator",
+    db_keys: tuple = ("database",)
+) -> MetricsRegistry:
+    """setup_metrics.
+
+    Install the metrics middleware (as the outermost middleware, so the
+    latency includes every other middleware), the default collectors and
+    the ``path`` endpoint on *app*.
+
+    Returns:
+        MetricsRegistry: the registry bound to the application.
+    """
+    # pylint: disable=C0415
+    from ..middlewares.metrics import metrics_middleware
+    if METRICS_KEY in app:
+        return app[METRICS_KEY]
+    registry = registry or MetricsRegistry(namespace=namespace)
+    app[METRICS_KEY] = registry
+    registry.register_collector(
+        app_collector(app, registry, db_keys=db_keys)
+    )
+    app.middlewares.insert(
+        0, metrics_middleware(registry, exclude=(path,))
+    )
+    app.router.add_get(path, metrics_handler, name="metrics", allow_head=False)
+    return registry
+
+
+__all__ = (
+    "MetricsRegistry",
+    "Metric",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "DEFAULT_BUCKETS",
+    "SIZE_BUCKETS",
+    "METRICS_KEY",
+    "CONTENT_TYPE",
+    "get_registry",
+    "metrics_handler",
+    "setup_metrics",
+    "SamplingProfiler",
+    "PROFILER_KEY",
+    "setup_profiler",
+    "LoopMonitor",
+    "LOOP_MONITOR_KEY",
+    "setup_loop_monitor",
+)
@@ -0,0 +1,133 @@
+"""Default collectors.
+
+Scrape-time gauges for the resources owned by an Application: database
+pools, background queues (and their executors), SSE and WebSocket
+connections. Every collector is best-effort: resources that are not
+configured (or expose no statistics) are simply skipped.
+"""
+import asyncio
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from aiohttp import web
+from .registry import MetricsRegistry, Gauge, Metric
+
+
+def _executor_stats(executor) -> tuple:
+    """Return (threads, pending work items) of a ThreadPoolExecutor."""
+    if not isinstance(executor, ThreadPoolExecutor):
+        return None
+    threads = len(getattr(executor, "_threads", ()))
+    try:
+        pending = executor._work_queue.qsize()  # pylint: disable=W0212
+    except (AttributeError, NotImplementedError):
+        pending = 0
+    return threads, pending
+
+
+def _pool_stats(conn) -> tuple:
+    """Return (size, idle) of an asyncdb pool, if the driver exposes it."""
+    pool = getattr(conn, "_pool", None)
+    if pool is None or not hasattr(pool, "get_size"):
+        return None
+    idle = pool.get_idle_size() if hasattr(pool, "get_idle_size") else 0
+    return pool.get_size(), idle
+
+
+def app_collector(
+    app: web.Application,
+    registry: MetricsRegistry,
+    db_keys: tuple = ("database",)
+):
+    """Build a collector bound to *app*."""
+    name = registry.metric_name
+
+    def collect() -> Iterable[Metric]:
+        metrics: list[Metric] = []
+        # Database pools.
+        pool_size = Gauge(
+            name("db_pool_size"), "Database pool connections.", ("pool",)
+        )
+        pool_idle = Gauge(
+            name("db_pool_idle"), "Idle database pool connections.", ("pool",)
+        )
+        for key in db_keys:
+            stats = _pool_stats(app.get(key))
+            if stats:
+                pool_size.set(stats[0], (key,))
+                pool_idle.set(stats[1], (key,))
+        metrics.extend((pool_size, pool_idle))
+        # Background queues (lazy import: background is optional here).
+        try:
+            from ..background.service import (  # pylint: disable=C0415
+                SERVICES_REGISTRY_KEY
+            )
+            services = app.get(SERVICES_REGISTRY_KEY) or {}
+        except ImportError:
+            services = {}
+        depth = Gauge(
+            name("background_queue_depth"), "Tasks waiting in queue.", ("service",)
+        )
+        capacity = Gauge(
+            name("background_queue_capacity"), "Queue max size.", ("service",)
+        )
+        consumers = Gauge(
+            name("background_queue_consumers"), "Queue consumers.", ("service",)
+        )
+        busy = Gauge(
+            name("background_queue_busy_consumers"),
+            "Queue consumers running a task.",
+            ("service",),
+        )
+        lane_depth = Gauge(
+            name("background_lane_depth"),
+            "Tasks waiting per priority lane.",
+            ("service", "lane"),
+        )
+        threads = Gauge(
+            name("executor_threads"), "Executor worker threads.", ("executor",)
+        )
+        pending = Gauge(
+            name("executor_pending"), "Executor pending work items.", ("executor",)
+        )
+        for svc_name, service in services.items():
+            queue = service.queue
+            depth.set(queue.queue.qsize(), (svc_name,))
+            capacity.set(queue.queue.maxsize, (svc_name,))
+            consumers.set(len(queue.consumers), (svc_name,))
+            if hasattr(queue, "busy"):
+                busy.set(queue.busy, (svc_name,))
+            if hasattr(queue.queue, "lanes"):
+                for lane, stats in queue.queue.lanes().items():
+                    lane_depth.set(stats["depth"], (svc_name, lane))
+            stats = _executor_stats(getattr(queue, "executor", None))
+            if stats:
+                threads.set(stats[0], (f"background:{svc_name}",))
+                pending.set(stats[1], (f"background:{svc_name}",))
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        stats = _executor_stats(getattr(loop, "_default_executor", None))
+        if stats:
+            threads.set(stats[0], ("default",))
+            pending.set(stats[1], ("default",))
+        metrics.extend(
+            (depth, capacity, consumers, busy, lane_depth, threads, pending)
+        )
+        # Server-Sent Events / WebSockets.
+        connections = Gauge(
+            name("connections"), "Open long-lived connections.", ("kind",)
+        )
+        sse = app.get("sse_manager")
+        if sse is not None and hasattr(sse, "get_stats"):
+            connections.set(sse.get_stats().get("active_connections", 0), ("sse",))
+        ws = app.get("ws_manager")
+        if ws is not None and hasattr(ws, "clients"):
+            connections.set(len(ws.clients), ("websocket",))
+        sockets = app.get("sockets")
+        if sockets is not None:
+            connections.set(len(sockets), ("channel",))
+        metrics.append(connections)
+        return metrics
+
+    return collect
@@ -0,0 +1,214 @@
+"""Event-Loop Monitor.
+
+Measure how late the event loop runs scheduled callbacks (scheduling lag)
+and detect the callbacks that block it.
+
+* A ticker coroutine sleeps ``interval`` seconds and records how much
+  later than expected it was woken up (``time.perf_counter``).
+* A watchdog thread checks the ticker heartbeat; when the loop has not
+  come back for more than ``slow_callback_duration`` seconds, it logs the
+  stack of the loop thread (and the running task), i.e. the culprit,
+  while it is still blocking.
+
+Lag percentiles are exported to the metrics registry (when installed),
+and :attr:`LoopMonitor.overloaded` can feed a load-shedding decision.
+"""
+from typing import Optional
+from collections import deque
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from aiohttp import web
+from navconfig.logging import logging
+from .registry import MetricsRegistry, Gauge, Metric
+
+
+LOOP_MONITOR_KEY: web.AppKey["LoopMonitor"] = web.AppKey("loop_monitor")
+LAG_BUCKETS: tuple = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+
+class LoopMonitor:
+    """LoopMonitor.
+
+    Args:
+        interval: ticker period, in seconds.
+        slow_callback_duration: blocking time (seconds) after which the
+            loop stack is logged, mirrors ``loop.slow_callback_duration``.
+        overload_lag: lag (seconds) above which the loop is considered
+            overloaded (see :attr:`overloaded`).
+        window: number of lag samples kept for percentiles.
+        registry: optional metrics registry to publish into.
+    """
+    def __init__(
+        self,
+        interval: float = 0.25,
+        slow_callback_duration: float = 0.1,
+        overload_lag: float = 0.1,
+        window: int = 1024,
+        registry: Optional[MetricsRegistry] = None
+    ) -> None:
+        self.interval = interval
+        self.slow_callback_duration = slow_callback_duration
+        self.overload_lag = overload_lag
+        self._samples: deque = deque(maxlen=window)
+        self.lag: float = 0.0  # last measured lag
+        self.ewma: float = 0.0  # smoothed lag (alpha=0.2)
+        self.blocked: int = 0
+        self._heartbeat: float = time.perf_counter()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.logger = logging.getLogger("NAV.LoopMonitor")
+        self._histogram = None
+        self._blocked_counter = None
+        if registry is not None:
+            self.register(registry)
+
+    # -----------------------------------------------------------
+    # Metrics
+    # -----------------------------------------------------------
+    def register(self, registry: MetricsRegistry) -> None:
+        self._histogram = registry.histogram(
+            "event_loop_lag_seconds",
+            "Event loop scheduling lag.",
+            buckets=LAG_BUCKETS,
+        )
+        self._blocked_counter = registry.counter(
+            "event_loop_blocked_total",
+            "Times the loop was blocked longer than slow_callback_duration.",
+        )
+        name = registry.metric_name
+
+        def collect() -> list[Metric]:
+            gauge = Gauge(
+                name("event_loop_lag_quantile_seconds"),
+                "Event loop lag percentiles over the recent window.",
+                ("quantile",),
+            )
+            for q, value in self.percentiles().items():
+                gauge.set(value, (str(q),))
+            return [gauge]
+
+        registry.register_collector(collect)
+
+    def percentiles(self, quantiles: tuple = (0.5, 0.9, 0.99)) -> dict:
+        if not self._samples:
+            return {q: 0.0 for q in quantiles}
+        ordered = sorted(self._samples)
+        last = len(ordered) - 1
+        return {q: ordered[min(int(q * len(ordered)), last)] for q in quantiles}
+
+    @property
+    def overloaded(self) -> bool:
+        """True when the smoothed lag exceeds ``overload_lag``."""
+        return self.ewma > self.overload_lag
+
+    # -----------------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------------
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._ticker(), name="nav-loop-monitor")
+        self._watchdog = threading.Thread(
+            target=self._watch, name="nav-loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        self.logger.info(
+            f"Loop Monitor started (interval={self.interval}s, "
+            f"slow callback={self.slow_callback_duration}s)"
+        )
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.interval * 2)
+            self._watchdog = None
+
+    async def on_startup(self, app: web.Application) -> None:
+        self.start()
+
+    async def on_cleanup(self, app: web.Application) -> None:
+        await self.stop()
+
+    # -----------------------------------------------------------
+    # Internals
+    # -----------------------------------------------------------
+    def record(self, lag: float) -> None:
+        lag = max(lag, 0.0)
+        self.lag = lag
+        self.ewma = 0.8 * self.ewma + 0.2 * lag
+        self._samples.append(lag)
+        if self._histogram is not None:
+            self._histogram.observe(lag)
+
+    async def _ticker(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._heartbeat = now
+            self.record(now - expected)
+
+    def _watch(self) -> None:
+        reported = False
+        while not self._stop.wait(self.slow_callback_duration / 2):
+            stalled = time.perf_counter() - self._heartbeat - self.interval
+            if stalled <= self.slow_callback_duration:
+                reported = False
+                continue
+            if reported:
+                continue  # report each blocking episode once.
+            reported = True
+            self.blocked += 1
+            if self._blocked_counter is not None:
+                self._blocked_counter.inc()
+            self.report_blocking(stalled)
+
+    def report_blocking(self, stalled: float) -> None:
+        """Log the stack currently blocking the loop thread."""
+        frame = sys._current_frames().get(self._loop_thread)  # pylint: disable=W0212
+        if frame is None:
+            return
+        stack = "".join(traceback.format_stack(frame))
+        task = None
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            pass
+        self.logger.warning(
+            f"Event loop blocked for more than {stalled:.3f}s "
+            f"by task {task!r}:\n{stack}"
+        )
+
+
+def setup_loop_monitor(
+    app: web.Application,
+    registry: Optional[MetricsRegistry] = None,
+    **kwargs
+) -> LoopMonitor:
+    """Attach a LoopMonitor to *app* lifecycle signals."""
+    if LOOP_MONITOR_KEY in app:
+        return app[LOOP_MONITOR_KEY]
+    monitor = LoopMonitor(registry=registry, **kwargs)
+    app[LOOP_MONITOR_KEY] = monitor
+    app.on_startup.append(monitor.on_startup)
+    app.on_cleanup.append(monitor.on_cleanup)
+    return monitor
@@ -0,0 +1,255 @@
+"""Sampling Profiler.
+
+Low-overhead, pure-Python stack sampler for live workers. A daemon thread
+reads the frame of the event-loop thread (``sys._current_frames``) every
+``interval`` seconds while, on the loop itself, the stacks of every
+pending asyncio Task are snapshotted. Results are returned as collapsed
+stacks (``flamegraph.pl`` / speedscope compatible) or speedscope JSON.
+
+The endpoint is admin-only (a ``PROFILER_TOKEN`` bearer token or a
+superuser session) and rate limited: one profile at a time per worker and
+a cool-down between runs.
+"""
+from typing import Optional
+from collections import Counter
+import asyncio
+import hmac
+import sys
+import threading
+import time
+from aiohttp import web
+from navconfig.logging import logging
+from ..libs.json import json_encoder
+
+
+PROFILER_KEY: web.AppKey["SamplingProfiler"] = web.AppKey("sampling_profiler")
+FORMATS = ("collapsed", "speedscope")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({code.co_filename}:{frame.f_lineno})"
+
+
+def collapse_frame(frame) -> str:
+    """Return the collapsed (root first, ``;`` separated) stack of *frame*."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def collapse_task(task: asyncio.Task) -> str:
+    """Return the collapsed coroutine stack of a pending asyncio Task."""
+    labels = [f"task:{task.get_name()}"]
+    labels.extend(_frame_label(f) for f in task.get_stack())
+    return ";".join(labels)
+
+
+class StackSampler:
+    """StackSampler.
+
+    Sample the stack of one thread (by default, the caller's) from a
+    background daemon thread.
+    """
+    def __init__(
+        self,
+        interval: float = 0.005,
+        thread_id: Optional[int] = None
+    ) -> None:
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="nav-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # pylint: disable=W0212
+            if frame is not None:
+                self.samples[collapse_frame(frame)] += 1
+            del frame
+
+
+def to_collapsed(samples: Counter) -> str:
+    """Render samples as collapsed stacks (``stack count`` per line)."""
+    return "\n".join(
+        f"{stack} {count}" for stack, count in samples.most_common()
+    ) + "\n"
+
+
+def to_speedscope(profiles: dict, name: str = "navigator") -> dict:
+    """Render ``{profile name: samples}`` as a speedscope document."""
+    frames: list = []
+    index: dict = {}
+    documents = []
+    for profile_name, samples in profiles.items():
+        stacks = []
+        weights = []
+        for stack, count in samples.items():
+            ids = []
+            for label in stack.split(";"):
+                if label not in index:
+                    index[label] = len(frames)
+                    frames.append({"name": label})
+                ids.append(index[label])
+            stacks.append(ids)
+            weights.append(count)
+        documents.append({
+            "type": "sampled",
+            "name": profile_name,
+            "unit": "none",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": stacks,
+            "weights": weights,
+        })
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "shared": {"frames": frames},
+        "profiles": documents,
+        "exporter": "navigator",
+    }
+
+
+class SamplingProfiler:
+    """SamplingProfiler.
+
+    On-demand profiler bound to an application. Only one profile can run
+    at a time and runs are separated by ``cooldown`` seconds.
+    """
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        max_seconds: float = 60.0,
+        cooldown: float = 30.0,
+        task_interval: float = 0.05
+    ) -> None:
+        self.token = token
+        self.max_seconds = max_seconds
+        self.cooldown = cooldown
+        self.task_interval = task_interval
+        self._lock = asyncio.Lock()
+        self._last_run: float = 0.0
+        self.logger = logging.getLogger("NAV.Profiler")
+
+    async def profile(
+        self,
+        seconds: float = 5.0,
+        interval: float = 0.005,
+        include_tasks: bool = True
+    ) -> dict:
+        """Profile the running event loop for *seconds*.
+
+        Returns:
+            dict: ``{"loop": Counter, "tasks": Counter}`` of collapsed stacks.
+        """
+        seconds = min(max(seconds, 0.1), self.max_seconds)
+        sampler = StackSampler(interval=interval)
+        tasks: Counter = Counter()
+        current = asyncio.current_task()
+        sampler.start()
+        try:
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.task_interval)
+                if not include_tasks:
+                    continue
+                for task in asyncio.all_tasks():
+                    if task is current or task.done():
+                        continue
+                    tasks[collapse_task(task)] += 1
+        finally:
+            sampler.stop()
+        result = {"loop": sampler.samples}
+        if include_tasks:
+            result["tasks"] = tasks
+        return result
+
+    async def is_authorized(self, request: web.Request) -> bool:
+        """Bearer ``PROFILER_TOKEN`` or a superuser session."""
+        if self.token:
+            header = request.headers.get("Authorization", "")
+            supplied = header[7:] if header.startswith("Bearer ") else ""
+            supplied = request.headers.get("X-Profiler-Token", supplied)
+            if supplied and hmac.compare_digest(supplied, self.token):
+                return True
+        try:
+            from navigator_session import get_session  # pylint: disable=C0415
+            session = await get_session(request)
+        except Exception:  # pylint: disable=W0703
+            return False
+        if not session:
+            return False
+        try:
+            data = session['session'] if 'session' in session else session
+            return bool(data.get('superuser', False))
+        except (AttributeError, KeyError, TypeError):
+            return False
+
+    async def handler(self, request: web.Request) -> web.StreamResponse:
+        """GET ?seconds=5&interval=0.005&format=collapsed|speedscope&tasks=1"""
+        if not await self.is_authorized(request):
+            raise web.HTTPForbidden(reason="Profiler requires admin access.")
+        try:
+            seconds = float(request.query.get("seconds", 5))
+            interval = max(float(request.query.get("interval", 0.005)), 0.001)
+        except ValueError as ex:
+            raise web.HTTPBadRequest(reason=f"Invalid parameter: {ex}") from ex
+        fmt = request.query.get("format", "collapsed")
+        if fmt not in FORMATS:
+            raise web.HTTPBadRequest(reason=f"format must be one of {FORMATS}")
+        include_tasks = request.query.get("tasks", "1") not in ("0", "false")
+        wait = self._last_run + self.cooldown - time.monotonic()
+        if self._lock.locked() or wait > 0:
+            raise web.HTTPTooManyRequests(
+                reason="Profiler busy or cooling down.",
+                headers={"Retry-After": str(max(int(wait) + 1, 1))}
+            )
+        async with self._lock:
+            self.logger.warning(
+                f"Profiling worker for {seconds}s (interval={interval}s)"
+            )
+            try:
+                profiles = await self.profile(seconds, interval, include_tasks)
+            finally:
+                self._last_run = time.monotonic()
+        if fmt == "speedscope":
+            return web.Response(
+                body=json_encoder(to_speedscope(profiles)).encode("utf-8"),
+                content_type="application/json",
+            )
+        text = "".join(
+            to_collapsed(samples) for samples in profiles.values() if samples
+        )
+        return web.Response(text=text, content_type="text/plain")
+
+
+def setup_profiler(
+    app: web.Application,
+    path: str = "/_profiler",
+    **kwargs
+) -> SamplingProfiler:
+    """Register the profiler endpoint on *app*."""
+    if PROFILER_KEY in app:
+        return app[PROFILER_KEY]
+    profiler = SamplingProfiler(**kwargs)
+    app[PROFILER_KEY] = profiler
+    app.router.add_get(path, profiler.handler, name="profiler", allow_head=False)
+    return profiler
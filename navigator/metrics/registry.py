@@ -0,0 +1,268 @@
+"""Metrics Registry.
+
+Minimal, dependency-free metric primitives (Counter, Gauge, Histogram)
+rendered in the Prometheus text exposition format (version 0.0.4).
+
+Every update happens on the event-loop thread of the worker that owns the
+registry, so the aggregators are plain dicts/lists without any lock: one
+registry per worker process, scraped individually.
+"""
+from typing import Any, Optional, Union
+from collections.abc import Callable, Iterable
+from bisect import bisect_left
+import math
+
+
+LabelValues = tuple
+Number = Union[int, float]
+
+# Latency buckets (seconds), tuned for web handlers.
+DEFAULT_BUCKETS: tuple = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+# Payload size buckets (bytes).
+SIZE_BUCKETS: tuple = (
+    128, 512, 1024, 4096, 16384, 65536,
+    262144, 1048576, 4194304, 16777216
+)
+
+
+def _format_value(value: Number) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, float) and value.is_integer():
+        return f"{value:.1f}"
+    return str(value)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[Any]) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    """Metric.
+
+    Base class for all metrics, a family of samples sharing a name and a
+    set of label names.
+    """
+    kind: str = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str = "",
+        labelnames: Iterable[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: tuple = tuple(labelnames)
+        self._values: dict[LabelValues, Number] = {}
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name}>"
+
+    def clear(self) -> None:
+        self._values.clear()
+
+    def get(self, labels: LabelValues = ()) -> Number:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> Iterable[tuple[str, LabelValues, tuple, Number]]:
+        """Yield (name, label names, label values, value) tuples."""
+        for labels, value in self._values.items():
+            yield self.name, self.labelnames, labels, value
+
+    def expose(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for name, names, values, value in self.samples():
+            lines.append(
+                f"{name}{_format_labels(names, values)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing counter."""
+    kind: str = "counter"
+
+    def inc(self, labels: LabelValues = (), amount: Number = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+    kind: str = "gauge"
+
+    def set(self, value: Number, labels: LabelValues = ()) -> None:
+        self._values[labels] = value
+
+    def inc(self, labels: LabelValues = (), amount: Number = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, labels: LabelValues = (), amount: Number = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+
+class Histogram(Metric):
+    """Histogram with fixed, cumulative buckets."""
+    kind: str = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str = "",
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[Number] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets: tuple = tuple(sorted(buckets))
+        # per label-set: [bucket counts..., +Inf count], sum
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._sums.clear()
+
+    def observe(self, value: Number, labels: LabelValues = ()) -> None:
+        try:
+            counts = self._counts[labels]
+        except KeyError:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+        # non-cumulative storage; made cumulative at exposition time.
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    def count(self, labels: LabelValues = ()) -> int:
+        return sum(self._counts.get(labels, ()))
+
+    def sum(self, labels: LabelValues = ()) -> float:
+        return self._sums.get(labels, 0.0)
+
+    def quantile(self, q: float, labels: LabelValues = ()) -> Optional[float]:
+        """Estimate the *q* quantile (0..1) using the bucket upper bounds."""
+        counts = self._counts.get(labels)
+        if not counts:
+            return None
+        target = q * sum(counts)
+        acc = 0
+        for bound, cnt in zip(self.buckets + (math.inf,), counts):
+            acc += cnt
+            if acc >= target:
+                return bound
+        return math.inf
+
+    def samples(self) -> Iterable[tuple[str, LabelValues, tuple, Number]]:
+        names = self.labelnames + ("le",)
+        for labels, counts in self._counts.items():
+            acc = 0
+            for bound, cnt in zip(self.buckets + (math.inf,), counts):
+                acc += cnt
+                yield (
+                    f"{self.name}_bucket", names,
+                    labels + (_format_value(bound),), acc
+                )
+            yield f"{self.name}_count", self.labelnames, labels, acc
+            yield f"{self.name}_sum", self.labelnames, labels, self._sums[labels]
+
+
+Collector = Callable[[], Iterable[Metric]]
+
+
+class MetricsRegistry:
+    """MetricsRegistry.
+
+    Holds the metrics of a worker process and the *collectors*: callables
+    evaluated at scrape time that return freshly built metrics (used for
+    gauges whose value lives somewhere else, e.g. DB pool or queue size).
+    """
+    def __init__(self, namespace: str = "navigator") -> None:
+        self.namespace = namespace
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: list[Collector] = []
+
+    def metric_name(self, name: str) -> str:
+        """Return *name* prefixed with the registry namespace."""
+        if self.namespace and not name.startswith(f"{self.namespace}_"):
+            return f"{self.namespace}_{name}"
+        return name
+
+    def _register(self, cls: type, name: str, *args, **kwargs) -> Metric:
+        name = self.metric_name(name)
+        try:
+            metric = self._metrics[name]
+        except KeyError:
+            metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+        if not isinstance(metric, cls):
+            raise ValueError(
+                f"Metric {name} already registered as {metric.kind}"
+            )
+        return metric
+
+    def counter(
+        self,
+        name: str,
+        documentation: str = "",
+        labelnames: Iterable[str] = ()
+    ) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str = "",
+        labelnames: Iterable[str] = ()
+    ) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str = "",
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[Number] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(self.metric_name(name))
+
+    def register_collector(self, collector: Collector) -> None:
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def unregister_collector(self, collector: Collector) -> None:
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def collect(self) -> list[Metric]:
+        metrics = list(self._metrics.values())
+        for collector in self._collectors:
+            try:
+                metrics.extend(collector())
+            except Exception:  # pylint: disable=W0703
+                # a broken collector must never break the scrape.
+                continue
+        return metrics
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        lines: list[str] = []
+        for metric in self.collect():
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
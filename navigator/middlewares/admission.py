@@ -0,0 +1,253 @@
+"""Admission Control Middleware.
+
+Adaptive load shedding: a concurrency limit tuned with AIMD (additive
+increase while latency and event-loop lag are healthy, multiplicative
+decrease under pressure) gates the requests. Each route belongs to a
+priority class which may use only a fraction of the limit; requests that
+do not fit wait briefly in a bounded queue (or are rejected right away
+for ``low`` priority) with ``503 Service Unavailable`` + ``Retry-After``.
+
+Pressure signals: in-flight count, latency against a target, the
+:class:`~navigator.metrics.loop.LoopMonitor` lag and any extra callables
+(e.g. :func:`db_pool_saturated`). Event-loop lag is *hard* pressure and
+sheds ``low`` and ``normal`` requests; the extra signals are *soft*: they
+shed ``low`` requests only, ``normal`` ones still waiting for a slot.
+"""
+from typing import Optional
+from collections import deque
+from collections.abc import Awaitable, Callable
+from time import monotonic, perf_counter
+import asyncio
+import contextlib
+from aiohttp import web
+from navconfig.logging import logging
+from .metrics import route_name
+
+
+ADMISSION_KEY: web.AppKey["AdmissionController"] = web.AppKey("admission_control")
+
+# Share of the concurrency limit each priority class may use.
+PRIORITIES: dict = {
+    "critical": None,  # never shed
+    "high": 1.0,
+    "normal": 0.8,
+    "low": 0.5,
+}
+DEFAULT_PRIORITY = "normal"
+
+
+def priority(level: str) -> Callable:
+    """Decorator: set the admission priority class of a handler."""
+    if level not in PRIORITIES:
+        raise ValueError(
+            f"Invalid priority {level!r}, expected one of {list(PRIORITIES)}"
+        )
+
+    def _decorator(handler: Callable) -> Callable:
+        handler._nav_priority = level  # pylint: disable=W0212
+        return handler
+
+    return _decorator
+
+
+def db_pool_saturated(app: web.Application, key: str = "database") -> Callable:
+    """Pressure signal: the DB pool is at max size with no idle connection."""
+    def _signal() -> bool:
+        pool = getattr(app.get(key), "_pool", None)
+        if pool is None or not hasattr(pool, "get_idle_size"):
+            return False
+        maxsize = getattr(pool, "_maxsize", None)
+        return (
+            pool.get_idle_size() == 0
+            and maxsize is not None
+            and pool.get_size() >= maxsize
+        )
+    return _signal
+
+
+class AdmissionController:
+    """AdmissionController.
+
+    Args:
+        initial_limit: starting concurrency limit.
+        min_limit / max_limit: bounds of the adaptive limit.
+        target_latency: latency (seconds) above which a completion counts
+            as a congestion signal.
+        backoff: multiplicative decrease factor.
+        queue_size: max requests waiting for a slot.
+        queue_timeout: max seconds a request waits for a slot.
+        retry_after: ``Retry-After`` header value (seconds).
+        routes: ``{canonical route: priority}`` overrides.
+        loop_monitor: optional LoopMonitor (lag signal).
+        signals: extra callables returning True under pressure.
+    """
+    def __init__(
+        self,
+        initial_limit: int = 100,
+        min_limit: int = 10,
+        max_limit: int = 1000,
+        target_latency: float = 1.0,
+        backoff: float = 0.9,
+        queue_size: int = 100,
+        queue_timeout: float = 1.0,
+        retry_after: int = 1,
+        routes: Optional[dict] = None,
+        loop_monitor=None,
+        signals: Optional[list] = None,
+        registry=None
+    ) -> None:
+        self.limit: float = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = str(retry_after)
+        self.routes: dict = routes or {}
+        self.loop_monitor = loop_monitor
+        self.signals: list = list(signals or [])
+        self.in_flight: int = 0
+        self._waiters: deque = deque()
+        self._last_decrease: float = 0.0
+        self.logger = logging.getLogger("NAV.Admission")
+        self._admitted = self._rejected = self._limit_gauge = None
+        if registry is not None:
+            self.register(registry)
+
+    def register(self, registry) -> None:
+        self._admitted = registry.counter(
+            "admission_admitted_total", "Admitted requests.", ("priority",)
+        )
+        self._rejected = registry.counter(
+            "admission_rejected_total", "Shed requests (503).", ("priority",)
+        )
+        self._limit_gauge = registry.gauge(
+            "admission_limit", "Adaptive concurrency limit."
+        )
+        self._limit_gauge.set(int(self.limit))
+
+    # -----------------------------------------------------------
+    # Decision
+    # -----------------------------------------------------------
+    def priority_of(self, request: web.Request) -> str:
+        level = getattr(request.match_info.handler, "_nav_priority", None)
+        if level is None:
+            level = self.routes.get(route_name(request), DEFAULT_PRIORITY)
+        return level
+
+    def pressure(self) -> Optional[str]:
+        """``"hard"`` (event-loop lag), ``"soft"`` (an extra signal) or None."""
+        if self.loop_monitor is not None and self.loop_monitor.overloaded:
+            return "hard"
+        for signal in self.signals:
+            try:
+                if signal():
+                    return "soft"
+            except Exception:  # pylint: disable=W0703
+                continue
+        return None
+
+    def under_pressure(self) -> bool:
+        return self.pressure() is not None
+
+    def has_capacity(self, level: str) -> bool:
+        share = PRIORITIES[level]
+        return share is None or self.in_flight < self.limit * share
+
+    def _on_complete(self, latency: float, pressure: bool) -> None:
+        """AIMD: grow by ~1 per limit's worth of good completions."""
+        if pressure or latency > self.target_latency:
+            now = monotonic()
+            # at most one decrease per target latency window.
+            if now - self._last_decrease > self.target_latency:
+                self._last_decrease = now
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+        elif self.in_flight >= self.limit * 0.5:
+            # only grow when the limit is actually being used.
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+        if self._limit_gauge is not None:
+            self._limit_gauge.set(int(self.limit))
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        # the first waiter whose class fits: a waiting "normal" request
+        # does not hold back a "high" one.
+        for index, (waiter, level) in enumerate(self._waiters):
+            if not waiter.done() and self.has_capacity(level):
+                del self._waiters[index]
+                waiter.set_result(True)
+                break
+
+    async def _wait_for_slot(self, level: str) -> bool:
+        if level == "low" or len(self._waiters) >= self.queue_size:
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (waiter, level)
+        self._waiters.append(entry)
+        try:
+            return await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            # timed out or cancelled (a woken waiter is already removed).
+            with contextlib.suppress(ValueError):
+                self._waiters.remove(entry)
+
+    def reject(self, level: str) -> web.HTTPServiceUnavailable:
+        if self._rejected is not None:
+            self._rejected.inc((level,))
+        return web.HTTPServiceUnavailable(
+            reason="Server overloaded, retry later.",
+            headers={"Retry-After": self.retry_after},
+        )
+
+    # -----------------------------------------------------------
+    # Middleware
+    # -----------------------------------------------------------
+    @web.middleware
+    async def middleware(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]]
+    ) -> web.StreamResponse:
+        level = self.priority_of(request)
+        pressure = self.pressure()
+        if PRIORITIES[level] is not None:
+            shed = ("low", "normal") if pressure == "hard" else ("low",)
+            if pressure is not None and level in shed:
+                raise self.reject(level)
+            if not self.has_capacity(level) and not await self._wait_for_slot(level):
+                raise self.reject(level)
+        if self._admitted is not None:
+            self._admitted.inc((level,))
+        self.in_flight += 1
+        started = perf_counter()
+        try:
+            return await handler(request)
+        finally:
+            self._on_complete(perf_counter() - started, pressure is not None)
+            self._release()
+
+
+def setup_admission_control(
+    app: web.Application,
+    **kwargs
+) -> AdmissionController:
+    """Install the admission-control middleware on *app*.
+
+    Placed right after the metrics middleware (if any) so shed requests
+    are still counted.
+    """
+    # pylint: disable=C0415
+    from ..metrics import METRICS_KEY, LOOP_MONITOR_KEY
+    if ADMISSION_KEY in app:
+        return app[ADMISSION_KEY]
+    kwargs.setdefault("loop_monitor", app.get(LOOP_MONITOR_KEY))
+    kwargs.setdefault("registry", app.get(METRICS_KEY))
+    kwargs.setdefault("signals", [db_pool_saturated(app)])
+    controller = AdmissionController(**kwargs)
+    app[ADMISSION_KEY] = controller
+    index = 1 if METRICS_KEY in app else 0
+    app.middlewares.insert(index, controller.middleware)
+    return controller
@@ -0,0 +1,188 @@
+"""Response Compression.
+
+Negotiates gzip/brotli/zstd per ``Accept-Encoding``:
+
+* ``web.Response`` bodies (``json_response``, templates, ...) are compressed
+  with the best coding; bodies over ``offload_size`` are compressed in an
+  executor so big payloads never stall the event loop.
+* streamed ``StreamResponse`` output is compressed chunk by chunk with
+  aiohttp's incremental gzip compressor: the middleware negotiates it
+  before the handler runs and it is started as the response is prepared,
+  before its headers are written.
+* static files are not touched here: ``add_static`` serves precompressed
+  ``.br``/``.gz`` siblings (see :func:`precompress_directory`) via sendfile.
+"""
+from typing import Optional
+from collections.abc import Awaitable, Callable, Iterable
+from concurrent.futures import Executor
+import asyncio
+from aiohttp import web, hdrs
+from ..utils.compression import (
+    available_codings,
+    compress,
+    is_compressible,
+    negotiate,
+    precompress_directory,
+)
+
+
+COMPRESSION_KEY: web.AppKey["ResponseCompressor"] = web.AppKey(
+    "response_compressor"
+)
+
+# content-types that must be flushed as produced.
+_STREAM_SKIP: tuple = ("text/event-stream",)
+
+# request key: content-coding negotiated for a streamed response.
+STREAM_CODING = (
+    web.RequestKey("navigator.compression.coding", str)
+    if hasattr(web, "RequestKey") else "navigator.compression.coding"
+)
+
+
+def add_vary(response: web.StreamResponse, header: str = hdrs.ACCEPT_ENCODING):
+    vary = response.headers.get(hdrs.VARY)
+    if not vary:
+        response.headers[hdrs.VARY] = header
+    elif header.lower() not in vary.lower() and vary != "*":
+        response.headers[hdrs.VARY] = f"{vary}, {header}"
+
+
+def etag_for(etag: str, coding: str) -> str:
+    """ETag of the encoded representation (must differ from identity)."""
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{coding}"'
+    return etag
+
+
+class ResponseCompressor:
+    """ResponseCompressor.
+
+    Args:
+        min_size: bodies smaller than this are sent as-is.
+        offload_size: bodies from this size are compressed in *executor*.
+        codings: allowed content-codings (default: all available).
+        levels: compression level per coding.
+        executor: executor for large bodies (default: loop executor).
+    """
+    def __init__(
+        self,
+        min_size: int = 1024,
+        offload_size: int = 64 * 1024,
+        codings: Optional[Iterable[str]] = None,
+        levels: Optional[dict] = None,
+        executor: Optional[Executor] = None
+    ) -> None:
+        self.min_size = min_size
+        self.offload_size = offload_size
+        supported = available_codings()
+        self.codings: tuple = tuple(
+            c for c in (codings or supported) if c in supported
+        )
+        self.levels: dict = levels or {}
+        self.executor = executor
+
+    def _should_compress(self, request: web.Request, response) -> bool:
+        return (
+            request.method != hdrs.METH_HEAD
+            and hdrs.CONTENT_ENCODING not in response.headers
+            and response.status not in (204, 304)
+            and is_compressible(response.content_type)
+        )
+
+    async def compress_body(self, request: web.Request, response: web.Response):
+        body = response.body
+        if not isinstance(body, (bytes, bytearray)) or len(body) < self.min_size:
+            return
+        if not self._should_compress(request, response):
+            return
+        add_vary(response)
+        coding = negotiate(request.headers.get(hdrs.ACCEPT_ENCODING), self.codings)
+        if coding is None:
+            return
+        level = self.levels.get(coding)
+        if len(body) >= self.offload_size:
+            loop = asyncio.get_running_loop()
+            data = await loop.run_in_executor(
+                self.executor, compress, bytes(body), coding, level
+            )
+        else:
+            data = compress(body, coding, level)
+        response.body = data
+        response.headers[hdrs.CONTENT_ENCODING] = coding
+        if hdrs.ETAG in response.headers:
+            response.headers[hdrs.ETAG] = etag_for(response.headers[hdrs.ETAG], coding)
+
+    async def on_response_prepare(
+        self,
+        request: web.Request,
+        response: web.StreamResponse
+    ) -> None:
+        """Incremental compression of streamed (chunked) responses.
+
+        aiohttp runs this hook once the headers are built but before they
+        are written: the coding negotiated by the middleware is started
+        here, with its Content-Encoding/Vary headers.
+        """
+        if isinstance(response, (web.Response, web.FileResponse)):
+            return
+        if isinstance(response, web.WebSocketResponse):
+            return
+        coding = request.get(STREAM_CODING)
+        if coding is None or response.content_type in _STREAM_SKIP:
+            return
+        if not self._should_compress(request, response):
+            return
+        add_vary(response)
+        if response.compression or response.content_length is not None:
+            return  # compressed by the handler, or a fixed length body
+        # pylint: disable=W0212
+        await response._do_start_compression(web.ContentCoding(coding))
+
+    @web.middleware
+    async def middleware(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]]
+    ) -> web.StreamResponse:
+        # a streamed response prepares (sends its headers) in the handler.
+        coding = negotiate(
+            request.headers.get(hdrs.ACCEPT_ENCODING),
+            [c for c in self.codings if c == "gzip"]
+        )
+        if coding is not None:
+            request[STREAM_CODING] = coding
+        response = await handler(request)
+        if isinstance(response, web.Response) and not response.prepared:
+            await self.compress_body(request, response)
+        return response
+
+
+def setup_compression(
+    app: web.Application,
+    static_dirs: Iterable[str] = (),
+    precompress: bool = False,
+    **kwargs
+) -> ResponseCompressor:
+    """Enable response compression on *app*.
+
+    With *precompress*, missing or stale ``.br``/``.gz`` siblings of the
+    files in *static_dirs* are generated at startup (in an executor); the
+    iterable is read on startup, so directories added later still count.
+    """
+    if COMPRESSION_KEY in app:
+        return app[COMPRESSION_KEY]
+    compressor = ResponseCompressor(**kwargs)
+    app[COMPRESSION_KEY] = compressor
+    # innermost: metrics and access logs see the encoded size.
+    app.middlewares.append(compressor.middleware)
+    app.on_response_prepare.append(compressor.on_response_prepare)
+    if precompress:
+
+        async def _precompress(app: web.Application):  # pylint: disable=W0613
+            loop = asyncio.get_running_loop()
+            for directory in static_dirs:
+                await loop.run_in_executor(None, precompress_directory, directory)
+
+        app.on_startup.append(_precompress)
+    return compressor
@@ -10,6 +10,8 @@ from navconfig.logging import logging
 from ..responses import HTMLResponse, JSONResponse
 
 
+logger = logging.getLogger("navigator.errors")
+
 error_codes = (404, 500, 501, 502, 503, 0, -1)
 
 not_found = """
@@ -210,7 +212,9 @@ async def error_middleware(
         except asyncio.CancelledError:
             pass
         except Exception as ex:  # pylint: disable=W0703
-            logging.warning(f"Request {request} has failed with exception: {ex!r}")
+            logger.warning(
+                "Request %s has failed with exception: %r", request, ex
+            )
             if DEBUG is True:
                 return manage_exception(app, status=500, ex=ex)
             else:
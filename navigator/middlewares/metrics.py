@@ -0,0 +1,98 @@
+"""Metrics Middleware.
+
+Per-route request instrumentation: latency histogram, status counters,
+in-flight gauge and request/response sizes, keyed by the canonical name
+of the matched resource (``/users/{id}``, not ``/users/42``) so the label
+cardinality stays bounded.
+"""
+from time import perf_counter
+from collections.abc import Awaitable, Callable
+from aiohttp import web
+from ..metrics.registry import MetricsRegistry, SIZE_BUCKETS
+
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_name(request: web.Request) -> str:
+    """Return the canonical route (resource) name of a request."""
+    try:
+        resource = request.match_info.route.resource
+    except AttributeError:
+        return UNMATCHED_ROUTE
+    if resource is None:
+        return UNMATCHED_ROUTE
+    return resource.canonical
+
+
+def metrics_middleware(
+    registry: MetricsRegistry,
+    exclude: tuple = ()
+) -> Callable:
+    """metrics_middleware.
+
+    Build a middleware recording request metrics into *registry*.
+
+    Args:
+        registry: Registry used to store the metrics.
+        exclude: Canonical route names that are not instrumented
+            (e.g. the metrics endpoint itself).
+    """
+    latency = registry.histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route.",
+        ("method", "route"),
+    )
+    requests = registry.counter(
+        "http_requests_total",
+        "HTTP responses by route and status code.",
+        ("method", "route", "status"),
+    )
+    in_flight = registry.gauge(
+        "http_requests_in_flight",
+        "HTTP requests currently being handled.",
+    )
+    request_size = registry.histogram(
+        "http_request_size_bytes",
+        "HTTP request body size by route.",
+        ("method", "route"),
+        buckets=SIZE_BUCKETS,
+    )
+    response_size = registry.histogram(
+        "http_response_size_bytes",
+        "HTTP response body size by route.",
+        ("method", "route"),
+        buckets=SIZE_BUCKETS,
+    )
+    excluded = frozenset(exclude)
+
+    @web.middleware
+    async def middleware_metrics(
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]]
+    ) -> web.StreamResponse:
+        route = route_name(request)
+        if route in excluded:
+            return await handler(request)
+        labels = (request.method, route)
+        status = 500
+        size = 0
+        in_flight.inc()
+        started = perf_counter()
+        try:
+            response = await handler(request)
+            status = response.status
+            size = response.content_length or response.body_length or 0
+            return response
+        except web.HTTPException as ex:
+            status = ex.status
+            size = ex.content_length or 0
+            raise
+        finally:
+            latency.observe(perf_counter() - started, labels)
+            in_flight.dec()
+            requests.inc(labels + (str(status),))
+            request_size.observe(request.content_length or 0, labels)
+            response_size.observe(size, labels)
+
+    return middleware_metrics
@@ -2,6 +2,7 @@ import contextlib
 from pathlib import Path
 from typing import Any, Union, Optional
 from collections.abc import Callable
+from importlib.util import find_spec
 import ssl
 import asyncio
 import signal
@@ -15,30 +16,20 @@ from datamodel.exceptions import ValidationError
 from aiohttp import web
 from aiohttp.abc import AbstractView
 from aiohttp.web_exceptions import HTTPError
-try:
-    import sockjs
-except ImportError:
-    sockjs = None
-
 import logging
 
 
-# Global Placeholder for Auth
-AUTH_INSTALLED = False
+# Global Placeholder for Auth: only probe for the package, importing
+# ``navigator_auth`` is deferred until an auth-related API is used.
 try:
-    import navigator_auth
-    AUTH_INSTALLED = True
-except (ImportError, Exception):
-    pass
+    AUTH_INSTALLED = find_spec("navigator_auth") is not None
+except (ImportError, ValueError):
+    AUTH_INSTALLED = False
 
 
 from .exceptions.handlers import nav_exception_handler, shutdown
 from .handlers import BaseAppHandler
 from .exceptions import NavException, ConfigError, InvalidArgument
-# Template Extension.
-from .template import TemplateParser
-# websocket resources
-from .services.ws import WebSocketHandler
 from .types import WebApp
 from .applications.base import BaseApplication
 from .applications.startup import ApplicationInstaller
@@ -58,6 +49,8 @@ class Application(BaseApplication):
     Args:
         Handler (BaseAppHandler): Main (principal) Application to be wrapped by Navigator.
     """
+    # access logger class of the runners (set by JSON_ACCESS_LOG).
+    _access_log_class = None
 
     def __init__(
         self,  # pylint: disable=W0613
@@ -80,7 +73,52 @@ class Application(BaseApplication):
         self._middlewares: list = kwargs.pop('middlewares', [])
         self.enable_jinja2 = enable_jinja2
         self.template_dirs = template_dirs
-        from navigator.conf import Context  # pylint: disable=C0415
+        from navigator.conf import (  # pylint: disable=C0415
+            Context,
+            ENABLE_METRICS,
+            METRICS_PATH,
+            ENABLE_PROFILER,
+            ENABLE_LOOP_MONITOR,
+            ENABLE_ADMISSION_CONTROL,
+            ENABLE_COMPRESSION,
+            ENABLE_QUEUE_LOGGING,
+            JSON_ACCESS_LOG,
+            ENABLE_TRACING,
+            ENABLE_HTTP_CLIENT_POOL,
+        )
+        # Request metrics (Prometheus endpoint):
+        self.enable_metrics: bool = kwargs.pop('enable_metrics', ENABLE_METRICS)
+        self.metrics_path: str = kwargs.pop('metrics_path', METRICS_PATH)
+        # On-demand sampling profiler:
+        self.enable_profiler: bool = kwargs.pop('enable_profiler', ENABLE_PROFILER)
+        # Event-loop lag monitor:
+        self.enable_loop_monitor: bool = kwargs.pop(
+            'enable_loop_monitor', ENABLE_LOOP_MONITOR
+        )
+        # Adaptive load shedding:
+        self.enable_admission_control: bool = kwargs.pop(
+            'enable_admission_control', ENABLE_ADMISSION_CONTROL
+        )
+        self.route_priorities: dict = kwargs.pop('route_priorities', {})
+        # Response compression (gzip/br/zstd):
+        self.enable_compression: bool = kwargs.pop(
+            'enable_compression', ENABLE_COMPRESSION
+        )
+        self._static_dirs: list = []
+        # Non-blocking logging and structured access log:
+        self.enable_queue_logging: bool = kwargs.pop(
+            'enable_queue_logging', ENABLE_QUEUE_LOGGING
+        )
+        # Distributed tracing:
+        self.enable_tracing: bool = kwargs.pop('enable_tracing', ENABLE_TRACING)
+        # Shared outbound HTTP client pool (closed on cleanup):
+        self.enable_http_client_pool: bool = kwargs.pop(
+            'enable_http_client_pool', ENABLE_HTTP_CLIENT_POOL
+        )
+        self._access_log_class = None
+        if kwargs.pop('json_access_log', JSON_ACCESS_LOG):
+            from .logs.access import JSONAccessLogger  # pylint: disable=C0415
+            self._access_log_class = JSONAccessLogger
         self._runner: Optional[web.AppRunner] = None
         self._sites: list = []
         self._shutdown_timeout = float(kwargs.pop('shutdown_timeout', 30.0))
@@ -118,6 +156,8 @@ class Application(BaseApplication):
         from navconfig import config  # pylint: disable=C0415
         app = self.handler.app
         if self.enable_jinja2 is True:
+            # Template Extension (Jinja2 is loaded only when enabled).
+            from .template import TemplateParser  # pylint: disable=C0415
             try:
                 # TODO: passing more parameters via configuration.
                 parser = TemplateParser(template_dir=self.template_dirs)
@@ -127,9 +167,25 @@ class Application(BaseApplication):
                 raise ConfigError(
                     f"Error on Template configuration, {e}"
                 ) from e
+        if self.enable_queue_logging is True:
+            self.setup_logging()
         if self._middlewares:
             for middleware in self._middlewares:
                 app.middlewares.append(middleware)
+        if self.enable_metrics is True:
+            self.setup_metrics(app)
+        if self.enable_profiler is True:
+            self.setup_profiler(app)
+        if self.enable_loop_monitor is True:
+            self.setup_loop_monitor(app)
+        if self.enable_admission_control is True:
+            self.setup_admission_control(app)
+        if self.enable_compression is True:
+            self.setup_compression(app)
+        if self.enable_tracing is True:
+            self.setup_tracing(app)
+        if self.enable_http_client_pool is True:
+            self.setup_http_client(app)
         # setup The Application and Sub-Applications Startup
         installer = ApplicationInstaller()
         INSTALLED_APPS: list = installer.installed_apps()
@@ -156,11 +212,221 @@ class Application(BaseApplication):
         ## Return aiohttp Application.
         return app
 
+    def setup_metrics(self, app: WebApp = None):
+        """setup_metrics.
+
+        Install the request-metrics middleware and expose the registry
+        in the Prometheus text format at ``metrics_path``.
+
+        Returns:
+            MetricsRegistry: registry where other components publish metrics.
+        """
+        from .metrics import setup_metrics  # pylint: disable=C0415
+        app = app or self.get_app()
+        registry = setup_metrics(app, path=self.metrics_path)
+        # scraped by Prometheus, without a user session.
+        self.auth_excluded(self.metrics_path)
+        return registry
+
+    def setup_profiler(self, app: WebApp = None):
+        """setup_profiler.
+
+        Register the admin-only sampling profiler endpoint (``PROFILER_PATH``).
+        Protected by ``PROFILER_TOKEN`` or a superuser session, one run at a
+        time per worker.
+        """
+        from .metrics.profiler import setup_profiler  # pylint: disable=C0415
+        from .conf import (  # pylint: disable=C0415
+            PROFILER_PATH,
+            PROFILER_TOKEN,
+            PROFILER_MAX_SECONDS,
+            PROFILER_COOLDOWN,
+        )
+        app = app or self.get_app()
+        if not PROFILER_TOKEN and not AUTH_INSTALLED:
+            self.logger.warning(
+                "Profiler enabled without PROFILER_TOKEN nor navigator_auth: "
+                "the endpoint will reject every request."
+            )
+        return setup_profiler(
+            app,
+            path=PROFILER_PATH,
+            token=PROFILER_TOKEN,
+            max_seconds=PROFILER_MAX_SECONDS,
+            cooldown=PROFILER_COOLDOWN,
+        )
+
+    def setup_loop_monitor(self, app: WebApp = None):
+        """setup_loop_monitor.
+
+        Start a LoopMonitor with the application: measures event-loop lag,
+        logs the stack of callbacks blocking the loop and publishes lag
+        percentiles into the metrics registry (if enabled).
+        """
+        # pylint: disable=C0415
+        from .metrics import get_registry
+        from .metrics.loop import setup_loop_monitor
+        from .conf import (
+            LOOP_MONITOR_INTERVAL,
+            LOOP_SLOW_CALLBACK,
+            LOOP_OVERLOAD_LAG,
+        )
+        app = app or self.get_app()
+        # keep asyncio debug-mode reports consistent with the monitor.
+        self._loop.slow_callback_duration = LOOP_SLOW_CALLBACK
+        return setup_loop_monitor(
+            app,
+            registry=get_registry(app),
+            interval=LOOP_MONITOR_INTERVAL,
+            slow_callback_duration=LOOP_SLOW_CALLBACK,
+            overload_lag=LOOP_OVERLOAD_LAG,
+        )
+
+    def setup_admission_control(self, app: WebApp = None):
+        """setup_admission_control.
+
+        Install the adaptive load-shedding middleware: under pressure
+        (concurrency limit reached, event-loop lag, DB pool saturated)
+        low-priority routes get ``503`` + ``Retry-After`` first.
+        Route priorities come from ``route_priorities`` or the
+        ``@priority()`` decorator.
+        """
+        # pylint: disable=C0415
+        from .middlewares.admission import setup_admission_control
+        from .conf import (
+            ADMISSION_INITIAL_LIMIT,
+            ADMISSION_MIN_LIMIT,
+            ADMISSION_MAX_LIMIT,
+            ADMISSION_TARGET_LATENCY,
+            ADMISSION_QUEUE_SIZE,
+            ADMISSION_QUEUE_TIMEOUT,
+            ADMISSION_RETRY_AFTER,
+        )
+        app = app or self.get_app()
+        return setup_admission_control(
+            app,
+            initial_limit=ADMISSION_INITIAL_LIMIT,
+            min_limit=ADMISSION_MIN_LIMIT,
+            max_limit=ADMISSION_MAX_LIMIT,
+            target_latency=ADMISSION_TARGET_LATENCY,
+            queue_size=ADMISSION_QUEUE_SIZE,
+            queue_timeout=ADMISSION_QUEUE_TIMEOUT,
+            retry_after=ADMISSION_RETRY_AFTER,
+            routes=self.route_priorities,
+        )
+
+    def setup_logging(self):
+        """setup_logging.
+
+        Move the handlers of the root and ``navigator`` loggers behind a
+        bounded queue drained by a writer thread: logging calls on the
+        event loop never wait for file, syslog or remote I/O.
+        """
+        # pylint: disable=C0415
+        from .logs import setup_queue_logging
+        from .conf import (
+            LOG_QUEUE_SIZE,
+            LOG_BATCH_SIZE,
+            LOG_FLUSH_INTERVAL,
+            LOG_SAMPLE_RATE,
+            LOG_JSON,
+        )
+        return setup_queue_logging(
+            loggers=("", "navigator", "aiohttp.access"),
+            queue_size=LOG_QUEUE_SIZE,
+            batch_size=LOG_BATCH_SIZE,
+            flush_interval=LOG_FLUSH_INTERVAL,
+            sample_rate=LOG_SAMPLE_RATE,
+            json=LOG_JSON,
+        )
+
+    def setup_tracing(self, app: WebApp = None):
+        """setup_tracing.
+
+        Trace requests, DB connections, ModelView queries, background tasks
+        and outbound actions; spans are sampled per trace
+        (``TRACING_SAMPLE_RATE``) and sent to ``TRACING_EXPORTER``.
+        """
+        # pylint: disable=C0415
+        from .tracing import setup_tracing, LogExporter, FileExporter
+        from .conf import (
+            TRACING_SAMPLE_RATE,
+            TRACING_EXPORTER,
+            TRACING_FILE,
+            TRACING_SERVICE_NAME,
+        )
+        app = app or self.get_app()
+        if TRACING_EXPORTER == "log":
+            exporter = LogExporter()
+        elif TRACING_EXPORTER == "file":
+            exporter = FileExporter(TRACING_FILE)
+        else:
+            module, _, clsname = TRACING_EXPORTER.rpartition(".")
+            try:
+                exporter = getattr(import_module(module), clsname)()
+            except (ImportError, AttributeError, ValueError) as ex:
+                raise ConfigError(
+                    f"Invalid TRACING_EXPORTER {TRACING_EXPORTER}: {ex}"
+                ) from ex
+        return setup_tracing(
+            app,
+            exporters=[exporter],
+            sample_rate=TRACING_SAMPLE_RATE,
+            service_name=TRACING_SERVICE_NAME,
+        )
+
+    def setup_http_client(self, app: WebApp = None):
+        """setup_http_client.
+
+        Bind the shared outbound HTTP pool and response cache (used by
+        ``RESTAction``) to the application lifecycle, closing their
+        connections on cleanup; provider rate limits are published with
+        the request metrics.
+        """
+        # pylint: disable=C0415
+        from .actions.client import setup_http_client
+        from .actions.cache import setup_response_cache
+        from .actions.ratelimit import get_rate_limits
+        from .metrics import get_registry
+        app = app or self.get_app()
+        setup_response_cache(app)
+        registry = get_registry(app)
+        if registry is not None:
+            get_rate_limits().register(registry)
+        return setup_http_client(app)
+
+    def setup_compression(self, app: WebApp = None):
+        """setup_compression.
+
+        Compress responses per ``Accept-Encoding`` (gzip, brotli, zstd);
+        with ``PRECOMPRESS_STATIC`` the static directories get ``.br``/``.gz``
+        siblings at startup, served by the static routes via sendfile.
+        """
+        # pylint: disable=C0415
+        from .middlewares.compression import setup_compression
+        from .conf import (
+            COMPRESSION_MIN_SIZE,
+            COMPRESSION_OFFLOAD_SIZE,
+            PRECOMPRESS_STATIC,
+        )
+        app = app or self.get_app()
+        if getattr(self.handler, 'enable_static', False) and self.handler.staticdir:
+            self._static_dirs.append(self.handler.staticdir)
+        return setup_compression(
+            app,
+            static_dirs=self._static_dirs,
+            precompress=PRECOMPRESS_STATIC,
+            min_size=COMPRESSION_MIN_SIZE,
+            offload_size=COMPRESSION_OFFLOAD_SIZE,
+        )
+
     def add_websockets(self, base_path: str = 'ws') -> None:
         """
         add_websockets.
         description: enable support for websockets in the main App
         """
+        # websocket resources
+        from .services.ws import WebSocketHandler  # pylint: disable=C0415
         app = self.get_app()
         if self.debug:
             self.logger.debug(
@@ -202,6 +468,7 @@ class Application(BaseApplication):
         description: register new route to static path.
         """
         self.get_app().add_static(route, path)
+        self._static_dirs.append(path)
 
     def add_view(self, route: str, handler: Any):
         self.get_app().router.add_view(route, handler)
@@ -389,34 +656,45 @@ class Application(BaseApplication):
         Returns:
             web.Response: add to Handler a variable with data validated.
         """
+        from .utils.validation import get_validator  # pylint: disable=C0415
+        validator = get_validator(model)
 
         def _validation(func, **kwargs):
+            # resolved once per handler, not per request.
+            sig = inspect.signature(func)
+            targets = [
+                a for a, param in sig.parameters.items() if param.annotation == model
+            ]
+            requests = [
+                a for a, param in sig.parameters.items()
+                if param.annotation is web.Request
+            ]
+            defaults = {
+                a: None if param.default is param.empty else param.default
+                for a, param in sig.parameters.items()
+                if a not in targets and a not in requests
+            }
+            # ``asyncio.coroutine`` was removed in Python 3.11; wrap
+            # sync callables in a coroutine function explicitly.
+            if asyncio.iscoroutinefunction(func):
+                coro = func
+            else:
+                async def coro(*a, **kw):  # type: ignore[no-redef]
+                    return func(*a, **kw)
+
             @wraps(func)
             async def _wrap(*args: Any) -> web.StreamResponse:
                 ## building arguments:
                 # Supports class based views see web.View
                 request = args[0].request if isinstance(args[0], AbstractView) else args[-1]
-                sig = inspect.signature(func)
-                new_args = {}
-                for a, val in sig.parameters.items():
-                    if isinstance(val, web.Request):
-                        new_args[a] = val
-                    else:
-                        _t = sig.parameters[a].annotation
-                        if _t == model:
-                            # working on build data validation
-                            data, errors = await self._validate_model(request, model)
-                            new_args[a] = data
-                            new_args["errors"] = errors
-                        else:
-                            new_args[a] = val
-                # ``asyncio.coroutine`` was removed in Python 3.11; wrap
-                # sync callables in a coroutine function explicitly.
-                if asyncio.iscoroutinefunction(func):
-                    coro = func
-                else:
-                    async def coro(*a, **kw):  # type: ignore[no-redef]
-                        return func(*a, **kw)
+                new_args = dict(defaults)
+                for a in requests:
+                    new_args[a] = request
+                for a in targets:
+                    # working on build data validation
+                    data, errors = await self._validate_model(request, validator)
+                    new_args[a] = data
+                    new_args["errors"] = errors
                 try:
                     context = await coro(**new_args)
                     return context
@@ -434,6 +712,9 @@ class Application(BaseApplication):
     async def _validate_model(
         self, request: web.Request, model: Union[dataclass, Any]
     ) -> dict:
+        from .utils.validation import check_request, get_validator  # pylint: disable=C0415
+        validator = get_validator(model)
+        check_request(request, content_types=frozenset({"application/json"}))
         if request.method in ("POST", "PUT", "PATCH"):
             # getting data from POST
             data = await request.json()
@@ -453,7 +734,7 @@ class Application(BaseApplication):
         errors = None
         if isinstance(data, dict):
             try:
-                validated = model(**data)
+                validated = validator(data)
             except ValidationError as ex:
                 errors = ex.payload
             except (TypeError, ValueError, AttributeError) as ex:
@@ -464,7 +745,7 @@ class Application(BaseApplication):
             errors = []
             for el in data:
                 try:
-                    valid = model(**el)
+                    valid = validator(el)
                     validated.append(valid)
                 except ValidationError as ex:
                     errors.append(ex.payload)
@@ -480,6 +761,12 @@ class Application(BaseApplication):
     def add_sock_endpoint(
         self, handler: Callable, name: str, route: str = "/sockjs/"
     ) -> None:
+        try:
+            import sockjs  # pylint: disable=C0415
+        except ImportError as ex:
+            raise ConfigError(
+                "sockjs is required for SockJS endpoints, install aiohttp-sockjs."
+            ) from ex
         app = self.get_app()
         sockjs.add_endpoint(app, handler, name=name, prefix=route)
 
@@ -620,11 +907,14 @@ class Application(BaseApplication):
             if max_request_size is not None:
                 app._client_max_size = int(max_request_size)
             # Only add these if they're explicitly provided (not None)
+            if self._access_log_class is not None:
+                kwargs.setdefault('access_log_class', self._access_log_class)
             if 'access_log_class' in kwargs and kwargs['access_log_class'] is not None:
                 runner_kwargs['access_log_class'] = kwargs['access_log_class']
 
             if 'access_log' in kwargs:
                 runner_kwargs['access_log'] = kwargs['access_log']
+            self._json_access_log(runner_kwargs)
 
             if 'access_log_format' in kwargs and kwargs['access_log_format'] is not None:
                 runner_kwargs['access_log_format'] = kwargs['access_log_format']
@@ -666,6 +956,16 @@ class Application(BaseApplication):
             self.logger.exception("Failed to start TCP server: %s", err)
             raise
 
+    def _json_access_log(self, runner_kwargs: dict) -> None:
+        """The JSON access log needs an access logger: without one
+        (``access_log=None``, ENABLE_ACCESS_LOG off) aiohttp logs nothing."""
+        if (
+            self._access_log_class is not None
+            and runner_kwargs.get('access_log_class') is self._access_log_class
+            and not isinstance(runner_kwargs.get('access_log'), logging.Logger)
+        ):
+            runner_kwargs['access_log'] = logging.getLogger('aiohttp.access')
+
     async def _run_unix(
         self,
         app: web.Application,
@@ -696,12 +996,16 @@ class Application(BaseApplication):
                 app._client_max_size = int(max_request_size)
 
             # Create and setup runner
-            self._runner = web.AppRunner(
-                app,
-                handle_signals=False,
-                access_log=kwargs.get('access_log'),
-                keepalive_timeout=kwargs.get('keepalive_timeout', 30),
-            )
+            runner_kwargs = {
+                'handle_signals': False,
+                'access_log': kwargs.get('access_log'),
+                'keepalive_timeout': kwargs.get('keepalive_timeout', 30),
+            }
+            access_log_class = kwargs.get('access_log_class', self._access_log_class)
+            if access_log_class is not None:
+                runner_kwargs['access_log_class'] = access_log_class
+            self._json_access_log(runner_kwargs)
+            self._runner = web.AppRunner(app, **runner_kwargs)
             await self._runner.setup()
 
             # Create Unix site — only forward kwargs that ``UnixSite``
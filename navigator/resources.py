@@ -2,7 +2,7 @@
 from pathlib import Path
 from aiohttp import web
 from navconfig import BASE_DIR
-from .libs.json import json_encoder
+from .responses import JSONResponse
 
 
 async def ping(request: web.Request):
@@ -47,6 +47,4 @@ async def home(request: web.Request):
         return web.FileResponse(file_path)
     except Exception as e:  # pylint: disable=W0703
         response_obj = {"status": "failed", "reason": str(e)}
-        return web.Response(
-            text=json_encoder(response_obj), status=500, content_type="application/json"
-        )
+        return JSONResponse(response_obj, status=500)
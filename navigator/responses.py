@@ -4,15 +4,16 @@ Various kinds of Application Responses.
 TODO: add FileResponse or JSONResponse or SSEResponse (server-side).
 """
 from typing import Any, Optional, Union
+from functools import lru_cache
 from pathlib import Path, PurePath
 import io
 import zipfile
-from aiohttp import web
+from aiohttp import web, hdrs
 from aiohttp.web_exceptions import (
     HTTPNoContent,
 )
 from aiohttp_sse import sse_response, EventSourceResponse
-from datamodel.parsers.json import json_encoder
+from .libs.json import json_encoder_bytes
 
 
 __all__ = (
@@ -78,6 +79,28 @@ def HTMLResponse(
     return Response(**response)
 
 
+@lru_cache(maxsize=32)
+def content_type_header(content_type: str, charset: str = "utf-8") -> str:
+    return f"{content_type}; charset={charset}"
+
+
+def json_body(content: Any) -> bytes:
+    """JSON-encoded body of *content*; bytes (e.g. cached) are kept as-is."""
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return content
+    return json_encoder_bytes(content)
+
+
+def json_headers(
+    headers: Optional[dict] = None,
+    content_type: str = "application/json"
+) -> dict:
+    """*headers* plus the Content-Type of a UTF-8 JSON body."""
+    if not headers:
+        return {hdrs.CONTENT_TYPE: content_type_header(content_type)}
+    return {**headers, hdrs.CONTENT_TYPE: content_type_header(content_type)}
+
+
 def JSONResponse(
     content: Any,
     status: int = 200,
@@ -88,17 +111,16 @@ def JSONResponse(
     """
     JSONResponse.
     Sending responses using JSON.
-    """
-    response = {
-        "content_type": content_type,
-        "status": status,
-        "dumps": json_encoder,
-        "reason": reason,
-    }
-    if headers:
-        response["headers"] = headers
 
-    return web.json_response(content, **response)
+    The payload is encoded once, straight to bytes; an already encoded
+    ``bytes`` payload is sent untouched.
+    """
+    return web.Response(
+        body=json_body(content),
+        status=status,
+        reason=reason,
+        headers=json_headers(headers, content_type),
+    )
 
 
 async def FileResponse(
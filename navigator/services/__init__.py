@@ -1 +1,51 @@
-from .sse import SSEManager, SSEMixin, setup_sse_manager
+"""
+navigator.services — long-lived connection services (SSE, WebSockets).
+
+Public API:
+    SSEManager, SSEConnection, SSEMixin, SSEEventView,
+    create_sse_routes, setup_sse_manager, sse_task.
+
+Lazy loading:
+    Nothing is imported at package load time; names are resolved on first
+    access (via __getattr__). Importing ``navigator.services.ws`` therefore
+    no longer drags the whole SSE stack along with it.
+"""
+from __future__ import annotations
+
+import importlib
+import sys
+
+# ── Lazy-load mapping: name → (relative module, attribute name) ────────────
+_LAZY: dict[str, tuple[str, str]] = {
+    "SSEManager": (".sse", "SSEManager"),
+    "SSEConnection": (".sse", "SSEConnection"),
+    "SSEMixin": (".sse", "SSEMixin"),
+    "SSEEventView": (".sse", "SSEEventView"),
+    "create_sse_routes": (".sse", "create_sse_routes"),
+    "setup_sse_manager": (".sse", "setup_sse_manager"),
+    "sse_task": (".sse", "sse_task"),
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    """Lazy-load service components on first access.
+
+    Args:
+        name: Attribute name being accessed.
+
+    Returns:
+        The requested object.
+
+    Raises:
+        AttributeError: If the name is not a recognised lazy export.
+    """
+    if name in _LAZY:
+        module_rel, attr = _LAZY[name]
+        module = importlib.import_module(module_rel, package=__name__)
+        obj = getattr(module, attr)
+        # Cache in this module so subsequent access is instant
+        setattr(sys.modules[__name__], name, obj)
+        return obj
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,2 +1,43 @@
-from .parser import TemplateParser
-from .decorators import use_template
+"""
+navigator.template — Jinja2-based template system.
+
+Public API:
+    TemplateParser  — Jinja2 environment wrapper (lazy-loaded).
+    use_template    — decorator rendering a handler result (lazy-loaded).
+
+Jinja2 is only imported when one of the names above is first accessed.
+"""
+from __future__ import annotations
+
+import importlib
+import sys
+
+# ── Lazy-load mapping: name → (relative module, attribute name) ────────────
+_LAZY: dict[str, tuple[str, str]] = {
+    "TemplateParser": (".parser", "TemplateParser"),
+    "use_template": (".decorators", "use_template"),
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    """Lazy-load the template system on first access.
+
+    Args:
+        name: Attribute name being accessed.
+
+    Returns:
+        The requested object.
+
+    Raises:
+        AttributeError: If the name is not a recognised lazy export.
+    """
+    if name in _LAZY:
+        module_rel, attr = _LAZY[name]
+        module = importlib.import_module(module_rel, package=__name__)
+        obj = getattr(module, attr)
+        # Cache in this module so subsequent access is instant
+        setattr(sys.modules[__name__], name, obj)
+        return obj
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
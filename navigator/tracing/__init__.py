@@ -0,0 +1,74 @@
+"""Navigator Tracing.
+
+Lightweight distributed tracing: spans propagated with contextvars across
+the request middleware, DB connection handling, ModelView queries, the
+BackgroundQueue (context carried by TaskWrapper) and outbound RESTAction
+calls, with W3C ``traceparent`` in and out.
+
+Enabled with ``enable_tracing=True``/``ENABLE_TRACING``; spans go to
+pluggable exporters (:class:`LogExporter`, :class:`FileExporter`,
+:class:`InMemoryExporter` or any :class:`SpanExporter`).
+"""
+import importlib
+import sys
+from .span import (
+    NonRecordingSpan,
+    Span,
+    SpanContext,
+    parse_traceparent,
+)
+from .exporters import (
+    FileExporter,
+    InMemoryExporter,
+    LogExporter,
+    SpanExporter,
+)
+from .tracer import (
+    Tracer,
+    current_span,
+    get_tracer,
+    inject,
+    set_tracer,
+    start_span,
+    traced,
+)
+
+# aiohttp-bound parts are loaded on first access: instrumented modules
+# (views, background queue, actions) only need the tracer.
+_LAZY: dict[str, tuple[str, str]] = {
+    "TRACER_KEY": (".middleware", "TRACER_KEY"),
+    "setup_tracing": (".middleware", "setup_tracing"),
+    "tracing_middleware": (".middleware", "tracing_middleware"),
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        module_rel, attr = _LAZY[name]
+        module = importlib.import_module(module_rel, package=__name__)
+        obj = getattr(module, attr)
+        setattr(sys.modules[__name__], name, obj)
+        return obj
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = (
+    "FileExporter",
+    "InMemoryExporter",
+    "LogExporter",
+    "NonRecordingSpan",
+    "Span",
+    "SpanContext",
+    "SpanExporter",
+    "TRACER_KEY",
+    "Tracer",
+    "current_span",
+    "get_tracer",
+    "inject",
+    "parse_traceparent",
+    "set_tracer",
+    "setup_tracing",
+    "start_span",
+    "traced",
+    "tracing_middleware",
+)
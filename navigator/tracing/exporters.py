@@ -0,0 +1,81 @@
+"""Span Exporters.
+
+An exporter receives batches of finished spans from the tracer's export
+thread (never from the event loop).
+"""
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Union
+import threading
+from navconfig.logging import logging
+from datamodel.parsers.json import json_encoder
+from .span import Span
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, spans: list[Span]) -> None:
+        """Export a batch of finished spans."""
+
+    def shutdown(self) -> None:
+        """Release resources; called once when the tracer stops."""
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps finished spans in memory (tests, debugging)."""
+    def __init__(self) -> None:
+        self.spans: list = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        with self._lock:
+            self.spans.extend(spans)
+
+    def get_finished_spans(self, name: str = None) -> list:
+        with self._lock:
+            if name is None:
+                return list(self.spans)
+            return [s for s in self.spans if s.name == name]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class FileExporter(SpanExporter):
+    """Appends spans as JSON lines to *path*."""
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._fp = None
+
+    def export(self, spans: list[Span]) -> None:
+        if self._fp is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fp = open(self.path, "a", encoding="utf-8")  # pylint: disable=R1732
+        self._fp.write(
+            "".join(json_encoder(span.to_dict()) + "\n" for span in spans)
+        )
+        self._fp.flush()
+
+    def shutdown(self) -> None:
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+
+class LogExporter(SpanExporter):
+    """Logs one line per span on ``navigator.tracing`` (DEBUG)."""
+    def __init__(self) -> None:
+        self.logger = logging.getLogger("navigator.tracing")
+
+    def export(self, spans: list[Span]) -> None:
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        for span in spans:
+            self.logger.debug(
+                "span %s %.3fms trace=%s",
+                span.name,
+                span.duration * 1000,
+                span.context.trace_id,
+                extra={"span": span.to_dict()},
+            )
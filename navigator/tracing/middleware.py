@@ -0,0 +1,85 @@
+"""Tracing Middleware: one server span per request."""
+from typing import Optional
+from collections.abc import Awaitable, Callable, Iterable
+from aiohttp import web
+from ..middlewares.metrics import route_name
+from .exporters import LogExporter, SpanExporter
+from .span import parse_traceparent
+from .tracer import Tracer, get_tracer, set_tracer
+
+
+TRACEPARENT = "traceparent"
+
+TRACER_KEY: web.AppKey[Tracer] = web.AppKey("navigator_tracer")
+
+
+@web.middleware
+async def tracing_middleware(
+    request: web.Request,
+    handler: Callable[[web.Request], Awaitable[web.StreamResponse]]
+) -> web.StreamResponse:
+    """Continue the caller's trace (``traceparent``) or start a new one."""
+    tracer = get_tracer()
+    if not tracer.enabled:
+        return await handler(request)
+    route = route_name(request)
+    span = tracer.start_span(
+        f"{request.method} {route}",
+        parent=parse_traceparent(request.headers.get(TRACEPARENT)),
+        kind="server",
+        attributes={
+            "http.method": request.method,
+            "http.route": route,
+            "http.target": request.path,
+        },
+    )
+    status = 500
+    try:
+        response = await handler(request)
+        status = response.status
+        return response
+    except web.HTTPException as exc:
+        status = exc.status
+        raise
+    except Exception as exc:
+        span.record_exception(exc)
+        raise
+    finally:
+        span.set_attribute("http.status_code", status)
+        if status >= 500:
+            span.status = "error"
+        span.end()
+
+
+def setup_tracing(
+    app: web.Application,
+    exporters: Optional[Iterable[SpanExporter]] = None,
+    sample_rate: float = 1.0,
+    service_name: str = "navigator",
+    **kwargs
+) -> Tracer:
+    """Install a Tracer as the global tracer and trace every request."""
+    if TRACER_KEY in app:
+        return app[TRACER_KEY]
+    if exporters is None:
+        exporters = [LogExporter()]
+    tracer = Tracer(
+        service_name=service_name,
+        sample_rate=sample_rate,
+        exporters=exporters,
+        **kwargs
+    )
+    set_tracer(tracer)
+    app[TRACER_KEY] = tracer
+    # outermost: the request span covers every other middleware.
+    app.middlewares.insert(0, tracing_middleware)
+
+    async def _start(app: web.Application):  # pylint: disable=W0613
+        tracer.start()
+
+    async def _stop(app: web.Application):  # pylint: disable=W0613
+        tracer.shutdown()
+
+    app.on_startup.append(_start)
+    app.on_cleanup.append(_stop)
+    return tracer
@@ -0,0 +1,149 @@
+"""Spans and W3C Trace Context (``traceparent``) propagation."""
+from typing import Optional
+from dataclasses import dataclass, field
+import random
+import time
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Identity of a span, as carried by ``traceparent``."""
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+
+    def to_traceparent(self) -> str:
+        flags = "01" if self.sampled else "00"
+        return f"00-{self.trace_id}-{self.span_id}-{flags}"
+
+
+# ids only need to be unique, not secret (same choice as OpenTelemetry).
+def new_trace_id() -> str:
+    return f"{random.getrandbits(128):032x}"
+
+
+def new_span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[SpanContext]:
+    """Parse a W3C ``traceparent`` header; None if absent or malformed."""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4:
+        return None
+    version, trace_id, span_id, flags = parts[:4]
+    if (
+        len(version) != 2 or version == "ff"
+        or len(trace_id) != 32 or trace_id == "0" * 32
+        or len(span_id) != 16 or span_id == "0" * 16
+        or len(flags) != 2
+    ):
+        return None
+    try:
+        int(trace_id, 16)
+        int(span_id, 16)
+        sampled = bool(int(flags, 16) & 0x01)
+    except ValueError:
+        return None
+    return SpanContext(trace_id.lower(), span_id.lower(), sampled)
+
+
+@dataclass
+class Span:
+    """A timed operation; finished spans are handed to the exporters."""
+    name: str
+    context: SpanContext
+    parent_id: Optional[str] = None
+    kind: str = "internal"
+    attributes: dict = field(default_factory=dict)
+    start: float = field(default_factory=time.time)
+    end_time: Optional[float] = None
+    status: str = "ok"
+    error: Optional[str] = None
+    _tracer: object = field(default=None, repr=False, compare=False)
+    _token: object = field(default=None, repr=False, compare=False)
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+    duration: float = 0.0
+
+    recording = True
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.status = "error"
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    def end(self) -> None:
+        if self.end_time is not None:
+            return
+        self.duration = time.perf_counter() - self._started
+        self.end_time = self.start + self.duration
+        if self._tracer is not None:
+            self._tracer._finish(self)  # pylint: disable=W0212
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "kind": self.kind,
+            "start": self.start,
+            "end": self.end_time,
+            "duration_ms": round(self.duration * 1000, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+    # context-manager protocol
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None:
+            self.record_exception(exc)
+        self.end()
+
+
+class NonRecordingSpan:
+    """Span of an unsampled trace: carries the context, records nothing.
+
+    Deliberately tiny (no attributes, no timing): unsampled requests are
+    the common case and must cost next to nothing.
+    """
+    __slots__ = ("name", "context", "parent_id", "status", "_tracer", "_token")
+    recording = False
+
+    def __init__(
+        self,
+        name: str,
+        context: SpanContext,
+        parent_id: Optional[str] = None,
+        _tracer=None
+    ) -> None:
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.status = "ok"
+        self._tracer = _tracer
+        self._token = None
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        if self._token is not None:
+            self._tracer._detach(self)  # pylint: disable=W0212
+
+    def __enter__(self) -> "NonRecordingSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end()
@@ -0,0 +1,230 @@
+"""Tracer.
+
+The current span lives in a :class:`contextvars.ContextVar`, so it follows
+``await`` chains and is inherited by tasks created with
+``asyncio.create_task`` (and callbacks using ``copy_context``).
+
+Sampling is head-based: decided once per trace from the trace id (so
+every service taking part in a trace makes the same decision); unsampled
+traces get a :class:`NonRecordingSpan`, which only carries the context
+for propagation. With tracing disabled ``start_span`` returns a shared
+no-op span.
+"""
+from typing import Optional, Union
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from functools import wraps
+import asyncio
+import threading
+from navconfig.logging import logging
+from .span import (
+    NonRecordingSpan,
+    Span,
+    SpanContext,
+    new_span_id,
+    new_trace_id,
+)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar(
+    "navigator_current_span", default=None
+)
+
+_NOOP_SPAN = NonRecordingSpan(
+    "noop", SpanContext("0" * 32, "0" * 16, sampled=False)
+)
+
+
+class Tracer:
+    """Tracer.
+
+    Args:
+        service_name: recorded on every span as ``service.name``.
+        sample_rate: fraction of traces recorded (head-based).
+        exporters: SpanExporter instances receiving finished spans.
+        batch_size: spans per export batch.
+        flush_interval: max seconds a finished span waits for export.
+        enabled: False turns every call into a no-op.
+    """
+    def __init__(
+        self,
+        service_name: str = "navigator",
+        sample_rate: float = 1.0,
+        exporters: Iterable = (),
+        batch_size: int = 512,
+        flush_interval: float = 1.0,
+        enabled: bool = True
+    ) -> None:
+        self.service_name = service_name
+        self.sample_rate = sample_rate
+        self._threshold = int(sample_rate * (1 << 64))
+        self.exporters: list = list(exporters)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        self.logger = logging.getLogger("navigator.tracing")
+        self._pending: list = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def should_sample(self, trace_id: str) -> bool:
+        return int(trace_id[:16], 16) < self._threshold
+
+    def start_span(
+        self,
+        name: str,
+        parent: Union[Span, SpanContext, None] = None,
+        kind: str = "internal",
+        attributes: Optional[dict] = None,
+        activate: bool = True
+    ) -> Span:
+        """Start a span, child of *parent* (default: the current span).
+
+        With *activate* the span becomes the current one until ``end()``.
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        if parent is None:
+            parent = _current_span.get()
+        if isinstance(parent, (Span, NonRecordingSpan)):
+            parent = parent.context
+        if parent is _NOOP_SPAN.context:
+            parent = None
+        if parent is None:
+            trace_id = new_trace_id()
+            sampled = self.should_sample(trace_id)
+            parent_id = None
+        else:
+            trace_id = parent.trace_id
+            sampled = parent.sampled
+            parent_id = parent.span_id
+        context = SpanContext(trace_id, new_span_id(), sampled)
+        if sampled:
+            span = Span(
+                name,
+                context,
+                parent_id=parent_id,
+                kind=kind,
+                attributes=attributes or {},
+                _tracer=self,
+            )
+        else:
+            span = NonRecordingSpan(name, context, parent_id=parent_id, _tracer=self)
+        if activate:
+            span._token = _current_span.set(span)  # pylint: disable=W0212
+        return span
+
+    def _detach(self, span: Union[Span, NonRecordingSpan]) -> None:
+        token = span._token  # pylint: disable=W0212
+        if token is None:
+            return
+        span._token = None  # pylint: disable=W0212
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            # ended in another context (e.g. a different task): the span
+            # was never current there, nothing to restore.
+            pass
+
+    def _finish(self, span: Span) -> None:
+        self._detach(span)
+        span.attributes.setdefault("service.name", self.service_name)
+        with self._lock:
+            self._pending.append(span)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    # -----------------------------------------------------------
+    # Export
+    # -----------------------------------------------------------
+    def flush(self) -> None:
+        """Export every pending span now (in the calling thread)."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+        for exporter in self.exporters:
+            try:
+                exporter.export(batch)
+            except Exception as exc:  # pylint: disable=W0703
+                self.logger.warning(f"Span exporter {exporter!r} failed: {exc}")
+
+    def _run(self) -> None:
+        while self._running:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def start(self) -> None:
+        """Start the export thread."""
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="NAV-SpanExporter", daemon=True
+        )
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        if self._thread is not None:
+            self._running = False
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+_tracer: Tracer = Tracer(enabled=False)
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    global _tracer  # pylint: disable=W0603
+    _tracer = tracer
+    return tracer
+
+
+def current_span() -> Union[Span, NonRecordingSpan, None]:
+    return _current_span.get()
+
+
+def start_span(name: str, **kwargs) -> Span:
+    """Start a span on the global tracer (usable as a context manager)."""
+    return _tracer.start_span(name, **kwargs)
+
+
+def inject(headers: Optional[dict] = None) -> dict:
+    """Return *headers* plus the ``traceparent`` of the current span."""
+    headers = dict(headers or {})
+    span = _current_span.get()
+    if span is not None and span is not _NOOP_SPAN:
+        headers["traceparent"] = span.context.to_traceparent()
+    return headers
+
+
+def traced(name: Optional[str] = None, kind: str = "internal") -> Callable:
+    """Decorator: run the (async or sync) function inside a span."""
+    def _decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def _async_wrap(*args, **kwargs):
+                with _tracer.start_span(span_name, kind=kind):
+                    return await func(*args, **kwargs)
+            return _async_wrap
+
+        @wraps(func)
+        def _wrap(*args, **kwargs):
+            with _tracer.start_span(span_name, kind=kind):
+                return func(*args, **kwargs)
+        return _wrap
+
+    return _decorator
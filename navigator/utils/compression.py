@@ -0,0 +1,208 @@
+"""HTTP content-coding helpers.
+
+Negotiation of ``Accept-Encoding`` and the gzip/brotli/zstd codecs used by
+the compression middleware and the static precompressor.
+
+brotli is a base dependency; zstd is optional (``compression.zstd`` on
+Python 3.14+, else the ``zstandard`` package) and only offered when it
+can be imported.
+"""
+from typing import Optional, Union
+from collections.abc import Iterable
+from pathlib import Path
+import os
+import zlib
+from navconfig.logging import logging
+
+
+logger = logging.getLogger("NAV.Compression")
+
+# server preference when the client gives several codings the same q.
+PREFERENCE: tuple = ("zstd", "br", "gzip")
+
+# sibling file extension per content-coding (aiohttp's FileResponse
+# serves ``.br`` and ``.gz`` siblings of static files).
+EXTENSIONS: dict = {"br": ".br", "gzip": ".gz", "zstd": ".zst"}
+
+COMPRESSIBLE_TYPES: tuple = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/ld+json",
+    "application/geo+json",
+    "application/wasm",
+    "image/svg+xml",
+)
+
+COMPRESSIBLE_EXTENSIONS: frozenset = frozenset({
+    ".html", ".htm", ".css", ".js", ".mjs", ".json", ".map", ".xml",
+    ".svg", ".txt", ".csv", ".wasm", ".webmanifest", ".ico", ".md",
+})
+
+DEFAULT_LEVELS: dict = {"gzip": 6, "br": 5, "zstd": 3}
+
+
+def _load_brotli():
+    try:
+        import brotli  # pylint: disable=C0415
+    except ImportError:
+        try:
+            import brotlicffi as brotli  # pylint: disable=C0415
+        except ImportError:
+            return None
+    return brotli
+
+
+def _load_zstd():
+    try:
+        from compression import zstd  # pylint: disable=C0415
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard  # pylint: disable=C0415
+        return zstandard
+    except ImportError:
+        return None
+
+
+_brotli = _load_brotli()
+_zstd = _load_zstd()
+
+
+def available_codings() -> tuple:
+    """Content-codings supported by this interpreter, in preference order."""
+    codings = []
+    for coding in PREFERENCE:
+        if coding == "br" and _brotli is None:
+            continue
+        if coding == "zstd" and _zstd is None:
+            continue
+        codings.append(coding)
+    return tuple(codings)
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    content_type = content_type.lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def negotiate(
+    accept_encoding: Optional[str],
+    available: Optional[Iterable[str]] = None
+) -> Optional[str]:
+    """Pick the content-coding to use for an ``Accept-Encoding`` header.
+
+    Honours q-values (``q=0`` disables a coding) and ``*``; ties are broken
+    by the server preference order. Returns None for identity.
+    """
+    if not accept_encoding:
+        return None
+    available = tuple(available or available_codings())
+    weights: dict = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding == "x-gzip":
+            coding = "gzip"
+        weights[coding] = q
+    wildcard = weights.get("*")
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, wildcard)
+        if q is not None and q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(data: bytes, coding: str, level: Optional[int] = None) -> bytes:
+    """One-shot compression of *data* (blocking: offload large payloads)."""
+    if level is None:
+        level = DEFAULT_LEVELS[coding]
+    if coding == "gzip":
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush()
+    if coding == "br":
+        return _brotli.compress(data, quality=level)
+    if coding == "zstd":
+        if _zstd.__name__ == "zstandard":
+            return _zstd.ZstdCompressor(level=level).compress(data)
+        return _zstd.compress(data, level=level)
+    raise ValueError(f"Unsupported content-coding: {coding}")
+
+
+def precompress_file(
+    path: Union[str, Path],
+    codings: Iterable[str] = ("br", "gzip"),
+    min_size: int = 1024,
+    level: Optional[dict] = None
+) -> list:
+    """Write compressed siblings (``file.br``, ``file.gz``) of *path*.
+
+    Siblings newer than the source are kept; a sibling that would not be
+    smaller than the source is not written. Returns the written paths.
+    """
+    path = Path(path)
+    stat = path.stat()
+    if stat.st_size < min_size:
+        return []
+    # max quality by default: it is paid once per file, not per request.
+    levels = {"gzip": 9, "br": 11, "zstd": 19, **(level or {})}
+    supported = available_codings()
+    data = None
+    written = []
+    for coding in codings:
+        if coding not in supported:
+            continue
+        sibling = path.with_name(path.name + EXTENSIONS[coding])
+        if sibling.exists() and sibling.stat().st_mtime >= stat.st_mtime:
+            continue
+        if data is None:
+            data = path.read_bytes()
+        packed = compress(data, coding, levels[coding])
+        if len(packed) >= stat.st_size:
+            continue
+        tmp = sibling.with_name(sibling.name + ".tmp")
+        tmp.write_bytes(packed)
+        os.replace(tmp, sibling)
+        # same mtime as the source: clients revalidate both together.
+        os.utime(sibling, (stat.st_atime, stat.st_mtime))
+        written.append(sibling)
+    return written
+
+
+def precompress_directory(
+    directory: Union[str, Path],
+    codings: Iterable[str] = ("br", "gzip"),
+    min_size: int = 1024,
+    extensions: Iterable[str] = COMPRESSIBLE_EXTENSIONS
+) -> list:
+    """Precompress every compressible file below *directory*."""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    extensions = frozenset(extensions)
+    skip = frozenset(EXTENSIONS.values())
+    written = []
+    for path in directory.rglob("*"):
+        if not path.is_file() or path.suffix in skip:
+            continue
+        if path.suffix.lower() not in extensions:
+            continue
+        try:
+            written.extend(precompress_file(path, codings, min_size))
+        except OSError as exc:
+            logger.warning(f"Unable to precompress {path}: {exc}")
+    return written
@@ -8,7 +8,8 @@ Public API:
     TempFileManager       — Temp files with auto-cleanup.
     S3FileManager         — AWS S3 (lazy-loaded on first access).
     GCSFileManager        — Google Cloud Storage (lazy-loaded on first access).
-    FileServingExtension  — aiohttp web-serving layer (Range requests).
+    FileServingExtension  — aiohttp web-serving layer (Range requests,
+                            lazy-loaded on first access).
     FileManagerFactory    — Runtime creation by type string.
 
 Backward compatibility:
@@ -16,10 +17,11 @@ Backward compatibility:
     ``from navigator.utils.file import GCSFileManager, S3FileManager, TempFileManager``
 
 Lazy loading:
-    S3FileManager and GCSFileManager are NOT imported at module load time.
-    They are only loaded when accessed (via __getattr__) or imported
-    explicitly.  This avoids pulling heavy cloud SDKs into memory until
-    they are actually needed.
+    S3FileManager, GCSFileManager and FileServingExtension are NOT imported
+    at module load time.  They are only loaded when accessed (via
+    __getattr__) or imported explicitly.  This avoids pulling heavy cloud
+    SDKs (and aiohttp + the application configuration, for the web layer)
+    into memory until they are actually needed.
 """
 from __future__ import annotations
 
@@ -32,12 +34,12 @@ from .abstract import FileManagerInterface, FileMetadata
 from .factory import FileManagerFactory
 from .local import LocalFileManager
 from .tmp import TempFileManager
-from .web import FileServingExtension
 
 # ── Lazy-load mapping: name → (relative module, class name) ───────────────
 _LAZY: dict[str, tuple[str, str]] = {
     "S3FileManager": (".s3", "S3FileManager"),
     "GCSFileManager": (".gcs", "GCSFileManager"),
+    "FileServingExtension": (".web", "FileServingExtension"),
 }
 
 __all__ = [
@@ -53,7 +55,7 @@ __all__ = [
 
 
 def __getattr__(name: str):
-    """Lazy-load cloud managers on first access.
+    """Lazy-load cloud managers and the web-serving layer on first access.
 
     Args:
         name: Attribute name being accessed.
@@ -0,0 +1,124 @@
+"""Compiled request-payload validators.
+
+``validate`` and ``validate_payload`` used to inspect their model on every
+request; :func:`get_validator` does it once per model (field names, the
+required set, converters for string-only sources) and caches the result,
+so a request only pays for the field checks and the model constructor.
+"""
+from typing import Any, Optional, Union, get_type_hints
+from collections.abc import Mapping
+from dataclasses import MISSING, is_dataclass
+from aiohttp import web
+from datamodel import BaseModel
+
+
+# content-types a validated body can be decoded from.
+BODY_CONTENT_TYPES: frozenset = frozenset({
+    "application/json",
+    "application/x-www-form-urlencoded",
+    "multipart/form-data",
+})
+
+_TRUE: frozenset = frozenset({"1", "true", "t", "yes", "y", "on"})
+
+
+def _to_bool(value: str) -> bool:
+    return value.strip().lower() in _TRUE
+
+
+# query strings and forms only carry strings: plain dataclasses get their
+# scalar fields converted (datamodel models convert by themselves).
+_CONVERTERS: dict = {int: int, float: float, bool: _to_bool}
+
+
+def _model_fields(model: type) -> dict:
+    return getattr(model, "__dataclass_fields__", None) or getattr(model, "__fields__", {})
+
+
+class ModelValidator:
+    """Validator compiled for one dataclass or datamodel ``BaseModel``.
+
+    Calling it with a mapping returns the model instance; missing required
+    fields raise ``TypeError`` before the model is built, other errors are
+    the model's own (``ValidationError``, ``TypeError``, ``ValueError``).
+    """
+    __slots__ = ("model", "name", "is_datamodel", "fields", "required", "converters")
+
+    def __init__(self, model: type) -> None:
+        self.is_datamodel = isinstance(model, type) and issubclass(model, BaseModel)
+        if not self.is_datamodel and not (isinstance(model, type) and is_dataclass(model)):
+            raise TypeError(f"Invalid Model Type: {model!r}")
+        self.model = model
+        self.name: str = model.__name__.lower()
+        fields = {
+            name: f for name, f in _model_fields(model).items()
+            if getattr(f, "init", True)
+        }
+        self.fields: frozenset = frozenset(fields)
+        # fields the constructor itself would refuse to go without.
+        self.required: tuple = tuple(
+            name for name, f in fields.items()
+            if getattr(f, "default", None) is MISSING
+            and getattr(f, "default_factory", None) is MISSING
+        )
+        self.converters: dict = {}
+        if not self.is_datamodel:
+            try:
+                hints = get_type_hints(model)
+            except Exception:  # pylint: disable=W0703
+                hints = {name: f.type for name, f in fields.items()}
+            self.converters = {
+                name: _CONVERTERS[hints[name]]
+                for name in fields
+                if hints.get(name) in _CONVERTERS
+            }
+
+    def missing(self, data: Mapping) -> list:
+        return [name for name in self.required if name not in data]
+
+    def __call__(self, data: Mapping) -> Any:
+        missing = self.missing(data)
+        if missing:
+            raise TypeError(f"Missing required field(s): {', '.join(missing)}")
+        if self.converters:
+            data = dict(data)
+            for name, convert in self.converters.items():
+                value = data.get(name)
+                if isinstance(value, str):
+                    data[name] = convert(value)
+        return self.model(**data)
+
+    def __repr__(self) -> str:
+        return f"<ModelValidator {self.model.__name__}>"
+
+
+_validators: dict = {}
+
+
+def get_validator(model: Union[type, ModelValidator]) -> ModelValidator:
+    """Compiled validator for *model* (built on first use, then cached)."""
+    if isinstance(model, ModelValidator):
+        return model
+    try:
+        return _validators[model]
+    except KeyError:
+        validator = _validators[model] = ModelValidator(model)
+        return validator
+
+
+def check_request(
+    request: web.Request,
+    max_size: Optional[int] = None,
+    content_types: frozenset = BODY_CONTENT_TYPES
+) -> None:
+    """Fast reject of bodies that cannot be validated (before reading them)."""
+    if request.method not in ("POST", "PUT", "PATCH"):
+        return
+    length = request.content_length
+    if max_size is not None and length is not None and length > max_size:
+        raise web.HTTPRequestEntityTooLarge(max_size=max_size, actual_size=length)
+    if length != 0 and request.content_type not in content_types:
+        raise web.HTTPUnsupportedMediaType(
+            reason=f"Unsupported Content-Type for validation: {request.content_type}",
+            content_type="application/json",
+        )
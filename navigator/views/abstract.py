@@ -23,6 +23,7 @@ from ..types import WebApp
 from ..routes import path
 from ..applications.base import BaseApplication
 from ..exceptions import ConfigError
+from ..tracing.tracer import current_span, start_span
 from .base import BaseView
 
 
@@ -73,9 +74,14 @@ class ConnectionHandler:
 
     async def __aenter__(self):
         if self._default is not True:
-            return await self._db.connection()
-        self._connection = await self._db.acquire()
-        return self._connection
+            with start_span("db.connect", attributes={"db.driver": self.driver}):
+                conn = await self._db.connection()
+        else:
+            with start_span("db.acquire", attributes={"db.driver": self.driver}):
+                self._connection = conn = await self._db.acquire()
+        # held until __aexit__ (queries run as its children).
+        start_span("db.connection", attributes={"db.driver": self.driver})
+        return conn
 
     async def default_connection(self, request: web.Request):
         if self._dbname in request.app:
@@ -125,6 +131,11 @@ class ConnectionHandler:
         return db
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        span = current_span()
+        if span is not None and span.name == "db.connection":
+            if exc_val is not None:
+                span.record_exception(exc_val)
+            span.end()
         # Assuming the connection has a close or release method
         # Adjust based on your specific database library
         if self._default:
@@ -394,7 +405,8 @@ class AbstractModel(BaseView):
         # TODO: Add ABAC Support.
         self._session = None
         try:
-            self._session = await get_session(self.request)
+            with start_span("session.get"):
+                self._session = await get_session(self.request)
         except (ValueError, RuntimeError) as err:
             return self.critical(
                 response={"error": "Error Decoding Session"},
@@ -25,10 +25,11 @@ from datamodel.exceptions import ValidationError
 from navconfig.logging import logging, loglevel
 from navigator_session import get_session
 from ..exceptions import NavException, InvalidArgument
-from ..responses import JSONResponse
+from ..responses import JSONResponse, json_body, json_headers
 from ..applications.base import BaseApplication
 from ..types import WebApp
 from ..conf import CORS_MAX_AGE
+from ..tracing.tracer import start_span
 
 # Monkey-patching
 DEFAULT_JSON_ENCODER = json_encoder
@@ -56,6 +57,16 @@ class BaseHandler(ABC):
         self.logger: logging.Logger = None
         self.post_init(self, *args, **kwargs)
 
+    def _json_body(self, content: Any) -> bytes:
+        """JSON body of *content*: the bytes fast path, unless the handler
+        swapped ``_json`` for its own encoder."""
+        if type(self._json) is JSONContent or isinstance(  # pylint: disable=C0123
+            content, (bytes, bytearray, memoryview)
+        ):
+            return json_body(content)
+        encoded = self._json.dumps(content)
+        return encoded.encode("utf-8") if isinstance(encoded, str) else encoded
+
     @property
     def _loop(self) -> Optional[asyncio.AbstractEventLoop]:
         """Return the running event loop, or the stored fallback.
@@ -89,7 +100,8 @@ class BaseHandler(ABC):
     async def session(self):
         session = None
         try:
-            session = await get_session(self.request)
+            with start_span("session.get"):
+                session = await get_session(self.request)
         except (ValueError, RuntimeError) as err:
             return self.critical(
                 reason="Error Decoding Session", request=self.request, exception=err
@@ -134,11 +146,14 @@ class BaseHandler(ABC):
             headers = {}
         if state is not None:  # backward compatibility
             status = state
-        args = {"status": status, "content_type": content_type, "headers": headers}
         if isinstance(response, dict):
-            args["text"] = self._json.dumps(response)
-        else:
-            args["body"] = response
+            return web.Response(
+                body=self._json_body(response),
+                status=status,
+                headers=json_headers(headers, content_type)
+            )
+        args = {"status": status, "content_type": content_type, "headers": headers}
+        args["body"] = response
         return web.Response(**args)
 
     def json_response(
@@ -186,16 +201,14 @@ class BaseHandler(ABC):
             "stacktrace": stacktrace,
         }
         args = {
-            "text": self._json.dumps(response_obj),
+            "body": self._json_body(response_obj),
             "reason": "Server Error",
-            "content_type": content_type,
+            "headers": json_headers(headers, content_type),
         }
         if status == 500:  # bad request
             obj = web.HTTPInternalServerError(**args)
         else:
             obj = web.HTTPServerError(**args)
-        for header, value in headers.items():
-            obj.headers[header] = value
         raise obj
 
     def error(
@@ -216,13 +229,16 @@ class BaseHandler(ABC):
             status = state
         if exception:
             response_obj["reason"] = str(exception)
-        args = {"content_type": content_type, **kwargs}
         if isinstance(response, dict):
             response_obj = {**response_obj, **response}
-            # args["content_type"] = "application/json"
-            args["text"] = self._json.dumps(response_obj)
+            args = {
+                "body": self._json_body(response_obj),
+                "headers": json_headers(headers, content_type),
+                **kwargs
+            }
+            headers = {}
         else:
-            args["body"] = response
+            args = {"content_type": content_type, "body": response, **kwargs}
         # defining the error
         if status == 400:  # bad request
             obj = web.HTTPBadRequest(**args)
@@ -254,15 +270,12 @@ class BaseHandler(ABC):
         if not headers:  # TODO: set to default headers.
             headers = {}
         args = {
-            "text": self._json.dumps(response),
+            "body": self._json_body(response),
             "reason": "Method not Implemented",
-            "content_type": content_type,
+            "headers": json_headers(headers, content_type),
             **kwargs,
         }
-        response = HTTPNotImplemented(**args)
-        for header, value in headers.items():
-            response.headers[header] = value
-        raise response
+        raise HTTPNotImplemented(**args)
 
     def not_allowed(
         self,
@@ -286,17 +299,18 @@ class BaseHandler(ABC):
                 "message": f"Method {request.method} not Allowed.",
                 "allowed": allow,
             }
-            response = self._json.dumps(response)
-        elif isinstance(response, dict):
-            response = self._json.dumps(response)
         args = {
             "method": request.method,
-            "text": response,
             "reason": "Method not Allowed",
-            "content_type": content_type,
             "allowed_methods": allow,
             **kwargs,
         }
+        if isinstance(response, dict):
+            args["body"] = self._json_body(response)
+            headers = json_headers(headers, content_type)
+        else:
+            args["text"] = response
+            args["content_type"] = content_type
         if allowed:
             headers["Allow"] = ",".join(allow)
         else:
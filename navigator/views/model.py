@@ -19,6 +19,7 @@ from asyncdb.exceptions import (
 from navigator.exceptions import (
     ConfigError
 )
+from ..tracing.tracer import traced
 from .abstract import AbstractModel, NotSet
 
 
@@ -314,6 +315,7 @@ class ModelView(AbstractModel):
             objid = None
         return objid
 
+    @traced("model.query")
     async def _get_data(self, qp, args):
         """_get_data.
 
@@ -416,6 +418,7 @@ class ModelView(AbstractModel):
             self.get_model.Meta.connection = None
         return data
 
+    @traced("model.filter")
     async def _filtering(self, queryparams: dict) -> web.Response:
         # Making a filter based on field received.
         filter_param = queryparams.get('_filter')
@@ -0,0 +1,160 @@
+"""Tests for provider rate limits and the concurrent action executor."""
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from navigator.actions.abstract import AbstractAction
+from navigator.actions.client import HTTPClientPool, RetryPolicy
+from navigator.actions.executor import ActionExecutor
+from navigator.actions.ratelimit import RateLimits, TokenBucket, parse_limits
+from navigator.metrics import MetricsRegistry
+
+
+class _Action(AbstractAction):
+    def __init__(self, *args, state=None, delay=0.02, fail=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.state = state
+        self.delay = delay
+        self.fail = fail
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def run(self):
+        self.state["inflight"] += 1
+        self.state["peak"] = max(self.state["peak"], self.state["inflight"])
+        await asyncio.sleep(self.delay)
+        self.state["inflight"] -= 1
+        if self.fail:
+            raise RuntimeError("provider down")
+        return self.provider
+
+
+class TestRateLimits:
+    def test_parse_limits(self):
+        assert parse_limits("zammad:5, hubspot:10:20,bad,x:y") == {
+            "zammad": (5.0, None),
+            "hubspot": (10.0, 20.0),
+        }
+
+    def test_configured_limits_win(self):
+        limits = RateLimits({"zammad": (2.0, 4.0)}, default_rate=7)
+        assert limits.get("Zammad") is limits.get("zammad")
+        assert limits.get("zammad", rate=100).max_rate == 2.0
+        assert limits.get("zammad").burst == 4.0
+        assert limits.get("other").max_rate == 7
+        assert limits.get("maps", rate=40).max_rate == 40
+
+    def test_adapts_to_throttling(self):
+        bucket = TokenBucket(rate=10)
+        bucket.throttle(retry_after=0)
+        bucket.throttle(retry_after=0)
+        assert bucket.rate == 2.5
+        assert bucket.throttled == 2
+        for _ in range(100):
+            bucket.success()
+        assert bucket.rate == 10
+
+
+@pytest.fixture
+async def throttling_server():
+    state = {"calls": 0}
+
+    async def handler(request):
+        state["calls"] += 1
+        if state["calls"] == 1:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    server = TestServer(app)
+    await server.start_server()
+    yield server, state
+    await server.close()
+
+
+async def test_pool_feeds_limiter(throttling_server):
+    server, state = throttling_server
+    pool = HTTPClientPool(retry=RetryPolicy(attempts=2, backoff=0))
+    bucket = TokenBucket(rate=100)
+    try:
+        async with pool.request("GET", str(server.make_url("/")), limiter=bucket) as resp:
+            assert resp.status == 200
+    finally:
+        await pool.close()
+    assert state["calls"] == 2
+    assert bucket.throttled == 1
+    assert bucket.acquired == 2
+
+
+class TestActionExecutor:
+    async def test_runs_concurrently_with_provider_bounds(self):
+        state = {"inflight": 0, "peak": 0}
+        limits = RateLimits(default_rate=1000)
+        executor = ActionExecutor(concurrency=10, per_provider=2, limits=limits)
+        actions = [_Action(state=state, provider="zammad") for _ in range(6)]
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await executor.gather(*actions)
+        assert results == ["zammad"] * 6
+        assert state["peak"] == 2
+        # three waves of two, not six sequential runs.
+        assert loop.time() - start < 6 * 0.02
+
+    async def test_queues_instead_of_failing(self):
+        state = {"inflight": 0, "peak": 0}
+        limits = RateLimits({"sms": (20.0, 1.0)})
+        executor = ActionExecutor(concurrency=10, per_provider=10, limits=limits)
+        actions = [_Action(state=state, provider="sms", delay=0) for _ in range(4)]
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        assert await executor.gather(*actions) == ["sms"] * 4
+        assert loop.time() - start >= 0.1
+
+    async def test_failures_and_metrics(self):
+        state = {"inflight": 0, "peak": 0}
+        registry = MetricsRegistry()
+        executor = ActionExecutor(
+            concurrency=4, per_provider=4, limits=RateLimits(default_rate=1000), registry=registry
+        )
+        results = await executor.gather(
+            _Action(state=state, provider="hubspot"),
+            _Action(state=state, provider="hubspot", fail=True),
+        )
+        assert results[0] == "hubspot"
+        assert isinstance(results[1], RuntimeError)
+        executed = registry.get("action_executor_total")
+        assert executed.get(("hubspot", "ok")) == 1
+        assert executed.get(("hubspot", "error")) == 1
+        output = registry.render()
+        assert 'navigator_action_calls_total{provider="hubspot"} 2' in output
+        assert "navigator_action_queue_seconds_count" in output
+
+    async def test_busy_provider_keeps_global_slots(self):
+        state = {"inflight": 0, "peak": 0}
+        other = {"inflight": 0, "peak": 0}
+        limits = RateLimits(default_rate=1000)
+        executor = ActionExecutor(concurrency=2, per_provider=1, limits=limits)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        slow = [_Action(state=state, provider="zammad", delay=0.05) for _ in range(4)]
+        runs = asyncio.gather(*(executor.execute(a) for a in slow))
+        await asyncio.sleep(0)
+        # calls queued for "zammad" do not take the global slots.
+        assert await executor.execute(_Action(state=other, provider="maps", delay=0)) == "maps"
+        assert loop.time() - start < 0.05
+        await runs
+
+    def test_register_once(self):
+        registry = MetricsRegistry()
+        limits = RateLimits(default_rate=1000)
+        limits.get("hubspot")
+        limits.register(registry)
+        ActionExecutor(concurrency=1, per_provider=1, limits=limits, registry=registry)
+        assert registry.render().count("# TYPE navigator_action_calls_total") == 1
@@ -0,0 +1,137 @@
+"""Tests for the Google Maps geocode/route cache and batch APIs.
+
+A local aiohttp application stands in for the Geocoding and Routes APIs.
+"""
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from navigator.actions.google.cache import GeoCache, normalize_address, route_key
+from navigator.actions.google.maps import LocationError, LocationFinder, Route
+from navigator.actions.google.models import Location, TravelerSearch
+from navigator.actions.ratelimit import TokenBucket
+
+
+def _geocode_result(address: str) -> dict:
+    return {
+        "formatted_address": address.title(),
+        "place_id": f"place-{address}",
+        "geometry": {"location": {"lat": 25.76, "lng": -80.19}},
+        "address_components": [
+            {"types": ["locality"], "long_name": "Miami", "short_name": "Miami"},
+            {"types": ["postal_code"], "long_name": "33130", "short_name": "33130"},
+        ],
+    }
+
+
+@pytest.fixture
+async def google_stub():
+    state = {"geocode": [], "routes": 0, "throttled": 1}
+
+    async def geocode(request):
+        address = request.query["address"]
+        state["geocode"].append(address)
+        await asyncio.sleep(0.01)
+        if address == "throttled" and state["throttled"]:
+            state["throttled"] -= 1
+            return web.json_response({"status": "OVER_QUERY_LIMIT"})
+        if address == "nowhere":
+            return web.json_response({"status": "ZERO_RESULTS", "results": []})
+        return web.json_response(
+            {"status": "OK", "results": [_geocode_result(address)]}
+        )
+
+    async def routes(request):
+        state["routes"] += 1
+        return web.json_response({
+            "routes": [{
+                "legs": [{"duration": "600s", "staticDuration": "540s", "distanceMeters": 1609}],
+            }]
+        })
+
+    app = web.Application()
+    app.router.add_get("/geocode/json", geocode)
+    app.router.add_post("/computeRoutes", routes)
+    server = TestServer(app)
+    await server.start_server()
+    yield server, state
+    await server.close()
+
+
+@pytest.fixture
+async def geo_cache(tmp_path):
+    cache = GeoCache(path=tmp_path / "maps.sqlite")
+    yield cache
+    await cache.close()
+
+
+def _finder(server, cache):
+    finder = LocationFinder(
+        api_key="test", cache=cache, rate_limiter=TokenBucket(1000), concurrency=2
+    )
+    finder.base_url = str(server.make_url("/geocode/json"))
+    return finder
+
+
+class TestKeys:
+    def test_normalize_address(self):
+        assert normalize_address("  100 Main St. ,Miami,FL ") == normalize_address("100 main st, miami, fl")
+
+    def test_route_key_ignores_api_key(self):
+        assert route_key({"origin": {"address": "1 Main St"}, "key": "x"}) == route_key(
+            {"origin": {"address": "1 main st "}, "key": "y"}
+        )
+        assert route_key({"intermediates": ["a", "b"]}) != route_key({"intermediates": ["b", "a"]})
+
+
+class TestGeocode:
+    async def test_geocode_many_dedupes_and_caches(self, google_stub, geo_cache):
+        server, state = google_stub
+        finder = _finder(server, geo_cache)
+        addresses = ["100 Main St, Miami", "100 main st,  miami", "200 Bay Rd", "nowhere"]
+        results = await finder.geocode_many(addresses)
+        assert results[0]["city"] == "Miami"
+        assert results[0] is results[1]
+        assert isinstance(results[3], LocationError)
+        assert len(state["geocode"]) == 3
+        # persistent tier: a new process (fresh memory) does not call the API.
+        fresh = _finder(server, GeoCache(path=geo_cache.path))
+        location = await fresh.find_location("100 MAIN ST, MIAMI", complete=True)
+        assert location["place_id"] == "place-100 Main St, Miami"
+        assert len(state["geocode"]) == 3
+        await fresh._cache.close()
+
+    async def test_over_query_limit_is_retried(self, google_stub, geo_cache, monkeypatch):
+        server, state = google_stub
+        finder = _finder(server, geo_cache)
+        monkeypatch.setattr(finder._limiter, "throttle", lambda seconds: None)
+        location = await finder.find_location("throttled")
+        assert location["zipcode"] == "33130"
+        assert state["geocode"] == ["throttled", "throttled"]
+
+
+class TestRoutes:
+    async def test_route_many_dedupes_and_caches(self, google_stub, geo_cache):
+        server, state = google_stub
+        route = Route(api_key="test", cache=geo_cache, rate_limiter=TokenBucket(1000))
+        route.routes_url = str(server.make_url("/computeRoutes"))
+        origin = Location(latitude=25.76, longitude=-80.19)
+        destination = Location(latitude=25.79, longitude=-80.13)
+        payload = TravelerSearch(origin=origin, destination=destination)
+        results = await route.route_many([payload, payload], complete=False, add_overview=False)
+        assert results[0]["duration"] == 10
+        assert results[0] is results[1]
+        await route.waypoint_route(payload)
+        assert state["routes"] == 1
+
+
+class TestTokenBucket:
+    async def test_spaces_calls(self):
+        bucket = TokenBucket(rate=50, burst=1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(4):
+            await bucket.acquire()
+        assert loop.time() - start >= 0.05
@@ -0,0 +1,129 @@
+"""Tests for the shared outbound HTTP client pool."""
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from navigator.actions.client import (
+    HTTP_CLIENT_KEY,
+    HTTPClientPool,
+    RetryPolicy,
+    parse_retry_after,
+    set_client_pool,
+    setup_http_client,
+)
+
+
+class TestRetryPolicy:
+    def test_parse_retry_after(self):
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        when = datetime.now(timezone.utc) + timedelta(seconds=30)
+        assert 25 < parse_retry_after(format_datetime(when, usegmt=True)) <= 30
+
+    def test_decisions(self):
+        policy = RetryPolicy(attempts=3)
+        assert policy.retry_status("GET", 503, 0)
+        assert not policy.retry_status("GET", 503, 2)
+        assert not policy.retry_status("GET", 500, 0)
+        # non idempotent: only retried when the server refused it (429).
+        assert not policy.retry_status("POST", 503, 0)
+        assert policy.retry_status("POST", 429, 0)
+        assert policy.retry_error("GET", 0)
+        assert not policy.retry_error("POST", 0)
+
+    def test_delay(self):
+        policy = RetryPolicy(backoff=0.5, max_backoff=2.0)
+        assert 0 <= policy.delay(1) <= 1.0
+        assert policy.delay(0, "60") == 2.0
+
+
+@pytest.fixture
+async def flaky_server():
+    state = {"calls": 0, "inflight": 0, "peak": 0}
+
+    async def flaky(request):
+        state["calls"] += 1
+        if state["calls"] < 3:
+            return web.Response(status=503, headers={"Retry-After": "0"})
+        return web.json_response({"ok": True})
+
+    async def slow(request):
+        state["inflight"] += 1
+        state["peak"] = max(state["peak"], state["inflight"])
+        await asyncio.sleep(0.02)
+        state["inflight"] -= 1
+        return web.Response(text="done")
+
+    app = web.Application()
+    app.router.add_get("/flaky", flaky)
+    app.router.add_post("/flaky", flaky)
+    app.router.add_get("/slow", slow)
+    server = TestServer(app)
+    await server.start_server()
+    yield server, state
+    await server.close()
+
+
+class TestHTTPClientPool:
+    async def test_session_is_reused(self):
+        pool = HTTPClientPool()
+        try:
+            assert pool.session() is pool.session()
+        finally:
+            await pool.close()
+        assert not pool._sessions
+
+    async def test_retries_idempotent_requests(self, flaky_server):
+        server, state = flaky_server
+        pool = HTTPClientPool(retry=RetryPolicy(attempts=3, backoff=0))
+        try:
+            async with pool.request("GET", str(server.make_url("/flaky"))) as resp:
+                assert resp.status == 200
+                assert await resp.json() == {"ok": True}
+        finally:
+            await pool.close()
+        assert state["calls"] == 3
+
+    async def test_post_is_not_retried(self, flaky_server):
+        server, state = flaky_server
+        pool = HTTPClientPool(retry=RetryPolicy(attempts=3, backoff=0))
+        try:
+            async with pool.request("POST", str(server.make_url("/flaky"))) as resp:
+                assert resp.status == 503
+        finally:
+            await pool.close()
+        assert state["calls"] == 1
+
+    async def test_per_host_limit(self, flaky_server):
+        server, state = flaky_server
+        pool = HTTPClientPool(limit_per_host=2)
+        url = str(server.make_url("/slow"))
+
+        async def fetch():
+            async with pool.request("GET", url) as resp:
+                return await resp.text()
+
+        try:
+            results = await asyncio.gather(*(fetch() for _ in range(6)))
+        finally:
+            await pool.close()
+        assert results == ["done"] * 6
+        assert state["peak"] <= 2
+
+    async def test_setup_closes_on_cleanup(self):
+        app = web.Application()
+        pool = HTTPClientPool()
+        assert setup_http_client(app, pool) is pool
+        assert app[HTTP_CLIENT_KEY] is pool
+        pool.session()
+        app.freeze()
+        try:
+            await app.cleanup()
+        finally:
+            set_client_pool(None)
+        assert not pool._sessions
@@ -0,0 +1,212 @@
+"""Tests for the response cache of outbound action calls."""
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from navigator.actions.cache import (
+    CachedResponse,
+    LRUCache,
+    CacheEntry,
+    ResponseCache,
+    freshness_lifetime,
+)
+from navigator.actions.client import HTTPClientPool, RetryPolicy
+
+
+class TestFreshness:
+    def test_max_age_and_age(self):
+        assert freshness_lifetime({"Cache-Control": "max-age=100", "Age": "30"}) == 70
+        assert freshness_lifetime({"Cache-Control": "public, s-maxage=5, max-age=100"}) == 5
+
+    def test_not_storable(self):
+        assert freshness_lifetime({"Cache-Control": "no-store"}) is None
+        # an explicit TTL never overrides no-store.
+        assert freshness_lifetime({"Cache-Control": "no-store"}, ttl=60) is None
+
+    def test_ttl_override(self):
+        assert freshness_lifetime({"Cache-Control": "no-cache"}, ttl=60) == 60
+        assert freshness_lifetime({}) == 0
+
+    def test_lru_bounds(self):
+        lru = LRUCache(maxsize=2, max_bytes=10)
+        for key in ("a", "b", "c"):
+            lru.set(key, CacheEntry(200, {}, b"1234", expires=0))
+        assert "a" not in lru and len(lru) == 2
+        lru.set("d", CacheEntry(200, {}, b"123456789", expires=0))
+        assert len(lru) == 1 and lru.nbytes == 9
+
+
+class _FakeRedis:
+    """In-memory stand-in of the ``redis.asyncio`` calls of the shared tier."""
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, name):
+        return self.data.get(name)
+
+    async def set(self, name, value, ex=None):
+        self.data[name] = value
+
+    async def sadd(self, name, *values):
+        self.data.setdefault(name, set()).update(values)
+
+    async def smembers(self, name):
+        return set(self.data.get(name, ()))
+
+    async def ttl(self, name):
+        return -1
+
+    async def expire(self, name, seconds):
+        return True
+
+    async def delete(self, *names):
+        for name in names:
+            self.data.pop(name, None)
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append(
+            getattr(self.client, name)(*args, **kwargs)
+        )
+
+    async def execute(self):
+        return [await call for call in self.calls]
+
+
+def _shared_cache(client):
+    cache = ResponseCache(redis_url="redis://shared")
+    cache.remote._client = lambda: client
+    return cache
+
+
+@pytest.fixture
+async def origin():
+    state = {"calls": 0, "conditional": 0}
+
+    async def catalog(request):
+        state["calls"] += 1
+        await asyncio.sleep(0.01)
+        return web.json_response(
+            {"items": [1, 2, 3]}, headers={"Cache-Control": "max-age=60"}
+        )
+
+    async def versioned(request):
+        state["calls"] += 1
+        if request.headers.get("If-None-Match") == '"v1"':
+            state["conditional"] += 1
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.json_response({"version": 1}, headers={"ETag": '"v1"'})
+
+    async def update(request):
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/catalog", catalog)
+    app.router.add_post("/catalog", update)
+    app.router.add_get("/versioned", versioned)
+    server = TestServer(app)
+    await server.start_server()
+    pool = HTTPClientPool(retry=RetryPolicy(attempts=1))
+    yield server, pool, state
+    await pool.close()
+    await server.close()
+
+
+class TestResponseCache:
+    async def test_fresh_hits_and_single_flight(self, origin):
+        server, pool, state = origin
+        cache = ResponseCache()
+        url = str(server.make_url("/catalog"))
+
+        async def fetch():
+            async with cache.fetch(pool, "GET", url) as resp:
+                return await resp.json()
+
+        results = await asyncio.gather(*(fetch() for _ in range(5)))
+        assert results == [{"items": [1, 2, 3]}] * 5
+        assert state["calls"] == 1
+        async with cache.fetch(pool, "GET", url) as resp:
+            assert isinstance(resp, CachedResponse)
+            assert resp.content_type == "application/json"
+        assert cache.stats()["hits"] == 5
+
+    async def test_etag_revalidation(self, origin):
+        server, pool, state = origin
+        cache = ResponseCache()
+        url = str(server.make_url("/versioned"))
+        for _ in range(3):
+            async with cache.fetch(pool, "GET", url) as resp:
+                assert resp.status == 200
+                assert await resp.json() == {"version": 1}
+        assert state["calls"] == 3
+        assert state["conditional"] == 2
+        assert cache.stats()["revalidated"] == 2
+
+    async def test_ttl_override_and_credentials(self, origin):
+        server, pool, state = origin
+        cache = ResponseCache()
+        url = str(server.make_url("/versioned"))
+        for _ in range(2):
+            async with cache.fetch(pool, "GET", url, ttl=60, credentials="a"):
+                pass
+        assert state["calls"] == 1
+        async with cache.fetch(pool, "GET", url, ttl=60, credentials="b"):
+            pass
+        assert state["calls"] == 2
+
+    async def test_request_headers_are_keyed(self, origin):
+        server, pool, state = origin
+        cache = ResponseCache()
+        url = str(server.make_url("/catalog"))
+        for key in ("a", "a", "b"):
+            async with cache.fetch(pool, "GET", url, headers={"api-key": key}):
+                pass
+        assert state["calls"] == 2
+        # tracing and transport headers do not split the cache.
+        async with cache.fetch(
+            pool, "GET", url, headers={"api-key": "a", "traceparent": "00-x"}
+        ) as resp:
+            assert isinstance(resp, CachedResponse)
+        assert state["calls"] == 2
+
+    async def test_unsafe_request_invalidates(self, origin):
+        server, pool, state = origin
+        cache = ResponseCache()
+        url = str(server.make_url("/catalog"))
+        async with cache.fetch(pool, "GET", url):
+            pass
+        async with cache.fetch(pool, "POST", url, json={}):
+            pass
+        async with cache.fetch(pool, "GET", url):
+            pass
+        assert state["calls"] == 2
+
+    async def test_unsafe_request_invalidates_shared_tier(self, origin):
+        server, pool, state = origin
+        client = _FakeRedis()
+        url = str(server.make_url("/catalog"))
+        async with _shared_cache(client).fetch(pool, "GET", url, params={"page": 1}):
+            pass
+        # a worker that never cached the resource updates it...
+        async with _shared_cache(client).fetch(pool, "POST", url, json={}):
+            pass
+        # ...and no worker finds the stale entry in Redis.
+        async with _shared_cache(client).fetch(pool, "GET", url, params={"page": 1}) as resp:
+            assert not isinstance(resp, CachedResponse)
+        assert state["calls"] == 2
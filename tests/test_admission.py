@@ -0,0 +1,180 @@
+"""Tests for the adaptive admission-control (load shedding) middleware."""
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from navigator.metrics import MetricsRegistry, setup_metrics
+from navigator.middlewares.admission import (
+    ADMISSION_KEY,
+    AdmissionController,
+    priority,
+    setup_admission_control,
+)
+
+
+class FakeMonitor:
+    overloaded = False
+
+
+class TestController:
+    def test_priority_shares(self):
+        controller = AdmissionController(initial_limit=10)
+        controller.in_flight = 6
+        assert controller.has_capacity("high")
+        assert controller.has_capacity("normal")
+        assert not controller.has_capacity("low")
+        controller.in_flight = 100
+        assert controller.has_capacity("critical")
+
+    def test_aimd(self):
+        controller = AdmissionController(
+            initial_limit=20, min_limit=5, target_latency=0.5
+        )
+        controller.in_flight = 15
+        controller._on_complete(0.01, False)
+        assert controller.limit > 20
+        controller._on_complete(2.0, False)
+        assert controller.limit < 20
+        # only one decrease per latency window.
+        limit = controller.limit
+        controller._on_complete(2.0, True)
+        assert controller.limit == limit
+
+    def test_limit_bounds(self):
+        controller = AdmissionController(initial_limit=5, min_limit=5)
+        controller._on_complete(10, True)
+        assert controller.limit == 5
+
+    async def test_release_wakes_first_fitting_waiter(self):
+        controller = AdmissionController(initial_limit=10, queue_timeout=1)
+        controller.in_flight = 10
+        normal = asyncio.ensure_future(controller._wait_for_slot("normal"))
+        high = asyncio.ensure_future(controller._wait_for_slot("high"))
+        await asyncio.sleep(0)
+        controller._release()  # 9 in flight: over the "normal" share.
+        assert await high is True
+        assert not normal.done()
+        normal.cancel()
+        await asyncio.gather(normal, return_exceptions=True)
+        assert not controller._waiters
+
+    def test_pressure_levels(self):
+        monitor = FakeMonitor()
+        saturated = [False]
+        controller = AdmissionController(
+            loop_monitor=monitor, signals=[lambda: saturated[0]]
+        )
+        assert controller.pressure() is None
+        saturated[0] = True
+        assert controller.pressure() == "soft"
+        monitor.overloaded = True
+        assert controller.pressure() == "hard"
+
+    def test_invalid_priority(self):
+        with pytest.raises(ValueError):
+            priority("urgent")
+
+
+@pytest.fixture
+async def admission_client():
+    app = web.Application()
+    release = asyncio.Event()
+    monitor = FakeMonitor()
+
+    async def slow(request):
+        await release.wait()
+        return web.Response(text="slow")
+
+    @priority("low")
+    async def report(request):
+        return web.Response(text="report")
+
+    @priority("critical")
+    async def health(request):
+        return web.Response(text="ok")
+
+    async def normal(request):
+        return web.Response(text="normal")
+
+    app.router.add_get("/slow", slow)
+    app.router.add_get("/report", report)
+    app.router.add_get("/health", health)
+    app.router.add_get("/normal", normal)
+    registry = setup_metrics(app)
+    controller = setup_admission_control(
+        app,
+        initial_limit=2,
+        min_limit=1,
+        queue_timeout=0.05,
+        retry_after=3,
+        loop_monitor=monitor,
+        routes={"/slow": "high"},
+    )
+    client = TestClient(TestServer(app))
+    await client.start_server()
+    yield client, controller, release, monitor, registry
+    release.set()
+    await client.close()
+
+
+class TestMiddleware:
+    def test_setup_position(self):
+        app = web.Application()
+        setup_metrics(app)
+        controller = setup_admission_control(app)
+        assert app[ADMISSION_KEY] is controller
+        assert app.middlewares[1] == controller.middleware
+        assert setup_admission_control(app) is controller
+
+    async def test_sheds_when_saturated(self, admission_client):
+        client, controller, release, _, registry = admission_client
+        pending = [asyncio.ensure_future(client.get("/slow")) for _ in range(2)]
+        while controller.in_flight < 2:
+            await asyncio.sleep(0.01)
+        resp = await client.get("/report")
+        assert resp.status == 503
+        assert resp.headers["Retry-After"] == "3"
+        # queued request times out, critical one always passes.
+        assert (await client.get("/normal")).status == 503
+        assert (await client.get("/health")).status == 200
+        release.set()
+        for resp in await asyncio.gather(*pending):
+            assert resp.status == 200
+        assert (await client.get("/normal")).status == 200
+        text = registry.render()
+        assert 'navigator_admission_rejected_total{priority="low"} 1' in text
+        assert 'status="503"' in text
+
+    async def test_queued_request_gets_slot(self, admission_client):
+        client, controller, release, _, _ = admission_client
+        controller.queue_timeout = 2.0
+        pending = [asyncio.ensure_future(client.get("/slow")) for _ in range(2)]
+        while controller.in_flight < 2:
+            await asyncio.sleep(0.01)
+        queued = asyncio.ensure_future(client.get("/normal"))
+        await asyncio.sleep(0.05)
+        release.set()
+        assert (await queued).status == 200
+        await asyncio.gather(*pending)
+
+    async def test_loop_pressure_sheds_low_priority(self, admission_client):
+        client, _, _, monitor, _ = admission_client
+        monitor.overloaded = True
+        assert (await client.get("/report")).status == 503
+        assert (await client.get("/normal")).status == 503
+        assert (await client.get("/health")).status == 200
+
+    async def test_soft_pressure_sheds_low_priority_only(self, admission_client):
+        client, controller, _, _, _ = admission_client
+        calls = []
+
+        def saturated():
+            calls.append(1)
+            return True
+        controller.signals = [saturated]
+        assert (await client.get("/report")).status == 503
+        assert (await client.get("/normal")).status == 200
+        # the signals are evaluated once per request.
+        assert len(calls) == 2
@@ -0,0 +1,135 @@
+"""Tests for micro-batching of background tasks."""
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from navigator.background import BackgroundService, JobTracker, TaskWrapper, batched
+from navigator.background.queue.batch import BatchHandler
+
+
+BATCHES = []
+
+
+@batched(max_size=3, max_wait=0.05)
+async def write_audit(rows: list) -> list:
+    BATCHES.append(list(rows))
+    return [
+        ValueError(f"bad row {row}") if row == "bad" else row.upper()
+        for row in rows
+    ]
+
+
+@batched(key="notifications", max_size=100, max_wait=0.05)
+def send_notifications(messages: list) -> None:
+    BATCHES.append(list(messages))
+
+
+@batched(max_size=10, max_wait=0.01)
+async def broken(rows: list) -> list:
+    BATCHES.append(list(rows))
+    raise RuntimeError("database is down")
+
+
+class CountingTracker(JobTracker):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+
+    async def start_jobs(self, job_ids):
+        self.calls.append(("start", len(job_ids)))
+        await super().start_jobs(job_ids)
+
+    async def finish_jobs(self, outcomes):
+        self.calls.append(("finish", len(outcomes)))
+        await super().finish_jobs(outcomes)
+
+
+@pytest.fixture
+async def service():
+    app = web.Application()
+    service = BackgroundService(app, tracker=CountingTracker())
+    await service.queue.fire_consumers()
+    BATCHES.clear()
+    yield service
+    await service.queue.on_cleanup(app)
+
+
+def test_batched_decorator():
+    assert isinstance(write_audit, BatchHandler)
+    assert write_audit.__name__ == "write_audit"
+    assert write_audit.key == "write_audit"
+    assert send_notifications.key == "notifications"
+
+
+async def test_direct_call():
+    assert await write_audit("a") == "A"
+    with pytest.raises(ValueError):
+        await write_audit("bad")
+
+
+async def test_batch_by_size(service):
+    records = [await service.submit(write_audit, row) for row in "abc"]
+    await asyncio.sleep(0.02)  # full before max_wait
+    assert BATCHES == [["a", "b", "c"]]
+    for record, value in zip(records, "ABC"):
+        assert (await service.tracker.status(record.task_id)).result == value
+    assert service.tracker.calls == [("start", 3), ("finish", 3)]
+
+
+async def test_batch_by_time(service):
+    records = await service.submit_many(
+        [(send_notifications, (f"m{i}",)) for i in range(5)]
+    )
+    await asyncio.sleep(0.01)
+    assert BATCHES == []
+    await asyncio.sleep(0.1)
+    assert BATCHES == [[f"m{i}" for i in range(5)]]
+    for record in records:
+        record = await service.tracker.status(record.task_id)
+        assert record.status == "done"
+        assert record.result is None
+
+
+async def test_per_item_failures(service):
+    records = [await service.submit(write_audit, row) for row in ("a", "bad")]
+    await asyncio.sleep(0.15)
+    ok, bad = [await service.tracker.status(r.task_id) for r in records]
+    assert ok.status == "done" and ok.result == "A"
+    assert bad.status == "failed"
+    assert bad.error == "ValueError: bad row bad"
+
+
+async def test_handler_failure_and_retries(service):
+    tw = TaskWrapper(broken, "x", max_retries=2)
+    other = await service.submit(broken, "y")
+    await service.submit(tw)
+    await asyncio.sleep(0.2)
+    # "x" is retried twice (in its own batches).
+    assert BATCHES == [["y", "x"], ["x"], ["x"]]
+    for task_id in (other.task_id, tw.task_uuid):
+        record = await service.tracker.status(task_id)
+        assert record.status == "failed"
+        assert record.error == "RuntimeError: database is down"
+    assert service.queue._tasks == {}
+
+
+async def test_cancel_pending_item(service):
+    records = [await service.submit(write_audit, row) for row in "ab"]
+    assert await service.cancel(records[0].task_id) is True
+    await asyncio.sleep(0.15)
+    assert BATCHES == [["b"]]
+    record = await service.tracker.status(records[0].task_id)
+    assert record.status == "cancelled"
+
+
+async def test_single_item_argument(service):
+    with pytest.raises(TypeError):
+        await service.queue.put(write_audit, "a", "b")
+
+
+async def test_queue_put(service):
+    for row in "abc":
+        await service.queue.put(write_audit, row)
+    await asyncio.sleep(0.02)
+    assert BATCHES == [["a", "b", "c"]]
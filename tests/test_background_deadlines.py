@@ -0,0 +1,110 @@
+"""Tests for task deadlines and cancellation in BackgroundService."""
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from navigator.background import BackgroundService, JobTracker
+from navigator.background.wrappers.loops import LoopThreadPool, set_loop_pool
+
+
+async def sleeper(duration: float = 10) -> float:
+    await asyncio.sleep(duration)
+    return duration
+
+
+async def wait_status(service, record, *statuses, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        rec = await service.tracker.status(record.task_id)
+        if rec.status in statuses:
+            return rec
+        await asyncio.sleep(0.02)
+    raise AssertionError(f"{record!r} still {rec.status}")
+
+
+@pytest.fixture
+async def service():
+    app = web.Application()
+    # a single consumer: a wedged task would block everything behind it.
+    service = BackgroundService(
+        app, tracker=JobTracker(), max_workers=2, process_workers=1
+    )
+    set_loop_pool(LoopThreadPool(threads=1, name="test-deadline"))
+    await service.queue.fire_consumers()
+    yield service
+    await service.queue.on_cleanup(app)
+    await service.process_pool.close()
+    set_loop_pool(None)
+
+
+class TestDeadlines:
+
+    async def test_task_timeout_frees_the_consumer(self, service):
+        slow = await service.submit(sleeper, 10, timeout=0.2)
+        fast = await service.submit(sleeper, 0)
+        rec = await wait_status(service, slow, "failed")
+        assert rec.error == "TimeoutError: Task timed out after 0.2 seconds"
+        assert (await wait_status(service, fast, "done")).result == 0
+
+    async def test_queue_default_timeout(self, service):
+        service.queue.task_timeout = 0.2
+        slow = await service.submit(sleeper, 10)
+        rec = await wait_status(service, slow, "failed")
+        assert rec.error.startswith("TimeoutError")
+
+    async def test_own_timeout_wins(self, service):
+        service.queue.task_timeout = 0.1
+        rec = await service.submit(sleeper, 0.3, timeout=5)
+        assert (await wait_status(service, rec, "done")).result == 0.3
+
+    async def test_thread_mode_timeout(self, service):
+        slow = await service.submit(sleeper, 10, execution_mode="thread", timeout=0.2)
+        rec = await wait_status(service, slow, "failed")
+        assert rec.error.startswith("TimeoutError")
+
+
+class TestCancel:
+
+    async def test_cancel_running_task(self, service):
+        running = await service.submit(sleeper, 10)
+        await wait_status(service, running, "running")
+        assert await service.cancel(running.task_id) is True
+        rec = await wait_status(service, running, "cancelled", timeout=1)
+        assert rec.finished_at is not None
+        # the consumer is free again:
+        fast = await service.submit(sleeper, 0)
+        await wait_status(service, fast, "done", timeout=1)
+        assert await service.cancel(running.task_id) is False
+
+    async def test_cancel_pending_task(self, service):
+        running = await service.submit(sleeper, 0.3)
+        pending = await service.submit(sleeper, 0)
+        assert await service.cancel(pending.task_id) is True
+        assert (await service.tracker.status(pending.task_id)).status == "cancelled"
+        await wait_status(service, running, "done")
+        await asyncio.sleep(0.05)
+        assert (await service.tracker.status(pending.task_id)).status == "cancelled"
+
+    async def test_cancel_thread_task(self, service):
+        rec = await service.submit(sleeper, 10, execution_mode="thread")
+        await wait_status(service, rec, "running")
+        await asyncio.sleep(0.05)
+        assert await service.cancel(rec.task_id) is True
+        await wait_status(service, rec, "cancelled", timeout=1)
+
+    async def test_cancel_process_task(self, service):
+        rec = await service.submit(time.sleep, 30, execution_mode="process")
+        await wait_status(service, rec, "running")
+        await asyncio.sleep(1)  # the worker process starts
+        assert await service.cancel(rec.task_id) is True
+        await wait_status(service, rec, "cancelled", timeout=5)
+        for _ in range(100):
+            if service.process_pool.killed:
+                break
+            await asyncio.sleep(0.05)
+        assert service.process_pool.killed == 1
+
+    async def test_unknown_task(self, service):
+        assert await service.cancel("0" * 32) is False
@@ -0,0 +1,156 @@
+"""Tests for idempotency keys and in-flight deduplication."""
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from navigator.background import BackgroundQueue, BackgroundService, JobTracker, TaskWrapper
+from navigator.background.tracker.models import JobRecord, is_duplicate, time_now
+
+
+CALLS = []
+
+
+async def slow_report(value, delay=0.1):
+    CALLS.append(value)
+    await asyncio.sleep(delay)
+    return value
+
+
+async def failing_report(value):
+    CALLS.append(value)
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+async def service():
+    app = web.Application()
+    service = BackgroundService(app, tracker=JobTracker())
+    await service.queue.fire_consumers()
+    CALLS.clear()
+    yield service
+    await service.queue.on_cleanup(app)
+
+
+def test_is_duplicate():
+    record = JobRecord(name="job")
+    assert is_duplicate(record, 0)
+    record.status = "done"
+    record.finished_at = time_now()
+    assert not is_duplicate(record, 0)
+    assert is_duplicate(record, 60)
+    record.status = "failed"
+    assert not is_duplicate(record, 60)
+    assert not is_duplicate(None, 60)
+
+
+class TestSubmit:
+
+    async def test_attach_to_running_job(self, service):
+        first = await service.submit(slow_report, "a", dedup_key="report:1")
+        second = await service.submit(slow_report, "b", dedup_key="report:1")
+        assert second.task_id == first.task_id
+        await asyncio.sleep(0.3)
+        assert CALLS == ["a"]
+        assert len(await service.tracker.list_jobs()) == 1
+
+    async def test_cached_result(self, service):
+        first = await service.submit(
+            slow_report, "a", delay=0, dedup_key="report:2", dedup_ttl=60
+        )
+        await asyncio.sleep(0.1)
+        second = await service.submit(
+            slow_report, "b", dedup_key="report:2", dedup_ttl=60
+        )
+        assert second.task_id == first.task_id
+        assert second.status == "done"
+        assert second.result == "a"
+        assert CALLS == ["a"]
+
+    async def test_done_without_ttl_runs_again(self, service):
+        await service.submit(slow_report, "a", delay=0, dedup_key="report:3")
+        await asyncio.sleep(0.1)
+        await service.submit(slow_report, "b", delay=0, dedup_key="report:3")
+        await asyncio.sleep(0.1)
+        assert CALLS == ["a", "b"]
+
+    async def test_failed_job_runs_again(self, service):
+        await service.submit(
+            failing_report, "a", dedup_key="report:4", dedup_ttl=60, max_retries=0
+        )
+        await asyncio.sleep(0.1)
+        record = await service.submit(
+            failing_report, "b", dedup_key="report:4", max_retries=0
+        )
+        await asyncio.sleep(0.1)
+        assert CALLS == ["a", "b"]
+        assert (await service.tracker.status(record.task_id)).status == "failed"
+
+    async def test_submit_many(self, service):
+        records = await service.submit_many(
+            [
+                TaskWrapper(slow_report, "a", dedup_key="k"),
+                TaskWrapper(slow_report, "b", dedup_key="k"),
+                TaskWrapper(slow_report, "c"),
+            ]
+        )
+        assert records[0].task_id == records[1].task_id
+        await asyncio.sleep(0.3)
+        assert sorted(CALLS) == ["a", "c"]
+
+    async def test_attach_to_queued_task(self, service):
+        # a tracker forgetting its binding still attaches to the queued task.
+        first = await service.submit(slow_report, "a", dedup_key="k")
+        await service.tracker.forget(first.task_id)
+        await service.tracker.create_job(first, name="slow_report")
+        second = await service.submit(slow_report, "b", dedup_key="k")
+        assert second.task_id == first.task_id
+        assert len(await service.tracker.list_jobs()) == 1
+
+
+async def test_resubmit_after_cancel():
+    app = web.Application()
+    service = BackgroundService(app, tracker=JobTracker())
+    CALLS.clear()
+    first = await service.submit(slow_report, "a", delay=0, dedup_key="k")
+    assert await service.cancel(first.task_id) is True
+    record = await service.submit(slow_report, "b", delay=0, dedup_key="k")
+    assert record.task_id != first.task_id
+    await service.queue.fire_consumers()
+    await asyncio.sleep(0.1)
+    assert CALLS == ["b"]
+    assert (await service.tracker.status(record.task_id)).status == "done"
+    await service.queue.on_cleanup(app)
+
+
+async def test_tracker_drops_bindings():
+    tracker = JobTracker(ttl_seconds=0)
+    records = [await tracker.create_job(JobRecord(name=n)) for n in "ab"]
+    assert await tracker.claim_dedup("a", records[0].task_id) is None
+    assert await tracker.claim_dedup("b", records[1].task_id) is None
+    await tracker.forget(records[0].task_id)
+    assert "a" not in tracker._dedup
+    await tracker.set_done(records[1].task_id)
+    await asyncio.sleep(0.01)
+    assert await tracker._reap_expired() == 1
+    assert tracker._dedup == {} and tracker._dedup_keys == {}
+
+
+class TestQueue:
+
+    async def test_put_drops_in_flight_duplicates(self):
+        queue = BackgroundQueue(app=web.Application(), max_workers=1)
+        assert await queue.put(slow_report, 1, _dedup_key="x") is True
+        assert await queue.put(slow_report, 2, _dedup_key="x") is False
+        count = await queue.put_many(
+            [
+                TaskWrapper(slow_report, 3, dedup_key="x"),
+                TaskWrapper(slow_report, 4, dedup_key="y"),
+                TaskWrapper(slow_report, 5, dedup_key="y"),
+            ]
+        )
+        assert count == 1
+        assert queue.queue.qsize() == 2
+        await queue.empty_queue()
+        assert queue._inflight == {}
+        assert await queue.put(slow_report, 6, _dedup_key="x") is True
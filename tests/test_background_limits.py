@@ -0,0 +1,148 @@
+"""Tests for keyed concurrency limits and ordered partitions."""
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from navigator.background import BackgroundService, JobTracker, TaskWrapper
+from navigator.background.queue.limits import KeyedLimiter
+
+
+EVENTS = []
+RUNNING = {}
+
+
+async def work(name, group="", delay=0.05):
+    RUNNING[group] = RUNNING.get(group, 0) + 1
+    EVENTS.append(("start", name, RUNNING[group]))
+    await asyncio.sleep(delay)
+    RUNNING[group] -= 1
+    EVENTS.append(("end", name))
+    return name
+
+
+class Task:
+    def __init__(self, name, partition=None, group=None, limit=1):
+        self.name = name
+        self.partition_key = partition
+        self.concurrency_key = group
+        self.max_concurrency = limit
+
+
+class TestLimiter:
+
+    def test_partition_fifo(self):
+        limiter = KeyedLimiter()
+        a, b, c = (Task(n, partition="p") for n in "abc")
+        assert limiter.acquire(a) is True
+        assert limiter.acquire(b) is False
+        assert limiter.acquire(c) is False
+        assert limiter.acquire(Task("other", partition="q")) is True
+        assert len(limiter) == 2
+        assert limiter.release(a) == [b]
+        assert limiter.release(b) == [c]
+        assert limiter.release(c) == []
+        assert limiter.running() == {("partition", "q"): 1}
+
+    def test_group_limit(self):
+        limiter = KeyedLimiter()
+        tasks = [Task(i, group="erp", limit=2) for i in range(4)]
+        assert [limiter.acquire(t) for t in tasks] == [True, True, False, False]
+        assert limiter.release(tasks[1]) == [tasks[2]]
+        assert limiter.running() == {("group", "erp"): 2}
+
+    def test_parked_on_group_keeps_partition(self):
+        limiter = KeyedLimiter()
+        busy = Task("busy", group="erp")
+        first = Task("first", partition="p", group="erp")
+        second = Task("second", partition="p")
+        assert limiter.acquire(busy) is True
+        assert limiter.acquire(first) is False  # holds "p", waits for "erp"
+        assert limiter.acquire(second) is False  # behind "first"
+        assert limiter.release(busy) == [first]
+        assert limiter.release(first) == [second]
+
+    def test_release_parked(self):
+        limiter = KeyedLimiter()
+        a, b, c = (Task(n, partition="p") for n in "abc")
+        for t in (a, b, c):
+            limiter.acquire(t)
+        assert limiter.parked(b)
+        assert limiter.release(b) == []
+        assert limiter.release(a) == [c]
+
+    def test_no_limits(self):
+        limiter = KeyedLimiter()
+        assert limiter.acquire(Task("free")) is True
+        assert limiter.release(Task("free")) == []
+
+
+@pytest.fixture
+async def service():
+    app = web.Application()
+    service = BackgroundService(app, tracker=JobTracker(), max_workers=5)
+    await service.queue.fire_consumers()
+    EVENTS.clear()
+    RUNNING.clear()
+    yield service
+    await service.queue.on_cleanup(app)
+
+
+def starts():
+    return [e for e in EVENTS if e[0] == "start"]
+
+
+async def test_partition_order(service):
+    for i in range(4):
+        await service.submit(work, f"p{i}", "p", partition_key="employee:1")
+    await service.submit(work, "q0", "q", partition_key="employee:2")
+    await asyncio.sleep(0.4)
+    names = [e[1] for e in EVENTS if e[1].startswith("p")]
+    assert names == ["p0", "p0", "p1", "p1", "p2", "p2", "p3", "p3"]
+    # other partitions run in parallel.
+    assert EVENTS.index(("start", "q0", 1)) < EVENTS.index(("end", "p0"))
+
+
+async def test_group_limit(service):
+    for i in range(6):
+        await service.submit(
+            work, f"erp{i}", "erp", concurrency_key="erp", max_concurrency=2
+        )
+    await service.submit(work, "free", "free", delay=0)
+    await asyncio.sleep(0.3)
+    assert max(e[2] for e in starts() if e[1].startswith("erp")) == 2
+    # parked tasks do not hold the consumers.
+    assert EVENTS.index(("end", "free")) < EVENTS.index(("end", "erp0"))
+    records = await service.tracker.list_jobs()
+    assert all(r.status == "done" for r in records.values())
+    assert service.queue.limiter.running() == {}
+
+
+async def test_thread_mode(service):
+    for i in range(3):
+        await service.submit(
+            work, f"t{i}", "t", partition_key="t", execution_mode="thread"
+        )
+    await asyncio.sleep(0.4)
+    assert [e[1] for e in EVENTS] == ["t0", "t0", "t1", "t1", "t2", "t2"]
+
+
+async def test_cancel_parked(service):
+    records = [
+        await service.submit(work, f"c{i}", "c", partition_key="c")
+        for i in range(3)
+    ]
+    assert await service.cancel(records[1].task_id) is True
+    assert len(service.queue.limiter) == 1
+    await asyncio.sleep(0.2)
+    assert [e[1] for e in starts()] == ["c0", "c2"]
+    record = await service.tracker.status(records[1].task_id)
+    assert record.status == "cancelled"
+
+
+def test_task_wrapper_options():
+    tw = TaskWrapper(work, "x", partition_key="employee:1", concurrency_key="erp")
+    assert (tw.partition_key, tw.concurrency_key, tw.max_concurrency) == (
+        "employee:1", "erp", 1
+    )
+    assert tw.clone().partition_key == "employee:1"
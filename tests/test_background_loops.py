@@ -0,0 +1,91 @@
+"""Tests for the pool of event-loop threads behind "thread" mode tasks."""
+import asyncio
+import threading
+
+import pytest
+
+from navigator.background import TaskWrapper, JobTracker
+from navigator.background.wrappers import coroutine_in_thread, run_in_loop_thread
+from navigator.background.wrappers.loops import LoopThreadPool, set_loop_pool
+
+
+async def whoami(delay: float = 0.0):
+    await asyncio.sleep(delay)
+    return threading.current_thread().name
+
+
+@pytest.fixture
+def pool():
+    pool = set_loop_pool(LoopThreadPool(threads=2, max_pending=4, name="test-loop"))
+    yield pool
+    pool.shutdown()
+    set_loop_pool(None)
+
+
+class TestLoopThreadPool:
+
+    async def test_threads_are_reused(self, pool):
+        futures = [await run_in_loop_thread(whoami()) for _ in range(20)]
+        names = {(await asyncio.wrap_future(f))[0] for f in futures}
+        assert names <= {"test-loop-0", "test-loop-1"}
+        assert pool.stats()["threads"] == 2
+        assert pool.completed == 20
+        assert pool.pending == 0
+
+    async def test_least_loaded_dispatch(self, pool):
+        futures = [pool.submit(whoami(0.05)) for _ in range(4)]
+        assert sorted(pool.stats()["load"]) == [2, 2]
+        results = [(await asyncio.wrap_future(f))[0] for f in futures]
+        assert results.count("test-loop-0") == 2
+
+    async def test_bounded_pending(self, pool):
+        futures = [pool.submit(whoami(0.05)) for _ in range(4)]
+        with pytest.raises(asyncio.QueueFull):
+            coroutine_in_thread(whoami())
+        # the async path waits for a slot instead.
+        extra = await asyncio.wait_for(run_in_loop_thread(whoami()), 1)
+        await asyncio.wrap_future(extra)
+        for f in futures:
+            await asyncio.wrap_future(f)
+        assert pool.pending == 0
+
+    async def test_callbacks(self, pool):
+        done = asyncio.Event()
+        seen = {}
+
+        async def callback(result, exc, loop=None):
+            seen["loop"] = loop
+
+        async def on_complete(result, exc):
+            seen["result"] = result
+            seen["loop_thread"] = threading.current_thread().name
+            done.set()
+
+        event = coroutine_in_thread(whoami(), callback, on_complete=on_complete)
+        await asyncio.wait_for(done.wait(), 1)
+        assert event.is_set()
+        assert seen["result"].startswith("test-loop")
+        assert seen["loop"] is not asyncio.get_running_loop()
+        assert seen["loop_thread"] == threading.current_thread().name
+
+    async def test_shutdown_cancels_pending(self, pool):
+        future = pool.submit(whoami(10))
+        await asyncio.to_thread(pool.shutdown)
+        assert future.cancelled()
+        assert pool.pending == 0
+        # the pool restarts on demand.
+        again = pool.submit(whoami())
+        assert (await asyncio.wrap_future(again))[0].startswith("test-loop")
+
+
+async def test_thread_mode_uses_pool(pool):
+    tracker = JobTracker()
+    tw = TaskWrapper(whoami, tracker=tracker, execution_mode="thread")
+    await tracker.create_job(tw.job_record)
+    assert (await tw())["status"] == "running"
+    for _ in range(50):
+        record = await tracker.status(tw.task_uuid)
+        if record.status == "done":
+            break
+        await asyncio.sleep(0.02)
+    assert record.result.startswith("test-loop")
@@ -0,0 +1,79 @@
+"""Tests for the "process" execution mode and its warm ProcessPool."""
+import asyncio
+import math
+import os
+import time
+
+import pytest
+
+from navigator.background import JobTracker, TaskWrapper
+from navigator.background.wrappers.process import ProcessPool
+
+
+@pytest.fixture
+async def pool():
+    pool = ProcessPool(workers=2)
+    await pool.start()
+    yield pool
+    await pool.close()
+
+
+class TestProcessPool:
+
+    async def test_runs_in_another_process(self, pool):
+        assert await pool.run(os.getpid) != os.getpid()
+        assert await pool.run(math.factorial, 20) == math.factorial(20)
+
+    async def test_closures_are_shipped(self, pool):
+        offset = 42
+        assert await pool.run(lambda x: x + offset, 1) == 43
+
+    async def test_exception_propagates(self, pool):
+        with pytest.raises(ValueError):
+            await pool.run(int, "not a number")
+
+    async def test_timeout_kills_only_the_runaway(self, pool):
+        other = asyncio.create_task(pool.run(time.sleep, 0.5))
+        await asyncio.sleep(0.1)
+        with pytest.raises(TimeoutError):
+            await pool.run(time.sleep, 30, timeout=0.3)
+        assert pool.killed == 1
+        # the task interrupted by the pool restart is submitted again.
+        await asyncio.wait_for(other, 10)
+        assert await pool.run(math.factorial, 5) == 120
+
+    async def test_max_tasks_per_child(self):
+        pool = ProcessPool(workers=1, max_tasks_per_child=2)
+        try:
+            pids = [await pool.run(os.getpid) for _ in range(4)]
+        finally:
+            await pool.close()
+        assert len(set(pids)) == 2
+
+
+class TestProcessMode:
+
+    async def test_result_reaches_tracker(self, pool):
+        tracker = JobTracker()
+        tw = TaskWrapper(
+            math.factorial, 10, tracker=tracker, execution_mode="process", process_pool=pool
+        )
+        await tracker.create_job(tw.job_record)
+        result = await tw()
+        assert result == {"status": "done", "result": 3628800}
+        record = await tracker.status(tw.task_uuid)
+        assert record.status == "done"
+        assert record.result == 3628800
+
+    async def test_failure_reaches_tracker(self, pool):
+        tracker = JobTracker()
+        tw = TaskWrapper(
+            time.sleep, 30, tracker=tracker, execution_mode="process",
+            process_pool=pool, timeout=0.3
+        )
+        await tracker.create_job(tw.job_record)
+        result = await tw()
+        assert result["status"] == "failed"
+        record = await tracker.status(tw.task_uuid)
+        assert record.status == "failed"
+        assert record.error.startswith("TimeoutError")
@@ -0,0 +1,283 @@
+"""Tests for BackgroundQueue enqueueing, priority lanes and fair scheduling."""
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from navigator.background import BackgroundQueue, BackgroundService, JobTracker, TaskWrapper
+from navigator.background.queue.base import TaskQueue
+from navigator.background.queue.fair import FairQueue
+from navigator.metrics import MetricsRegistry
+
+
+async def noop(value=None):
+    return value
+
+
+class TestTaskQueue:
+
+    async def test_put_many_is_all_or_nothing(self):
+        queue = TaskQueue(maxsize=3)
+        queue.put_nowait("a")
+        queue.put_nowait("b")
+        batch = asyncio.create_task(queue.put_many(["c", "d"]))
+        await asyncio.sleep(0)
+        # one free slot is not enough: nothing of the batch is visible.
+        assert not batch.done()
+        assert queue.qsize() == 2
+        assert queue.get_nowait() == "a"
+        assert await asyncio.wait_for(batch, 1) == 2
+        assert [queue.get_nowait() for _ in range(3)] == ["b", "c", "d"]
+
+    async def test_oversized_batch_waits_for_empty_queue(self):
+        queue = TaskQueue(maxsize=2)
+        queue.put_nowait("a")
+        batch = asyncio.create_task(queue.put_many(range(5)))
+        await asyncio.sleep(0)
+        assert not batch.done()
+        queue.get_nowait()
+        queue.task_done()
+        assert await asyncio.wait_for(batch, 1) == 5
+        assert queue.qsize() == 5
+
+    async def test_cancelled_batch_enqueues_nothing(self):
+        queue = TaskQueue(maxsize=1)
+        queue.put_nowait("a")
+        batch = asyncio.create_task(queue.put_many(["b", "c"]))
+        await asyncio.sleep(0)
+        batch.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await batch
+        assert queue.qsize() == 1
+
+    async def test_wakes_consumers(self):
+        queue = TaskQueue()
+        getters = [asyncio.create_task(queue.get()) for _ in range(3)]
+        await asyncio.sleep(0)
+        await queue.put_many([1, 2, 3])
+        assert sorted(await asyncio.gather(*getters)) == [1, 2, 3]
+
+
+class _Item:
+    def __init__(self, name, key=None, priority=None):
+        self.name = name
+        self.fair_key = key
+        self.priority = priority
+
+
+def _drain(queue, release=True):
+    names = []
+    while not queue.empty():
+        item = queue.get_nowait()
+        names.append(item.name)
+        if release:
+            queue.release(item)
+    return names
+
+
+class TestFairQueue:
+
+    def test_fifo_without_keys_or_priorities(self):
+        queue = FairQueue()
+        for i in range(5):
+            queue.put_nowait(_Item(i))
+        assert _drain(queue) == [0, 1, 2, 3, 4]
+
+    def test_priority_lanes(self):
+        queue = FairQueue()
+        queue.put_nowait(_Item("export", priority="low"))
+        queue.put_nowait(_Item("report"))
+        queue.put_nowait(_Item("reset", priority="critical"))
+        queue.put_nowait(_Item("email", priority="high"))
+        assert _drain(queue) == ["reset", "email", "report", "export"]
+        assert queue.lanes()["low"]["depth"] == 0
+
+    def test_invalid_priority(self):
+        queue = FairQueue()
+        with pytest.raises(ValueError):
+            queue.put_nowait(_Item("x", priority="urgent"))
+
+    def test_keys_are_interleaved(self):
+        queue = FairQueue()
+        for i in range(4):
+            queue.put_nowait(_Item(f"a{i}", key="bulk"))
+        queue.put_nowait(_Item("b0", key="small"))
+        queue.put_nowait(_Item("b1", key="small"))
+        assert _drain(queue) == ["a0", "b0", "a1", "b1", "a2", "a3"]
+
+    def test_weights(self):
+        queue = FairQueue(weights={"gold": 2})
+        for i in range(4):
+            queue.put_nowait(_Item(f"g{i}", key="gold"))
+            queue.put_nowait(_Item(f"s{i}", key="silver"))
+        assert _drain(queue)[:6] == ["g0", "s0", "g1", "g2", "s1", "g3"]
+
+    def test_consumer_share(self):
+        queue = FairQueue(slots=4)
+        for i in range(6):
+            queue.put_nowait(_Item(f"a{i}", key="a"))
+        # "a" alone may use every consumer.
+        taken = [queue.get_nowait() for _ in range(4)]
+        assert queue.running() == {"a": 4}
+        queue.put_nowait(_Item("b0", key="b"))
+        queue.put_nowait(_Item("b1", key="b"))
+        queue.release(taken[0])
+        # "a" holds 3 of 4 consumers, over its half: "b" goes first.
+        assert queue.get_nowait().name == "b0"
+        queue.release(taken[1])
+        assert queue.get_nowait().name == "b1"
+        queue.release(taken[2])
+        assert queue.get_nowait().name == "a4"
+
+    def test_wait_histogram(self):
+        registry = MetricsRegistry()
+        queue = FairQueue()
+        queue.histogram = registry.histogram(
+            "background_queue_wait_seconds", "", ("service", "lane")
+        )
+        queue.labels = ("default",)
+        queue.put_nowait(_Item("x", priority="high"))
+        queue.get_nowait()
+        assert queue.histogram.count(("default", "high")) == 1
+
+
+class TestBackgroundQueuePut:
+
+    async def test_put_returns_without_delay(self):
+        queue = BackgroundQueue(web.Application(), queue_size=100)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for i in range(50):
+            await queue.put(noop, i)
+        assert loop.time() - start < 0.5
+        assert queue.queue.qsize() == 50
+        queue.shutdown_executor()
+
+    async def test_put_many_mixed_items(self):
+        queue = BackgroundQueue(web.Application(), queue_size=10)
+        tw = TaskWrapper(noop)
+        count = await queue.put_many([tw, noop, (noop, (1,), {})])
+        assert count == 3
+        assert queue.queue.get_nowait() is tw
+        assert queue.queue.get_nowait() == (noop, (), {})
+        assert queue.queue.get_nowait() == (noop, (1,), {})
+        queue.shutdown_executor()
+
+    async def test_put_priority_and_fair_by(self):
+        queue = BackgroundQueue(web.Application(), queue_size=10, fair_by="tenant")
+        await queue.put(noop, 1, tenant="acme")
+        await queue.put(noop, 2, tenant="acme")
+        await queue.put(noop, 3, tenant="other")
+        await queue.put(noop, 4, _priority="high")
+        order = [queue.queue.get_nowait()[1][0] for _ in range(4)]
+        assert order == [4, 1, 3, 2]
+        queue.shutdown_executor()
+
+    async def test_put_rejects_non_callables(self):
+        queue = BackgroundQueue(web.Application())
+        with pytest.raises(TypeError):
+            await queue.put_many([42])
+        queue.shutdown_executor()
+
+
+class TestSubmitMany:
+
+    async def test_jobs_created_in_one_batch_and_run(self):
+        app = web.Application()
+        tracker = JobTracker()
+        service = BackgroundService(app, tracker=tracker, queue_size=4)
+        calls = []
+        original = tracker.create_jobs
+
+        async def create_jobs(jobs):
+            calls.append(len(jobs))
+            return await original(jobs)
+
+        tracker.create_jobs = create_jobs
+        await service.queue.fire_consumers()
+        try:
+            records = await service.submit_many(
+                [(noop, (i,)) for i in range(10)]
+            )
+            assert calls == [10]
+            assert len(records) == 10
+            for _ in range(50):
+                jobs = await tracker.list_jobs()
+                if all(r.status == "done" for r in jobs.values()):
+                    break
+                await asyncio.sleep(0.02)
+            assert sorted(r.result for r in jobs.values()) == list(range(10))
+        finally:
+            await service.queue.on_cleanup(app)
+
+
+class TestAutoscaler:
+
+    async def test_fixed_pool_runs_max_workers(self):
+        queue = BackgroundQueue(web.Application(), max_workers=1)
+        await queue.fire_consumers()
+        try:
+            assert len(queue.consumers) == 1
+            assert queue._scaler is None
+        finally:
+            await queue.on_cleanup(queue.app)
+
+    async def test_scales_up_and_down(self):
+        registry = MetricsRegistry()
+        queue = BackgroundQueue(
+            web.Application(),
+            max_workers=4,
+            min_workers=1,
+            queue_size=100,
+            scale_interval=3600,
+            scale_idle=10,
+        )
+        queue.register(registry)
+        await queue.fire_consumers()
+        try:
+            assert len(queue.consumers) == 1
+            gate = asyncio.Event()
+            for _ in range(6):
+                await queue.put(TaskWrapper(gate.wait))
+            await asyncio.sleep(0.05)
+            assert queue.busy == 1
+            assert queue.scale(now=0) == 3
+            assert len(queue.consumers) == 4
+            await asyncio.sleep(0.05)
+            assert queue.busy == 4
+            assert queue.scale(now=0) == 0  # already at max_workers
+            gate.set()
+            await asyncio.wait_for(queue.queue.join(), 1)
+            assert queue.scale(now=100) == 0  # idle period starts
+            assert queue.scale(now=105) == 0
+            assert queue.scale(now=110) == -1
+            assert queue.scale(now=111) == -1
+            assert queue.scale(now=112) == -1
+            assert queue.scale(now=113) == 0  # min_workers
+            await asyncio.sleep(0)
+            assert len(queue.consumers) == 1
+            scaling = registry.get("background_queue_scaling_total")
+            assert scaling.get(("service_queue", "up")) == 3
+            assert scaling.get(("service_queue", "down")) == 3
+            # the remaining consumer still works:
+            await queue.put(TaskWrapper(noop, 1))
+            await asyncio.wait_for(queue.queue.join(), 1)
+        finally:
+            await queue.on_cleanup(queue.app)
+
+    async def test_scales_up_on_wait_time(self):
+        queue = BackgroundQueue(
+            web.Application(), max_workers=3, min_workers=1, scale_wait=0.05
+        )
+        gate = asyncio.Event()
+        await queue.fire_consumers()
+        try:
+            await queue.put(TaskWrapper(gate.wait))
+            await queue.put(TaskWrapper(gate.wait))
+            await asyncio.sleep(0.01)
+            assert queue.scale() == 0  # one task waits, not for long
+            await asyncio.sleep(0.06)
+            assert queue.scale() == 1
+            gate.set()
+        finally:
+            await queue.on_cleanup(queue.app)
@@ -0,0 +1,168 @@
+"""Tests for delayed and cron scheduling of background tasks."""
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import pytest
+from aiohttp import web
+
+from navigator.background import BackgroundService, JobTracker, TaskWrapper
+from navigator.background.scheduler import Schedule, Scheduler
+from navigator.background.scheduler.cron import CronSchedule
+
+
+CALLS = []
+
+
+async def record_call(value=None):
+    CALLS.append(value)
+    return value
+
+
+def ts(*args) -> float:
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+class TestCron:
+
+    def test_next_after(self):
+        cron = CronSchedule("*/15 9-17 * * mon-fri")
+        # Friday 2026-10-16 17:50 -> Monday 09:00
+        assert cron.next_after(ts(2026, 10, 16, 17, 50)) == ts(2026, 10, 19, 9, 0)
+        assert cron.next_after(ts(2026, 10, 19, 9, 0)) == ts(2026, 10, 19, 9, 15)
+
+    def test_macros_and_names(self):
+        assert CronSchedule("@yearly").next_after(ts(2026, 3, 1)) == ts(2027, 1, 1)
+        cron = CronSchedule("30 6 * jan,jul sun")
+        assert cron.next_after(ts(2026, 6, 30)) == ts(2026, 7, 5, 6, 30)
+
+    def test_day_of_month_or_week(self):
+        # the 13th, or any Friday.
+        cron = CronSchedule("0 0 13 * 5")
+        assert cron.next_after(ts(2026, 10, 10)) == ts(2026, 10, 13)
+        assert cron.next_after(ts(2026, 10, 13)) == ts(2026, 10, 16)
+
+    def test_timezone(self):
+        cron = CronSchedule("0 9 * * *", tz="America/New_York")
+        assert cron.next_after(ts(2026, 10, 18, 12)) == ts(2026, 10, 18, 13)
+
+    @pytest.mark.parametrize(
+        "expression", ["* * * *", "61 * * * *", "* * * * mon-xyz", "*/0 * * * *"]
+    )
+    def test_invalid(self, expression):
+        with pytest.raises(ValueError):
+            CronSchedule(expression)
+
+    def test_never_fires(self):
+        with pytest.raises(ValueError):
+            CronSchedule("0 0 30 2 *").next_after(ts(2026, 1, 1))
+
+
+@pytest.fixture
+async def service():
+    app = web.Application()
+    service = BackgroundService(app, tracker=JobTracker())
+    await service.queue.fire_consumers()
+    await service.scheduler.start()
+    CALLS.clear()
+    yield service
+    await service.scheduler.stop()
+    await service.queue.on_cleanup(app)
+
+
+class TestSchedule:
+
+    async def test_delay(self, service):
+        schedule_id = await service.schedule(record_call, 1, delay=0.1)
+        assert [s["schedule_id"] for s in service.schedules()] == [schedule_id]
+        await asyncio.sleep(0.05)
+        assert CALLS == []
+        await asyncio.sleep(0.2)
+        assert CALLS == [1]
+        assert service.schedules() == []
+        jobs = await service.tracker.list_jobs()
+        assert [r.status for r in jobs.values()] == ["done"]
+
+    async def test_at_and_task_wrapper(self, service):
+        tw = TaskWrapper(record_call, 2, jitter=0.05)
+        await service.schedule(tw, at=time.time() + 0.05)
+        assert tw.jitter == 0.0  # the timer adds it
+        await asyncio.sleep(0.3)
+        assert CALLS == [2]
+
+    async def test_one_of_at_delay_cron(self, service):
+        with pytest.raises(ValueError):
+            await service.schedule(record_call, delay=1, cron="* * * * *")
+        with pytest.raises(ValueError):
+            await service.schedule(record_call, delay=1, misfire="later")
+
+    async def test_unschedule(self, service):
+        schedule_id = await service.schedule(record_call, 3, delay=0.1)
+        assert await service.unschedule(schedule_id) is True
+        await asyncio.sleep(0.2)
+        assert CALLS == []
+        assert await service.unschedule(schedule_id) is False
+
+    async def test_thousands_of_timers(self, service):
+        for i in range(5000):
+            await service.schedule(record_call, i, delay=3600 + i)
+        assert len(service.scheduler) == 5000
+        tasks = [t for t in asyncio.all_tasks() if "_run" in repr(t.get_coro())]
+        assert len(tasks) == 1
+        # the earliest one is found without scanning the others.
+        first = await service.schedule(record_call, -1, delay=0.05)
+        await asyncio.sleep(0.2)
+        assert CALLS == [-1]
+        assert service.scheduler.get(first) is None
+
+    async def test_restore(self, service):
+        await service.schedule(record_call, 4, cron="0 0 1 1 *", schedule_id="yearly")
+        saved = await service.tracker.load_schedules()
+        assert saved["yearly"]["spec"]["fn"] == f"{__name__}:record_call"
+        other = BackgroundService(web.Application(), tracker=service.tracker)
+        assert await other.scheduler.restore() == 1
+        restored = other.scheduler.get("yearly")
+        assert restored.cron.expression == "0 0 1 1 *"
+        assert restored.task.args == (4,)
+
+    async def test_lambdas_are_not_saved(self, service):
+        await service.schedule(lambda: None, delay=60)
+        assert await service.tracker.load_schedules() == {}
+
+
+class TestMisfire:
+
+    def _cron(self, misfire: str) -> tuple:
+        scheduler = Scheduler(service=None, misfire_grace=60)
+        now = ts(2026, 10, 18, 12, 0, 30)
+        schedule = Schedule(
+            "s",
+            TaskWrapper(record_call),
+            next_run=ts(2026, 10, 18, 11, 55),
+            cron=CronSchedule("* * * * *"),
+            misfire=misfire,
+        )
+        return scheduler._due_runs(schedule, now), schedule
+
+    def test_fire_once(self):
+        runs, schedule = self._cron("fire_once")
+        assert runs == [ts(2026, 10, 18, 12, 0)]
+        assert schedule.next_run == ts(2026, 10, 18, 12, 1)
+
+    def test_fire_all(self):
+        runs, _ = self._cron("fire_all")
+        assert runs == [ts(2026, 10, 18, 11, m) for m in range(55, 60)] + [
+            ts(2026, 10, 18, 12, 0)
+        ]
+
+    def test_skip(self):
+        runs, schedule = self._cron("skip")
+        assert runs == []
+        assert schedule.next_run == ts(2026, 10, 18, 12, 1)
+
+    def test_within_grace(self):
+        scheduler = Scheduler(service=None, misfire_grace=60)
+        schedule = Schedule(
+            "s", TaskWrapper(record_call), next_run=100.0, misfire="skip"
+        )
+        assert scheduler._due_runs(schedule, 130.0) == [100.0]
@@ -0,0 +1,128 @@
+"""Tests for response compression and static precompression."""
+import gzip
+import os
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from navigator.middlewares.compression import COMPRESSION_KEY, setup_compression
+from navigator.utils.compression import (
+    available_codings,
+    compress,
+    negotiate,
+    precompress_directory,
+)
+
+
+class TestNegotiation:
+    def test_preference_order(self):
+        assert negotiate("gzip, br", ("br", "gzip")) == "br"
+
+    def test_q_values(self):
+        assert negotiate("br;q=0.5, gzip", ("br", "gzip")) == "gzip"
+        assert negotiate("br;q=0, gzip;q=0", ("br", "gzip")) is None
+
+    def test_wildcard_and_identity(self):
+        assert negotiate("*", ("gzip",)) == "gzip"
+        assert negotiate("identity", ("gzip",)) is None
+        assert negotiate(None) is None
+
+    def test_gzip_roundtrip(self):
+        data = b"navigator " * 100
+        assert gzip.decompress(compress(data, "gzip")) == data
+
+
+class TestPrecompress:
+    def test_writes_smaller_siblings(self, tmp_path):
+        (tmp_path / "app.js").write_text("console.log('x');\n" * 500)
+        (tmp_path / "tiny.css").write_text("a{}")
+        (tmp_path / "photo.png").write_bytes(os.urandom(4096))
+        written = precompress_directory(tmp_path, codings=("gzip",))
+        assert written == [tmp_path / "app.js.gz"]
+        gz = tmp_path / "app.js.gz"
+        assert gzip.decompress(gz.read_bytes()) == (tmp_path / "app.js").read_bytes()
+        # up-to-date siblings are not rebuilt.
+        assert precompress_directory(tmp_path, codings=("gzip",)) == []
+
+
+@pytest.fixture
+async def compression_client(tmp_path):
+    app = web.Application()
+    payload = {"rows": [{"id": i, "name": f"row {i}"} for i in range(2000)]}
+
+    async def big(request):
+        resp = web.json_response(payload)
+        resp.headers["ETag"] = '"v1"'
+        return resp
+
+    async def small(request):
+        return web.json_response({"ok": True})
+
+    async def stream(request):
+        resp = web.StreamResponse(headers={"Content-Type": "text/plain"})
+        await resp.prepare(request)
+        for _ in range(100):
+            await resp.write(b"chunk of streamed text\n")
+        await resp.write_eof()
+        return resp
+
+    (tmp_path / "app.js").write_text("console.log('x');\n" * 500)
+    app.router.add_get("/big", big)
+    app.router.add_get("/small", small)
+    app.router.add_get("/stream", stream)
+    app.router.add_static("/static/", tmp_path)
+    setup_compression(
+        app, static_dirs=[tmp_path], precompress=True, min_size=512, offload_size=4096
+    )
+    client = TestClient(TestServer(app))
+    await client.start_server()
+    yield client, payload
+    await client.close()
+
+
+class TestMiddleware:
+    def test_setup_is_idempotent(self):
+        app = web.Application()
+        compressor = setup_compression(app)
+        assert app[COMPRESSION_KEY] is compressor
+        assert setup_compression(app) is compressor
+        assert app.middlewares[-1] == compressor.middleware
+
+    async def test_compresses_large_json(self, compression_client):
+        client, payload = compression_client
+        resp = await client.get("/big", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in resp.headers["Vary"]
+        assert resp.headers["ETag"] == '"v1-gzip"'
+        assert await resp.json() == payload
+
+    async def test_best_coding_is_negotiated(self, compression_client):
+        client, _ = compression_client
+        resp = await client.get("/big", headers={"Accept-Encoding": "gzip, br"})
+        expected = "br" if "br" in available_codings() else "gzip"
+        assert resp.headers["Content-Encoding"] == expected
+
+    async def test_small_and_identity_untouched(self, compression_client):
+        client, _ = compression_client
+        resp = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in resp.headers
+        resp = await client.get("/big", headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in resp.headers
+        assert resp.headers["Vary"] == "Accept-Encoding"
+
+    async def test_streamed_response(self, compression_client):
+        client, _ = compression_client
+        resp = await client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert (await resp.text()).count("chunk") == 100
+
+    async def test_precompressed_static(self, compression_client, tmp_path):
+        client, _ = compression_client
+        assert (tmp_path / "app.js.gz").exists()
+        resp = await client.get(
+            "/static/app.js", headers={"Accept-Encoding": "gzip"}
+        )
+        assert resp.status == 200
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert (await resp.text()).startswith("console.log")
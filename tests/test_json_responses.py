@@ -0,0 +1,82 @@
+"""Tests for the bytes fast path of JSON responses."""
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import orjson
+import pytest
+from aiohttp import web
+
+from navigator.libs.json import json_encoder, json_encoder_bytes
+from navigator.responses import JSONResponse, json_body, json_headers
+from navigator.views.base import BaseHandler
+
+
+class _Handler(BaseHandler):
+    pass
+
+
+class TestEncoder:
+    def test_encodes_to_bytes(self):
+        payload = {"name": "número", "items": [1, 2, 3], "when": datetime(2024, 1, 1)}
+        body = json_encoder_bytes(payload)
+        assert isinstance(body, bytes)
+        assert orjson.loads(body) == orjson.loads(json_encoder(payload))
+
+    def test_datetimes_match_str_path(self):
+        payload = {
+            "naive": datetime(2024, 1, 1, 12),
+            "aware": datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+        }
+        assert json_encoder_bytes(payload) == json_encoder(payload).encode("utf-8")
+        assert orjson.loads(json_encoder_bytes(payload))["naive"] == "2024-01-01T12:00:00Z"
+
+    def test_falls_back_to_datamodel_encoder(self):
+        body = json_encoder_bytes({"amount": Decimal("1.50")})
+        assert orjson.loads(body) == orjson.loads(json_encoder({"amount": Decimal("1.50")}))
+
+    def test_encoded_payload_untouched(self):
+        cached = b'{"cached":true}'
+        assert json_body(cached) is cached
+
+    def test_headers_are_merged(self):
+        headers = {"X-Test": "1"}
+        merged = json_headers(headers)
+        assert merged["Content-Type"] == "application/json; charset=utf-8"
+        assert merged["X-Test"] == "1"
+        assert "Content-Type" not in headers
+
+
+class TestResponses:
+    def test_json_response_body_is_bytes(self):
+        response = JSONResponse({"ok": True}, status=201, headers={"X-Test": "1"})
+        assert response.status == 201
+        assert response.body == b'{"ok":true}'
+        assert response.content_type == "application/json"
+        assert response.charset == "utf-8"
+        assert response.headers["X-Test"] == "1"
+
+    def test_handler_response(self):
+        response = _Handler().response({"a": 1})
+        assert response.body == b'{"a":1}'
+        assert response.content_type == "application/json"
+
+    def test_handler_custom_encoder(self):
+        class _Encoder:
+            def dumps(self, obj):
+                return '{"custom":true}'
+
+        handler = _Handler()
+        handler._json = _Encoder()
+        assert handler.response({"a": 1}).body == b'{"custom":true}'
+
+    def test_handler_error_raises_json(self):
+        with pytest.raises(web.HTTPNotFound) as exc:
+            _Handler().error({"message": "missing"}, status=404, headers={"X-Test": "1"})
+        assert orjson.loads(exc.value.body) == {"message": "missing"}
+        assert exc.value.content_type == "application/json"
+        assert exc.value.headers["X-Test"] == "1"
+
+    def test_handler_critical_raises_json(self):
+        with pytest.raises(web.HTTPInternalServerError) as exc:
+            _Handler().critical(reason="boom", exception=ValueError("bad"))
+        assert orjson.loads(exc.value.body)["error"] == "bad"
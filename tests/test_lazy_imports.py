@@ -0,0 +1,86 @@
+"""Tests for the PEP 562 lazy-import facade.
+
+Verifies that importing ``navigator`` (and the heavy sub-packages) keeps
+the import set small: ``Application``, the template system, the SSE /
+WebSocket services and the actions are only loaded on first access.
+"""
+import subprocess
+import sys
+
+import pytest
+
+
+HEAVY_MODULES = (
+    "navigator.navigator",
+    "navigator.responses",
+    "navigator.template.parser",
+    "navigator.services.sse",
+    "navigator.services.ws",
+    "navigator.actions.rest",
+    "navigator.utils.file.web",
+    "aiohttp",
+    "jinja2",
+    "sockjs",
+    "navigator_auth",
+)
+
+
+def _loaded_after(statement: str) -> set:
+    """Run *statement* in a fresh interpreter, return the heavy modules loaded."""
+    code = (
+        f"import sys\n{statement}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    line = out.stdout.strip().splitlines()[-1] if out.stdout.strip() else ""
+    return {m for m in line.split(",") if m}
+
+
+class TestImportSet:
+    def test_import_navigator_is_small(self):
+        """``import navigator`` must not load the application stack."""
+        assert _loaded_after("import navigator") == set()
+
+    def test_version_does_not_load_application(self):
+        loaded = _loaded_after("import navigator; navigator.version()")
+        assert "navigator.navigator" not in loaded
+
+    @pytest.mark.parametrize(
+        "package",
+        ["navigator.services", "navigator.template", "navigator.actions"],
+    )
+    def test_subpackage_import_is_small(self, package):
+        assert _loaded_after(f"import {package}") == set()
+
+
+class TestLazyAttributes:
+    @pytest.mark.parametrize(
+        "package, name",
+        [
+            ("navigator.services", "SSEManager"),
+            ("navigator.template", "TemplateParser"),
+            ("navigator.actions", "AbstractAction"),
+        ],
+    )
+    def test_lazy_attribute_is_cached(self, package, name):
+        import importlib
+        pkg = importlib.import_module(package)
+        obj = getattr(pkg, name)
+        assert obj is not None
+        assert name in pkg.__dict__
+        assert name in pkg.__all__
+
+    @pytest.mark.parametrize(
+        "package",
+        ["navigator", "navigator.services", "navigator.template", "navigator.actions"],
+    )
+    def test_unknown_attribute_raises(self, package):
+        import importlib
+        pkg = importlib.import_module(package)
+        with pytest.raises(AttributeError):
+            _ = pkg.NonExistentName
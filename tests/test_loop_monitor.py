@@ -0,0 +1,59 @@
+"""Tests for the event-loop lag monitor and slow-callback detector."""
+import asyncio
+import logging
+import time
+
+from aiohttp import web
+
+from navigator.metrics import MetricsRegistry
+from navigator.metrics.loop import LOOP_MONITOR_KEY, LoopMonitor, setup_loop_monitor
+
+
+class TestLoopMonitor:
+    async def test_records_lag(self):
+        monitor = LoopMonitor(interval=0.01)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            await monitor.stop()
+        assert len(monitor._samples) > 0
+        assert monitor.percentiles()[0.5] >= 0.0
+
+    async def test_detects_blocking_callback(self, caplog):
+        monitor = LoopMonitor(interval=0.01, slow_callback_duration=0.05)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.05)
+            with caplog.at_level(logging.WARNING, logger="NAV.LoopMonitor"):
+                time.sleep(0.3)  # blocks the loop on purpose
+                await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+        assert monitor.blocked >= 1
+        assert monitor.percentiles()[0.99] >= 0.2
+        assert "test_detects_blocking_callback" in caplog.text
+
+    async def test_overloaded_flag(self):
+        monitor = LoopMonitor(overload_lag=0.05)
+        assert monitor.overloaded is False
+        for _ in range(20):
+            monitor.record(0.5)
+        assert monitor.overloaded is True
+
+    def test_exports_metrics(self):
+        registry = MetricsRegistry()
+        monitor = LoopMonitor(registry=registry)
+        monitor.record(0.02)
+        text = registry.render()
+        assert "navigator_event_loop_lag_seconds_bucket" in text
+        assert 'navigator_event_loop_lag_quantile_seconds{quantile="0.99"}' in text
+
+
+class TestSetup:
+    def test_setup_is_idempotent(self):
+        app = web.Application()
+        monitor = setup_loop_monitor(app)
+        assert app[LOOP_MONITOR_KEY] is monitor
+        assert setup_loop_monitor(app) is monitor
+        assert monitor.on_startup in app.on_startup
@@ -0,0 +1,128 @@
+"""Tests for the request-metrics middleware and Prometheus registry."""
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from navigator.metrics import (
+    METRICS_KEY,
+    MetricsRegistry,
+    get_registry,
+    setup_metrics,
+)
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+class TestRegistry:
+    def test_namespace_prefix(self):
+        registry = MetricsRegistry(namespace="nav")
+        counter = registry.counter("hits_total", "Hits.")
+        assert counter.name == "nav_hits_total"
+        assert registry.get("hits_total") is counter
+
+    def test_register_is_idempotent(self):
+        registry = MetricsRegistry()
+        assert registry.counter("a") is registry.counter("a")
+
+    def test_kind_conflict_raises(self):
+        registry = MetricsRegistry()
+        registry.counter("a")
+        with pytest.raises(ValueError):
+            registry.gauge("a")
+
+    def test_histogram_exposition(self):
+        registry = MetricsRegistry(namespace="")
+        hist = registry.histogram("lat", "Latency.", ("route",), buckets=(0.1, 1))
+        hist.observe(0.05, ("/a",))
+        hist.observe(0.5, ("/a",))
+        hist.observe(5, ("/a",))
+        text = registry.render()
+        assert "# TYPE lat histogram" in text
+        assert 'lat_bucket{route="/a",le="0.1"} 1' in text
+        assert 'lat_bucket{route="/a",le="1"} 2' in text
+        assert 'lat_bucket{route="/a",le="+Inf"} 3' in text
+        assert 'lat_count{route="/a"} 3' in text
+        assert hist.count(("/a",)) == 3
+        assert hist.quantile(0.5, ("/a",)) == 1
+
+    def test_label_escaping(self):
+        registry = MetricsRegistry(namespace="")
+        registry.counter("c", "", ("path",)).inc(('a"b',))
+        assert 'c{path="a\\"b"} 1' in registry.render()
+
+    def test_broken_collector_is_ignored(self):
+        registry = MetricsRegistry()
+
+        def broken():
+            raise RuntimeError("boom")
+
+        registry.register_collector(broken)
+        registry.counter("ok").inc()
+        assert "navigator_ok 1" in registry.render()
+
+
+# ---------------------------------------------------------------------------
+# Middleware + endpoint
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+async def metrics_client():
+    app = web.Application()
+
+    async def hello(request):
+        return web.Response(text="hello")
+
+    async def item(request):
+        return web.json_response({"id": request.match_info["id"]})
+
+    async def boom(request):
+        raise web.HTTPNotFound()
+
+    app.router.add_get("/hello", hello)
+    app.router.add_get("/items/{id}", item)
+    app.router.add_get("/boom", boom)
+    setup_metrics(app)
+    client = TestClient(TestServer(app))
+    await client.start_server()
+    try:
+        yield client
+    finally:
+        await client.close()
+
+
+class TestMiddleware:
+    async def test_registry_installed(self, metrics_client):
+        assert isinstance(get_registry(metrics_client.app), MetricsRegistry)
+        assert METRICS_KEY in metrics_client.app
+
+    async def test_route_label_is_canonical(self, metrics_client):
+        for i in range(3):
+            await metrics_client.get(f"/items/{i}")
+        registry = get_registry(metrics_client.app)
+        counter = registry.get("http_requests_total")
+        assert counter.get(("GET", "/items/{id}", "200")) == 3
+
+    async def test_http_exception_status(self, metrics_client):
+        await metrics_client.get("/boom")
+        registry = get_registry(metrics_client.app)
+        counter = registry.get("http_requests_total")
+        assert counter.get(("GET", "/boom", "404")) == 1
+
+    async def test_in_flight_back_to_zero(self, metrics_client):
+        await metrics_client.get("/hello")
+        registry = get_registry(metrics_client.app)
+        assert registry.get("http_requests_in_flight").get() == 0
+
+    async def test_metrics_endpoint(self, metrics_client):
+        await metrics_client.get("/hello")
+        resp = await metrics_client.get("/metrics")
+        assert resp.status == 200
+        assert resp.headers["Content-Type"].startswith("text/plain")
+        text = await resp.text()
+        assert "navigator_http_request_duration_seconds_bucket" in text
+        assert 'route="/hello"' in text
+        # the endpoint itself is not instrumented
+        assert 'route="/metrics"' not in text
+        assert "navigator_connections" in text
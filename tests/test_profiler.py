@@ -0,0 +1,114 @@
+"""Tests for the on-demand sampling profiler."""
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from navigator.metrics.profiler import (
+    SamplingProfiler,
+    StackSampler,
+    setup_profiler,
+    to_collapsed,
+    to_speedscope,
+)
+
+
+def busy_function(seconds: float) -> None:
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        sum(range(1000))
+
+
+class TestStackSampler:
+    def test_samples_calling_thread(self):
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        busy_function(0.2)
+        sampler.stop()
+        assert sum(sampler.samples.values()) > 0
+        assert any("busy_function" in stack for stack in sampler.samples)
+
+    def test_collapsed_format(self):
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        busy_function(0.05)
+        sampler.stop()
+        for line in to_collapsed(sampler.samples).splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert stack
+            assert int(count) > 0
+
+    def test_speedscope_document(self):
+        doc = to_speedscope({"loop": {"a;b": 2, "a;c": 1}})
+        assert [f["name"] for f in doc["shared"]["frames"]] == ["a", "b", "c"]
+        profile = doc["profiles"][0]
+        assert profile["type"] == "sampled"
+        assert profile["samples"] == [[0, 1], [0, 2]]
+        assert profile["weights"] == [2, 1]
+        assert profile["endValue"] == 3
+
+
+class TestSamplingProfiler:
+    async def test_profile_includes_task_stacks(self):
+        profiler = SamplingProfiler(task_interval=0.01)
+
+        async def waiting_forever():
+            await asyncio.sleep(60)
+
+        task = asyncio.create_task(waiting_forever(), name="waiter")
+        try:
+            result = await profiler.profile(seconds=0.2)
+        finally:
+            task.cancel()
+        assert any(
+            stack.startswith("task:waiter;") for stack in result["tasks"]
+        )
+
+    async def test_duration_is_capped(self):
+        profiler = SamplingProfiler(max_seconds=0.1, task_interval=0.01)
+        started = time.monotonic()
+        await profiler.profile(seconds=30)
+        assert time.monotonic() - started < 2
+
+
+@pytest.fixture
+async def profiler_client():
+    app = web.Application()
+    setup_profiler(app, token="s3cret", max_seconds=1, cooldown=60)
+    client = TestClient(TestServer(app))
+    await client.start_server()
+    try:
+        yield client
+    finally:
+        await client.close()
+
+
+class TestProfilerEndpoint:
+    async def test_requires_admin(self, profiler_client):
+        resp = await profiler_client.get("/_profiler?seconds=0.1")
+        assert resp.status == 403
+        resp = await profiler_client.get(
+            "/_profiler?seconds=0.1", headers={"Authorization": "Bearer nope"}
+        )
+        assert resp.status == 403
+
+    async def test_speedscope_and_rate_limit(self, profiler_client):
+        headers = {"Authorization": "Bearer s3cret"}
+        resp = await profiler_client.get(
+            "/_profiler?seconds=0.2&format=speedscope", headers=headers
+        )
+        assert resp.status == 200
+        doc = await resp.json()
+        assert doc["exporter"] == "navigator"
+        # second run inside the cool-down window is rejected
+        resp = await profiler_client.get("/_profiler?seconds=0.2", headers=headers)
+        assert resp.status == 429
+        assert "Retry-After" in resp.headers
+
+    async def test_invalid_format(self, profiler_client):
+        resp = await profiler_client.get(
+            "/_profiler?format=svg", headers={"X-Profiler-Token": "s3cret"}
+        )
+        assert resp.status == 400
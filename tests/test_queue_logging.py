@@ -0,0 +1,114 @@
+"""Tests for the non-blocking, queue-backed logging pipeline."""
+import io
+import json
+import logging
+
+import pytest
+
+from navigator.logs import (
+    JSONFormatter,
+    NonBlockingQueueHandler,
+    QueueLogging,
+    SamplingFilter,
+)
+
+
+@pytest.fixture
+def stream_logger():
+    logger = logging.getLogger("tests.queue_logging")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    logger.addHandler(handler)
+    yield logger, stream, handler
+    logger.handlers.clear()
+
+
+class TestQueueLogging:
+    def test_records_reach_handlers(self, stream_logger):
+        logger, stream, handler = stream_logger
+        before = list(logger.handlers)
+        pipeline = QueueLogging(loggers=[logger.name], flush_interval=0.05)
+        pipeline.start()
+        assert logger.handlers == [pipeline.handlers[logger.name]]
+        for i in range(500):
+            logger.info("message %d", i)
+        pipeline.stop()
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 500
+        assert lines[-1] == "message 499"
+        # handlers are given back on stop.
+        assert handler in logger.handlers
+        assert logger.handlers == before
+
+    def test_json_format_keeps_extra(self, stream_logger):
+        logger, stream, _ = stream_logger
+        pipeline = QueueLogging(loggers=[logger.name], json=True)
+        pipeline.start()
+        logger.warning("slow", extra={"route": "/users/{id}", "latency_ms": 12.5})
+        pipeline.stop()
+        entry = json.loads(stream.getvalue())
+        assert entry["message"] == "slow"
+        assert entry["level"] == "WARNING"
+        assert entry["route"] == "/users/{id}"
+        assert entry["latency_ms"] == 12.5
+
+    def test_json_formatter_restored(self, stream_logger):
+        logger, _, handler = stream_logger
+        formatter = logging.Formatter("%(message)s")
+        handler.setFormatter(formatter)
+        pipeline = QueueLogging(loggers=[logger.name], json=True)
+        pipeline.start()
+        assert isinstance(handler.formatter, JSONFormatter)
+        pipeline.stop()
+        assert handler.formatter is formatter
+
+    def test_propagated_records_written_once(self, stream_logger):
+        logger, stream, _ = stream_logger
+        child = logging.getLogger(f"{logger.name}.child")
+        child_stream = io.StringIO()
+        child.addHandler(logging.StreamHandler(child_stream))
+        try:
+            pipeline = QueueLogging(
+                loggers=[logger.name, child.name], flush_interval=0.05
+            )
+            pipeline.start()
+            child.info("hello-child")
+            pipeline.stop()
+        finally:
+            child.handlers.clear()
+        assert stream.getvalue() == "hello-child\n"
+        assert child_stream.getvalue() == "hello-child\n"
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        import queue
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        record = logging.makeLogRecord({"msg": "x"})
+        handler.handle(record)
+        handler.handle(record)
+        assert handler.dropped == 1
+
+
+class TestSampling:
+    def test_samples_info_keeps_warnings(self):
+        sampler = SamplingFilter(rate=0.1)
+        info = logging.makeLogRecord({"levelno": logging.INFO})
+        warn = logging.makeLogRecord({"levelno": logging.WARNING})
+        assert sum(sampler.filter(info) for _ in range(100)) == 10
+        assert all(sampler.filter(warn) for _ in range(10))
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            SamplingFilter(rate=0)
+
+
+def test_formatter_exception():
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        record = logging.getLogger("x").makeRecord(
+            "x", logging.ERROR, __file__, 1, "failed", (), __import__("sys").exc_info()
+        )
+    entry = json.loads(JSONFormatter().format(record))
+    assert "RuntimeError: boom" in entry["exc_info"]
@@ -0,0 +1,155 @@
+"""Tests for the tracing layer (spans, propagation, exporters, middleware)."""
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from navigator.tracing import (
+    FileExporter,
+    InMemoryExporter,
+    NonRecordingSpan,
+    Tracer,
+    current_span,
+    get_tracer,
+    inject,
+    parse_traceparent,
+    set_tracer,
+    setup_tracing,
+    start_span,
+    traced,
+)
+
+TRACEPARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+@pytest.fixture
+def exporter():
+    previous = get_tracer()
+    memory = InMemoryExporter()
+    tracer = set_tracer(Tracer(exporters=[memory]))
+    yield memory
+    tracer.flush()
+    set_tracer(previous)
+
+
+class TestTraceparent:
+    def test_parse(self):
+        ctx = parse_traceparent(TRACEPARENT)
+        assert ctx.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+        assert ctx.span_id == "00f067aa0ba902b7"
+        assert ctx.sampled is True
+        assert ctx.to_traceparent() == TRACEPARENT
+
+    @pytest.mark.parametrize("header", [
+        None, "", "garbage", "ff-" + TRACEPARENT[3:],
+        "00-" + "0" * 32 + "-00f067aa0ba902b7-01",
+    ])
+    def test_invalid(self, header):
+        assert parse_traceparent(header) is None
+
+
+class TestTracer:
+    async def test_parent_child_and_context(self, exporter):
+        with start_span("parent") as parent:
+            assert current_span() is parent
+            with start_span("child") as child:
+                pass
+
+            async def in_task():
+                with start_span("task"):
+                    await asyncio.sleep(0)
+
+            await asyncio.create_task(in_task())
+            assert current_span() is parent
+        assert current_span() is None
+        get_tracer().flush()
+        spans = {s.name: s for s in exporter.get_finished_spans()}
+        assert spans["child"].parent_id == parent.context.span_id
+        assert spans["task"].parent_id == parent.context.span_id
+        assert spans["task"].context.trace_id == parent.context.trace_id
+        assert spans["parent"].parent_id is None
+
+    async def test_traced_records_errors(self, exporter):
+        @traced("boom")
+        async def boom():
+            raise RuntimeError("failed")
+
+        with pytest.raises(RuntimeError):
+            await boom()
+        get_tracer().flush()
+        span, = exporter.get_finished_spans("boom")
+        assert span.status == "error"
+        assert "RuntimeError" in span.error
+
+    def test_head_sampling(self):
+        memory = InMemoryExporter()
+        tracer = Tracer(sample_rate=0.0, exporters=[memory])
+        root = tracer.start_span("root")
+        child = tracer.start_span("child")
+        assert isinstance(root, NonRecordingSpan)
+        assert isinstance(child, NonRecordingSpan)
+        assert child.context.trace_id == root.context.trace_id
+        child.end()
+        root.end()
+        tracer.flush()
+        assert memory.spans == []
+
+    def test_disabled_tracer_is_noop(self):
+        tracer = Tracer(enabled=False)
+        span = tracer.start_span("x")
+        span.end()
+        assert current_span() is None
+
+    def test_inject(self, exporter):
+        assert "traceparent" not in inject({})
+        with start_span("client") as span:
+            headers = inject({"Accept": "application/json"})
+        assert headers["traceparent"] == span.context.to_traceparent()
+        assert headers["Accept"] == "application/json"
+
+    def test_file_exporter(self, tmp_path):
+        path = tmp_path / "spans.jsonl"
+        tracer = Tracer(exporters=[FileExporter(path)])
+        with tracer.start_span("op", attributes={"k": "v"}):
+            pass
+        tracer.shutdown()
+        entry = json.loads(path.read_text().splitlines()[0])
+        assert entry["name"] == "op"
+        assert entry["attributes"]["k"] == "v"
+
+
+@pytest.fixture
+async def tracing_client():
+    previous = get_tracer()
+    app = web.Application()
+    memory = InMemoryExporter()
+
+    async def item(request):
+        with start_span("work"):
+            return web.json_response({"traceparent": inject().get("traceparent")})
+
+    app.router.add_get("/items/{id}", item)
+    tracer = setup_tracing(app, exporters=[memory])
+    client = TestClient(TestServer(app))
+    await client.start_server()
+    yield client, tracer, memory
+    await client.close()
+    set_tracer(previous)
+
+
+class TestMiddleware:
+    async def test_continues_incoming_trace(self, tracing_client):
+        client, tracer, memory = tracing_client
+        resp = await client.get("/items/1", headers={"traceparent": TRACEPARENT})
+        assert resp.status == 200
+        outgoing = parse_traceparent((await resp.json())["traceparent"])
+        tracer.flush()
+        server, = memory.get_finished_spans("GET /items/{id}")
+        work, = memory.get_finished_spans("work")
+        assert server.context.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+        assert server.parent_id == "00f067aa0ba902b7"
+        assert server.attributes["http.status_code"] == 200
+        assert work.parent_id == server.context.span_id
+        assert outgoing.span_id == work.context.span_id
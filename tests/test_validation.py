@@ -0,0 +1,94 @@
+"""Tests for the compiled payload validators."""
+from dataclasses import dataclass, field
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from navigator.decorators import validate_data, validate_payload
+from navigator.utils.validation import ModelValidator, get_validator
+
+
+@dataclass
+class Airport:
+    iata: str
+    elevation: int
+    active: bool = True
+    tags: list = field(default_factory=list)
+
+
+class TestModelValidator:
+    def test_compiled_once(self):
+        validator = get_validator(Airport)
+        assert get_validator(Airport) is validator
+        assert get_validator(validator) is validator
+        assert validator.required == ("iata", "elevation")
+        assert validator.fields == frozenset({"iata", "elevation", "active", "tags"})
+
+    def test_converts_string_sources(self):
+        airport = get_validator(Airport)({"iata": "AEP", "elevation": "18", "active": "false"})
+        assert airport.elevation == 18
+        assert airport.active is False
+
+    def test_missing_required(self):
+        with pytest.raises(TypeError, match="elevation"):
+            get_validator(Airport)({"iata": "AEP"})
+
+    def test_invalid_model(self):
+        with pytest.raises(TypeError):
+            ModelValidator(dict)
+
+    def test_validate_data_shapes(self):
+        validator = get_validator(Airport)
+        valid, errors = validate_data(validator, [{"iata": "AEP", "elevation": 1}, {"iata": "X"}])
+        assert [a.iata for a in valid] == ["AEP"]
+        assert "error" in errors
+        valid, errors = validate_data(
+            validator, {"a": {"iata": "AEP", "elevation": 1}, "b": {"iata": "EZE", "elevation": 2}}
+        )
+        assert set(valid) == {"a", "b"}
+        assert not errors
+
+
+@pytest.fixture
+async def payload_client():
+    app = web.Application()
+
+    @validate_payload(Airport, max_size=256)
+    async def create(request, airport=None, errors=None):
+        if errors:
+            return web.json_response(errors, status=400)
+        return web.json_response({"iata": airport.iata, "elevation": airport.elevation})
+
+    app.router.add_post("/airports", create)
+    client = TestClient(TestServer(app))
+    await client.start_server()
+    yield client
+    await client.close()
+
+
+class TestValidatePayload:
+    async def test_json_body(self, payload_client):
+        resp = await payload_client.post("/airports", json={"iata": "AEP", "elevation": 18})
+        assert resp.status == 200
+        assert await resp.json() == {"iata": "AEP", "elevation": 18}
+
+    async def test_form_body(self, payload_client):
+        resp = await payload_client.post("/airports", data={"iata": "AEP", "elevation": "18"})
+        assert resp.status == 200
+        assert (await resp.json())["elevation"] == 18
+
+    async def test_validation_errors(self, payload_client):
+        resp = await payload_client.post("/airports", json={"iata": "AEP"})
+        assert resp.status == 400
+        assert "airport" in await resp.json()
+
+    async def test_unsupported_content_type(self, payload_client):
+        resp = await payload_client.post(
+            "/airports", data=b"iata=AEP", headers={"Content-Type": "text/plain"}
+        )
+        assert resp.status == 415
+
+    async def test_body_too_large(self, payload_client):
+        resp = await payload_client.post("/airports", json={"iata": "A" * 512, "elevation": 1})
+        assert resp.status == 413
@@ -87,3 +87,14 @@ class TestLazyLoading:
         import navigator.utils.file as pkg
         with pytest.raises(AttributeError):
             _ = pkg.NonExistentClass
+
+    def test_web_layer_not_eagerly_loaded(self):
+        """FileServingExtension (aiohttp + app config) is resolved lazily."""
+        import navigator.utils.file as pkg
+
+        if "FileServingExtension" in pkg.__dict__:
+            del pkg.__dict__["FileServingExtension"]
+
+        ext = getattr(pkg, "FileServingExtension")
+        assert ext is not None
+        assert "FileServingExtension" in pkg.__dict__